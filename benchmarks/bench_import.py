@@ -0,0 +1,104 @@
+"""
+Benchmarks of the time taken to import the graph front end.
+
+Each import is timed in a new interpreter, as modules are only imported\
+once in a process, and the median of a number of repeats is reported with\
+the number of modules the import loaded::
+
+    python benchmarks/bench_import.py --repeats 10 --output imports.json
+"""
+
+# general imports
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# The folder holding the front end benchmarked
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The statements timed, by name; each is run on its own after the\
+# interpreter has started
+IMPORTS = [
+    ("package", "import spinnaker_graph_front_end"),
+    ("config", (
+        "from spinnaker_graph_front_end.utilities.conf import config")),
+    ("config loaded", (
+        "from spinnaker_graph_front_end.utilities.conf import config\n"
+        "config.load()")),
+    ("lattice", "from spinnaker_graph_front_end.graphs import lattice"),
+    ("machine edge", (
+        "import spinnaker_graph_front_end as front_end\n"
+        "front_end.MachineEdge")),
+    ("tool chain", (
+        "import spinnaker_graph_front_end as front_end\n"
+        "front_end.SpiNNaker"))
+]
+
+# The code which times a statement in a new interpreter, and prints the\
+# seconds taken and the number of modules loaded
+_TIMER = """
+import sys
+import time
+sys.path.insert(0, {root!r})
+n_modules = len(sys.modules)
+start = time.time()
+exec {statement!r}
+print time.time() - start, len(sys.modules) - n_modules
+"""
+
+
+def time_import(statement, repeats):
+    """ Time a statement in a number of new interpreters
+
+    :param statement: the statement to time
+    :type statement: str
+    :param repeats: the number of interpreters to time it in
+    :type repeats: int
+    :return: the seconds taken by each run, and the number of modules loaded
+    :rtype: (list of float, int)
+    """
+    code = _TIMER.format(root=_ROOT, statement=statement)
+    times = list()
+    n_modules = None
+    for _ in xrange(repeats):
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], stderr=open(os.devnull, "w"))
+        seconds, n_modules = output.split()[-2:]
+        times.append(float(seconds))
+    return times, int(n_modules)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the import of the graph front end")
+    parser.add_argument(
+        "--repeats", type=int, default=5,
+        help="the number of interpreters to time each import in")
+    parser.add_argument(
+        "--output", help="a file to write the results to as JSON")
+    options = parser.parse_args(args)
+
+    results = list()
+    print "{:14} {:>10} {:>10} {:>8}".format(
+        "import", "median ms", "min ms", "modules")
+    for name, statement in IMPORTS:
+        times, n_modules = time_import(statement, options.repeats)
+        times.sort()
+        median = times[len(times) // 2]
+        print "{:14} {:10.1f} {:10.1f} {:8}".format(
+            name, median * 1000, times[0] * 1000, n_modules)
+        results.append({
+            "name": name, "statement": statement, "seconds": times,
+            "median_seconds": median, "n_modules": n_modules})
+
+    if options.output is not None:
+        with open(options.output, "w") as f:
+            json.dump({"python": sys.version, "results": results}, f,
+                      indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
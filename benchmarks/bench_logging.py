@@ -0,0 +1,189 @@
+"""
+Micro-benchmarks of the cost of logging through the configured filters of\
+the graph front end, as seen by the code logging.
+
+The level of each record is found by the filter from the Logging section of\
+the config, and the records which pass are formatted and written by the\
+handlers, either in the thread logging or, with a queue, in a thread of\
+their own::
+
+    python benchmarks/bench_logging.py --records 100000
+
+The handlers write to a file and to a stream whose writes block, as those\
+to a busy terminal or a network file system do.
+"""
+
+# general imports
+import ConfigParser
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+# The benchmarks are of the front end of the tree holding them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The logger names used, of the depths of those of the tool chain
+_LOGGER_NAMES = [
+    "spinnaker_graph_front_end.spinnaker",
+    "pacman.operations.router_algorithms.basic_dijkstra_routing",
+    "spinn_front_end_common.interface.interface_functions."
+    "front_end_common_load_executable_images",
+    "spinnman.transceiver",
+    "data_specification.data_specification_executor"]
+
+# The levels set for some modules, as a user might in the Logging section
+_LEVELS = {
+    "debug": "spinnaker_graph_front_end.utilities",
+    "warning": "pacman.operations, spinnman",
+    "error": "data_specification"}
+
+# The seconds for which each write to a slow stream blocks, as to a busy\
+# terminal or a network file system
+_SLOW_WRITE_SECONDS = 0.0001
+
+
+class _SlowStream(object):
+    """ A stream which discards what is written after blocking for a time
+    """
+
+    def write(self, _):
+        time.sleep(_SLOW_WRITE_SECONDS)
+
+    def flush(self):
+        pass
+
+
+def _make_config(use_queue=False):
+    from spinnaker_graph_front_end.utilities.conf import config
+    config.load()
+    conf = ConfigParser.RawConfigParser()
+    conf.add_section("Logging")
+    for option, value in config.items("Logging"):
+        conf.set("Logging", option, value)
+    for level, modules in _LEVELS.iteritems():
+        conf.set("Logging", level, modules)
+    conf.set("Logging", "use_queue", str(use_queue))
+    return conf
+
+
+def _uncached_filter(conf):
+    """ The filter as it was before the levels were cached, which found the\
+        deepest parent of each record with a regular expression
+    """
+    from spinnaker_graph_front_end.utilities.conf.log import \
+        ConfiguredFormatter, levels
+    parents = ConfiguredFormatter.construct_logging_parents(conf)
+    default_level = levels[conf.get("Logging", "default")]
+
+    def filter_record(record):
+        match = record.name
+        keys = parents.keys()
+        while '.' in match and match not in keys:
+            match = re.sub(r'\.[^.]+$', '', match)
+        if match not in keys:
+            return record.levelno >= default_level
+        return record.levelno >= parents[match]
+    return filter_record
+
+
+def bench_filters(n_records):
+    """ Time filtering records with and without the cache of levels
+
+    :return: the microseconds per record of each filter
+    :rtype: list of (str, float)
+    """
+    from spinnaker_graph_front_end.utilities.conf.log import ConfiguredFilter
+    conf = _make_config()
+    records = [
+        logging.LogRecord(
+            _LOGGER_NAMES[i % len(_LOGGER_NAMES)], logging.INFO, __file__, 0,
+            "message %d", (i, ), None)
+        for i in xrange(n_records)]
+    results = list()
+    for name, filter_record in (
+            ("uncached filter", _uncached_filter(conf)),
+            ("cached filter", ConfiguredFilter(conf).filter)):
+        start = time.time()
+        for record in records:
+            filter_record(record)
+        results.append(
+            (name, (time.time() - start) * 1000000.0 / n_records))
+    return results
+
+
+def bench_handlers(n_records, stream, stream_name):
+    """ Time logging records to a stream, with the handler called directly\
+        and through a queue, as seen by the thread logging
+
+    :return: the microseconds per record logged, in the thread logging and\
+        until all are written
+    :rtype: list of (str, float, float)
+    """
+    from spinnaker_graph_front_end.utilities.conf.log import \
+        ConfiguredFilter, ConfiguredFormatter, QueueHandler, QueueListener, \
+        RecordQueue
+    conf = _make_config()
+    results = list()
+    for use_queue in (False, True):
+        logger = logging.getLogger("bench_logging.{}.queue{}".format(
+            stream_name, use_queue))
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(ConfiguredFilter(conf))
+        handler.setFormatter(ConfiguredFormatter(conf))
+        listener = None
+        if use_queue:
+            queue = RecordQueue()
+            queue_handler = QueueHandler(queue)
+            queue_handler.addFilter(ConfiguredFilter(conf))
+            listener = QueueListener(queue, handler)
+            listener.start()
+            logger.addHandler(queue_handler)
+        else:
+            logger.addHandler(handler)
+
+        start = time.time()
+        for i in xrange(n_records):
+            logger.info("Placed vertex %d of %d", i, n_records)
+        logged = time.time()
+        if listener is not None:
+            listener.stop()
+        written = time.time()
+        logger.handlers = []
+        results.append((
+            "{}, {}".format(stream_name, "queued" if use_queue else "direct"),
+            (logged - start) * 1000000.0 / n_records,
+            (written - start) * 1000000.0 / n_records))
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the per-record cost of logging")
+    parser.add_argument(
+        "--records", type=int, default=100000,
+        help="the number of records to log in each benchmark")
+    options = parser.parse_args(args)
+
+    print "{:20} {:>12}".format("filter", "us/record")
+    for name, micros in bench_filters(options.records):
+        print "{:20} {:12.2f}".format(name, micros)
+    print
+    print "{:20} {:>12} {:>12}".format("handler", "us/record", "us written")
+    with open(os.devnull, "w") as devnull:
+        results = bench_handlers(options.records, devnull, "file")
+
+    # the slow stream is limited by its writes, so fewer records are enough
+    results.extend(bench_handlers(
+        max(options.records // 10, 1), _SlowStream(), "slow stream"))
+    for name, micros, written_micros in results:
+        print "{:20} {:12.2f} {:12.2f}".format(name, micros, written_micros)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""
+Benchmarks of the mapping work flow of the graph front end on virtual boards.
+
+Heat demo, Conway and hello world graphs are built for a sweep of virtual\
+machine sizes, and each is mapped, has its data generated and its reports\
+written by a run on a virtual board.  The wall time and peak resident memory\
+of building the graph and of each algorithm run are written to a JSON file,\
+and the results of two versions can be compared::
+
+    python benchmarks/bench_mapping.py --sizes 2x2,8x8 --output new.json
+    python benchmarks/bench_mapping.py --compare old.json new.json
+
+Each graph and size is run in a process of its own, so that the memory of\
+one does not count towards the next.  The measurements of each algorithm\
+are those of front_end.get_run_profile(), with the peak resident memory of\
+each sampled by this script.
+"""
+
+# general imports
+from datetime import datetime
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# The benchmarks are of the front end of the tree holding them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The graphs which can be benchmarked
+GRAPHS = ("heat", "conway", "hello")
+
+# The number of seconds between samples of the resident memory
+_SAMPLE_SECONDS = 0.005
+
+# The fraction by which a stage must be slower or larger to be reported as a\
+# regression by a comparison
+_DEFAULT_THRESHOLD = 0.1
+
+
+class MemorySampler(object):
+    """ Samples the resident memory of the process in a thread of its own,\
+        so that the peak of any interval of the run can be found afterwards
+    """
+
+    __slots__ = [
+
+        # The (host time, resident bytes) of each sample
+        "_samples",
+
+        # The thread taking the samples
+        "_thread",
+
+        # True once the sampling is to stop
+        "_done"
+    ]
+
+    def __init__(self):
+        self._samples = list()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._done = False
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+
+    def stop(self):
+        self._done = True
+        self._thread.join()
+        self.sample()
+
+    def _run(self):
+        while not self._done:
+            self.sample()
+            time.sleep(_SAMPLE_SECONDS)
+
+    def sample(self):
+        """ Take a sample now
+
+        :return: the resident bytes
+        :rtype: int
+        """
+        rss = resident_bytes()
+        self._samples.append((time.time(), rss))
+        return rss
+
+    def peak(self, start_time, end_time):
+        """ The largest resident memory sampled in an interval, including\
+            the last sample before it
+
+        :param start_time: the host time of the start of the interval
+        :type start_time: float
+        :param end_time: the host time of the end of the interval
+        :type end_time: float
+        :rtype: int
+        """
+        peak = None
+        before = None
+        for sample_time, rss in list(self._samples):
+            if sample_time < start_time:
+                before = rss
+            elif sample_time <= end_time:
+                peak = rss if peak is None else max(peak, rss)
+        if before is not None:
+            peak = before if peak is None else max(peak, before)
+        return peak or 0
+
+
+def resident_bytes():
+    """ The resident memory of this process, or its peak so far if the\
+        current value cannot be read
+
+    :rtype: int
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize()
+    except (IOError, OSError, IndexError, ValueError):
+
+        # ru_maxrss is in kilobytes on Linux and bytes on Mac OS X
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def classify(phase, algorithm):
+    """ The stage of the work flow to which an algorithm belongs
+
+    :param phase: the phase of the work flow in which the algorithm ran
+    :type phase: str
+    :param algorithm: the name of the algorithm
+    :type algorithm: str
+    :rtype: str
+    """
+    if "report" in algorithm.lower():
+        return "reports"
+    if phase == "data generation":
+        return "dsg"
+    return phase or "other"
+
+
+def build_graph(front_end, graph, width, height):
+    """ Add the vertices and edges of a graph filling a virtual machine
+
+    :param front_end: the graph front end, set up
+    :param graph: the graph to build; one of GRAPHS
+    :type graph: str
+    :param width: the width of the machine in chips
+    :type width: int
+    :param height: the height of the machine in chips
+    :type height: int
+    :return: the number of vertices added
+    :rtype: int
+    """
+    from spinnaker_graph_front_end.graphs import lattice
+
+    if graph == "heat":
+        from spinnaker_graph_front_end.examples.heat_demo.heat_demo_vertex\
+            import HeatDemoVertex
+        from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+            import HeatDemoEdge
+
+        # a 4 by 4 grid of elements on each chip, as in the heat demo
+        vertices = lattice.build_lattice(
+            (width * 4, height * 4),
+            lambda x, y: HeatDemoVertex(
+                label="Heat Element {}, {}".format(x, y),
+                machine_time_step=1000, time_scale_factor=1),
+            stencil=lattice.VON_NEUMANN, wrap=False,
+            partition_id="TRANSMISSION", edge_class=HeatDemoEdge,
+            direction_param="direction",
+            direction_values={
+                "N": HeatDemoEdge.DIRECTIONS.SOUTH,
+                "E": HeatDemoEdge.DIRECTIONS.WEST,
+                "S": HeatDemoEdge.DIRECTIONS.NORTH,
+                "W": HeatDemoEdge.DIRECTIONS.EAST})
+        return vertices.size
+
+    if graph == "conway":
+        from spinnaker_graph_front_end.examples.Conways.\
+            partitioned_example_b_no_vis_buffer.conways_basic_cell \
+            import ConwayBasicCell
+
+        # a glider on a torus of a cell for each core
+        glider = set([(2, 2), (3, 2), (3, 3), (4, 3), (2, 4)])
+        vertices = lattice.build_lattice(
+            (width * 4, height * 4),
+            lambda x, y: ConwayBasicCell(
+                "cell{}_{}".format(x, y), (x, y) in glider),
+            stencil=lattice.MOORE, wrap=True, partition_id="STATE")
+        return vertices.size
+
+    if graph == "hello":
+        from spinnaker_graph_front_end.examples.hello_world.\
+            hello_world_vertex import HelloWorldVertex
+        n_vertices = width * height * 16
+        front_end.add_machine_vertices(
+            HelloWorldVertex, {}, n_vertices, labels="Hello World {}")
+        return n_vertices
+
+    raise ValueError("Unknown graph {}; expected one of {}".format(
+        graph, ", ".join(GRAPHS)))
+
+
+def run_single(graph, width, height, runtime):
+    """ Build, map and run one graph on a virtual machine in this process
+
+    :return: the results of the benchmark
+    :rtype: dict
+    """
+    from spinnaker_graph_front_end.utilities.conf import config
+    config.set("Machine", "virtual_board", "True")
+    config.set("Machine", "width", str(width))
+    config.set("Machine", "height", str(height))
+    config.set("Machine", "version", "None")
+    config.set("Machine", "machineName", "None")
+
+    import spinnaker_graph_front_end as front_end
+
+    sampler = MemorySampler()
+    sampler.start()
+    try:
+        front_end.setup(graph_label="benchmark_{}".format(graph))
+
+        build_start = time.time()
+        n_vertices = build_graph(front_end, graph, width, height)
+        build_end = time.time()
+
+        run_start = time.time()
+        front_end.run(runtime)
+        run_end = time.time()
+
+        records = front_end.get_run_profile().records
+        n_edges = len(front_end.machine_graph().edges)
+    finally:
+        sampler.stop()
+
+    base_rss = sampler.peak(0, build_start)
+    algorithms = list()
+    stages = {"graph building": {
+        "seconds": build_end - build_start,
+        "peak_rss": sampler.peak(build_start, build_end)}}
+    for record in records:
+        stage = classify(record.phase, record.name)
+        seconds = record.wall_seconds
+        peak_rss = sampler.peak(record.start_time, record.start_time + seconds)
+        algorithm = record.to_dict()
+        algorithm.update({
+            "stage": stage, "seconds": seconds, "peak_rss": peak_rss})
+        algorithms.append(algorithm)
+        totals = stages.setdefault(stage, {"seconds": 0.0, "peak_rss": 0})
+        totals["seconds"] += seconds
+        totals["peak_rss"] = max(totals["peak_rss"], peak_rss)
+
+    try:
+        front_end.stop()
+    except Exception as e:
+        logger.warn("Error stopping the front end: {}".format(e))
+
+    return {
+        "graph": graph, "width": width, "height": height,
+        "runtime": runtime, "n_vertices": n_vertices, "n_edges": n_edges,
+        "base_rss": base_rss, "run_seconds": run_end - run_start,
+        "stages": stages, "algorithms": algorithms}
+
+
+def run_sweep(graphs, sizes, runtime):
+    """ Run each graph at each size in a process of its own
+
+    :return: the results of each benchmark, or of its error
+    :rtype: list of dict
+    """
+    results = list()
+    for graph in graphs:
+        for width, height in sizes:
+            logger.info("Benchmarking {} on {}x{}".format(
+                graph, width, height))
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--single",
+                 "--graphs", graph, "--sizes", "{}x{}".format(width, height),
+                 "--runtime", str(runtime)],
+                stdout=subprocess.PIPE)
+            output, _ = process.communicate()
+            try:
+                results.append(json.loads(output.splitlines()[-1]))
+            except (IndexError, ValueError):
+                logger.error("Benchmark of {} on {}x{} failed".format(
+                    graph, width, height))
+                results.append({
+                    "graph": graph, "width": width, "height": height,
+                    "runtime": runtime,
+                    "error": "exit code {}".format(process.returncode)})
+    return results
+
+
+def metadata():
+    """ A description of the version and host benchmarked
+
+    :rtype: dict
+    """
+    from spinnaker_graph_front_end._version import __version__
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "hostname": socket.gethostname(),
+        "timestamp": datetime.utcnow().isoformat() + "Z"}
+
+
+def compare(old_path, new_path, threshold=_DEFAULT_THRESHOLD):
+    """ Print the changes in time and memory of each stage between two\
+        result files
+
+    :return: the number of stages which got worse by more than the threshold
+    :rtype: int
+    """
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    old_results = dict(
+        ((result["graph"], result["width"], result["height"]), result)
+        for result in old["results"] if "stages" in result)
+
+    n_regressions = 0
+    print "{:8} {:>7} {:16} {:>10} {:>10} {:>8} {:>10} {:>10} {:>8}".format(
+        "graph", "size", "stage", "old s", "new s", "change", "old MB",
+        "new MB", "change")
+    for result in new["results"]:
+        key = (result["graph"], result["width"], result["height"])
+        if "stages" not in result or key not in old_results:
+            continue
+        old_stages = old_results[key]["stages"]
+        for stage in sorted(result["stages"]):
+            if stage not in old_stages:
+                continue
+            old_stage = old_stages[stage]
+            new_stage = result["stages"][stage]
+            time_change = _change(old_stage["seconds"], new_stage["seconds"])
+            rss_change = _change(
+                old_stage["peak_rss"], new_stage["peak_rss"])
+            worse = time_change > threshold or rss_change > threshold
+            n_regressions += worse
+            print (
+                "{:8} {:>7} {:16} {:10.3f} {:10.3f} {:+7.1%} {:10.1f}"
+                " {:10.1f} {:+7.1%}{}".format(
+                    key[0], "{}x{}".format(key[1], key[2]), stage,
+                    old_stage["seconds"], new_stage["seconds"], time_change,
+                    old_stage["peak_rss"] / 1048576.0,
+                    new_stage["peak_rss"] / 1048576.0, rss_change,
+                    " *" if worse else ""))
+    return n_regressions
+
+
+def _change(old, new):
+    if not old:
+        return 0.0
+    return (new - old) / float(old)
+
+
+def _parse_sizes(sizes):
+    parsed = list()
+    for size in sizes.split(","):
+        width, _, height = size.strip().lower().partition("x")
+        parsed.append((int(width), int(height or width)))
+    return parsed
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the mapping of graphs on virtual boards")
+    parser.add_argument(
+        "--graphs", default=",".join(GRAPHS),
+        help="comma-separated graphs to build, from {}".format(
+            ", ".join(GRAPHS)))
+    parser.add_argument(
+        "--sizes", default="2x2,8x8",
+        help="comma-separated virtual machine sizes, as WIDTHxHEIGHT in chips")
+    parser.add_argument(
+        "--runtime", type=int, default=10,
+        help="the number of time steps to run for")
+    parser.add_argument(
+        "--output", default="benchmark_results.json",
+        help="the file to write the results to")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"),
+        help="compare two result files instead of running")
+    parser.add_argument(
+        "--threshold", type=float, default=_DEFAULT_THRESHOLD,
+        help="the fractional change reported as a regression")
+    parser.add_argument(
+        "--single", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args(args)
+
+    if options.compare:
+        return 1 if compare(
+            options.compare[0], options.compare[1], options.threshold) else 0
+
+    graphs = [graph.strip() for graph in options.graphs.split(",")]
+    sizes = _parse_sizes(options.sizes)
+    if options.single:
+
+        # the result is the last line of the output, after any of the tools
+        result = run_single(graphs[0], sizes[0][0], sizes[0][1],
+                            options.runtime)
+        sys.stdout.write("\n" + json.dumps(result) + "\n")
+        return 0
+
+    results = run_sweep(graphs, sizes, options.runtime)
+    with open(options.output, "w") as f:
+        json.dump({"metadata": metadata(), "results": results}, f, indent=2,
+                  sort_keys=True)
+    logger.info("Wrote results to {}".format(options.output))
+    return 0 if all("error" not in result for result in results) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -7,14 +7,20 @@ setup(
     description="Front end to the SpiNNaker tool chain which uses a basic graph",
     url="https://github.com/SpiNNakerManchester/SpiNNakerGraphFrontEnd",
     packages=['spinnaker_graph_front_end',
+              'spinnaker_graph_front_end.abstract_models',
               'spinnaker_graph_front_end.examples',
               'spinnaker_graph_front_end.examples.heat_demo',
               'spinnaker_graph_front_end.examples.hello_world',
+              'spinnaker_graph_front_end.graphs',
+              'spinnaker_graph_front_end.interface_functions',
               'spinnaker_graph_front_end.utilities',
+              'spinnaker_graph_front_end.utilities.connections',
               'spinnaker_graph_front_end.utilities.conf'],
     package_data={'spinnaker_graph_front_end.examples.heat_demo': ['*.aplx'],
                   'spinnaker_graph_front_end.examples.hello_world': ['*.aplx'],
                   'spinnaker_graph_front_end': ['spiNNakerGraphFrontEnd.cfg'],
+                  'spinnaker_graph_front_end.interface_functions':
+                      ['*.xml'],
                   'spinnaker_graph_front_end.utilities.conf':
                       ['spiNNakerGraphFrontEnd.cfg.template']},
     install_requires=['SpiNNFrontEndCommon >= 3.0.0, < 4.0.0',
@@ -1,4 +1,5 @@
 # front end common imports
+from spinn_front_end_common.utilities import exceptions
 from spinn_front_end_common.utilities.notification_protocol.socket_address \
     import SocketAddress
 from spinn_front_end_common.utilities.utility_objs.executable_finder \
@@ -7,22 +8,49 @@ from spinn_front_end_common.utilities.utility_objs.executable_finder \
 # graph front end imports
 from spinnaker_graph_front_end._version import \
     __version__, __version_name__, __version_month__, __version_year__
-from spinnaker_graph_front_end.spinnaker import SpiNNaker
-
-# utility models for graph front ends
-from spinn_front_end_common.utility_models.live_packet_gather \
-    import LivePacketGather  # @IgnorePep8
-from spinn_front_end_common.utility_models.reverse_ip_tag_multi_cast_source \
-    import ReverseIpTagMultiCastSource  # @IgnorePep8
-from pacman.model.graphs.machine.impl.machine_edge \
-    import MachineEdge  # @IgnorePep8
-
 
+from itertools import izip
+import importlib
 import logging
-import inspect
 import sys
+import types
 logger = logging.getLogger(__name__)
 
+# The names of the front end which are only imported when first used, with
+# the module each is imported from and its name in that module, or None for
+# the module itself; between them they load most of the tool chain, which is
+# not needed to read the configuration or to build graphs offline
+_LAZY_ATTRIBUTES = {
+    "SpiNNaker": ("spinnaker_graph_front_end.spinnaker", "SpiNNaker"),
+    "bulk_utilities": (
+        "spinnaker_graph_front_end.utilities.bulk_utilities", None),
+    "recorded_data": (
+        "spinnaker_graph_front_end.utilities.recorded_data", None),
+    "RecordingStore": (
+        "spinnaker_graph_front_end.utilities.recording_store",
+        "RecordingStore"),
+    "KeyIndex": ("spinnaker_graph_front_end.utilities.key_index", "KeyIndex"),
+    "LiveEventInjector": (
+        "spinnaker_graph_front_end.utilities.connections.live_event_injector",
+        "LiveEventInjector"),
+    "config": ("spinnaker_graph_front_end.utilities.conf", "config"),
+    "xml_graph_reader": (
+        "spinnaker_graph_front_end.graphs.xml_graph_reader", None),
+    "graph_snapshot": (
+        "spinnaker_graph_front_end.graphs.graph_snapshot", None),
+
+    # utility models for graph front ends
+    "LivePacketGather": (
+        "spinn_front_end_common.utility_models.live_packet_gather",
+        "LivePacketGather"),
+    "ReverseIpTagMultiCastSource": (
+        "spinn_front_end_common.utility_models."
+        "reverse_ip_tag_multi_cast_source", "ReverseIpTagMultiCastSource"),
+    "MachineEdge": (
+        "pacman.model.graphs.machine.impl.machine_edge", "MachineEdge"),
+    "numpy": ("numpy", None)
+}
+
 
 _spinnaker = None
 _none_labelled_vertex_count = None
@@ -60,8 +88,10 @@ def setup(hostname=None, graph_label=None, model_binary_module=None,
     :type database_socket_addresses: list of SocketAddresses
     :param user_dsg_algorithm:\
         an algorithm used for generating the application data which is loaded\
-        onto the machine. if not set, will use the data specification language\
-        algorithm required for the type of graph being used.
+        onto the machine. if not set, will use the dsg_algorithm of the\
+        SpecExecution section of the configuration, e.g.\
+        GraphFrontEndParallelDataSpecificationWriter to generate the data\
+        specifications in parallel.
     :type user_dsg_algorithm: str
     :param n_chips_required:\
         if you need to be allocated a machine (for spalloc) before building\
@@ -80,11 +110,16 @@ def setup(hostname=None, graph_label=None, model_binary_module=None,
     :type extra_pre_run_algorithms: list of str
     """
     from spinnaker_graph_front_end import spinnaker
+    from spinnaker_graph_front_end.utilities.conf import config
     import os
     global _spinnaker
     global _none_labelled_vertex_count
     global _none_labelled_edge_count
 
+    # read the configuration and set up logging before anything is logged,
+    # and parse it once for all the vertices built to share
+    config.load()
+    config.snapshot()
     logger.info(
         "SpiNNaker graph front end (c) {}, "
         "University of Manchester".format(__version_year__))
@@ -107,7 +142,7 @@ def setup(hostname=None, graph_label=None, model_binary_module=None,
         executable_finder.add_path(file_dir)
 
     # set up the spinnaker object
-    _spinnaker = SpiNNaker(
+    _spinnaker = spinnaker.SpiNNaker(
         host_name=hostname, graph_label=graph_label,
         executable_finder=executable_finder,
         database_socket_addresses=database_socket_addresses,
@@ -130,6 +165,36 @@ def run(duration=None):
     _spinnaker.run(duration)
 
 
+def run_iter(duration, chunk_steps, vertices, region, dtype="uint8"):
+    """ Run an application for a number of milliseconds, chunk_steps time\
+        steps at a time, giving the data recorded in each chunk as soon as\
+        the chunk ends; the simulation is paused while the data of a chunk\
+        is used, and the next chunk runs when it is asked for, for example::
+
+            for first_step, n_steps, data in front_end.run_iter(
+                    500, 50, cells, 0, "<u4"):
+                analyse(first_step, data)
+
+    :param duration: the number of milliseconds to run for
+    :type duration: float
+    :param chunk_steps: the number of time steps in each chunk
+    :type chunk_steps: int
+    :param vertices: the vertices whose recorded data is given
+    :type vertices: iterable of MachineVertex
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :return: iterable of (first time step, number of time steps, the data\
+        recorded by each vertex in the chunk)
+    :rtype: iterable of (int, int, dict of vertex to NumPy array)
+    :raises ConfigurationException:\
+        if there is no duration or the chunks are empty
+    """
+    global _spinnaker
+    return _spinnaker.run_iter(duration, chunk_steps, vertices, region, dtype)
+
+
 def stop():
     """ Do any necessary cleaning up before exiting. Unregisters the controller
     """
@@ -141,16 +206,77 @@ def stop():
     _executable_finder = None
 
 
-def read_xml_file(file_path):
-    """ Reads a xml file and translates it into an application graph and \
-        machine graph (if required)
+def read_xml_file(file_path, registry=None, batch_size=None):
+    """ Reads a xml file and translates it into an application graph or \
+        machine graph, streaming through the file so that the whole document\
+        is never held in memory
 
     :param file_path: the file path in absolute form
+    :param registry:\
+        the registry used to resolve the class names in the file; defaults to\
+        the registry of classes shipped with the tool chain, with other\
+        classes of the tool chain resolved by their full dotted path; any\
+        other class must be registered, or its package allowed with\
+        :py:meth:`GraphClassRegistry.allow_imports_from`
+    :param batch_size:\
+        the number of vertices or edges to build before adding them to the\
+        graph
+    :type file_path: str
+    :type registry: GraphClassRegistry
+    :type batch_size: int
+    :return: the vertices read, by the id used for them in the file
+    :rtype: dict
+    """
+    from spinnaker_graph_front_end.graphs import xml_graph_reader
+    global _spinnaker
+    if batch_size is None:
+        batch_size = xml_graph_reader.DEFAULT_BATCH_SIZE
+    reader = xml_graph_reader.XMLGraphReader(registry, batch_size)
+    return reader.read(file_path, _spinnaker)
+
+
+def save_graph(path, registry=None):
+    """ Save the machine graph, its partitions and the placer constraints of\
+        its vertices as a snapshot which can be quickly reloaded with\
+        :py:func:`load_graph`
+
+    :param path: the directory to save the snapshot in
+    :param registry:\
+        the registry used to name classes and get the construction\
+        parameters of vertices and edges which do not implement\
+        AbstractProvidesConstructionParams
+    :type path: str
+    :type registry: GraphClassRegistry
     :return: None
+    :raises ConfigurationException:\
+        if a vertex or edge of the graph, such as a\
+        LivePacketGatherMachineVertex, cannot describe how to rebuild\
+        itself; nothing is saved
     """
+    from spinnaker_graph_front_end.graphs import graph_snapshot
     global _spinnaker
-    logger.warn("This functionality is not yet supported")
-    _spinnaker.read_xml_file(file_path)
+    if len(_spinnaker.application_graph.vertices) > 0:
+        raise exceptions.ConfigurationException(
+            "Only machine graphs can be saved")
+    graph_snapshot.save_graph_snapshot(
+        path, _spinnaker.machine_graph, registry)
+
+
+def load_graph(path, registry=None):
+    """ Load a snapshot saved with :py:func:`save_graph` into the machine\
+        graph
+
+    :param path: the directory the snapshot was saved in
+    :param registry:\
+        the registry used to resolve the class names in the snapshot
+    :type path: str
+    :type registry: GraphClassRegistry
+    :return: the vertices loaded, in the order they were saved
+    :rtype: list of MachineVertex
+    """
+    from spinnaker_graph_front_end.graphs import graph_snapshot
+    global _spinnaker
+    return graph_snapshot.load_graph_snapshot(path, _spinnaker, registry)
 
 
 def add_vertex(cellclass, cellparams, label=None, constraints=None):
@@ -242,6 +368,116 @@ def add_machine_vertex_instance(vertex_to_add):
     _spinnaker.add_machine_vertex(vertex_to_add)
 
 
+def add_machine_vertex_instances(vertices_to_add):
+    """ Add a batch of already built vertices to the machine graph in one\
+        call
+
+    :param vertices_to_add: the vertices to add to the machine graph
+    :type vertices_to_add: list of MachineVertex
+    :return: None
+    """
+    global _spinnaker
+    _spinnaker.add_machine_vertices(vertices_to_add)
+
+
+def add_vertices(cellclass, params_columns, n, labels=None, constraints=None):
+    """ Build and add a batch of application vertices in one call
+
+    :param cellclass: the class object for creating the vertices
+    :param params_columns:\
+        the input params for the class object; lists and NumPy arrays are\
+        treated as columns with one entry per vertex, anything else is\
+        passed unchanged to every vertex
+    :param n: the number of vertices to build
+    :param labels:\
+        the labels of the vertices; either a column of labels, a format\
+        string which is given a number for each vertex, counted on from the\
+        numbers of the default labels so that no two batches share one, or\
+        None to use default labels
+    :param constraints:\
+        any constraints to be applied to every vertex once built
+    :type cellclass: python object
+    :type params_columns: dictionary of name and column or value
+    :type n: int
+    :type labels: list of str or str
+    :type constraints: list of AbstractConstraint
+    :return: the list of vertex instance objects
+    """
+    global _spinnaker
+    vertices = _build_vertices(
+        cellclass, params_columns, n, labels, constraints)
+    _spinnaker.add_application_vertices(vertices)
+    return vertices
+
+
+def add_machine_vertices(
+        cellclass, params_columns, n, labels=None, constraints=None):
+    """ Build and add a batch of machine vertices in one call
+
+    :param cellclass: the class object for creating the vertices
+    :param params_columns:\
+        the input params for the class object; lists and NumPy arrays are\
+        treated as columns with one entry per vertex, anything else is\
+        passed unchanged to every vertex
+    :param n: the number of vertices to build
+    :param labels:\
+        the labels of the vertices; either a column of labels, a format\
+        string which is given a number for each vertex, counted on from the\
+        numbers of the default labels so that no two batches share one, or\
+        None to use default labels
+    :param constraints:\
+        any constraints to be applied to every vertex once built
+    :type cellclass: python object
+    :type params_columns: dictionary of name and column or value
+    :type n: int
+    :type labels: list of str or str
+    :type constraints: list of AbstractConstraint
+    :return: the list of vertex instance objects
+    """
+    global _spinnaker
+    vertices = _build_vertices(
+        cellclass, params_columns, n, labels, constraints)
+    _spinnaker.add_machine_vertices(vertices)
+    return vertices
+
+
+def _build_vertices(cellclass, params_columns, n, labels, constraints):
+    from spinnaker_graph_front_end.utilities import bulk_utilities
+    params_columns = dict(params_columns or {})
+
+    # a label in the params takes the place of the labels argument; as the
+    # other params, it is either a column or given to every vertex, and is
+    # never a format
+    params_labels = params_columns.pop('label', None)
+    if labels is None and params_labels is not None:
+        labels = params_labels
+        if isinstance(labels, basestring):
+            labels = [labels] * n
+
+    # correct labels if needed; these are only formatted as each vertex is
+    # built
+    if labels is None:
+        labels = _spinnaker.none_labelled_vertex_labels(n)
+    elif isinstance(labels, basestring):
+        labels = _spinnaker.none_labelled_vertex_labels(n, labels)
+    elif len(labels) != n:
+        raise ValueError(
+            "{} labels given for {} vertices".format(len(labels), n))
+    else:
+        labels = bulk_utilities.column_to_list(labels)
+
+    # a constraints column in the params gives each vertex its own list
+    shared = dict()
+    if 'constraints' not in params_columns:
+        shared['constraints'] = constraints
+
+    return [
+        cellclass(label=label, **kwargs)
+        for label, kwargs in izip(
+            labels,
+            bulk_utilities.iterate_kwargs(params_columns, n, shared))]
+
+
 def add_edge(cell_type, cellparams, semantic_label, label=None):
     """
 
@@ -321,6 +557,78 @@ def add_machine_edge(cellclass, cellparams, semantic_label, label=None):
     return edge
 
 
+def add_machine_edges_from_arrays(
+        vertices, pre_idx, post_idx, partition_id, edge_class=None,
+        extra_columns=None):
+    """ Build and add a batch of machine edges from arrays of indices into\
+        a sequence of vertices
+
+    :param vertices:\
+        the vertices the indices refer to; a multi-dimensional NumPy array of\
+        vertices is indexed in flattened (C) order
+    :param pre_idx: the index of the pre vertex of each edge
+    :param post_idx: the index of the post vertex of each edge
+    :param partition_id:\
+        the partition identifier for the outgoing edge partitions
+    :param edge_class:\
+        the class object for creating the edges; MachineEdge if None
+    :param extra_columns:\
+        any other input params for the class object; lists and NumPy arrays\
+        are treated as columns with one entry per edge, anything else is\
+        passed unchanged to every edge. Edges are given default labels\
+        unless a label is given here
+    :type vertices: list of MachineVertex or NumPy object array
+    :type pre_idx: NumPy array of int
+    :type post_idx: NumPy array of int
+    :type partition_id: str
+    :type edge_class: python object
+    :type extra_columns: dictionary of name and column or value
+    :return: the list of edge instance objects
+    :raises ValueError:\
+        if an index is negative or refers to a missing (None) vertex
+    """
+    from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+    from spinnaker_graph_front_end.utilities import bulk_utilities
+    import numpy
+    global _spinnaker
+
+    if edge_class is None:
+        edge_class = MachineEdge
+    pre_idx = numpy.asarray(pre_idx, dtype=numpy.intp).ravel()
+    post_idx = numpy.asarray(post_idx, dtype=numpy.intp).ravel()
+    if len(pre_idx) != len(post_idx):
+        raise ValueError(
+            "{} pre vertex indices given with {} post vertex indices".format(
+                len(pre_idx), len(post_idx)))
+
+    # negative indices would silently count back from the end of the vertices
+    if len(pre_idx) > 0 and min(pre_idx.min(), post_idx.min()) < 0:
+        raise ValueError("Vertex indices must not be negative")
+
+    # gather the end points of every edge with one indexing operation each
+    vertices = bulk_utilities.to_object_array(vertices)
+    pre_vertices = vertices[pre_idx].tolist()
+    post_vertices = vertices[post_idx].tolist()
+    if (any(vertex is None for vertex in pre_vertices) or
+            any(vertex is None for vertex in post_vertices)):
+        raise ValueError("Every edge must have a pre and a post vertex")
+
+    # edges without a label are numbered on as add_machine_edge does
+    n_edges = len(pre_idx)
+    if extra_columns is None or extra_columns.get('label') is None:
+        extra_columns = dict(extra_columns or {})
+        extra_columns['label'] = list(
+            _spinnaker.none_labelled_edge_labels(n_edges))
+
+    edges = [
+        edge_class(pre_vertex=pre_vertex, post_vertex=post_vertex, **kwargs)
+        for pre_vertex, post_vertex, kwargs in izip(
+            pre_vertices, post_vertices,
+            bulk_utilities.iterate_kwargs(extra_columns, n_edges))]
+    _spinnaker.add_machine_edges(edges, partition_id)
+    return edges
+
+
 def add_socket_address(
         database_ack_port_num, database_notify_host, database_notify_port_num):
     """
@@ -340,6 +648,99 @@ def add_socket_address(
     _spinnaker.add_socket_address(database_socket)
 
 
+def extract_all(vertices, region, dtype="uint8", workers=None):
+    """ Get the data recorded in a region by each of several vertices after\
+        a run, reading the boards of the machine at the same time.  The\
+        cores near each Ethernet connected chip are read by one thread, and\
+        the rate at which each was read is logged.
+
+    :param vertices: the vertices which recorded the data
+    :type vertices: iterable of MachineVertex
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :param workers:\
+        the number of threads to read with; if None, the number given by\
+        extraction_workers in the Buffers section of the configuration,\
+        where 0 is one thread for each Ethernet connected chip
+    :type workers: int
+    :return: the data of each vertex
+    :rtype: dict of vertex to NumPy array
+    """
+    from spinnaker_graph_front_end.utilities import recorded_data
+    from spinnaker_graph_front_end.utilities.conf import config
+    global _spinnaker
+    if workers is None:
+        workers = config.getint("Buffers", "extraction_workers")
+    return recorded_data.extract_all(
+        vertices, _spinnaker.placements, _spinnaker.buffer_manager, region,
+        dtype, _spinnaker.machine, workers)
+
+
+def add_recording_store(
+        path, vertices, region, dtype, n_timesteps=None,
+        items_per_timestep=1):
+    """ Keep the data recorded in a region by each of several vertices in a\
+        memory-mapped file, to which the data recorded in each run is\
+        appended as the run ends
+
+    :param path: the path of the data file to make; the metadata is written\
+        to the same path with ".json" added
+    :type path: str
+    :param vertices: the vertices whose recorded data is to be stored
+    :type vertices: iterable of MachineVertex
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :param n_timesteps: the number of time steps to preallocate space for
+    :type n_timesteps: int
+    :param items_per_timestep:\
+        the number of items recorded by a vertex in each time step
+    :type items_per_timestep: int
+    :return: the store, from which the data can be got as NumPy memmaps
+    :rtype: RecordingStore
+    """
+    from spinnaker_graph_front_end.utilities.recording_store \
+        import RecordingStore
+    global _spinnaker
+    store = RecordingStore(
+        path, vertices, region, dtype, n_timesteps, items_per_timestep)
+    _spinnaker.add_recording_store(store)
+    return store
+
+
+def live_event_injector(vertex, max_lateness=1, max_packets_per_second=None):
+    """ Get an injector which sends arrays of events to a vertex which\
+        receives them through a reverse IP tag, such as a\
+        ReverseIpTagMultiCastSource, paced by the machine time step and time\
+        scale factor of the simulation; for example::
+
+            injector = front_end.live_event_injector(source)
+            report = injector.inject(keys, send_times=steps)
+
+    :param vertex: the vertex to send the events to; only available after\
+        the graph has been mapped
+    :param max_lateness:\
+        the number of time steps late that a packet can be sent before it\
+        is dropped, or None to never drop late packets
+    :type max_lateness: float
+    :param max_packets_per_second:\
+        the largest number of packets to send in a second, or None for no\
+        limit
+    :type max_packets_per_second: float
+    :rtype: LiveEventInjector
+    """
+    from spinnaker_graph_front_end.utilities.connections.live_event_injector\
+        import LiveEventInjector
+    global _spinnaker
+    ip_address, port = _spinnaker.get_live_input_address(vertex)
+    return LiveEventInjector(
+        ip_address, port, _spinnaker.machine_time_step,
+        _spinnaker.time_scale_factor, max_lateness, max_packets_per_second)
+
+
 def get_txrx():
     """
     returns the transceiver used by the tool chain
@@ -432,6 +833,45 @@ def routing_infos():
     return _spinnaker.routing_infos
 
 
+def algorithm_timings():
+    """ Get the phase of the work flow, the name, the host start time and\
+        the seconds taken of each algorithm run so far, in the order run
+
+    :rtype: list of (str, str, float, float)
+    """
+    global _spinnaker
+    return _spinnaker.algorithm_timings
+
+
+def get_run_profile():
+    """ Get the measurements of each algorithm run so far by the work flow,\
+        including any extra pre and post run algorithms, which can be\
+        grouped by phase and written as a Chrome trace
+
+    :rtype: RunProfile
+    """
+    global _spinnaker
+    return _spinnaker.run_profile
+
+
+def key_index(vertices=None):
+    """ Get an index of the keys sent by vertices of the machine graph, which\
+        finds the vertex index and atom of arrays of keys in one operation;\
+        it can be saved with its save method for programs which decode the\
+        keys without reading the database
+
+    :param vertices:\
+        the vertices to index, by index; if None, all the vertices of the\
+        machine graph
+    :type vertices: iterable of MachineVertex
+    :rtype: KeyIndex
+    """
+    from spinnaker_graph_front_end.utilities.key_index import KeyIndex
+    global _spinnaker
+    return KeyIndex.from_graph(
+        _spinnaker.machine_graph, _spinnaker.routing_infos, vertices)
+
+
 def placements():
     """
 
@@ -478,4 +918,41 @@ def machine():
 
 
 def is_allocated_machine():
+    from spinnaker_graph_front_end.spinnaker import SpiNNaker
     return SpiNNaker.is_allocated_machine
+
+
+class _LazyModule(types.ModuleType):
+    """ The front end module, which imports each of the names in\
+        _LAZY_ATTRIBUTES when it is first used
+    """
+
+    def __init__(self, module):
+        types.ModuleType.__init__(self, module.__name__, module.__doc__)
+
+        # all attributes are those of the module replaced, which is kept as
+        # Python 2 clears the globals of a module when it is freed
+        self.__dict__["_module"] = module
+
+    def __getattr__(self, name):
+        module = self.__dict__["_module"]
+        if name in _LAZY_ATTRIBUTES and name not in module.__dict__:
+            module_name, attribute = _LAZY_ATTRIBUTES[name]
+            value = importlib.import_module(module_name)
+            if attribute is not None:
+                value = getattr(value, attribute)
+            module.__dict__[name] = value
+        return getattr(module, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.__dict__["_module"], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__["_module"], name)
+
+    def __dir__(self):
+        return sorted(
+            set(self.__dict__["_module"].__dict__) | set(_LAZY_ATTRIBUTES))
+
+
+sys.modules[__name__] = _LazyModule(sys.modules[__name__])
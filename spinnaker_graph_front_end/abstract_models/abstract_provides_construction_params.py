@@ -0,0 +1,23 @@
+from abc import ABCMeta
+from six import add_metaclass
+from abc import abstractmethod
+
+
+@add_metaclass(ABCMeta)
+class AbstractProvidesConstructionParams(object):
+    """ A vertex or edge which can describe how to rebuild itself, so that it\
+        can be saved in a graph snapshot
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def get_construction_params(self):
+        """ Get the parameters which rebuild this object when passed to the\
+            constructor of its class.  The label, constraints and (for\
+            edges) pre and post vertex are handled separately, so are not\
+            included.
+
+        :return: dictionary of parameter name to value
+        :rtype: dict
+        """
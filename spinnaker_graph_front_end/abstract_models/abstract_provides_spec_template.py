@@ -0,0 +1,41 @@
+from abc import ABCMeta
+from six import add_metaclass
+from abc import abstractmethod
+
+
+@add_metaclass(ABCMeta)
+class AbstractProvidesSpecTemplate(object):
+    """ A vertex whose data specification can be built from that of another\
+        vertex with the same template key, by replacing the words which\
+        hold the template values.
+
+    Vertices with the same template key must generate specifications which\
+    differ only in the 32-bit words written from their template values; the\
+    words are found by comparing the first few specifications generated for\
+    each key, which are checked against each other before any specification\
+    is built from the template.  A word which differs between vertices but\
+    is not written from a template value cannot be told apart from a\
+    constant if it is the same in those first specifications, so templates\
+    are only used when the use_spec_templates option is turned on.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def get_spec_template_key(self):
+        """ Get the key of the template of the specification of this vertex
+
+        :return: a hashable key, or None if the specification must be\
+            generated in full
+        """
+
+    @abstractmethod
+    def get_spec_template_values(self, placement):
+        """ Get the values that differ between the specifications of\
+            vertices with the same template key
+
+        :param placement: the placement of this vertex
+        :type placement: Placement
+        :return: the values, in the same order for every vertex with the key
+        :rtype: list of int
+        """
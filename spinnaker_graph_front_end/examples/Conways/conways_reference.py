@@ -0,0 +1,65 @@
+"""
+A reference simulation of the Conway examples on the host, which computes\
+the states of all the cells of a machine graph at once with NumPy, using the\
+same B3/S23 rule as conways_cell.c.
+"""
+
+# graph front end imports
+from spinnaker_graph_front_end.graphs.adjacency_index import AdjacencyIndex
+
+# general imports
+import numpy
+
+
+def run_reference(machine_graph, n_timesteps, vertices=None):
+    """ Compute the state of each cell at each time step, as conways_cell.c\
+        records it if every state arrives in time.
+
+    The cells are the vertices with a ``state``, and each counts the alive\
+    cells at the other end of its incoming edges.  As on the machine, the\
+    state recorded in the first time step is that after one generation.
+
+    :param machine_graph: the machine graph holding the cells
+    :type machine_graph: MachineGraph
+    :param n_timesteps: the number of time steps to run for
+    :type n_timesteps: int
+    :param vertices: the cells, by index; if None, all the cells of the\
+        graph in the order of the graph
+    :type vertices: iterable of ConwayBasicCell
+    :return: 1 where each cell was alive and 0 where it was dead, with a\
+        row for each cell, in the same form as the recorded data
+    :rtype: NumPy array of uint32 of shape (number of cells, n_timesteps)
+    """
+    adjacency_index = AdjacencyIndex(machine_graph)
+    graph_vertices = adjacency_index.vertices
+    if vertices is None:
+        vertices = [
+            vertex for vertex in graph_vertices if hasattr(vertex, "state")]
+    vertices = list(vertices)
+
+    # the index of each cell amongst the cells, by graph index
+    cell_indices = numpy.empty(len(graph_vertices), dtype="intp")
+    cell_indices.fill(-1)
+    graph_indices = numpy.array(
+        [adjacency_index.vertex_index(vertex) for vertex in vertices],
+        dtype="intp")
+    cell_indices[graph_indices] = numpy.arange(len(vertices))
+
+    # keep the edges between cells
+    offsets, sources, _ = adjacency_index.incoming_csr()
+    targets = numpy.repeat(
+        numpy.arange(len(graph_vertices)), numpy.diff(offsets))
+    pre_cells = cell_indices[sources]
+    post_cells = cell_indices[targets]
+    is_cell = (pre_cells >= 0) & (post_cells >= 0)
+    pre_cells = pre_cells[is_cell]
+    post_cells = post_cells[is_cell]
+
+    alive = numpy.array([bool(vertex.state) for vertex in vertices])
+    results = numpy.empty((len(vertices), n_timesteps), dtype="uint32")
+    for timestep in xrange(n_timesteps):
+        n_alive = numpy.bincount(
+            post_cells, weights=alive[pre_cells], minlength=len(vertices))
+        alive = (n_alive == 3) | (alive & (n_alive == 2))
+        results[:, timestep] = alive
+    return results
@@ -1,8 +1,8 @@
 # pacman imports
 from pacman.model.decorators.overrides import overrides
 
-from pacman.executor.injection_decorator import requires_injection, \
-    supports_injection
+from pacman.executor.injection_decorator import inject_items, \
+    requires_injection, supports_injection
 from pacman.model.graphs.machine.impl.machine_vertex import MachineVertex
 from pacman.model.resources.resource_container import ResourceContainer
 from pacman.model.resources.cpu_cycles_per_tick_resource import \
@@ -24,15 +24,25 @@ from spinn_front_end_common.abstract_models.impl.machine_data_specable_vertex \
 from spinn_front_end_common.abstract_models.abstract_has_associated_binary \
     import AbstractHasAssociatedBinary
 
+# GFE imports
+from spinnaker_graph_front_end.graphs.adjacency_index \
+    import ADJACENCY_INDEX_ITEM
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+from spinnaker_graph_front_end.utilities.region_builder import RegionBuilder
+
 # general imports
 from enum import Enum
+import numpy
 import struct
 
 
 @supports_injection
 class ConwayBasicCell(
         MachineVertex, MachineDataSpecableVertex, AbstractHasAssociatedBinary,
-        NeedsNMachineTimeSteps, AbstractBinaryUsesSimulationRun):
+        NeedsNMachineTimeSteps, AbstractBinaryUsesSimulationRun,
+        AbstractProvidesConstructionParams):
     """ Cell which represents a cell within the 2d fabric
     """
 
@@ -62,6 +72,10 @@ class ConwayBasicCell(
         # app specific elements
         self._state = state
 
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {'state': self._state}
+
     @overrides(AbstractHasAssociatedBinary.get_binary_file_name)
     def get_binary_file_name(self):
         return "conways_cell.aplx"
@@ -98,78 +112,74 @@ class ConwayBasicCell(
             time_scale_factor))
 
         # check got right number of keys and edges going into me
-        partitions = \
-            machine_graph.get_outgoing_edge_partitions_starting_at_vertex(self)
+        adjacency_index = self._get_adjacency_index()
+        index = adjacency_index.vertex_index(self)
+        partitions = adjacency_index.outgoing_partitions(index)
         if len(partitions) != 1:
             raise exceptions.ConfigurationException(
                 "Can only handle one type of partition. ")
 
         # check for duplicates
-        edges = machine_graph.get_edges_ending_at_vertex(self)
-        empty_list = set()
-        for edge in edges:
-            empty_list.add(edge.pre_vertex.label)
-        if len(empty_list) != 8:
+        sources = adjacency_index.incoming_sources(index)
+        if len(numpy.unique(sources)) != 8:
             output = ""
-            for edge in edges:
-                output += edge.pre_subvertex.label + " : "
+            for source in sources:
+                output += adjacency_index.vertices[source].label + " : "
             raise exceptions.ConfigurationException(
                 "I've got duplicate edges. This is a error. The edges are "
                 "connected to these vertices \n {}".format(output))
 
-        if len(machine_graph.get_edges_ending_at_vertex(self)) != 8:
+        if len(sources) != 8:
             raise exceptions.ConfigurationException(
                 "I've not got the right number of connections. I have {} "
-                "instead of 9".format(
-                    len(machine_graph.incoming_subedges_from_subvertex(self))))
+                "instead of 9".format(len(sources)))
 
-        for edge in edges:
-            if edge.pre_vertex == self:
-                raise exceptions.ConfigurationException(
-                    "I'm connected to myself, this is deemed an error"
-                    " please fix.")
+        if (sources == index).any():
+            raise exceptions.ConfigurationException(
+                "I'm connected to myself, this is deemed an error"
+                " please fix.")
 
         # write key needed to transmit with
         key = routing_info.get_first_key_from_partition(partitions[0])
 
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.TRANSMISSIONS.value)
+        region = RegionBuilder(
+            self.DATA_REGIONS.TRANSMISSIONS.value,
+            self.TRANSMISSION_DATA_SIZE)
         if key is None:
-            spec.write_value(0)
-            spec.write_value(0)
+            region.add_array([0, 0])
         else:
-            spec.write_value(1)
-            spec.write_value(key)
+            region.add_array([1, key])
+        region.write(spec)
 
         # write state value
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.STATE.value)
-
-        if self._state:
-            spec.write_value(1)
-        else:
-            spec.write_value(0)
+        region = RegionBuilder(
+            self.DATA_REGIONS.STATE.value, self.STATE_DATA_SIZE)
+        region.add_value(1 if self._state else 0)
+        region.write(spec)
 
         # write neighbours data state
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.NEIGHBOUR_INITIAL_STATES.value)
-        alive = 0
-        dead = 0
-        for edge in machine_graph.get_edges_ending_at_vertex(self):
-            state = edge.pre_vertex.state
-            if state:
-                alive += 1
-            else:
-                dead += 1
-
-        spec.write_value(alive)
-        spec.write_value(dead)
+        alive = int(numpy.count_nonzero(
+            adjacency_index.incoming_attribute(index, "state")))
+        dead = len(sources) - alive
+        region = RegionBuilder(
+            self.DATA_REGIONS.NEIGHBOUR_INITIAL_STATES.value,
+            self.NEIGHBOUR_INITIAL_STATES_SIZE)
+        region.add_array([alive, dead])
+        region.write(spec)
 
         # End-of-Spec:
         spec.end_specification()
 
+    @inject_items({"adjacency_index": ADJACENCY_INDEX_ITEM})
+    def _get_adjacency_index(self, adjacency_index):
+        return adjacency_index
+
     def get_data(self, transceiver, placement):
-        data = list()
+        """ Get the state of the cell at each time step
+
+        :return: True where the cell was alive, by time step
+        :rtype: NumPy array of bool
+        """
 
         # Get the data region base address where results are stored for the
         # core
@@ -187,22 +197,13 @@ class ConwayBasicCell(
         if number_of_bytes_to_read != (self._n_machine_time_steps * 4):
             raise exceptions.ConfigurationException(
                 "number of bytes seems wrong")
-        else:
-            raw_data = str(transceiver.read_memory(
-                placement.x, placement.y, record_region_base_address + 4,
-                number_of_bytes_to_read))
-
-        # convert to ints
-        elements = struct.unpack(
-            "<{}I".format(self._n_machine_time_steps), raw_data)
-        for element in elements:
-            if element == 0:
-                data.append(False)
-            else:
-                data.append(True)
-
-        # return the data
-        return data
+        raw_data = transceiver.read_memory(
+            placement.x, placement.y, record_region_base_address + 4,
+            number_of_bytes_to_read)
+
+        # view as ints, without copying
+        return numpy.frombuffer(
+            raw_data, dtype="<u4", count=self._n_machine_time_steps) != 0
 
     @property
     @overrides(MachineVertex.resources_required)
@@ -1,9 +1,9 @@
 import spinnaker_graph_front_end as front_end
+from spinnaker_graph_front_end.graphs import lattice
 
 from spinnaker_graph_front_end.examples.Conways.\
     partitioned_example_a_no_vis_no_buffer.conways_basic_cell \
     import ConwayBasicCell
-from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
 
 runtime = 50
 machine_time_step = 100
@@ -18,21 +18,19 @@ cores = front_end.get_number_of_cores_on_machine()
 if cores <= (MAX_X_SIZE_OF_FABRIC * MAX_Y_SIZE_OF_FABRIC):
     raise KeyError("Don't have enough cores to run simulation")
 
-# contain the vertices for the connection aspect
-vertices = [
-    [None for _ in range(MAX_X_SIZE_OF_FABRIC)]
-    for _ in range(MAX_Y_SIZE_OF_FABRIC)]
-
 active_states = [(2, 2), (3, 2), (3, 3), (4, 3), (2, 4)]
 
-# build vertices
-for x in range(0, MAX_X_SIZE_OF_FABRIC):
-    for y in range(0, MAX_Y_SIZE_OF_FABRIC):
-        vert = ConwayBasicCell(
-            "cell{}".format((x * MAX_X_SIZE_OF_FABRIC) + y),
-            (x, y) in active_states)
-        vertices[x][y] = vert
-        front_end.add_machine_vertex_instance(vert)
+
+# build vertices, each connected to its eight neighbours on a torus
+def create_cell(x, y):
+    return ConwayBasicCell(
+        "cell{}".format((x * MAX_X_SIZE_OF_FABRIC) + y),
+        (x, y) in active_states)
+
+
+vertices = lattice.build_lattice(
+    (MAX_X_SIZE_OF_FABRIC, MAX_Y_SIZE_OF_FABRIC), create_cell,
+    stencil=lattice.MOORE, wrap=True, partition_id="STATE")
 
 # verify the initial state
 output = ""
@@ -46,30 +44,6 @@ for y in range(MAX_X_SIZE_OF_FABRIC - 1, 0, -1):
 print output
 print "\n\n"
 
-# build edges
-for x in range(0, MAX_X_SIZE_OF_FABRIC):
-    for y in range(0, MAX_Y_SIZE_OF_FABRIC):
-
-        positions = [
-            (x, (y + 1) % MAX_Y_SIZE_OF_FABRIC, "N"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC,
-                (y + 1) % MAX_Y_SIZE_OF_FABRIC, "NE"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC, y, "E"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC,
-                (y - 1) % MAX_Y_SIZE_OF_FABRIC, "SE"),
-            (x, (y - 1) % MAX_Y_SIZE_OF_FABRIC, "S"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC,
-                (y - 1) % MAX_Y_SIZE_OF_FABRIC, "SW"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC, y, "W"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC,
-                (y + 1) % MAX_Y_SIZE_OF_FABRIC, "NW")]
-
-        for (dest_x, dest_y, compass) in positions:
-            front_end.add_machine_edge_instance(
-                MachineEdge(
-                    vertices[x][y], vertices[dest_x][dest_y],
-                    label=compass), "STATE")
-
 # run the simulation
 front_end.run(runtime)
 
@@ -1,4 +1,5 @@
 # pacman imports
+from pacman.executor.injection_decorator import inject_items
 from pacman.model.decorators.overrides import overrides
 from pacman.model.graphs.machine.impl.machine_vertex import MachineVertex
 from pacman.model.resources.resource_container import ResourceContainer
@@ -24,16 +25,24 @@ from spinn_front_end_common.abstract_models.abstract_has_associated_binary \
     import AbstractHasAssociatedBinary
 
 # GFE imports
+from spinnaker_graph_front_end.graphs.adjacency_index \
+    import ADJACENCY_INDEX_ITEM
+from spinnaker_graph_front_end.utilities import recorded_data
 from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.utilities.region_builder import RegionBuilder
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
 
 # general imports
 from enum import Enum
-import struct
+import numpy
 
 
 class ConwayBasicCell(
         MachineVertex, MachineDataSpecableVertex, AbstractHasAssociatedBinary,
-        AbstractReceiveBuffersToHost, AbstractBinaryUsesSimulationRun):
+        AbstractReceiveBuffersToHost, AbstractBinaryUsesSimulationRun,
+        AbstractProvidesConstructionParams):
     """ Cell which represents a cell within the 2d fabric
     """
 
@@ -53,20 +62,22 @@ class ConwayBasicCell(
     def __init__(self, label, state):
         MachineVertex .__init__(self, label)
 
+        buffers = config.snapshot().buffers
         self._buffer_size_before_receive = None
-        if config.getboolean("Buffers", "enable_buffered_recording"):
-            self._buffer_size_before_receive = config.getint(
-                "Buffers", "buffer_size_before_receive")
-        self._time_between_requests = config.getint(
-            "Buffers", "time_between_requests")
-        self._receive_buffer_host = config.get(
-            "Buffers", "receive_buffer_host")
-        self._receive_buffer_port = helpful_functions.read_config_int(
-            config, "Buffers", "receive_buffer_port")
+        if buffers.enable_buffered_recording:
+            self._buffer_size_before_receive = \
+                buffers.buffer_size_before_receive
+        self._time_between_requests = buffers.time_between_requests
+        self._receive_buffer_host = buffers.receive_buffer_host
+        self._receive_buffer_port = buffers.receive_buffer_port
 
         # app specific data items
         self._state = state
 
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {'state': self._state}
+
     @overrides(AbstractHasAssociatedBinary.get_binary_file_name)
     def get_binary_file_name(self):
         return "conways_cell.aplx"
@@ -110,99 +121,95 @@ class ConwayBasicCell(
             iptags))
 
         # check got right number of keys and edges going into me
-        partitions = \
-            machine_graph.get_outgoing_edge_partitions_starting_at_vertex(self)
+        adjacency_index = self._get_adjacency_index()
+        index = adjacency_index.vertex_index(self)
+        partitions = adjacency_index.outgoing_partitions(index)
         if len(partitions) != 1:
             raise exceptions.ConfigurationException(
                 "Can only handle one type of partition. ")
 
         # check for duplicates
-        edges = machine_graph.get_edges_ending_at_vertex(self)
-        empty_list = set()
-        for edge in edges:
-            empty_list.add(edge.pre_vertex.label)
-        if len(empty_list) != 8:
+        sources = adjacency_index.incoming_sources(index)
+        if len(numpy.unique(sources)) != 8:
             output = ""
-            for edge in edges:
-                output += edge.pre_vertex.label + " : "
+            for source in sources:
+                output += adjacency_index.vertices[source].label + " : "
             raise exceptions.ConfigurationException(
                 "I've got duplicate edges. This is a error. The edges are "
                 "connected to these vertices \n {}".format(output))
 
-        if len(machine_graph.get_edges_ending_at_vertex(self)) != 8:
+        if len(sources) != 8:
             raise exceptions.ConfigurationException(
                 "I've not got the right number of connections. I have {} "
-                "instead of 9".format(
-                    len(machine_graph.incoming_subedges_from_vertex(self))))
+                "instead of 9".format(len(sources)))
 
-        for edge in edges:
-            if edge.pre_vertex == self:
-                raise exceptions.ConfigurationException(
-                    "I'm connected to myself, this is deemed an error"
-                    " please fix.")
+        if (sources == index).any():
+            raise exceptions.ConfigurationException(
+                "I'm connected to myself, this is deemed an error"
+                " please fix.")
 
         # write key needed to transmit with
         key = routing_info.get_first_key_from_partition(partitions[0])
 
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.TRANSMISSIONS.value)
+        region = RegionBuilder(
+            self.DATA_REGIONS.TRANSMISSIONS.value,
+            self.TRANSMISSION_DATA_SIZE)
         if key is None:
-            spec.write_value(0)
-            spec.write_value(0)
+            region.add_array([0, 0])
         else:
-            spec.write_value(1)
-            spec.write_value(key)
+            region.add_array([1, key])
+        region.write(spec)
 
         # write state value
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.STATE.value)
-
-        if self._state:
-            spec.write_value(1)
-        else:
-            spec.write_value(0)
+        region = RegionBuilder(
+            self.DATA_REGIONS.STATE.value, self.STATE_DATA_SIZE)
+        region.add_value(1 if self._state else 0)
+        region.write(spec)
 
         # write neighbours data state
-        spec.switch_write_focus(
-            region=self.DATA_REGIONS.NEIGHBOUR_INITIAL_STATES.value)
-        alive = 0
-        dead = 0
-        for edge in machine_graph.get_edges_ending_at_vertex(self):
-            state = edge.pre_vertex.state
-            if state:
-                alive += 1
-            else:
-                dead += 1
-
-        spec.write_value(alive)
-        spec.write_value(dead)
+        alive = int(numpy.count_nonzero(
+            adjacency_index.incoming_attribute(index, "state")))
+        dead = len(sources) - alive
+        region = RegionBuilder(
+            self.DATA_REGIONS.NEIGHBOUR_INITIAL_STATES.value,
+            self.NEIGHBOUR_INITIAL_STATES_SIZE)
+        region.add_array([alive, dead])
+        region.write(spec)
 
         # End-of-Spec:
         spec.end_specification()
 
+    @inject_items({"adjacency_index": ADJACENCY_INDEX_ITEM})
+    def _get_adjacency_index(self, adjacency_index):
+        return adjacency_index
+
     def get_data(self, buffer_manager, placement):
-        data = list()
+        """ Get the state of the cell at each time step
+
+        :return: True where the cell was alive, by time step
+        :rtype: NumPy array of bool
+        """
+        return self.get_data_array(buffer_manager, placement, 0, "<u4") != 0
+
+    def get_data_array(self, buffer_manager, placement, region, dtype):
+        """ Get the data recorded in a region as an array which is a view\
+            of the extracted data
+
+        :param buffer_manager: the buffer manager
+        :param placement: the location of this vertex
+        :param region: the id of the recording region
+        :param dtype: the type of the recorded items
+        :rtype: NumPy array
+        """
 
         # for buffering output info is taken form the buffer manager
-        reader, data_missing = buffer_manager.get_data_for_vertex(placement, 0)
+        data, data_missing = recorded_data.read_data_array(
+            buffer_manager, placement, region, dtype)
 
         # do check for missing data
         if data_missing:
             print "missing_data from ({}, {}, {}); ".format(
                 placement.x, placement.y, placement.p)
-
-        # get raw data
-        raw_data = reader.read_all()
-
-        elements = struct.unpack(
-            "<{}I".format(len(raw_data) / 4), str(raw_data))
-        for element in elements:
-            if element == 0:
-                data.append(False)
-            else:
-                data.append(True)
-
-        # return the data
         return data
 
     @property
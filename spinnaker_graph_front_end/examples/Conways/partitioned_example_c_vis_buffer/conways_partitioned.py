@@ -1,4 +1,8 @@
 import spinnaker_graph_front_end as front_end
+from spinnaker_graph_front_end.graphs import lattice
+from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.utilities.recorded_data \
+    import stack_data_arrays
 
 from pacman.model.constraints.placer_constraints.\
     placer_chip_and_core_constraint import \
@@ -6,7 +10,7 @@ from pacman.model.constraints.placer_constraints.\
 from spinnaker_graph_front_end.examples.Conways.\
     partitioned_example_c_vis_buffer.conways_basic_cell \
     import ConwayBasicCell
-from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from spinnaker_graph_front_end.examples.Conways import conways_reference
 
 runtime = 500
 machine_time_step = 1000
@@ -22,11 +26,6 @@ cores = front_end.get_number_of_cores_on_machine()
 if cores <= (MAX_X_SIZE_OF_FABRIC * MAX_Y_SIZE_OF_FABRIC):
     raise KeyError("Don't have enough cores to run simulation")
 
-# contain the vertices for the connection aspect
-vertices = [
-    [None for _ in range(MAX_X_SIZE_OF_FABRIC)]
-    for _ in range(MAX_Y_SIZE_OF_FABRIC)]
-
 active_states = [(2, 2), (3, 2), (3, 3), (4, 3), (2, 4)]
 
 placement_to_make_tubogrid_work_correctly = dict()
@@ -86,18 +85,22 @@ placement_to_make_tubogrid_work_correctly[(0, 2)] = (1, 1, 9)
 placement_to_make_tubogrid_work_correctly[(0, 1)] = (1, 1, 10)
 placement_to_make_tubogrid_work_correctly[(0, 0)] = (1, 1, 11)
 
-# build vertices
-for x in range(0, MAX_X_SIZE_OF_FABRIC):
-    for y in range(0, MAX_Y_SIZE_OF_FABRIC):
-        vert = ConwayBasicCell(
-            "cell{}".format((x * MAX_X_SIZE_OF_FABRIC) + y),
-            (x, y) in active_states)
-        vert.add_constraint(PlacerChipAndCoreConstraint(
-            placement_to_make_tubogrid_work_correctly[(x, y)][0],
-            placement_to_make_tubogrid_work_correctly[(x, y)][1],
-            placement_to_make_tubogrid_work_correctly[(x, y)][2]))
-        vertices[x][y] = vert
-        front_end.add_machine_vertex_instance(vert)
+
+# build vertices, each connected to its eight neighbours on a torus
+def create_cell(x, y):
+    vert = ConwayBasicCell(
+        "cell{}".format((x * MAX_X_SIZE_OF_FABRIC) + y),
+        (x, y) in active_states)
+    vert.add_constraint(PlacerChipAndCoreConstraint(
+        placement_to_make_tubogrid_work_correctly[(x, y)][0],
+        placement_to_make_tubogrid_work_correctly[(x, y)][1],
+        placement_to_make_tubogrid_work_correctly[(x, y)][2]))
+    return vert
+
+
+vertices = lattice.build_lattice(
+    (MAX_X_SIZE_OF_FABRIC, MAX_Y_SIZE_OF_FABRIC), create_cell,
+    stencil=lattice.MOORE, wrap=True, partition_id="STATE")
 
 # verify the initial state
 output = ""
@@ -111,30 +114,6 @@ for y in range(MAX_X_SIZE_OF_FABRIC - 1, 0, -1):
 print output
 print "\n\n"
 
-# build edges
-for x in range(0, MAX_X_SIZE_OF_FABRIC):
-    for y in range(0, MAX_Y_SIZE_OF_FABRIC):
-
-        positions = [
-            (x, (y + 1) % MAX_Y_SIZE_OF_FABRIC, "N"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC,
-                (y + 1) % MAX_Y_SIZE_OF_FABRIC, "NE"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC, y, "E"),
-            ((x + 1) % MAX_X_SIZE_OF_FABRIC,
-                (y - 1) % MAX_Y_SIZE_OF_FABRIC, "SE"),
-            (x, (y - 1) % MAX_Y_SIZE_OF_FABRIC, "S"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC,
-                (y - 1) % MAX_Y_SIZE_OF_FABRIC, "SW"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC, y, "W"),
-            ((x - 1) % MAX_X_SIZE_OF_FABRIC,
-                (y + 1) % MAX_Y_SIZE_OF_FABRIC, "NW")]
-
-        for (dest_x, dest_y, compass) in positions:
-            front_end.add_machine_edge_instance(
-                MachineEdge(
-                    vertices[x][y], vertices[dest_x][dest_y], label=compass),
-                "STATE")
-
 # set up vis
 # inputs = [
 #    "/home/alan/spinnaker/alpha_package_103_git/spinnaker_tools/"
@@ -147,22 +126,27 @@ for x in range(0, MAX_X_SIZE_OF_FABRIC):
 # run the simulation
 front_end.run(runtime)
 
-# get recorded data
-recorded_data = dict()
-
-# get the data per vertex
-for x in range(0, MAX_X_SIZE_OF_FABRIC):
-    for y in range(0, MAX_Y_SIZE_OF_FABRIC):
-        recorded_data[(x, y)] = vertices[x][y].get_data(
-            front_end.buffer_manager(),
-            front_end.placements().get_placement_of_subvertex(vertices[x][y]))
+# get the recorded data of every vertex, as one array of states by
+# position and time; nothing runs on a virtual board, so the states are then
+# computed on the host instead
+cells = [vertices[x][y] for x in range(0, MAX_X_SIZE_OF_FABRIC)
+         for y in range(0, MAX_Y_SIZE_OF_FABRIC)]
+if config.getboolean("Machine", "virtual_board"):
+    recorded_data = conways_reference.run_reference(
+        front_end.machine_graph(), runtime, cells)
+else:
+    recorded_data = stack_data_arrays(
+        cells, front_end.placements(), front_end.buffer_manager(), 0, "<u4",
+        runtime, machine=front_end.machine(), n_workers=0)
+recorded_data = recorded_data.reshape(
+    MAX_X_SIZE_OF_FABRIC, MAX_Y_SIZE_OF_FABRIC, runtime)
 
 # visualise it in text form (bad but no vis this time)
 for time in range(0, runtime):
     output = ""
     for y in range(MAX_X_SIZE_OF_FABRIC - 1, 0, -1):
         for x in range(0, MAX_Y_SIZE_OF_FABRIC):
-            if recorded_data[(x, y)][time]:
+            if recorded_data[x, y, time]:
                 output += "X"
             else:
                 output += " "
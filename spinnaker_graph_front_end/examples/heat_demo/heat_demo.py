@@ -9,18 +9,17 @@ from pacman.model.constraints.placer_constraints\
 from spinn_front_end_common.utility_models.\
     live_packet_gather_machine_vertex import \
     LivePacketGatherMachineVertex
-from threading import Condition
 from spinn_front_end_common.utilities.notification_protocol.socket_address \
     import SocketAddress
-from spinn_front_end_common.utilities.connections.live_event_connection \
-    import LiveEventConnection
 
 # SpiNNMan imports
 from spinnman.messages.eieio.eieio_type import EIEIOType
 
 # graph front end imports
 import spinnaker_graph_front_end as front_end
-from spinnaker_graph_front_end import MachineEdge
+from spinnaker_graph_front_end.graphs import lattice
+from spinnaker_graph_front_end.utilities.connections\
+    .batched_live_event_connection import BatchedLiveEventConnection
 
 # example imports
 from spinnaker_graph_front_end.examples.heat_demo.heat_demo_vertex\
@@ -28,6 +27,7 @@ from spinnaker_graph_front_end.examples.heat_demo.heat_demo_vertex\
 from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
     import HeatDemoEdge
 
+import numpy
 import sys
 
 machine_time_step = 1000
@@ -67,127 +67,70 @@ live_gatherer = front_end.add_machine_vertex(
 )
 live_gatherer.add_constraint(PlacerChipAndCoreConstraint(0, 0, 1))
 
-# Create a list of lists of vertices (x * 4) by (y * 4)
+# Create a grid of vertices (x * 4) by (y * 4)
 # (for 16 cores on a chip - missing cores will have missing vertices)
 max_x_element_id = (machine.max_chip_x + 1) * 4
 max_y_element_id = (machine.max_chip_y + 1) * 4
-vertices = [
-    [None for j in range(max_y_element_id)]
-    for i in range(max_x_element_id)
-]
-for x in range(0, max_x_element_id):
-    for y in range(0, max_y_element_id):
-
-        chip_x = x / 4
-        chip_y = y / 4
-        core_x = x % 4
-        core_y = y % 4
-        core_p = ((core_x * 4) + core_y) + 1
-
-        # Add an element if the chip and core exists
-        chip = machine.get_chip_at(chip_x, chip_y)
-        if chip is not None:
-            core = chip.get_processor_with_id(core_p)
-            if (core is not None and not core.is_monitor and
-                    not (chip_x == 0 and chip_y == 0 and core_p == 1)):
-                element = front_end.add_machine_vertex(
-                    HeatDemoVertex,
-                    {
-                        'machine_time_step': machine_time_step,
-                        'time_scale_factor': time_scale_factor
-                    },
-                    label="Heat Element {}, {}".format(
-                        x, y))
-                vertices[x][y] = element
-                vertices[x][y].add_constraint(PlacerChipAndCoreConstraint(
-                    chip_x, chip_y, core_p))
-
-# build edges
-receive_labels = list()
-for x in range(0, max_x_element_id):
-    for y in range(0, max_y_element_id):
-
-        if vertices[x][y] is not None:
-
-            # add a link from the heat element to the live packet gatherer
-            front_end.add_machine_edge(
-                MachineEdge,
-                {
-                    'pre_vertex': vertices[x][y],
-                    'post_vertex': live_gatherer
-                },
-                label="Live output from {}, {}".format(x, y),
-                semantic_label="TRANSMISSION")
-            receive_labels.append(vertices[x][y].label)
-
-            # Add a north link if not at the top
-            if (y + 1) < max_y_element_id and vertices[x][y + 1] is not None:
-                front_end.add_machine_edge(
-                    HeatDemoEdge,
-                    {
-                        'pre_vertex': vertices[x][y],
-                        'post_vertex': vertices[x][y + 1],
-                        'direction': HeatDemoEdge.DIRECTIONS.SOUTH
-                    },
-                    label="North Edge from {}, {} to {}, {}".format(
-                        x, y, x + 1, y),
-                    semantic_label="TRANSMISSION")
-
-            # Add an east link if not at the right
-            if (x + 1) < max_y_element_id and vertices[x + 1][y] is not None:
-                front_end.add_machine_edge(
-                    HeatDemoEdge,
-                    {
-                        'pre_vertex': vertices[x][y],
-                        'post_vertex': vertices[x + 1][y],
-                        'direction': HeatDemoEdge.DIRECTIONS.WEST
-                    },
-                    label="East Edge from {}, {} to {}, {}".format(
-                        x, y, x + 1, y),
-                    semantic_label="TRANSMISSION")
-
-            # Add a south link if not at the bottom
-            if (y - 1) >= 0 and vertices[x][y - 1] is not None:
-                front_end.add_machine_edge(
-                    HeatDemoEdge,
-                    {
-                        'pre_vertex': vertices[x][y],
-                        'post_vertex': vertices[x][y - 1],
-                        'direction': HeatDemoEdge.DIRECTIONS.NORTH
-                    },
-                    label="South Edge from {}, {} to {}, {}".format(
-                        x, y, x, y - 1),
-                    semantic_label="TRANSMISSION")
-
-            # check for the likely hood for a W link
-            if (x - 1) >= 0 and vertices[x - 1][y] is not None:
-                front_end.add_machine_edge(
-                    HeatDemoEdge,
-                    {
-                        'pre_vertex': vertices[x][y],
-                        'post_vertex': vertices[x - 1][y],
-                        'direction': HeatDemoEdge.DIRECTIONS.EAST
-                    },
-                    label="West Edge from {}, {} to {}, {}".format(
-                        x, y, x - 1, y),
-                    semantic_label="TRANSMISSION")
-
-
-# Set up the live connection for receiving heat elements
-live_heat_connection = LiveEventConnection(
+
+
+def create_element(x, y):
+    chip_x = x / 4
+    chip_y = y / 4
+    core_x = x % 4
+    core_y = y % 4
+    core_p = ((core_x * 4) + core_y) + 1
+
+    # Add an element if the chip and core exists
+    chip = machine.get_chip_at(chip_x, chip_y)
+    if chip is None:
+        return None
+    core = chip.get_processor_with_id(core_p)
+    if (core is None or core.is_monitor or
+            (chip_x == 0 and chip_y == 0 and core_p == 1)):
+        return None
+    return HeatDemoVertex(
+        label="Heat Element {}, {}".format(x, y),
+        machine_time_step=machine_time_step,
+        time_scale_factor=time_scale_factor,
+        constraints=[PlacerChipAndCoreConstraint(chip_x, chip_y, core_p)])
+
+
+# Link each element to the neighbours which exist; the direction of a link is
+# the side of the receiving element that it arrives on
+vertices = lattice.build_lattice(
+    (max_x_element_id, max_y_element_id), create_element,
+    stencil=lattice.VON_NEUMANN, wrap=False, partition_id="TRANSMISSION",
+    edge_class=HeatDemoEdge, direction_param="direction",
+    direction_values={
+        "N": HeatDemoEdge.DIRECTIONS.SOUTH,
+        "E": HeatDemoEdge.DIRECTIONS.WEST,
+        "S": HeatDemoEdge.DIRECTIONS.NORTH,
+        "W": HeatDemoEdge.DIRECTIONS.EAST})
+
+# add a link from each heat element to the live packet gatherer, which sits
+# just after the elements in the list of vertices
+elements = [vertex for vertex in vertices.ravel() if vertex is not None]
+front_end.add_machine_edges_from_arrays(
+    elements + [live_gatherer], numpy.arange(len(elements)),
+    numpy.repeat(len(elements), len(elements)), "TRANSMISSION")
+receive_labels = [vertex.label for vertex in elements]
+
+# Set up the live connection for receiving heat elements, which gives the
+# heat values received in each packet together
+live_heat_connection = BatchedLiveEventConnection(
     live_gatherer_label, receive_labels=receive_labels, local_port=notify_port,
     machine_vertices=True)
-condition = Condition()
 
 
-def receive_heat(label, atom, value):
-    condition.acquire()
-    print "{}: {}".format(label, value / 65536.0)
-    condition.release()
+def receive_heat(batch):
+    temperatures = batch.payloads / 65536.0
+    print "\n".join(
+        "{}: {}".format(batch.labels[label_id], temperature)
+        for label_id, temperature in zip(
+            batch.label_ids.tolist(), temperatures.tolist()))
 
-# Set up callbacks to occur when spikes are received
-for label in receive_labels:
-    live_heat_connection.add_receive_callback(label, receive_heat)
+# Set up the callback to occur when heat values are received
+live_heat_connection.add_batch_receive_callback(receive_heat)
 
 front_end.run(1000)
 front_end.stop()
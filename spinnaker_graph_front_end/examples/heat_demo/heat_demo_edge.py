@@ -1,10 +1,16 @@
 from enum import Enum
 
 # front end common imports
+from pacman.model.decorators.overrides import overrides
 from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
 
+# graph front end imports
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
 
-class HeatDemoEdge(MachineEdge):
+
+class HeatDemoEdge(MachineEdge, AbstractProvidesConstructionParams):
     """ Used in conjunction with a heat demo vertex to execute the heat demo
     """
 
@@ -19,6 +25,7 @@ class HeatDemoEdge(MachineEdge):
         MachineEdge.__init__(
             self, pre_vertex, post_vertex, label=label)
         self._direction = direction
+        self._n_keys = n_keys
 
     @property
     def direction(self):
@@ -28,6 +35,10 @@ class HeatDemoEdge(MachineEdge):
         """
         return self._direction
 
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {'direction': self._direction, 'n_keys': self._n_keys}
+
     def __str__(self):
         return self.__repr__()
 
@@ -0,0 +1,115 @@
+"""
+A reference simulation of the heat demo on the host, which computes the\
+temperatures of all the heat elements of a machine graph at once with NumPy,\
+using the same 16.16 fixed-point update as heat_demo.c.
+"""
+
+# graph front end imports
+from spinnaker_graph_front_end.graphs.adjacency_index import AdjacencyIndex
+
+# example imports
+from .heat_demo_edge import HeatDemoEdge
+
+# general imports
+import numpy
+
+# the coefficients of the update, in 16.16 fixed point, as in heat_demo.c
+CX_ADJ = int(0.03125 * (1 << 16))
+CY_ADJ = int(0.03125 * (1 << 16))
+
+# the temperature used for a neighbour which does not exist, by direction in
+# the order EAST, NORTH, WEST, SOUTH; heat_demo.c writes the initial value
+# for a missing east neighbour into the north slot, so the east value of an
+# element with no east neighbour stays 0
+BOUNDARY_TEMPERATURES = (0, 40 << 16, 40 << 16, 10 << 16)
+
+_EAST = HeatDemoEdge.DIRECTIONS.EAST.value
+_NORTH = HeatDemoEdge.DIRECTIONS.NORTH.value
+_WEST = HeatDemoEdge.DIRECTIONS.WEST.value
+_SOUTH = HeatDemoEdge.DIRECTIONS.SOUTH.value
+
+
+def get_neighbours(machine_graph, vertices=None):
+    """ Get the heat element from which each heat element receives the\
+        temperature of each direction
+
+    :param machine_graph: the machine graph holding the heat elements
+    :type machine_graph: MachineGraph
+    :param vertices: the heat elements, by index; if None, all the\
+        vertices of the graph with a heat_temperature, in the order of the\
+        graph
+    :type vertices: iterable of HeatDemoVertex
+    :return: the heat elements, and an array of shape (number of elements,\
+        4) of the index of the neighbour in each direction, in the order\
+        EAST, NORTH, WEST, SOUTH, or -1 if there is none
+    :rtype: (list of HeatDemoVertex, NumPy array of int)
+    """
+    adjacency_index = AdjacencyIndex(machine_graph)
+    graph_vertices = adjacency_index.vertices
+    if vertices is None:
+        vertices = [
+            vertex for vertex in graph_vertices
+            if hasattr(vertex, "heat_temperature")]
+    vertices = list(vertices)
+
+    # the index of each heat element amongst the elements, by graph index
+    element_indices = numpy.empty(len(graph_vertices), dtype="intp")
+    element_indices.fill(-1)
+    graph_indices = numpy.array(
+        [adjacency_index.vertex_index(vertex) for vertex in vertices],
+        dtype="intp")
+    element_indices[graph_indices] = numpy.arange(len(vertices))
+
+    # keep the edges between heat elements
+    offsets, sources, edges = adjacency_index.incoming_csr()
+    targets = numpy.repeat(
+        numpy.arange(len(graph_vertices)), numpy.diff(offsets))
+    pre_elements = element_indices[sources]
+    post_elements = element_indices[targets]
+    is_heat = (
+        (pre_elements >= 0) & (post_elements >= 0) &
+        numpy.array([isinstance(edge, HeatDemoEdge) for edge in edges],
+                    dtype=bool))
+    directions = numpy.array(
+        [edge.direction.value for edge in edges[is_heat]], dtype="intp")
+
+    neighbours = numpy.empty((len(vertices), 4), dtype="intp")
+    neighbours.fill(-1)
+    neighbours[post_elements[is_heat], directions] = pre_elements[is_heat]
+    return vertices, neighbours
+
+
+def run_reference(machine_graph, n_timesteps, vertices=None):
+    """ Compute the temperature of each heat element at each time step, as\
+        heat_demo.c would if every temperature arrived in time
+
+    :param machine_graph: the machine graph holding the heat elements
+    :type machine_graph: MachineGraph
+    :param n_timesteps: the number of time steps to run for
+    :type n_timesteps: int
+    :param vertices: the heat elements, by index; if None, all the\
+        vertices of the graph with a heat_temperature, in the order of the\
+        graph
+    :type vertices: iterable of HeatDemoVertex
+    :return: the 16.16 fixed-point temperature sent by each element at the\
+        end of each time step, with a row for each element
+    :rtype: NumPy array of int32 of shape (number of elements, n_timesteps)
+    """
+    vertices, neighbours = get_neighbours(machine_graph, vertices)
+    temperatures = numpy.array(
+        [vertex.heat_temperature for vertex in vertices], dtype="int64")
+    has_neighbour = neighbours >= 0
+    boundary = numpy.array(BOUNDARY_TEMPERATURES, dtype="int64")
+    sources = numpy.where(has_neighbour, neighbours, 0)
+
+    results = numpy.empty((len(vertices), n_timesteps), dtype="int32")
+    for timestep in xrange(n_timesteps):
+        received = numpy.where(
+            has_neighbour, temperatures[sources], boundary)
+        tmp1 = received[:, _EAST] + received[:, _WEST] - 2 * temperatures
+        tmp2 = received[:, _NORTH] + received[:, _SOUTH] - 2 * temperatures
+        temperatures = (
+            temperatures + ((CX_ADJ * tmp1) >> 16) + ((CY_ADJ * tmp2) >> 16))
+        numpy.maximum(temperatures, 0, out=temperatures)
+        results[:, timestep] = temperatures
+    return results
@@ -3,6 +3,7 @@
 from data_specification.enums.data_type import DataType
 
 # pacman imports
+from pacman.executor.injection_decorator import inject_items
 from pacman.model.decorators.overrides import overrides
 from pacman.model.graphs.machine.impl.machine_vertex \
     import MachineVertex
@@ -14,7 +15,15 @@ from pacman.model.resources.sdram_resource import SDRAMResource
 
 # graph front end imports
 from .heat_demo_edge import HeatDemoEdge
+from spinnaker_graph_front_end.graphs.adjacency_index \
+    import ADJACENCY_INDEX_ITEM
 from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.utilities.region_builder import RegionBuilder
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_spec_template import AbstractProvidesSpecTemplate
 
 # FEC imports
 from spinn_front_end_common.abstract_models\
@@ -40,7 +49,8 @@ logger = logging.getLogger(__name__)
 
 class HeatDemoVertex(
         MachineVertex, MachineDataSpecableVertex, AbstractHasAssociatedBinary,
-        AbstractBinaryUsesSimulationRun):
+        AbstractBinaryUsesSimulationRun, AbstractProvidesConstructionParams,
+        AbstractProvidesSpecTemplate):
     """ A vertex partition for a heat demo; represents a heat element.
     """
 
@@ -68,8 +78,8 @@ class HeatDemoVertex(
                  heat_temperature=0, constraints=None):
 
         # resources used by a heat element vertex
-        sdram = SDRAMResource(
-            23 + config.getint("Buffers", "minimum_buffer_sdram"))
+        buffers = config.snapshot().buffers
+        sdram = SDRAMResource(23 + buffers.minimum_buffer_sdram)
         self._resources = \
             ResourceContainer(cpu_cycles=CPUCyclesPerTickResource(45),
                               dtcm=DTCMResource(34), sdram=sdram)
@@ -77,9 +87,10 @@ class HeatDemoVertex(
         MachineVertex.__init__(self, label=label, constraints=constraints)
 
         # app specific data items
+        self._machine_time_step = machine_time_step
+        self._time_scale_factor = time_scale_factor
         self._heat_temperature = heat_temperature
-        self._time_between_requests = config.getint(
-            "Buffers", "time_between_requests")
+        self._time_between_requests = buffers.time_between_requests
 
     @property
     @overrides(MachineVertex.resources_required)
@@ -94,6 +105,67 @@ class HeatDemoVertex(
         """
         return "heat_demo.aplx"
 
+    @property
+    def heat_temperature(self):
+        """ The initial temperature, in 16.16 fixed point
+
+        :rtype: int
+        """
+        return self._heat_temperature
+
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {
+            'machine_time_step': self._machine_time_step,
+            'time_scale_factor': self._time_scale_factor,
+            'heat_temperature': self._heat_temperature
+        }
+
+    @inject_items({
+        "adjacency_index": ADJACENCY_INDEX_ITEM,
+        "routing_info": "MemoryRoutingInfos"
+    })
+    @overrides(
+        AbstractProvidesSpecTemplate.get_spec_template_key,
+        additional_arguments={"adjacency_index", "routing_info"})
+    def get_spec_template_key(self, adjacency_index, routing_info):
+
+        # the order of several outgoing partitions is not fixed, so their
+        # keys cannot be put in the same words for every vertex
+        index = adjacency_index.vertex_index(self)
+        partitions = adjacency_index.outgoing_partitions(index)
+        if len(partitions) > 1:
+            return None
+        direction_edges, fake_temp_edges = \
+            self._get_incoming_edges_by_direction(adjacency_index, index)
+        return (
+            tuple(routing_info.get_first_key_from_partition(partition)
+                  is not None for partition in partitions),
+            tuple(sorted(direction_edges)), tuple(sorted(fake_temp_edges)))
+
+    @inject_items({
+        "adjacency_index": ADJACENCY_INDEX_ITEM,
+        "routing_info": "MemoryRoutingInfos"
+    })
+    @overrides(
+        AbstractProvidesSpecTemplate.get_spec_template_values,
+        additional_arguments={"adjacency_index", "routing_info"})
+    def get_spec_template_values(
+            self, placement, adjacency_index, routing_info):
+        index = adjacency_index.vertex_index(self)
+        values = list()
+        for partition in adjacency_index.outgoing_partitions(index):
+            key = routing_info.get_first_key_from_partition(partition)
+            if key is not None:
+                values.append(key)
+        for edges in self._get_incoming_edges_by_direction(
+                adjacency_index, index):
+            values.extend(
+                routing_info.get_first_key_for_edge(edges[direction])
+                for direction in sorted(edges))
+        values.append(self._heat_temperature)
+        return values
+
     @overrides(MachineDataSpecableVertex.generate_machine_data_specification)
     def generate_machine_data_specification(
             self, spec, placement, machine_graph, routing_info, iptags,
@@ -129,8 +201,11 @@ class HeatDemoVertex(
             time_scale_factor))
 
         # application specific data items
-        self._write_transmission_keys(spec, routing_info, machine_graph)
-        self._write_key_data(spec, routing_info, machine_graph)
+        adjacency_index = self._get_adjacency_index()
+        index = adjacency_index.vertex_index(self)
+        self._write_transmission_keys(
+            spec, routing_info, adjacency_index, index)
+        self._write_key_data(spec, routing_info, adjacency_index, index)
         self._write_temp_data(spec)
 
         # End-of-Spec:
@@ -164,65 +239,86 @@ class HeatDemoVertex(
             region=self.DATA_REGIONS.TEMP_VALUE.value,
             size=self.TEMP_VALUE_SIZE, label="temp")
 
-    def _write_transmission_keys(self, spec, routing_info, graph):
+    def _write_transmission_keys(
+            self, spec, routing_info, adjacency_index, index):
         """
 
         :param spec:
         :param routing_info:
-        :param graph:
+        :param adjacency_index:
+        :param index: the index of this vertex in the adjacency index
         :return:
         """
 
+        region = RegionBuilder(
+            self.DATA_REGIONS.TRANSMISSIONS.value,
+            self.TRANSMISSION_DATA_SIZE)
+
         # Every edge should have the same key
-        partitions = graph.get_outgoing_edge_partitions_starting_at_vertex(
-            self)
+        partitions = adjacency_index.outgoing_partitions(index)
         for partition in partitions:
             key = routing_info.get_first_key_from_partition(partition)
-            spec.switch_write_focus(
-                region=self.DATA_REGIONS.TRANSMISSIONS.value)
 
             # Write Key info for this core:
             if key is None:
 
                 # if there's no key, then two false's will cover it.
-                spec.write_value(data=0)
-                spec.write_value(data=0)
+                region.add_array([0, 0])
 
             else:
 
                 # has a key, thus set has key to 1 and then add key
-                spec.write_value(data=1)
-                spec.write_value(data=key)
+                region.add_array([1, key])
+        region.write(spec)
+
+    @inject_items({"adjacency_index": ADJACENCY_INDEX_ITEM})
+    def _get_adjacency_index(self, adjacency_index):
+        return adjacency_index
 
-    def _write_key_data(self, spec, routing_info, graph):
+    @staticmethod
+    def _get_incoming_edges_by_direction(adjacency_index, index):
+        """ Get the incoming edges from neighbouring heat elements and from\
+            injectors of temperatures
+
+        :param adjacency_index:
+        :param index: the index of this vertex in the adjacency index
+        :return: the two dictionaries of direction value to edge
+        """
+        direction_edges = dict()
+        fake_temp_edges = dict()
+        for incoming_edge in adjacency_index.incoming_edges(index):
+            if (isinstance(incoming_edge, HeatDemoEdge) and
+                    isinstance(incoming_edge.pre_vertex,
+                               ReverseIpTagMultiCastSource)):
+                fake_temp_edges[incoming_edge.direction.value] = incoming_edge
+            elif (isinstance(incoming_edge, HeatDemoEdge) and
+                    isinstance(incoming_edge.pre_vertex,
+                               HeatDemoVertex)):
+                direction_edges[incoming_edge.direction.value] = incoming_edge
+        return direction_edges, fake_temp_edges
+
+    def _write_key_data(self, spec, routing_info, adjacency_index, index):
         """
 
         :param spec:
         :param routing_info:
-        :param graph:
+        :param adjacency_index:
+        :param index: the index of this vertex in the adjacency index
         :return:
         """
-        spec.switch_write_focus(region=self.DATA_REGIONS.NEIGHBOUR_KEYS.value)
+        region = RegionBuilder(
+            self.DATA_REGIONS.NEIGHBOUR_KEYS.value, self.NEIGHBOUR_DATA_SIZE)
 
         # get incoming edges
-        incoming_edges = graph.get_edges_ending_at_vertex(self)
+        incoming_edges = adjacency_index.incoming_edges(index)
         spec.comment("\n the keys for the neighbours in EAST, NORTH, WEST, "
                      "SOUTH. order:\n\n")
-        direction_edges = list()
-        fake_temp_edges = list()
+        direction_edges, fake_temp_edges = \
+            self._get_incoming_edges_by_direction(adjacency_index, index)
         command_edge = None
         output_edge = None
-        for incoming_edge in incoming_edges:
-            if (isinstance(incoming_edge, HeatDemoEdge) and
-                    isinstance(incoming_edge.pre_vertex,
-                               ReverseIpTagMultiCastSource)):
-                fake_temp_edges.append(incoming_edge)
-            elif (isinstance(incoming_edge, HeatDemoEdge) and
-                    isinstance(incoming_edge.pre_vertex,
-                               HeatDemoVertex)):
-                direction_edges.append(incoming_edge)
 
-        out_going_edges = graph.get_edges_starting_at_vertex(self)
+        out_going_edges = adjacency_index.outgoing_edges(index)
         for out_going_edge in out_going_edges:
             if isinstance(out_going_edge.post_vertex, LivePacketGather):
                 if output_edge is not None:
@@ -231,10 +327,6 @@ class HeatDemoVertex(
                         " Can't have more than one!")
                 output_edge = out_going_edge
 
-        direction_edges = {
-            edge.direction.value: edge for edge in direction_edges
-        }
-
         # write each key that this module should expect packets from in order
         # of EAST, NORTH, WEST, SOUTH.
         loaded_keys = 0
@@ -242,10 +334,10 @@ class HeatDemoVertex(
             edge = direction_edges.get(current_direction, None)
             if edge is not None:
                 key = routing_info.get_first_key_for_edge(edge)
-                spec.write_value(data=key)
+                region.add_value(key)
                 loaded_keys += 1
             else:
-                spec.write_value(data_type=DataType.INT32, data=-1)
+                region.add_value(-1, data_type=DataType.INT32)
 
         if loaded_keys == 0:
             raise exceptions.ConfigurationException(
@@ -258,20 +350,19 @@ class HeatDemoVertex(
 
         # write each key that this model should expect packets from in order of
         # EAST, NORTH, WEST, SOUTH for injected temperatures
-        fake_temp_edges = {
-            edge.direction.value: edge for edge in fake_temp_edges
-        }
         current_direction = 0
         for current_direction in range(4):
             edge = fake_temp_edges.get(current_direction, None)
             if edge is not None:
                 key = routing_info.get_first_key_for_edge(edge)
-                spec.write_value(data=key)
+                region.add_value(key)
             else:
-                spec.write_value(data_type=DataType.INT32, data=-1)
+                region.add_value(-1, data_type=DataType.INT32)
+        region.write(spec)
 
         # write keys for commands
-        spec.switch_write_focus(region=self.DATA_REGIONS.COMMAND_KEYS.value)
+        region = RegionBuilder(
+            self.DATA_REGIONS.COMMAND_KEYS.value, self.COMMAND_KEYS_SIZE)
         spec.comment(
             "\n the command keys in order of STOP, PAUSE, RESUME:\n\n")
         commands_keys_and_masks = \
@@ -289,11 +380,10 @@ class HeatDemoVertex(
                 raise exceptions.ConfigurationException(
                     "Do not have enough keys to reflect the commands. broken."
                     "There are {} keys instead of 3".format(len(keys)))
-            for key in keys:
-                spec.write_value(data=key)
+            region.add_array(keys)
         else:
-            for _ in range(0, 3):
-                spec.write_value(data_type=DataType.INT32, data=-1)
+            region.add_array([-1] * 3, data_type=DataType.INT32)
             logger.warn(
                 "Set up to not use commands. If commands are needed, "
                 "Please create a command sender and wire it to this vertex.")
+        region.write(spec)
@@ -33,19 +33,19 @@ total_number_of_cores = len([
     if not processor.is_monitor])
 
 # fill all cores with a HelloWorldVertex each
-for x in range(0, total_number_of_cores):
-    front_end.add_machine_vertex(
-        HelloWorldVertex,
-        {},
-        label="Hello World at x {}".format(x))
+front_end.add_machine_vertices(
+    HelloWorldVertex, {}, total_number_of_cores,
+    labels="Hello World at x {}")
 
 front_end.run(10)
 
-placements = front_end.placements()
-buffer_manager = front_end.buffer_manager()
+placements = sorted(
+    front_end.placements().placements, key=lambda p: (p.x, p.y, p.p))
+recorded = front_end.extract_all(
+    [placement.vertex for placement in placements], 0)
 
-for placement in sorted(placements.placements, key=lambda p: (p.x, p.y, p.p)):
-    hello_world = placement.vertex.read(placement, buffer_manager)
+for placement in placements:
+    hello_world = recorded[placement.vertex].tostring()
     logger.info("{}, {}, {} > {}".format(
         placement.x, placement.y, placement.p, hello_world))
 
@@ -1,3 +1,4 @@
+from pacman.executor.injection_decorator import inject_items
 from pacman.model.decorators.overrides import overrides
 from pacman.model.graphs.machine.impl.machine_vertex \
     import MachineVertex
@@ -22,7 +23,13 @@ from spinn_front_end_common.interface.buffer_management\
 from spinn_front_end_common.utilities import helpful_functions
 
 
+from spinnaker_graph_front_end.utilities import recorded_data
 from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_spec_template import AbstractProvidesSpecTemplate
 
 from enum import Enum
 
@@ -33,7 +40,8 @@ logger = logging.getLogger(__name__)
 
 class HelloWorldVertex(
         MachineVertex, MachineDataSpecableVertex, AbstractHasAssociatedBinary,
-        AbstractReceiveBuffersToHost, AbstractBinaryUsesSimulationRun):
+        AbstractReceiveBuffersToHost, AbstractBinaryUsesSimulationRun,
+        AbstractProvidesConstructionParams, AbstractProvidesSpecTemplate):
 
     DATA_REGIONS = Enum(
         value="DATA_REGIONS",
@@ -45,16 +53,14 @@ class HelloWorldVertex(
     def __init__(self, label, constraints=None):
         MachineVertex.__init__(self, label=label, constraints=constraints)
 
+        buffers = config.snapshot().buffers
         self._buffer_size_before_receive = None
-        if config.getboolean("Buffers", "enable_buffered_recording"):
-            self._buffer_size_before_receive = config.getint(
-                "Buffers", "buffer_size_before_receive")
-        self._time_between_requests = config.getint(
-            "Buffers", "time_between_requests")
-        self._receive_buffer_host = config.get(
-            "Buffers", "receive_buffer_host")
-        self._receive_buffer_port = helpful_functions.read_config_int(
-            config, "Buffers", "receive_buffer_port")
+        if buffers.enable_buffered_recording:
+            self._buffer_size_before_receive = \
+                buffers.buffer_size_before_receive
+        self._time_between_requests = buffers.time_between_requests
+        self._receive_buffer_host = buffers.receive_buffer_host
+        self._receive_buffer_port = buffers.receive_buffer_port
 
         self._string_data_size = 5000
 
@@ -73,10 +79,28 @@ class HelloWorldVertex(
 
         return resources
 
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {}
+
     @overrides(AbstractHasAssociatedBinary.get_binary_file_name)
     def get_binary_file_name(self):
         return "hello_world.aplx"
 
+    @inject_items({"tags": "MemoryTags"})
+    @overrides(
+        AbstractProvidesSpecTemplate.get_spec_template_key,
+        additional_arguments={"tags"})
+    def get_spec_template_key(self, tags):
+        return len(tags.get_ip_tags_for_vertex(self) or [])
+
+    @inject_items({"tags": "MemoryTags"})
+    @overrides(
+        AbstractProvidesSpecTemplate.get_spec_template_values,
+        additional_arguments={"tags"})
+    def get_spec_template_values(self, placement, tags):
+        return [tag.tag for tag in tags.get_ip_tags_for_vertex(self) or []]
+
     @overrides(MachineDataSpecableVertex.generate_machine_data_specification)
     def generate_machine_data_specification(
             self, spec, placement, machine_graph, routing_info, iptags,
@@ -122,13 +146,24 @@ class HelloWorldVertex(
         :param buffer_manager: the buffer manager
         :return: string output
         """
-        data_pointer, missing_data = buffer_manager.get_data_for_vertex(
-            placement, 0)
+        return self.get_data_array(
+            buffer_manager, placement, 0, "uint8").tostring()
+
+    def get_data_array(self, buffer_manager, placement, region, dtype):
+        """ Get the data recorded in a region as an array which is a view\
+            of the extracted data
+
+        :param buffer_manager: the buffer manager
+        :param placement: the location of this vertex
+        :param region: the id of the recording region
+        :param dtype: the type of the recorded items
+        :rtype: NumPy array
+        """
+        data, missing_data = recorded_data.read_data_array(
+            buffer_manager, placement, region, dtype)
         if missing_data:
             raise Exception("missing data!")
-        record_raw = data_pointer.read_all()
-        output = str(record_raw)
-        return output
+        return data
 
     def get_minimum_buffer_sdram_usage(self):
         return self._string_data_size
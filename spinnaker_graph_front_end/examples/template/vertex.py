@@ -57,16 +57,14 @@ class Vertex(
             n_machine_time_steps=1000, buffered_sdram_per_timestep=[1000],
             minimum_sdram_for_buffering=1024)
 
+        buffers = config.snapshot().buffers
         self._buffer_size_before_receive = None
-        if config.getboolean("Buffers", "enable_buffered_recording"):
-            self._buffer_size_before_receive = config.getint(
-                "Buffers", "buffer_size_before_receive")
-        self._time_between_requests = config.getint(
-            "Buffers", "time_between_requests")
-        self._receive_buffer_host = config.get(
-            "Buffers", "receive_buffer_host")
-        self._receive_buffer_port = helpful_functions.read_config_int(
-            config, "Buffers", "receive_buffer_port")
+        if buffers.enable_buffered_recording:
+            self._buffer_size_before_receive = \
+                buffers.buffer_size_before_receive
+        self._time_between_requests = buffers.time_between_requests
+        self._receive_buffer_host = buffers.receive_buffer_host
+        self._receive_buffer_port = buffers.receive_buffer_port
 
         self.placement = None
 
@@ -0,0 +1,268 @@
+"""
+A frozen, compressed sparse row index of the edges of a machine graph,\
+by integer vertex index.
+"""
+
+from spinnaker_graph_front_end.utilities.bulk_utilities \
+    import to_object_array
+
+import numpy
+
+# The name of the item holding the index of the machine graph while data is\
+# generated; inject it with\
+# ``@inject_items({"adjacency_index": ADJACENCY_INDEX_ITEM})``
+ADJACENCY_INDEX_ITEM = "MemoryMachineGraphAdjacencyIndex"
+
+
+def _freeze(array):
+    array.flags.writeable = False
+    return array
+
+
+class AdjacencyIndex(object):
+    """ The incoming and outgoing edges and the outgoing partitions of each\
+        vertex of a machine graph, built in one pass over the graph.
+
+    Each vertex is given the index of its position in the graph.  The edges\
+    are held in compressed sparse row form, sorted by pre vertex for\
+    outgoing edges and by post vertex for incoming edges, so the edges of a\
+    vertex are found in constant time and are a view of the index rather\
+    than a new list.  All arrays are read only; the index does not follow\
+    later changes to the graph.
+    """
+
+    __slots__ = [
+
+        # The vertices, by index
+        "_vertices",
+
+        # The index of each vertex
+        "_vertex_indices",
+
+        # The start of the outgoing edges of each vertex, and the end
+        "_out_offsets",
+
+        # The outgoing edges, by pre vertex
+        "_out_edges",
+
+        # The post vertex index of each outgoing edge
+        "_out_targets",
+
+        # The start of the incoming edges of each vertex, and the end
+        "_in_offsets",
+
+        # The incoming edges, by post vertex
+        "_in_edges",
+
+        # The pre vertex index of each incoming edge
+        "_in_sources",
+
+        # The start of the outgoing partitions of each vertex, and the end
+        "_partition_offsets",
+
+        # The outgoing partitions, by pre vertex
+        "_partitions",
+
+        # The vertex attribute arrays read so far, by attribute name
+        "_attributes"
+    ]
+
+    def __init__(self, machine_graph):
+        """
+
+        :param machine_graph: the graph to index
+        :type machine_graph: MachineGraph
+        """
+        vertices = list(machine_graph.vertices)
+        n_vertices = len(vertices)
+        self._vertices = _freeze(to_object_array(vertices))
+        self._vertex_indices = dict(
+            (vertex, index) for index, vertex in enumerate(vertices))
+
+        partitions = list()
+        partition_counts = numpy.zeros(n_vertices, dtype="intp")
+        edges = list()
+        sources = list()
+        targets = list()
+        for index, vertex in enumerate(vertices):
+            vertex_partitions = list(
+                machine_graph.get_outgoing_edge_partitions_starting_at_vertex(
+                    vertex))
+            partition_counts[index] = len(vertex_partitions)
+            partitions.extend(vertex_partitions)
+            for partition in vertex_partitions:
+                for edge in partition.edges:
+                    edges.append(edge)
+                    sources.append(index)
+                    targets.append(self._vertex_indices[edge.post_vertex])
+
+        self._partition_offsets = _freeze(_offsets(partition_counts))
+        self._partitions = _freeze(to_object_array(partitions))
+
+        sources = numpy.array(sources, dtype="intp")
+        targets = numpy.array(targets, dtype="intp")
+        edges = to_object_array(edges)
+        self._out_offsets = _freeze(_offsets(
+            numpy.bincount(sources, minlength=n_vertices)))
+        self._out_edges = _freeze(edges)
+        self._out_targets = _freeze(targets)
+
+        # a stable sort keeps the incoming edges of each vertex in the order
+        # of their pre vertices
+        order = numpy.argsort(targets, kind="mergesort")
+        self._in_offsets = _freeze(_offsets(
+            numpy.bincount(targets, minlength=n_vertices)))
+        self._in_edges = _freeze(edges[order])
+        self._in_sources = _freeze(sources[order])
+
+        self._attributes = dict()
+
+    @property
+    def n_vertices(self):
+        """ The number of vertices in the graph
+
+        :rtype: int
+        """
+        return len(self._vertices)
+
+    @property
+    def vertices(self):
+        """ The vertices, by index
+
+        :rtype: read only NumPy array of object
+        """
+        return self._vertices
+
+    def vertex_index(self, vertex):
+        """ Get the index of a vertex
+
+        :param vertex: a vertex of the graph
+        :rtype: int
+        :raises KeyError: if the vertex was not in the graph when indexed
+        """
+        return self._vertex_indices[vertex]
+
+    def in_degree(self, index):
+        """ Get the number of edges ending at a vertex
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: int
+        """
+        return int(self._in_offsets[index + 1] - self._in_offsets[index])
+
+    def out_degree(self, index):
+        """ Get the number of edges starting at a vertex
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: int
+        """
+        return int(self._out_offsets[index + 1] - self._out_offsets[index])
+
+    def incoming_edges(self, index):
+        """ Get the edges ending at a vertex
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: read only NumPy array of object
+        """
+        return self._in_edges[
+            self._in_offsets[index]:self._in_offsets[index + 1]]
+
+    def incoming_sources(self, index):
+        """ Get the indices of the pre vertices of the edges ending at a\
+            vertex, in the order of :py:meth:`incoming_edges`
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: read only NumPy array of int
+        """
+        return self._in_sources[
+            self._in_offsets[index]:self._in_offsets[index + 1]]
+
+    def incoming_csr(self):
+        """ Get the edges ending at every vertex at once
+
+        :return: a tuple of (the offsets, with an extra offset at the end,\
+            the pre vertex indices and the edges); the edges ending at\
+            vertex i are those from offsets[i] to offsets[i + 1]
+        :rtype: (read only NumPy array of int, read only NumPy array of int,\
+            read only NumPy array of object)
+        """
+        return self._in_offsets, self._in_sources, self._in_edges
+
+    def outgoing_edges(self, index):
+        """ Get the edges starting at a vertex, grouped by partition
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: read only NumPy array of object
+        """
+        return self._out_edges[
+            self._out_offsets[index]:self._out_offsets[index + 1]]
+
+    def outgoing_targets(self, index):
+        """ Get the indices of the post vertices of the edges starting at a\
+            vertex, in the order of :py:meth:`outgoing_edges`
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: read only NumPy array of int
+        """
+        return self._out_targets[
+            self._out_offsets[index]:self._out_offsets[index + 1]]
+
+    def outgoing_partitions(self, index):
+        """ Get the outgoing edge partitions of a vertex
+
+        :param index: the index of the vertex
+        :type index: int
+        :rtype: read only NumPy array of object
+        """
+        return self._partitions[
+            self._partition_offsets[index]:
+            self._partition_offsets[index + 1]]
+
+    def get_attribute(self, name):
+        """ Get an attribute of every vertex.  The attribute is read from\
+            the vertices the first time that it is asked for, and is not\
+            read again.
+
+        :param name: the name of the attribute
+        :type name: str
+        :return: the attribute of each vertex, by index; None for vertices\
+            without the attribute
+        :rtype: read only NumPy array
+        """
+        values = self._attributes.get(name, None)
+        if values is None:
+            values = [getattr(vertex, name, None) for vertex in self._vertices]
+            if any(value is None for value in values):
+                values = to_object_array(values)
+            else:
+                values = numpy.array(values)
+            values = _freeze(values)
+            self._attributes[name] = values
+        return values
+
+    def incoming_attribute(self, index, name):
+        """ Get an attribute of the pre vertices of the edges ending at a\
+            vertex, in the order of :py:meth:`incoming_edges`
+
+        :param index: the index of the vertex
+        :type index: int
+        :param name: the name of the attribute
+        :type name: str
+        :rtype: NumPy array
+        """
+        return self.get_attribute(name)[self.incoming_sources(index)]
+
+
+def _offsets(counts):
+    """ Get the offsets of groups of the given sizes in a flat array, with\
+        an extra offset for the end of the last group
+    """
+    offsets = numpy.zeros(len(counts) + 1, dtype="intp")
+    numpy.cumsum(counts, out=offsets[1:])
+    return offsets
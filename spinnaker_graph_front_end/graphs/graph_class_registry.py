@@ -0,0 +1,329 @@
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+
+import importlib
+import inspect
+import pkgutil
+import sys
+
+
+class GraphClassRegistry(object):
+    """ Maps the class names used in graph files to the vertex, edge and\
+        constraint classes that they stand for.
+
+    Names which have not been registered are treated as the full dotted\
+    path of the class (e.g.\
+    ``pacman.model.graphs.machine.impl.machine_edge.MachineEdge``), which is\
+    imported the first time it is seen, as long as it is in one of the\
+    packages from which the registry is allowed to import; a graph file can\
+    therefore only name classes which are registered or which are in those\
+    packages.  Enum classes held by a class\
+    attribute are named by the path of the attribute (e.g.\
+    ``spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge.HeatDemoEdge.DIRECTIONS``).
+    """
+
+    __slots__ = [
+
+        # The classes by registered name
+        "_classes",
+
+        # The registered names by class
+        "_names",
+
+        # The parameter converters by class, then by parameter name
+        "_converters",
+
+        # The callables which get construction parameters by class
+        "_params_getters",
+
+        # The packages from which unregistered classes may be imported
+        "_import_packages"
+    ]
+
+    def __init__(self, import_packages=None):
+        """
+
+        :param import_packages:\
+            the names of the packages (or modules) from which classes which\
+            have not been registered may be imported by their dotted path;\
+            by default, no unregistered class may be imported
+        :type import_packages: iterable of str
+        """
+        self._classes = dict()
+        self._names = dict()
+        self._converters = dict()
+        self._params_getters = dict()
+        self._import_packages = set()
+        if import_packages is not None:
+            for package in import_packages:
+                self.allow_imports_from(package)
+
+    def register(
+            self, graph_class, name=None, converters=None,
+            params_getter=None):
+        """ Register a class with the registry
+
+        :param graph_class: the class to register
+        :param name:\
+            the name of the class in graph files; defaults to the name of the\
+            class itself
+        :type name: str
+        :param converters:\
+            a dictionary of parameter name to a callable that converts the\
+            value read from the file into the value passed to the class;\
+            enum parameters are given the member name to convert
+        :type converters: dict of str -> callable
+        :param params_getter:\
+            a callable which gets the construction parameters of an instance\
+            of the class, for classes which do not implement\
+            AbstractProvidesConstructionParams
+        :type params_getter: callable(object) -> dict
+        """
+        if name is None:
+            name = graph_class.__name__
+        self._classes[name] = graph_class
+        self._names[graph_class] = name
+        if converters is not None:
+            self._converters[graph_class] = dict(converters)
+        if params_getter is not None:
+            self._params_getters[graph_class] = params_getter
+
+    def allow_imports_from(self, package):
+        """ Allow classes which have not been registered to be imported by\
+            their dotted path from a package and its sub-packages
+
+        :param package: the dotted name of the package or module
+        :type package: str
+        """
+        self._import_packages.add(package)
+
+    def get_class(self, name):
+        """ Get the class with the given name
+
+        :param name: the registered name or full dotted path of the class
+        :type name: str
+        :return: the class
+        :raises KeyError:\
+            if the class cannot be found, or is not registered and is not in\
+            a package from which imports are allowed
+        :raises ImportError:\
+            if the module of the class exists but fails to import
+        """
+        graph_class = self._classes.get(name, None)
+        if graph_class is None:
+            if not self._may_import(name):
+                raise KeyError(
+                    "The class {} has not been registered and is not in a"
+                    " package from which classes may be imported; register"
+                    " it, or allow imports from its package".format(name))
+            graph_class = _import_path(name)
+            if graph_class is None:
+                raise KeyError(
+                    "The class {} has not been registered and cannot be"
+                    " imported".format(name))
+            self._classes[name] = graph_class
+        return graph_class
+
+    def _may_import(self, name):
+        parts = name.split(".")
+        return any(
+            ".".join(parts[:n_parts]) in self._import_packages
+            for n_parts in xrange(1, len(parts)))
+
+    def get_name(self, graph_class):
+        """ Get the name with which to write a class to a graph file
+
+        :param graph_class: the class
+        :return: the registered name, or the full dotted path of the class
+        :rtype: str
+        """
+        name = self._names.get(graph_class, None)
+        if name is None:
+            name = "{}.{}".format(graph_class.__module__, graph_class.__name__)
+        return name
+
+    def get_enum_name(self, enum_class):
+        """ Get the name with which to write the class of an enum value to a\
+            graph file, checking that the class can be found again by it
+
+        :param enum_class: the enum class
+        :return: the registered name, or the dotted path of the class or of\
+            the class attribute which holds it
+        :rtype: str
+        :raises KeyError: if the class cannot be found again by any name
+        """
+        name = self._names.get(enum_class, None)
+        if name is None:
+            name = _find_path(enum_class)
+            if name is None or _import_path(name) is not enum_class:
+                raise KeyError(
+                    "The enum class {} cannot be found by its module and name"
+                    " or by a class attribute of its module; register it"
+                    " with a name".format(enum_class.__name__))
+        return name
+
+    def get_enum_value(self, enum_name, member_name):
+        """ Get the member of an enum class with the given names
+
+        :param enum_name: the registered name or dotted path of the class
+        :type enum_name: str
+        :param member_name: the name of the member
+        :type member_name: str
+        :return: the member
+        :raises KeyError:\
+            if the class or member cannot be found, or the class may not be\
+            imported
+        """
+        enum_class = self.get_class(enum_name)
+        try:
+            return enum_class[member_name]
+        except KeyError:
+            raise KeyError("{} has no member {}".format(
+                enum_name, member_name))
+
+    def convert(self, graph_class, param_name, value):
+        """ Convert a value read from a graph file into the value to pass to\
+            the class
+
+        :param graph_class: the class which will be given the value
+        :param param_name: the name of the parameter
+        :type param_name: str
+        :param value: the value as read from the file
+        :return: the converted value
+        """
+        converters = self._converters.get(graph_class, None)
+        if converters is None or param_name not in converters:
+            return value
+        return converters[param_name](value)
+
+    def has_converter(self, graph_class, param_name):
+        """ Determine if a parameter of a class has a converter
+
+        :param graph_class: the class which will be given the value
+        :param param_name: the name of the parameter
+        :type param_name: str
+        :rtype: bool
+        """
+        return param_name in self._converters.get(graph_class, ())
+
+    def get_params(self, graph_object):
+        """ Get the parameters which rebuild an object when passed to the\
+            constructor of its class
+
+        :param graph_object: the vertex or edge
+        :return: dictionary of parameter name to value
+        :rtype: dict
+        :raises KeyError: if the parameters of the object cannot be found
+        """
+        params_getter = self._params_getters.get(type(graph_object), None)
+        if params_getter is not None:
+            return params_getter(graph_object)
+        if isinstance(graph_object, AbstractProvidesConstructionParams):
+            return graph_object.get_construction_params()
+        raise KeyError(
+            "{} does not provide its construction parameters and has no"
+            " registered parameter getter".format(
+                self.get_name(type(graph_object))))
+
+
+#: The packages of the tool chain, from which a default registry may import
+#: classes which have not been registered
+TOOL_CHAIN_PACKAGES = (
+    "pacman", "spinn_front_end_common", "spinnaker_graph_front_end",
+    "spinnman")
+
+
+def default_registry():
+    """ Create a registry containing the edge and constraint classes that\
+        are shipped with the tool chain, along with getters of their\
+        construction parameters, which may also import other classes of the\
+        tool chain by their dotted paths
+
+    :rtype: :py:class:`GraphClassRegistry`
+    """
+    from pacman.model.constraints.placer_constraints\
+        .placer_chip_and_core_constraint import PlacerChipAndCoreConstraint
+    from pacman.model.graphs.application.impl.application_edge \
+        import ApplicationEdge
+    from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+
+    registry = GraphClassRegistry(TOOL_CHAIN_PACKAGES)
+    registry.register(MachineEdge, params_getter=_machine_edge_params)
+    registry.register(ApplicationEdge, params_getter=_application_edge_params)
+    registry.register(
+        PlacerChipAndCoreConstraint, params_getter=_placer_constraint_params)
+    return registry
+
+
+def _machine_edge_params(edge):
+    return {"traffic_type": edge.traffic_type,
+            "traffic_weight": edge.traffic_weight}
+
+
+def _application_edge_params(edge):
+    return {"traffic_type": edge.traffic_type}
+
+
+def _placer_constraint_params(constraint):
+    return {"x": constraint.x, "y": constraint.y, "p": constraint.p}
+
+
+def _import_path(path):
+    """ Find the object with a dotted path, made of the path of a module\
+        followed by the names of attributes within it
+
+    :return: the object, or None if it cannot be found
+    :raises ImportError: if a module on the path exists but fails to import
+    """
+    parts = path.split(".")
+    for n_module_parts in xrange(len(parts) - 1, 0, -1):
+        module_name = ".".join(parts[:n_module_parts])
+        try:
+            found = importlib.import_module(module_name)
+        except ImportError:
+
+            # only a module which does not exist means the path is shorter
+            if _module_exists(module_name):
+                raise
+            continue
+        try:
+            for part in parts[n_module_parts:]:
+                found = getattr(found, part)
+        except AttributeError:
+            return None
+        return found
+    return None
+
+
+def _module_exists(module_name):
+    """ Determine if a module can be found, without importing it (although\
+        its parent packages are imported)
+    """
+    try:
+        return pkgutil.find_loader(module_name) is not None
+    except ImportError:
+        return False
+
+
+def _find_path(enum_class):
+    """ Find the dotted path of an enum class within its module, which is\
+        either its name or, for enums made with the functional API and kept\
+        by a class (such as ``HeatDemoEdge.DIRECTIONS``), the name of the\
+        class attribute holding it
+
+    :return: the path, or None if the class is not held by its module
+    """
+    module = sys.modules.get(enum_class.__module__, None)
+    if module is None:
+        return None
+    if getattr(module, enum_class.__name__, None) is enum_class:
+        return "{}.{}".format(module.__name__, enum_class.__name__)
+    for owner_name, owner in sorted(vars(module).iteritems()):
+        if not inspect.isclass(owner) or owner.__module__ != module.__name__:
+            continue
+        for attribute_name, value in sorted(vars(owner).iteritems()):
+            if value is enum_class:
+                return "{}.{}.{}".format(
+                    module.__name__, owner_name, attribute_name)
+    return None
@@ -0,0 +1,426 @@
+"""
+Compact, array-backed snapshots of machine graphs.
+
+A snapshot is a directory holding a small JSON description of the graph\
+and one NumPy ``.npy`` file per column of data; the columns are\
+memory-mapped when the snapshot is loaded, rather than read and parsed.\
+Vertices and edges are stored as typed columns of their construction\
+parameters (see\
+:py:class:`spinnaker_graph_front_end.abstract_models.abstract_provides_construction_params.AbstractProvidesConstructionParams`),\
+grouped by class, along with the partition of each edge and the\
+PlacerChipAndCoreConstraint (if any) of each vertex.  Enum parameters are\
+stored by member name, with the class of the enum in the description.
+"""
+
+# pacman imports
+from pacman.model.constraints.placer_constraints\
+    .placer_chip_and_core_constraint import PlacerChipAndCoreConstraint
+
+# front end common imports
+from spinn_front_end_common.utilities import exceptions
+
+# graph front end imports
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import default_registry
+from spinnaker_graph_front_end.utilities import bulk_utilities
+
+# general imports
+from enum import Enum
+import json
+import numpy
+import os
+
+# The version of the snapshot layout written
+FORMAT_VERSION = 2
+
+# The name of the file describing the graph
+DESCRIPTION_FILE = "graph.json"
+
+# The value of a placer column for a vertex with no constraint, or a\
+# constraint with no processor
+_NO_PLACEMENT = -1
+
+_NUMPY_KINDS = {
+    "int": numpy.int64,
+    "float": numpy.float64,
+    "bool": numpy.bool_
+}
+
+
+def save_graph_snapshot(directory, machine_graph, registry=None):
+    """ Save a machine graph as a snapshot
+
+    :param directory:\
+        the directory to write the snapshot to; created if it does not exist
+    :type directory: str
+    :param machine_graph: the graph to save
+    :type machine_graph: MachineGraph
+    :param registry:\
+        the registry used to name classes and get construction parameters;\
+        defaults to the registry of classes shipped with the tool chain
+    :type registry: GraphClassRegistry
+    :raises ConfigurationException:\
+        if a vertex, edge or constraint in the graph cannot be saved; this\
+        is found before anything is written
+    """
+    if registry is None:
+        registry = default_registry()
+
+    # everything is gathered before anything is written, so that a graph
+    # which cannot be saved leaves no snapshot behind
+    columns = list()
+    string_columns = list()
+
+    # vertices
+    vertices = list(machine_graph.vertices)
+    vertex_indices = dict((vertex, index)
+                          for index, vertex in enumerate(vertices))
+    vertex_classes, vertex_class_ids, vertex_params = _group_by_class(
+        vertices, registry, "vertex")
+    placer_x, placer_y, placer_p = _placer_columns(vertices)
+    columns.extend([
+        ("vertex_class", vertex_class_ids), ("placer_x", placer_x),
+        ("placer_y", placer_y), ("placer_p", placer_p)])
+    string_columns.append(
+        ("vertex_label", [vertex.label for vertex in vertices]))
+
+    # edges, along with their partitions
+    edges = list()
+    partitions = list()
+    edge_partition_ids = list()
+    for partition in machine_graph.outgoing_edge_partitions:
+        partition_edges = list(partition.edges)
+        edges.extend(partition_edges)
+        edge_partition_ids.extend([len(partitions)] * len(partition_edges))
+        partitions.append(partition.identifier)
+    edge_classes, edge_class_ids, edge_params = _group_by_class(
+        edges, registry, "edge")
+    columns.extend([
+        ("edge_pre", numpy.array(
+            [vertex_indices[edge.pre_vertex] for edge in edges],
+            dtype="int64")),
+        ("edge_post", numpy.array(
+            [vertex_indices[edge.post_vertex] for edge in edges],
+            dtype="int64")),
+        ("edge_partition", numpy.array(edge_partition_ids, dtype="uint32")),
+        ("edge_class", edge_class_ids)])
+    string_columns.append(("edge_label", [edge.label for edge in edges]))
+
+    description = {
+        "format_version": FORMAT_VERSION,
+        "label": _graph_label(machine_graph),
+        "n_vertices": len(vertices),
+        "n_edges": len(edges),
+        "partitions": partitions,
+        "vertex_classes": vertex_classes,
+        "edge_classes": edge_classes,
+        "vertex_params": [
+            _params_columns(
+                "vertex_params.{}".format(index), params, registry,
+                columns, string_columns)
+            for index, params in enumerate(vertex_params)],
+        "edge_params": [
+            _params_columns(
+                "edge_params.{}".format(index), params, registry,
+                columns, string_columns)
+            for index, params in enumerate(edge_params)]
+    }
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    for name, array in columns:
+        _save(directory, name, array)
+    for name, strings in string_columns:
+        _save_strings(directory, name, strings)
+    with open(os.path.join(directory, DESCRIPTION_FILE), "w") as f:
+        json.dump(description, f, indent=1)
+
+
+def load_graph_snapshot(directory, spinnaker, registry=None):
+    """ Load a snapshot into the machine graph of a front end
+
+    :param directory: the directory holding the snapshot
+    :type directory: str
+    :param spinnaker: the front end to add the graph to
+    :type spinnaker: SpiNNaker
+    :param registry:\
+        the registry used to resolve class names; defaults to the registry\
+        of classes shipped with the tool chain
+    :type registry: GraphClassRegistry
+    :return: the vertices, in the order they were saved
+    :rtype: list of MachineVertex
+    """
+    if registry is None:
+        registry = default_registry()
+    with open(os.path.join(directory, DESCRIPTION_FILE)) as f:
+        description = json.load(f)
+    if description["format_version"] != FORMAT_VERSION:
+        raise exceptions.ConfigurationException(
+            "Graph snapshot {} has format version {}; only version {} is"
+            " supported".format(
+                directory, description["format_version"], FORMAT_VERSION))
+
+    # vertices
+    vertices = _build_by_class(
+        directory, registry, "vertex", _load(directory, "vertex_class"),
+        description["vertex_classes"], description["vertex_params"],
+        _load_strings(directory, "vertex_label"), dict())
+    placer_x = _load(directory, "placer_x").tolist()
+    placer_y = _load(directory, "placer_y").tolist()
+    placer_p = _load(directory, "placer_p").tolist()
+    for vertex, x, y, p in zip(vertices, placer_x, placer_y, placer_p):
+        if x != _NO_PLACEMENT:
+            vertex.add_constraint(PlacerChipAndCoreConstraint(
+                x, y, None if p == _NO_PLACEMENT else p))
+    spinnaker.add_machine_vertices(vertices.tolist())
+
+    # edges; the end points of the edges are found by indexing the vertices
+    edge_partition = _load(directory, "edge_partition")
+    edges = _build_by_class(
+        directory, registry, "edge", _load(directory, "edge_class"),
+        description["edge_classes"], description["edge_params"],
+        _load_strings(directory, "edge_label"), {
+            "pre_vertex": vertices[_load(directory, "edge_pre")],
+            "post_vertex": vertices[_load(directory, "edge_post")]})
+    order = numpy.argsort(edge_partition, kind="mergesort")
+    boundaries = numpy.flatnonzero(numpy.diff(edge_partition[order])) + 1
+    for edge_indices in numpy.split(order, boundaries):
+        if len(edge_indices):
+            spinnaker.add_machine_edges(
+                edges[edge_indices].tolist(),
+                description["partitions"][edge_partition[edge_indices[0]]])
+    return vertices.tolist()
+
+
+def _group_by_class(graph_objects, registry, object_type):
+    """ Find the class of each object, and the construction parameters of\
+        the objects of each class in order
+
+    :raises ConfigurationException:\
+        naming every class whose construction parameters cannot be found
+    """
+    class_names = list()
+    class_indices = dict()
+    class_ids = numpy.zeros(len(graph_objects), dtype="uint16")
+    params = list()
+    unsaveable = dict()
+    for index, graph_object in enumerate(graph_objects):
+        graph_class = type(graph_object)
+        class_index = class_indices.get(graph_class, None)
+        if class_index is None:
+            class_index = len(class_names)
+            class_indices[graph_class] = class_index
+            class_names.append(registry.get_name(graph_class))
+            params.append(list())
+        class_ids[index] = class_index
+        try:
+            params[class_index].append(registry.get_params(graph_object))
+        except KeyError:
+            unsaveable.setdefault(graph_class, graph_object)
+    if unsaveable:
+        raise exceptions.ConfigurationException(
+            "The graph cannot be saved, as the construction parameters of"
+            " some of its {}s cannot be found: {}.  Each class must"
+            " implement AbstractProvidesConstructionParams or have a"
+            " params_getter registered with the GraphClassRegistry".format(
+                object_type, "; ".join(
+                    "{} (e.g. {})".format(
+                        registry.get_name(graph_class), graph_object.label)
+                    for graph_class, graph_object in sorted(
+                        unsaveable.iteritems(),
+                        key=lambda item: item[0].__name__))))
+    return class_names, class_ids, params
+
+
+def _placer_columns(vertices):
+    placer_x = numpy.full(len(vertices), _NO_PLACEMENT, dtype="int32")
+    placer_y = numpy.full(len(vertices), _NO_PLACEMENT, dtype="int32")
+    placer_p = numpy.full(len(vertices), _NO_PLACEMENT, dtype="int32")
+    for index, vertex in enumerate(vertices):
+        for constraint in vertex.constraints:
+            if (not isinstance(constraint, PlacerChipAndCoreConstraint) or
+                    placer_x[index] != _NO_PLACEMENT):
+                raise exceptions.ConfigurationException(
+                    "Vertex {} has constraint {}; only a single"
+                    " PlacerChipAndCoreConstraint can be saved".format(
+                        vertex.label, constraint))
+            placer_x[index] = constraint.x
+            placer_y[index] = constraint.y
+            if constraint.p is not None:
+                placer_p[index] = constraint.p
+    return placer_x, placer_y, placer_p
+
+
+def _graph_label(graph):
+    """ Get the label of a graph, which some versions of PACMAN give by a\
+        method rather than a property
+    """
+    label = graph.label
+    if callable(label):
+        label = label()
+    return label
+
+
+def _params_columns(prefix, params, registry, columns, string_columns):
+    """ Make the columns of the construction parameters of the objects of\
+        one class, adding them to the columns to be saved
+
+    :return: dictionary of parameter name to the kind of column, and for\
+        enum columns the name of the enum class
+    """
+    names = set(params[0].keys()) if params else set()
+    for object_params in params:
+        if set(object_params.keys()) != names:
+            raise exceptions.ConfigurationException(
+                "Objects of the same class have different construction"
+                " parameters: {} and {}".format(
+                    sorted(names), sorted(object_params.keys())))
+
+    kinds = dict()
+    for name in names:
+        values = [object_params[name] for object_params in params]
+        kind = _column_kind(name, values)
+        column_name = "{}.{}".format(prefix, name)
+        if kind in _NUMPY_KINDS:
+            columns.append((column_name, numpy.array(
+                values, dtype=_NUMPY_KINDS[kind])))
+        elif kind == "str":
+            string_columns.append((column_name, values))
+        elif kind == "enum":
+            string_columns.append(
+                (column_name, [value.name for value in values]))
+        kinds[name] = {"kind": kind}
+        if kind == "enum":
+            kinds[name]["enum"] = _enum_name(name, values, registry)
+    return kinds
+
+
+def _enum_name(name, values, registry):
+    """ Get the name of the enum class of a column of enum values, checking\
+        that it can be found again when the snapshot is loaded
+    """
+    enum_classes = set(type(value) for value in values)
+    if len(enum_classes) != 1:
+        raise exceptions.ConfigurationException(
+            "Construction parameter {} has values of more than one enum"
+            " class: {}".format(name, sorted(
+                enum_class.__name__ for enum_class in enum_classes)))
+    try:
+        return registry.get_enum_name(enum_classes.pop())
+    except KeyError as e:
+        raise exceptions.ConfigurationException(
+            "Construction parameter {} cannot be saved: {}".format(
+                name, e.args[0]))
+
+
+def _column_kind(name, values):
+    kinds = set(_value_kind(name, value) for value in values)
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == set(("int", "float")):
+        return "float"
+    raise exceptions.ConfigurationException(
+        "Construction parameter {} has values of more than one kind: {}"
+        .format(name, sorted(kinds)))
+
+
+def _value_kind(name, value):
+    if isinstance(value, numpy.generic):
+        value = value.item()
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, long)):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, basestring):
+        return "str"
+    if isinstance(value, Enum):
+        return "enum"
+    raise exceptions.ConfigurationException(
+        "Construction parameter {} has a value of type {}, which cannot be"
+        " saved".format(name, type(value)))
+
+
+def _build_by_class(
+        directory, registry, object_type, class_ids, class_names,
+        class_params, labels, end_points):
+    """ Build the objects of each class from their parameter columns
+
+    :return: the objects in saved order
+    :rtype: NumPy array of object
+    """
+    graph_objects = numpy.empty(len(class_ids), dtype=object)
+    for class_index, class_name in enumerate(class_names):
+        graph_class = registry.get_class(class_name)
+        indices = numpy.flatnonzero(class_ids == class_index)
+        columns = {
+            name: _load_param(
+                directory, registry, graph_class,
+                "{}_params.{}.{}".format(object_type, class_index, name),
+                name, kind, len(indices))
+            for name, kind in class_params[class_index].iteritems()}
+        columns["label"] = [labels[index] for index in indices.tolist()]
+        for name, column in end_points.iteritems():
+            columns[name] = column[indices]
+        graph_objects[indices] = [
+            graph_class(**kwargs)
+            for kwargs in bulk_utilities.iterate_kwargs(columns, len(indices))]
+    return graph_objects
+
+
+def _load_param(directory, registry, graph_class, column_name, name, kind, n):
+    if kind["kind"] == "none":
+        values = [None] * n
+    elif kind["kind"] in _NUMPY_KINDS:
+        values = _load(directory, column_name).tolist()
+    else:
+        values = _load_strings(directory, column_name)
+    if registry.has_converter(graph_class, name):
+        values = [registry.convert(graph_class, name, value)
+                  for value in values]
+    elif kind["kind"] == "enum":
+        try:
+            values = [registry.get_enum_value(kind["enum"], value)
+                      for value in values]
+        except KeyError as e:
+            raise exceptions.ConfigurationException(
+                "Parameter {} of {} cannot be loaded: {}".format(
+                    name, graph_class.__name__, e.args[0]))
+    return values
+
+
+def _save(directory, name, array):
+    numpy.save(os.path.join(directory, name + ".npy"), array)
+
+
+def _load(directory, name):
+    return numpy.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+
+
+def _save_strings(directory, name, strings):
+    """ Save a column of strings (or None) as a byte array, the offsets of\
+        each string within it, and a mask of the None entries
+    """
+    encoded = [
+        "" if string is None else
+        string.encode("utf-8") if isinstance(string, unicode) else string
+        for string in strings]
+    offsets = numpy.zeros(len(encoded) + 1, dtype="int64")
+    numpy.cumsum([len(string) for string in encoded], out=offsets[1:])
+    _save(directory, name + ".data",
+          numpy.frombuffer("".join(encoded), dtype="uint8"))
+    _save(directory, name + ".offsets", offsets)
+    _save(directory, name + ".none", numpy.array(
+        [string is None for string in strings], dtype=bool))
+
+
+def _load_strings(directory, name):
+    data = _load(directory, name + ".data").tobytes()
+    offsets = _load(directory, name + ".offsets").tolist()
+    is_none = _load(directory, name + ".none").tolist()
+    return [
+        None if none else data[start:end]
+        for start, end, none in zip(offsets[:-1], offsets[1:], is_none)]
@@ -0,0 +1,211 @@
+"""
+Generation of 2D lattice (grid) machine graphs, in which each cell is\
+connected to the neighbours picked out by a stencil.
+
+Cells are indexed as ``vertices[x][y]``, with ``x`` running east and ``y``\
+running north; flat cell indices are in C order, so the cell at (x, y) has\
+index ``x * height + y``.
+"""
+
+# pacman imports
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+
+# graph front end imports
+import spinnaker_graph_front_end as front_end
+
+# general imports
+import numpy
+
+#: The four neighbours sharing a side with a cell
+VON_NEUMANN = "von_neumann"
+
+#: The eight neighbours sharing a side or a corner with a cell
+MOORE = "moore"
+
+# The (direction, x offset, y offset) of the neighbours of each stencil
+_STENCILS = {
+    VON_NEUMANN: (
+        ("N", 0, 1), ("E", 1, 0), ("S", 0, -1), ("W", -1, 0)),
+    MOORE: (
+        ("N", 0, 1), ("NE", 1, 1), ("E", 1, 0), ("SE", 1, -1),
+        ("S", 0, -1), ("SW", -1, -1), ("W", -1, 0), ("NW", -1, 1))
+}
+
+
+def stencil_directions(stencil):
+    """ Get the names of the directions of a stencil, in the order used by\
+        the direction indices returned by :py:func:`lattice_edges`
+
+    :param stencil: the stencil; one of VON_NEUMANN or MOORE
+    :type stencil: str
+    :rtype: list of str
+    """
+    return [direction for direction, _, _ in _get_stencil(stencil)]
+
+
+def lattice_edges(shape, stencil=MOORE, wrap=True, present=None):
+    """ Compute the edges of a lattice as arrays of flat cell indices
+
+    :param shape: the (width, height) of the lattice
+    :type shape: (int, int)
+    :param stencil: the stencil; one of VON_NEUMANN or MOORE
+    :type stencil: str
+    :param wrap:\
+        True to wrap edges around both dimensions (a torus), False for no\
+        wrapping, or an (x, y) tuple of flags to wrap only some dimensions;\
+        a wrapped dimension must be at least 3 cells long, as a shorter one\
+        would link cells to themselves or link the same cells twice
+    :type wrap: bool or (bool, bool)
+    :param present:\
+        optional boolean array of the lattice shape marking the cells that\
+        exist; edges to or from missing cells are left out
+    :type present: NumPy array of bool
+    :return:\
+        a tuple of (pre indices, post indices, direction indices), where the\
+        direction index refers to the list from\
+        :py:func:`stencil_directions`; a cell with a neighbour to the north\
+        has an edge to that neighbour with direction "N"
+    :rtype: (NumPy array, NumPy array, NumPy array)
+    :raises ValueError: if a wrapped dimension is shorter than 3 cells
+    """
+    width, height = shape
+    wrap_x, wrap_y = _get_wrap(wrap, shape)
+
+    # the cells which send edges
+    if present is None:
+        cells = numpy.arange(width * height, dtype=numpy.intp)
+    else:
+        present = numpy.asarray(present, dtype=bool).reshape(-1)
+        cells = numpy.flatnonzero(present)
+    xs, ys = numpy.divmod(cells, height)
+
+    # each direction is handled for every cell at once
+    pre_indices = list()
+    post_indices = list()
+    direction_indices = list()
+    for direction_index, (_, d_x, d_y) in enumerate(_get_stencil(stencil)):
+        valid = numpy.ones(len(cells), dtype=bool)
+        dest_xs = _offset(xs, d_x, width, wrap_x, valid)
+        dest_ys = _offset(ys, d_y, height, wrap_y, valid)
+        dests = dest_xs[valid] * height + dest_ys[valid]
+        if present is not None:
+            exists = present[dests]
+            valid[valid] = exists
+            dests = dests[exists]
+        pre_indices.append(cells[valid])
+        post_indices.append(dests)
+        direction_indices.append(numpy.repeat(
+            numpy.uint8(direction_index), len(dests)))
+
+    return (numpy.concatenate(pre_indices),
+            numpy.concatenate(post_indices),
+            numpy.concatenate(direction_indices))
+
+
+def build_lattice(
+        shape, vertex_factory, stencil=MOORE, wrap=True,
+        partition_id="STATE", edge_class=MachineEdge,
+        direction_param="label", direction_values=None):
+    """ Build a lattice of machine vertices and the edges between them, and\
+        add them to the machine graph
+
+    :param shape: the (width, height) of the lattice
+    :type shape: (int, int)
+    :param vertex_factory:\
+        callable taking the x and y of a cell and returning the vertex of\
+        that cell, or None if the cell is to be left out
+    :type vertex_factory: callable(int, int) -> MachineVertex
+    :param stencil: the stencil; one of VON_NEUMANN or MOORE
+    :type stencil: str
+    :param wrap:\
+        True to wrap edges around both dimensions (a torus), False for no\
+        wrapping, or an (x, y) tuple of flags to wrap only some dimensions;\
+        a wrapped dimension must be at least 3 cells long, as a shorter one\
+        would link cells to themselves or link the same cells twice
+    :type wrap: bool or (bool, bool)
+    :param partition_id: the partition identifier of the edges
+    :type partition_id: str
+    :param edge_class: the class object for creating the edges
+    :type edge_class: python object
+    :param direction_param:\
+        the parameter of edge_class which is given the direction of each\
+        edge, or None if the direction is not needed
+    :type direction_param: str
+    :param direction_values:\
+        optional mapping from each direction name of the stencil to the\
+        value passed in direction_param; if not given, the direction names\
+        themselves are passed
+    :type direction_values: dict
+    :return: the vertices, as a (width, height) NumPy object array
+    :rtype: NumPy array of MachineVertex
+    :raises ValueError: if a wrapped dimension is shorter than 3 cells
+    """
+    width, height = shape
+
+    # check the wrapping before any vertex is added to the graph
+    _get_wrap(wrap, shape)
+    vertices = numpy.empty((width, height), dtype=object)
+    present = numpy.zeros((width, height), dtype=bool)
+    for x in xrange(width):
+        for y in xrange(height):
+            vertex = vertex_factory(x, y)
+            if vertex is not None:
+                vertices[x, y] = vertex
+                present[x, y] = True
+    front_end.add_machine_vertex_instances(vertices[present].tolist())
+
+    pre_indices, post_indices, direction_indices = lattice_edges(
+        shape, stencil, wrap, present)
+
+    extra_columns = None
+    if direction_param is not None:
+        directions = stencil_directions(stencil)
+        if direction_values is not None:
+            directions = [direction_values[direction]
+                          for direction in directions]
+
+        # look up the direction of every edge with a single index operation
+        direction_table = numpy.empty(len(directions), dtype=object)
+        direction_table[:] = directions
+        extra_columns = {
+            direction_param: direction_table[direction_indices]}
+
+    front_end.add_machine_edges_from_arrays(
+        vertices, pre_indices, post_indices, partition_id,
+        edge_class=edge_class, extra_columns=extra_columns)
+    return vertices
+
+
+def _get_stencil(stencil):
+    if stencil not in _STENCILS:
+        raise ValueError(
+            "Unknown stencil {}; must be one of {}".format(
+                stencil, sorted(_STENCILS.keys())))
+    return _STENCILS[stencil]
+
+
+def _get_wrap(wrap, shape):
+    """ Get the wrap flag of each dimension, checking that the wrapped\
+        dimensions are long enough for every cell to have distinct neighbours
+    """
+    if numpy.ndim(wrap) == 0:
+        wrap = (wrap, wrap)
+    wrap_x, wrap_y = bool(wrap[0]), bool(wrap[1])
+    for name, is_wrapped, size in zip(
+            ("width", "height"), (wrap_x, wrap_y), shape):
+        if is_wrapped and size < 3:
+            raise ValueError(
+                "Cannot wrap a lattice {} of {}; a wrapped dimension needs"
+                " at least 3 cells".format(name, size))
+    return wrap_x, wrap_y
+
+
+def _offset(coordinates, offset, size, wrap, valid):
+    """ Offset coordinates in one dimension, either wrapping them around or\
+        clearing the valid flag of those that fall off the edge
+    """
+    moved = coordinates + offset
+    if wrap:
+        return moved % size
+    valid &= (moved >= 0) & (moved < size)
+    return moved
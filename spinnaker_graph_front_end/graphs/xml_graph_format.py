@@ -0,0 +1,92 @@
+"""
+The layout of graph XML files, and the encoding of parameter values.
+
+A graph file looks like::
+
+    <graph type="machine" label="heat_demo_graph">
+      <vertex id="0" label="Heat Element 0, 0"
+          class="spinnaker_graph_front_end.examples.heat_demo.heat_demo_vertex.HeatDemoVertex">
+        <param name="machine_time_step" type="int">1000</param>
+        <constraint class="PlacerChipAndCoreConstraint">
+          <param name="x" type="int">0</param>
+          <param name="y" type="int">0</param>
+          <param name="p" type="int">2</param>
+        </constraint>
+      </vertex>
+      <edge pre="0" post="1" partition="TRANSMISSION"
+          class="spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge.HeatDemoEdge">
+        <param name="direction" type="enum"
+            class="spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge.HeatDemoEdge.DIRECTIONS">SOUTH</param>
+      </edge>
+    </graph>
+
+Classes are given by registered name or by dotted path.  Enum values are\
+stored by member name, with the class of the enum; an enum parameter\
+without a class can only be read if a converter has been registered for\
+it.  Vertices must appear before any edge that refers to them.
+"""
+from enum import Enum
+import numpy
+
+GRAPH = "graph"
+VERTEX = "vertex"
+EDGE = "edge"
+PARAM = "param"
+CONSTRAINT = "constraint"
+
+MACHINE_GRAPH = "machine"
+APPLICATION_GRAPH = "application"
+GRAPH_TYPES = (MACHINE_GRAPH, APPLICATION_GRAPH)
+
+_TRUE = ("true", "1")
+
+
+def encode_value(value):
+    """ Encode a parameter value for writing to a graph file
+
+    :param value: the value
+    :return: a tuple of (type name, text)
+    :raises TypeError: if the value cannot be stored in a graph file
+    """
+    if isinstance(value, numpy.generic):
+        value = value.item()
+    if value is None:
+        return "none", ""
+    if isinstance(value, bool):
+        return "bool", "true" if value else "false"
+    if isinstance(value, (int, long)):
+        return "int", str(value)
+    if isinstance(value, float):
+        return "float", repr(value)
+    if isinstance(value, basestring):
+        return "str", value
+    if isinstance(value, Enum):
+        return "enum", value.name
+    raise TypeError(
+        "A value of type {} cannot be written to a graph file".format(
+            type(value)))
+
+
+def decode_value(type_name, text):
+    """ Decode a parameter value read from a graph file
+
+    :param type_name: the type name of the value
+    :type type_name: str
+    :param text: the text of the value
+    :type text: str
+    :return: the value; enum values are returned as the member name
+    :raises ValueError: if the type name is not known
+    """
+    if text is None:
+        text = ""
+    if type_name == "int":
+        return int(text)
+    if type_name == "float":
+        return float(text)
+    if type_name == "bool":
+        return text.strip().lower() in _TRUE
+    if type_name == "str" or type_name == "enum":
+        return text
+    if type_name == "none":
+        return None
+    raise ValueError("Unknown parameter type {}".format(type_name))
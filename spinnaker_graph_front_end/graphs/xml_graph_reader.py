@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from lxml import etree
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinnaker_graph_front_end.graphs import xml_graph_format as graph_format
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import default_registry
+
+# The number of vertices or edges to build before adding them to the graph
+DEFAULT_BATCH_SIZE = 10000
+
+
+class XMLGraphReader(object):
+    """ Reads a graph file, as written by\
+        :py:class:`spinnaker_graph_front_end.graphs.xml_graph_writer.XMLGraphWriter`,\
+        into the graphs of a front end.
+
+    The file is parsed as a stream, and each element is discarded as soon\
+    as the vertex or edge it describes has been built, so the memory used\
+    is that of the graph being built rather than that of the document.\
+    Vertices and edges are added to the graph in batches.
+    """
+
+    __slots__ = [
+
+        # The registry used to resolve class names
+        "_registry",
+
+        # The number of vertices or edges to build before adding them
+        "_batch_size"
+    ]
+
+    def __init__(self, registry=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+
+        :param registry:\
+            the registry used to resolve class names; defaults to the\
+            registry of classes shipped with the tool chain
+        :type registry: GraphClassRegistry
+        :param batch_size:\
+            the number of vertices or edges to build before adding them to\
+            the graph
+        :type batch_size: int
+        """
+        if registry is None:
+            registry = default_registry()
+        self._registry = registry
+        self._batch_size = batch_size
+
+    def read(self, file_path, spinnaker):
+        """ Read a graph file into the graphs of a front end
+
+        :param file_path: the path of the file to read
+        :type file_path: str
+        :param spinnaker: the front end to add the graph to
+        :type spinnaker: SpiNNaker
+        :return: the vertices read, by the id used for them in the file
+        :rtype: dict
+        """
+        graph_type = None
+        add_vertices = None
+        add_edges = None
+        default_edge_class = None
+        vertices_by_id = dict()
+
+        # The vertices and edges built but not yet added to the graph; edges
+        # are grouped by partition identifier
+        vertex_batch = list()
+        edge_batches = OrderedDict()
+        n_batched_edges = 0
+
+        for event, element in etree.iterparse(
+                file_path, events=("start", "end")):
+            if event == "start":
+                if element.tag == graph_format.GRAPH:
+                    graph_type = element.get(
+                        "type", graph_format.MACHINE_GRAPH)
+                    if graph_type == graph_format.MACHINE_GRAPH:
+                        add_vertices = spinnaker.add_machine_vertices
+                        add_edges = spinnaker.add_machine_edges
+                        default_edge_class = self._registry.get_class(
+                            "MachineEdge")
+                    elif graph_type == graph_format.APPLICATION_GRAPH:
+                        add_vertices = spinnaker.add_application_vertices
+                        add_edges = spinnaker.add_application_edges
+                        default_edge_class = self._registry.get_class(
+                            "ApplicationEdge")
+                    else:
+                        raise exceptions.ConfigurationException(
+                            "Unknown graph type {} in {}".format(
+                                graph_type, file_path))
+                continue
+
+            if element.tag == graph_format.VERTEX:
+                self._check_in_graph(graph_type, element, file_path)
+                vertex_id = element.get("id")
+                if vertex_id in vertices_by_id:
+                    raise exceptions.ConfigurationException(
+                        "Vertex id {} is used more than once in {}".format(
+                            vertex_id, file_path))
+                vertex = self._build_vertex(element)
+                vertices_by_id[vertex_id] = vertex
+                vertex_batch.append(vertex)
+                if len(vertex_batch) >= self._batch_size:
+                    add_vertices(vertex_batch)
+                    vertex_batch = list()
+                self._discard(element)
+
+            elif element.tag == graph_format.EDGE:
+                self._check_in_graph(graph_type, element, file_path)
+
+                # vertices must be in the graph before their edges
+                if vertex_batch:
+                    add_vertices(vertex_batch)
+                    vertex_batch = list()
+
+                edge = self._build_edge(
+                    element, vertices_by_id, default_edge_class, file_path)
+                partition_id = element.get("partition")
+                if partition_id not in edge_batches:
+                    edge_batches[partition_id] = list()
+                edge_batches[partition_id].append(edge)
+                n_batched_edges += 1
+                if n_batched_edges >= self._batch_size:
+                    self._add_edges(add_edges, edge_batches)
+                    n_batched_edges = 0
+                self._discard(element)
+
+        if graph_type is None:
+            raise exceptions.ConfigurationException(
+                "No graph found in {}".format(file_path))
+        if vertex_batch:
+            add_vertices(vertex_batch)
+        self._add_edges(add_edges, edge_batches)
+        return vertices_by_id
+
+    def _build_vertex(self, element):
+        vertex_class = self._registry.get_class(element.get("class"))
+        params = self._read_params(element, vertex_class)
+        label = element.get("label")
+        if label is not None:
+            params["label"] = label
+        constraints = [
+            self._build_object(constraint)
+            for constraint in element.iterchildren(graph_format.CONSTRAINT)]
+        if constraints:
+            params["constraints"] = constraints
+        return vertex_class(**params)
+
+    def _build_edge(
+            self, element, vertices_by_id, default_edge_class, file_path):
+        edge_class = default_edge_class
+        class_name = element.get("class")
+        if class_name is not None:
+            edge_class = self._registry.get_class(class_name)
+        params = self._read_params(element, edge_class)
+        label = element.get("label")
+        if label is not None:
+            params["label"] = label
+        try:
+            params["pre_vertex"] = vertices_by_id[element.get("pre")]
+            params["post_vertex"] = vertices_by_id[element.get("post")]
+        except KeyError as e:
+            raise exceptions.ConfigurationException(
+                "Edge in {} refers to vertex {}, which has not been"
+                " defined".format(file_path, e.args[0]))
+        return edge_class(**params)
+
+    def _build_object(self, element):
+        graph_class = self._registry.get_class(element.get("class"))
+        return graph_class(**self._read_params(element, graph_class))
+
+    def _read_params(self, element, graph_class):
+        params = dict()
+        for param in element.iterchildren(graph_format.PARAM):
+            name = param.get("name")
+            type_name = param.get("type", "str")
+            value = graph_format.decode_value(type_name, param.text)
+            if self._registry.has_converter(graph_class, name):
+                value = self._registry.convert(graph_class, name, value)
+            elif type_name == "enum":
+                value = self._read_enum(param, graph_class, name, value)
+            params[name] = value
+        return params
+
+    def _read_enum(self, param, graph_class, name, member_name):
+        enum_name = param.get("class")
+        if enum_name is None:
+            raise exceptions.ConfigurationException(
+                "Parameter {} of {} is an enum with no class, and no"
+                " converter has been registered for it".format(
+                    name, graph_class.__name__))
+        try:
+            return self._registry.get_enum_value(enum_name, member_name)
+        except KeyError as e:
+            raise exceptions.ConfigurationException(
+                "Parameter {} of {} cannot be read: {}".format(
+                    name, graph_class.__name__, e.args[0]))
+
+    @staticmethod
+    def _add_edges(add_edges, edge_batches):
+        for partition_id, edges in edge_batches.iteritems():
+            add_edges(edges, partition_id)
+        edge_batches.clear()
+
+    @staticmethod
+    def _check_in_graph(graph_type, element, file_path):
+        if graph_type is None:
+            raise exceptions.ConfigurationException(
+                "Found a {} outside of a graph in {}".format(
+                    element.tag, file_path))
+
+    @staticmethod
+    def _discard(element):
+        """ Free an element that has been read, along with any earlier\
+            siblings that are still held by the parent
+        """
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
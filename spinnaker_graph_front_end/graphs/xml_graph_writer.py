@@ -0,0 +1,316 @@
+from enum import Enum
+from itertools import izip
+from lxml import etree
+
+from spinnaker_graph_front_end.graphs import xml_graph_format as graph_format
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import default_registry
+from spinnaker_graph_front_end.utilities import bulk_utilities
+
+
+class XMLGraphWriter(object):
+    """ Writes a graph file one vertex or edge at a time, so that graphs can\
+        be generated offline without holding them in memory.
+
+    Vertices are given consecutive integer ids in the order that they are\
+    written, which are then used to refer to them when writing edges::
+
+        with XMLGraphWriter("graph.xml") as writer:
+            first = writer.write_vertex(HeatDemoVertex, {...}, label="a")
+            second = writer.write_vertex(HeatDemoVertex, {...}, label="b")
+            writer.write_edge(first, second, "TRANSMISSION")
+
+    A graph which has already been built can be written with\
+    :py:meth:`write_graph`.
+    """
+
+    __slots__ = [
+
+        # The registry used to name classes
+        "_registry",
+
+        # The path of the file being written
+        "_file_path",
+
+        # The type of graph being written
+        "_graph_type",
+
+        # The label of the graph being written
+        "_label",
+
+        # The incremental file writer and its context
+        "_xml_file",
+        "_writer",
+
+        # The context of the root graph element
+        "_graph_element",
+
+        # The id of the next vertex to be written
+        "_next_vertex_id"
+    ]
+
+    def __init__(
+            self, file_path, graph_type=graph_format.MACHINE_GRAPH,
+            label=None, registry=None):
+        """
+
+        :param file_path: the path of the file to write
+        :type file_path: str
+        :param graph_type: "machine" or "application"
+        :type graph_type: str
+        :param label: the label of the graph
+        :type label: str
+        :param registry:\
+            the registry used to name classes; defaults to the registry of\
+            classes shipped with the tool chain
+        :type registry: GraphClassRegistry
+        """
+        if graph_type not in graph_format.GRAPH_TYPES:
+            raise ValueError(
+                "Unknown graph type {}; must be one of {}".format(
+                    graph_type, graph_format.GRAPH_TYPES))
+        if registry is None:
+            registry = default_registry()
+        self._registry = registry
+        self._file_path = file_path
+        self._graph_type = graph_type
+        self._label = label
+        self._xml_file = None
+        self._writer = None
+        self._graph_element = None
+        self._next_vertex_id = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """ Open the file and write the start of the graph
+        """
+        attributes = {"type": self._graph_type}
+        if self._label is not None:
+            attributes["label"] = self._label
+        self._xml_file = etree.xmlfile(self._file_path, encoding="utf-8")
+        self._writer = self._xml_file.__enter__()
+        self._writer.write_declaration()
+        self._graph_element = self._writer.element(
+            graph_format.GRAPH, attributes)
+        self._graph_element.__enter__()
+
+    def close(self):
+        """ Write the end of the graph and close the file
+        """
+        if self._xml_file is None:
+            return
+        self._graph_element.__exit__(None, None, None)
+        self._xml_file.__exit__(None, None, None)
+        self._graph_element = None
+        self._writer = None
+        self._xml_file = None
+
+    @property
+    def n_vertices(self):
+        """ The number of vertices written so far
+
+        :rtype: int
+        """
+        return self._next_vertex_id
+
+    def write_vertex(
+            self, vertex_class, params=None, label=None, constraints=None):
+        """ Write a vertex
+
+        :param vertex_class: the class object, or name, of the vertex
+        :param params: the input params for the class object
+        :type params: dictionary of name and value
+        :param label: the label of the vertex
+        :type label: str
+        :param constraints:\
+            the constraints of the vertex, as (class, params) pairs
+        :type constraints: list of (class, dict)
+        :return: the id of the vertex, for use when writing edges
+        :rtype: int
+        """
+        vertex_id = self._next_vertex_id
+        self._next_vertex_id += 1
+        element = etree.Element(
+            graph_format.VERTEX, id=str(vertex_id),
+            attrib={"class": self._class_name(vertex_class)})
+        if label is not None:
+            element.set("label", label)
+        self._add_params(element, params)
+        if constraints is not None:
+            for constraint_class, constraint_params in constraints:
+                constraint = etree.SubElement(
+                    element, graph_format.CONSTRAINT,
+                    attrib={"class": self._class_name(constraint_class)})
+                self._add_params(constraint, constraint_params)
+        self._writer.write(element)
+        return vertex_id
+
+    def write_vertices(
+            self, vertex_class, params_columns, n, labels=None,
+            constraints=None):
+        """ Write a batch of vertices of the same class
+
+        :param vertex_class: the class object, or name, of the vertices
+        :param params_columns:\
+            the input params for the class object; lists and NumPy arrays are\
+            treated as columns with one entry per vertex, anything else is\
+            written for every vertex
+        :type params_columns: dictionary of name and column or value
+        :param n: the number of vertices to write
+        :type n: int
+        :param labels: a column of labels, or None
+        :type labels: list of str
+        :param constraints:\
+            the constraints of every vertex, as (class, params) pairs
+        :type constraints: list of (class, dict)
+        :return: the ids of the vertices
+        :rtype: xrange
+        """
+        first_id = self._next_vertex_id
+        if labels is None:
+            labels = [None] * n
+        for label, params in izip(
+                labels, bulk_utilities.iterate_kwargs(params_columns, n)):
+            self.write_vertex(vertex_class, params, label, constraints)
+        return xrange(first_id, self._next_vertex_id)
+
+    def write_edge(
+            self, pre_vertex_id, post_vertex_id, partition_id,
+            edge_class=None, params=None, label=None):
+        """ Write an edge
+
+        :param pre_vertex_id: the id of the pre vertex
+        :type pre_vertex_id: int
+        :param post_vertex_id: the id of the post vertex
+        :type post_vertex_id: int
+        :param partition_id: the partition identifier of the edge
+        :type partition_id: str
+        :param edge_class:\
+            the class object, or name, of the edge; defaults to the basic\
+            edge class of the graph type
+        :param params: any other input params for the class object
+        :type params: dictionary of name and value
+        :param label: the label of the edge
+        :type label: str
+        """
+        element = etree.Element(
+            graph_format.EDGE, pre=str(pre_vertex_id),
+            post=str(post_vertex_id), partition=partition_id)
+        if edge_class is not None:
+            element.set("class", self._class_name(edge_class))
+        if label is not None:
+            element.set("label", label)
+        self._add_params(element, params)
+        self._writer.write(element)
+
+    def write_edges(
+            self, pre_vertex_ids, post_vertex_ids, partition_id,
+            edge_class=None, extra_columns=None):
+        """ Write a batch of edges of the same class and partition
+
+        :param pre_vertex_ids: the id of the pre vertex of each edge
+        :param post_vertex_ids: the id of the post vertex of each edge
+        :param partition_id: the partition identifier of the edges
+        :type partition_id: str
+        :param edge_class: the class object, or name, of the edges
+        :param extra_columns:\
+            any other input params for the class object; lists and NumPy\
+            arrays are treated as columns with one entry per edge, anything\
+            else is written for every edge
+        :type extra_columns: dictionary of name and column or value
+        """
+        pre_vertex_ids = bulk_utilities.column_to_list(pre_vertex_ids)
+        post_vertex_ids = bulk_utilities.column_to_list(post_vertex_ids)
+        if len(pre_vertex_ids) != len(post_vertex_ids):
+            raise ValueError(
+                "{} pre vertex ids given with {} post vertex ids".format(
+                    len(pre_vertex_ids), len(post_vertex_ids)))
+        for pre_vertex_id, post_vertex_id, params in izip(
+                pre_vertex_ids, post_vertex_ids,
+                bulk_utilities.iterate_kwargs(
+                    extra_columns, len(pre_vertex_ids))):
+            self.write_edge(
+                pre_vertex_id, post_vertex_id, partition_id, edge_class,
+                params)
+
+    def write_graph(self, graph):
+        """ Write the vertices and edges of a graph which has been built,\
+            with the construction parameters of each found by the registry
+
+        :param graph: the graph to write
+        :type graph: MachineGraph or ApplicationGraph
+        :return: the ids of the vertices written, by vertex
+        :rtype: dict
+        :raises TypeError:\
+            if a vertex, edge or constraint of the graph cannot be written;\
+            this is found before any of the graph is written
+        """
+
+        # find everything to be written first, so that nothing is written
+        # for a graph which cannot be
+        vertices = [
+            (vertex, self._get_params(vertex), [
+                (type(constraint), self._get_params(constraint))
+                for constraint in vertex.constraints])
+            for vertex in graph.vertices]
+        edges = [
+            (edge, partition.identifier, self._get_params(edge))
+            for partition in graph.outgoing_edge_partitions
+            for edge in partition.edges]
+        for _, params, constraints in vertices:
+            self._check_params(params)
+            for _, constraint_params in constraints:
+                self._check_params(constraint_params)
+        for _, _, params in edges:
+            self._check_params(params)
+
+        vertex_ids = dict()
+        for vertex, params, constraints in vertices:
+            vertex_ids[vertex] = self.write_vertex(
+                type(vertex), params, vertex.label, constraints or None)
+        for edge, partition_id, params in edges:
+            self.write_edge(
+                vertex_ids[edge.pre_vertex], vertex_ids[edge.post_vertex],
+                partition_id, type(edge), params, edge.label)
+        return vertex_ids
+
+    def _get_params(self, graph_object):
+        try:
+            return self._registry.get_params(graph_object)
+        except KeyError as e:
+            raise TypeError(e.args[0])
+
+    def _check_params(self, params):
+        for value in params.itervalues():
+            graph_format.encode_value(value)
+            if isinstance(value, Enum):
+                self._enum_name(value)
+
+    def _enum_name(self, value):
+        try:
+            return self._registry.get_enum_name(type(value))
+        except KeyError as e:
+            raise TypeError(e.args[0])
+
+    def _class_name(self, graph_class):
+        if isinstance(graph_class, basestring):
+            return graph_class
+        return self._registry.get_name(graph_class)
+
+    def _add_params(self, element, params):
+        if params is None:
+            return
+        for name, value in params.iteritems():
+            type_name, text = graph_format.encode_value(value)
+            param = etree.SubElement(
+                element, graph_format.PARAM, name=name, type=type_name)
+            if isinstance(value, Enum):
+                param.set("class", self._enum_name(value))
+            param.text = text
@@ -0,0 +1,148 @@
+# data specification imports
+from data_specification.data_specification_generator import \
+    DataSpecificationGenerator
+
+# front end common imports
+from spinn_front_end_common.interface.interface_functions.\
+    front_end_common_graph_data_specification_writer import \
+    FrontEndCommonGraphDataSpecificationWriter
+
+# graph front end imports
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_spec_template import AbstractProvidesSpecTemplate
+from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.utilities.spec_template_cache \
+    import SpecTemplateCache
+
+# general imports
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class GraphFrontEndDataSpecificationWriter(
+        FrontEndCommonGraphDataSpecificationWriter):
+    """ Generates the data specifications of a graph, building those of\
+        vertices which provide a spec template from the specifications of\
+        other vertices with the same template key.
+
+    Specifications built from templates are stored by their content, so\
+    cores with identical specifications share a single file.
+    """
+
+    __slots__ = [
+
+        # The templates of the specifications generated by this call
+        "_spec_templates"
+    ]
+
+    def __init__(self):
+        self._spec_templates = None
+
+    def __call__(
+            self, placements, graph, hostname,
+            report_default_directory, write_text_specs,
+            app_data_runtime_folder, graph_mapper=None):
+        """
+
+        :return: the specification files, by core
+        """
+        self._start_spec_templates()
+        dsg_targets = FrontEndCommonGraphDataSpecificationWriter.__call__(
+            self, placements, graph, hostname, report_default_directory,
+            write_text_specs, app_data_runtime_folder, graph_mapper)
+        self._end_spec_templates()
+        return dsg_targets
+
+    def _start_spec_templates(self):
+        self._spec_templates = None
+        if config.getboolean("SpecExecution", "use_spec_templates"):
+            self._spec_templates = SpecTemplateCache()
+
+    def _end_spec_templates(self):
+        if self._spec_templates is not None:
+            logger.info(
+                "Built {} data specifications from templates and generated"
+                " {}".format(self._spec_templates.n_built,
+                             self._spec_templates.n_generated))
+
+    def _generate_data_spec_for_vertices(
+            self, placement, associated_vertex, dsg_targets, hostname,
+            report_default_directory, write_text_specs,
+            app_data_runtime_folder):
+
+        # text specifications can only be written by generating in full
+        key = None
+        if (self._spec_templates is not None and not write_text_specs and
+                isinstance(associated_vertex, AbstractProvidesSpecTemplate)):
+            key = associated_vertex.get_spec_template_key()
+        if key is None:
+            FrontEndCommonGraphDataSpecificationWriter.\
+                _generate_data_spec_for_vertices(
+                    self, placement, associated_vertex, dsg_targets, hostname,
+                    report_default_directory, write_text_specs,
+                    app_data_runtime_folder)
+            return
+
+        spec = self._spec_templates.get_spec(
+            (type(associated_vertex), key),
+            associated_vertex.get_spec_template_values(placement),
+            lambda: _generate_spec_in_memory(associated_vertex, placement))
+        dsg_targets[placement.x, placement.y, placement.p] = \
+            _write_shared_spec(spec, hostname, app_data_runtime_folder)
+
+
+def _generate_spec_in_memory(vertex, placement):
+    writer = _MemoryDataWriter()
+    vertex.generate_data_specification(
+        DataSpecificationGenerator(writer), placement)
+    return writer.getvalue()
+
+
+def _write_shared_spec(spec, hostname, app_data_runtime_folder):
+    """ Write a specification to a file named by its content, unless the\
+        file already exists
+
+    :return: the name of the file
+    """
+    if app_data_runtime_folder == "TEMP":
+        app_data_runtime_folder = tempfile.gettempdir()
+    file_path = os.path.join(
+        app_data_runtime_folder, "{}_dataSpec_shared_{}.dat".format(
+            hostname, hashlib.sha1(spec).hexdigest()))
+    if not os.path.exists(file_path):
+
+        # write to a temporary file and then rename it, so that other
+        # processes never see a partly written file
+        handle, temp_path = tempfile.mkstemp(
+            dir=app_data_runtime_folder, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(spec)
+        os.rename(temp_path, file_path)
+    return file_path
+
+
+class _MemoryDataWriter(object):
+    """ A data writer which keeps what is written in memory
+    """
+
+    __slots__ = [
+
+        # The blocks of data written
+        "_blocks"
+    ]
+
+    def __init__(self):
+        self._blocks = list()
+
+    def write(self, data):
+        self._blocks.append(bytes(data))
+
+    def close(self):
+        pass
+
+    def getvalue(self):
+        return b"".join(self._blocks)
@@ -0,0 +1,42 @@
+# spinn machine imports
+from spinn_machine.utilities.progress_bar import ProgressBar
+
+# graph front end imports
+from spinnaker_graph_front_end.interface_functions.\
+    graph_front_end_data_specification_writer import \
+    GraphFrontEndDataSpecificationWriter
+
+
+class GraphFrontEndIncrementalDataSpecificationWriter(
+        GraphFrontEndDataSpecificationWriter):
+    """ Generates the data specifications of some of the vertices of a\
+        machine graph, keeping the specifications already generated for the\
+        other vertices
+    """
+
+    __slots__ = []
+
+    def __call__(
+            self, placements, graph, hostname, report_default_directory,
+            write_text_specs, app_data_runtime_folder, vertices,
+            dsg_targets):
+        """
+
+        :param vertices: the vertices whose specifications are generated
+        :param dsg_targets:\
+            the specification files already generated, by core
+        :return: the specification files of all the vertices, by core
+        """
+        dsg_targets = dict(dsg_targets)
+        progress_bar = ProgressBar(
+            len(vertices), "Generating data specifications of changed"
+            " vertices")
+        self._start_spec_templates()
+        for vertex in vertices:
+            self._generate_data_spec_for_vertices(
+                placements.get_placement_of_vertex(vertex), vertex,
+                dsg_targets, hostname, report_default_directory,
+                write_text_specs, app_data_runtime_folder)
+            progress_bar.update()
+        progress_bar.end()
+        return dsg_targets
@@ -0,0 +1,137 @@
+# pacman imports
+from pacman.model.graphs.application.impl.application_graph import \
+    ApplicationGraph
+
+# spinn machine imports
+from spinn_machine.utilities.progress_bar import ProgressBar
+
+# graph front end imports
+from spinnaker_graph_front_end.interface_functions.\
+    graph_front_end_data_specification_writer import \
+    GraphFrontEndDataSpecificationWriter
+from spinnaker_graph_front_end.utilities.conf import config
+
+# general imports
+import multiprocessing
+import os
+
+# The number of shards given to each process, so that processes which get\
+# quick vertices can take on more of the work
+_SHARDS_PER_PROCESS = 4
+
+# The work of the current call, as (writer, placements, vertices, writer\
+# arguments).  This is held by the module rather than sent to the workers,\
+# so that the forked workers share the graph, routing information and tags\
+# with the parent instead of each receiving a pickled copy of them
+_job = None
+
+
+class GraphFrontEndParallelDataSpecificationWriter(
+        GraphFrontEndDataSpecificationWriter):
+    """ Generates the data specifications of a graph, sharding the\
+        placements across a pool of processes.
+
+    The worker processes are forked from the process running the tool chain\
+    and so see the graph, routing information, tags and any injected items\
+    as they were when the pool was started; they write the specification\
+    files directly and return the names of the files.  Each worker keeps\
+    its own spec templates.  Where processes cannot be forked, the\
+    specifications are generated in this process.
+
+    Changes that a vertex makes to itself while generating its\
+    specification are made in a worker and so are not seen by the tool\
+    chain; graphs with such vertices should use the serial writer.
+    """
+
+    __slots__ = []
+
+    def __call__(
+            self, placements, graph, hostname,
+            report_default_directory, write_text_specs,
+            app_data_runtime_folder, graph_mapper=None):
+        """
+
+        :return: the specification files, by core
+        """
+        global _job
+
+        placements = list(placements.placements)
+        if isinstance(graph, ApplicationGraph):
+            vertices = [
+                graph_mapper.get_application_vertex(placement.vertex)
+                for placement in placements]
+        else:
+            vertices = [placement.vertex for placement in placements]
+        n_processes = self._get_n_processes(len(placements))
+
+        progress_bar = ProgressBar(
+            len(placements), "Generating data specifications in {} processes"
+            .format(n_processes))
+        dsg_targets = dict()
+        self._start_spec_templates()
+        _job = (self, placements, vertices, (
+            hostname, report_default_directory, write_text_specs,
+            app_data_runtime_folder))
+        try:
+            shards = _shards(
+                len(placements), n_processes * _SHARDS_PER_PROCESS)
+            if n_processes == 1:
+                for shard in shards:
+                    dsg_targets.update(_generate_shard(shard))
+                    progress_bar.update(len(shard))
+            else:
+                pool = multiprocessing.Pool(n_processes)
+                try:
+                    for shard_targets, n_done in pool.imap_unordered(
+                            _generate_shard_with_count, shards):
+                        dsg_targets.update(shard_targets)
+                        progress_bar.update(n_done)
+                finally:
+
+                    # the workers are idle once all the shards are done, and
+                    # must not be left running if a shard failed
+                    pool.terminate()
+                    pool.join()
+        finally:
+            _job = None
+        progress_bar.end()
+        return dsg_targets
+
+    @staticmethod
+    def _get_n_processes(n_placements):
+        """ Get the number of processes to use, from the configuration
+        """
+        n_processes = config.getint("SpecExecution", "dsg_processes")
+        if n_processes <= 0:
+            n_processes = multiprocessing.cpu_count()
+        if not hasattr(os, "fork"):
+            n_processes = 1
+        return max(1, min(n_processes, n_placements))
+
+
+def _shards(n_items, n_shards):
+    """ Split the indices of some items into contiguous ranges
+
+    :return: list of xrange
+    """
+    shard_size = max(1, -(-n_items // max(1, n_shards)))
+    return [xrange(first, min(first + shard_size, n_items))
+            for first in xrange(0, n_items, shard_size)]
+
+
+def _generate_shard(indices):
+    """ Generate the specifications of the placements at some indices of\
+        the current job
+
+    :return: the specification files of the shard, by core
+    """
+    writer, placements, vertices, args = _job
+    dsg_targets = dict()
+    for index in indices:
+        writer._generate_data_spec_for_vertices(
+            placements[index], vertices[index], dsg_targets, *args)
+    return dsg_targets
+
+
+def _generate_shard_with_count(indices):
+    return _generate_shard(indices), len(indices)
@@ -1,13 +1,32 @@
 
+# pacman imports
+from pacman.model.graphs.abstract_virtual_vertex import AbstractVirtualVertex
+from pacman.model.graphs.application.impl.application_vertex \
+    import ApplicationVertex
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.routing_info.partition_routing_info \
+    import PartitionRoutingInfo
+from pacman.model.routing_info.routing_info import RoutingInfo
+
 # common front end imports
 from spinn_front_end_common.interface.spinnaker_main_interface import \
     SpinnakerMainInterface
+from spinn_front_end_common.utilities import exceptions
 
 # graph front end imports
+from spinnaker_graph_front_end import interface_functions
+from spinnaker_graph_front_end.graphs import adjacency_index
+from spinnaker_graph_front_end.utilities import incremental_mapping
+from spinnaker_graph_front_end.utilities import mapping_cache
+from spinnaker_graph_front_end.utilities import recorded_data
 from spinnaker_graph_front_end.utilities.conf import config
+from spinnaker_graph_front_end.utilities.run_profile \
+    import ProfilingAlgorithmExecutor, RunProfile
 
 # general imports
 import logging
+import os
+import sys
 
 
 logger = logging.getLogger(__name__)
@@ -25,9 +44,41 @@ class SpiNNaker(SpinnakerMainInterface):
         # dsg algorithm store for user defined algorithms
         self._user_dsg_algorithm = dsg_algorithm
 
+        # the on-disk cache of mapping results, if enabled, along with the
+        # key of the mapping being done and whether it was found in the cache
+        self._mapping_cache = None
+        if config.getboolean("Mapping", "use_mapping_cache"):
+            self._mapping_cache = mapping_cache.MappingCache(
+                self._get_mapping_cache_folder(),
+                config.getint("Mapping", "mapping_cache_max_size"))
+        self._mapping_cache_key = None
+        self._mapping_cache_hit = False
+
+        # the vertices and (edge, partition id) pairs added to the machine
+        # graph since it was last mapped, and the mapper which places them
+        # around the existing placements
+        self._added_machine_vertices = list()
+        self._added_machine_edges = list()
+        self._incremental_mapper = None
+
+        # the index of the edges of the machine graph handed to the vertices
+        # as they generate their data, built once per mapping
+        self._adjacency_index = None
+
+        # the stores on disk to which recorded data is added after each run
+        self._recording_stores = list()
+
+        # the measurements of each algorithm run, and the phase of the work
+        # flow being run
+        self._run_profile = RunProfile()
+        self._algorithm_phase = None
+
         # create xml path for where to locate GFE related functions when
         # using auto pause and resume
         extra_xml_path = list()
+        extra_xml_path.append(os.path.join(
+            os.path.dirname(interface_functions.__file__),
+            "graph_front_end_interface_functions.xml"))
 
         extra_mapping_inputs = dict()
         extra_mapping_inputs["CreateAtomToEventIdMapping"] = config.getboolean(
@@ -71,6 +122,187 @@ class SpiNNaker(SpinnakerMainInterface):
         logger.info("Setting machine time step to {} micro-seconds."
                     .format(self._machine_time_step))
 
+    def _get_machine(self, total_run_time=0, n_machine_time_steps=None):
+        self._algorithm_phase = "machine"
+        return SpinnakerMainInterface._get_machine(
+            self, total_run_time, n_machine_time_steps)
+
+    def _do_mapping(self, run_time, n_machine_time_steps, total_run_time):
+        self._algorithm_phase = "mapping"
+
+        # a full mapping includes anything added since the last one
+        del self._added_machine_vertices[:]
+        del self._added_machine_edges[:]
+        self._incremental_mapper = None
+        self._adjacency_index = None
+
+        if (self._mapping_cache is None or
+                len(self._application_graph.vertices) > 0):
+            SpinnakerMainInterface._do_mapping(
+                self, run_time, n_machine_time_steps, total_run_time)
+            return
+
+        # the mapping algorithms are skipped when they are next run if the
+        # graph has been mapped onto this machine before
+        key = mapping_cache.fingerprint(
+            self._machine_graph, self._machine, self._get_mapping_config())
+        self._mapping_cache_key = key
+        self._mapping_cache_hit = False
+        try:
+            SpinnakerMainInterface._do_mapping(
+                self, run_time, n_machine_time_steps, total_run_time)
+        finally:
+            self._mapping_cache_key = None
+        if not self._mapping_cache_hit:
+            self._mapping_cache.put(
+                key, self._machine_graph, self._placements,
+                self._routing_infos, self._tags, self._router_tables)
+
+    def _do_data_generation(self, n_machine_time_steps):
+        self._algorithm_phase = "data generation"
+        self._mapping_outputs[adjacency_index.ADJACENCY_INDEX_ITEM] = \
+            self._get_adjacency_index()
+        SpinnakerMainInterface._do_data_generation(self, n_machine_time_steps)
+
+    def _get_adjacency_index(self):
+        if self._adjacency_index is None:
+            self._adjacency_index = adjacency_index.AdjacencyIndex(
+                self._machine_graph)
+        return self._adjacency_index
+
+    def _do_load(self):
+        self._algorithm_phase = "load"
+        SpinnakerMainInterface._do_load(self)
+
+    def _do_run(self, n_machine_time_steps):
+        self._algorithm_phase = "run"
+        first_timestep = self._current_run_timesteps
+        SpinnakerMainInterface._do_run(self, n_machine_time_steps)
+
+        # move what was recorded in this run to disk
+        if self._recording_stores and not self._use_virtual_board:
+            n_workers = config.getint("Buffers", "extraction_workers")
+            for store in self._recording_stores:
+                store.add_recorded_data(
+                    self._buffer_manager, self._placements, first_timestep,
+                    n_machine_time_steps, self._machine, n_workers)
+
+    def reset(self):
+        SpinnakerMainInterface.reset(self)
+        for store in self._recording_stores:
+            store.reset()
+
+    def add_recording_store(self, store):
+        """ Add a store to which recorded data is added after each run
+
+        :param store: the store
+        :type store: RecordingStore
+        """
+        self._recording_stores.append(store)
+
+    def get_live_input_address(self, vertex):
+        """ Get the address to which events are sent to be injected by a\
+            vertex which receives them through a reverse IP tag, such as a\
+            ReverseIpTagMultiCastSource
+
+        :param vertex: the application or machine vertex
+        :return: the board address and port of the reverse IP tag
+        :rtype: (str, int)
+        """
+        machine_vertex = vertex
+        if isinstance(vertex, ApplicationVertex):
+            machine_vertex = next(iter(
+                self._graph_mapper.get_machine_vertices(vertex)))
+        tags = None
+        if self._tags is not None:
+            tags = self._tags.get_reverse_ip_tags_for_vertex(machine_vertex)
+        if not tags:
+            raise exceptions.ConfigurationException(
+                "Vertex {} has no reverse IP tag to receive events on".format(
+                    vertex.label))
+        return tags[0].board_address, tags[0].port
+
+    def _run_machine_algorithms(
+            self, inputs, algorithms, outputs, optional_algorithms=None):
+        if self._mapping_cache_key is not None:
+            key = self._mapping_cache_key
+            self._mapping_cache_key = None
+            cached = self._mapping_cache.get(key, self._machine_graph)
+            if cached is not None:
+                logger.info("Using the cached mapping {}".format(key))
+                placements, routing_infos, tags, router_tables = cached
+                inputs = dict(inputs)
+                inputs["MemoryPlacements"] = placements
+                inputs["MemoryRoutingInfos"] = routing_infos
+                inputs["MemoryTags"] = tags
+                inputs["MemoryRoutingTables"] = router_tables
+                recompute = config.get(
+                    "Mapping", "mapping_cache_recompute").split(",")
+                algorithms = [
+                    algorithm for algorithm in algorithms
+                    if algorithm in recompute]
+                self._mapping_cache_hit = True
+
+        # as SpinnakerMainInterface, but measuring each algorithm
+        executor = ProfilingAlgorithmExecutor(
+            profile=self._run_profile, phase=self._algorithm_phase,
+            extra_pre_run_algorithms=self._extra_pre_run_algorithms,
+            extra_post_run_algorithms=self._extra_post_run_algorithms,
+            count_objects=config.getboolean(
+                "Reports", "profile_count_objects"),
+            algorithms=algorithms,
+            optional_algorithms=optional_algorithms or [],
+            inputs=inputs, xml_paths=self._xml_paths, required_outputs=outputs,
+            do_timings=self._do_timings, print_timings=self._print_timings)
+        try:
+            executor.execute_mapping()
+            self._pacman_provenance.extract_provenance(executor)
+            return executor
+        except BaseException:
+            self._txrx = executor.get_item("MemoryTransceiver")
+            self._machine_allocation_controller = executor.get_item(
+                "MachineAllocationController")
+            self._shutdown()
+            ex_type, ex_value, ex_traceback = sys.exc_info()
+            raise ex_type, ex_value, ex_traceback
+
+    @property
+    def run_profile(self):
+        """ The measurements of each algorithm run so far
+
+        :rtype: RunProfile
+        """
+        return self._run_profile
+
+    @property
+    def algorithm_timings(self):
+        """ The phase of the work flow, the name, the host start time and\
+            the seconds taken of each algorithm run so far, in the order run
+
+        :rtype: list of (str, str, float, float)
+        """
+        return [
+            (record.phase, record.name, record.start_time,
+             record.wall_seconds)
+            for record in self._run_profile]
+
+    @staticmethod
+    def _get_mapping_cache_folder():
+        folder = config.get("Mapping", "mapping_cache_folder")
+        if folder == "DEFAULT":
+            folder = os.path.expanduser(os.path.join(
+                "~", ".spiNNakerGraphFrontEnd_mapping_cache"))
+        return folder
+
+    @staticmethod
+    def _get_mapping_config():
+        """ Get the configuration which changes the result of mapping
+        """
+        return [
+            (name, value) for name, value in config.items("Mapping")
+            if not name.startswith("mapping_cache") and
+            name != "use_mapping_cache"]
+
     def get_machine_dimensions(self):
         """ Get the machine dimensions
         :return:
@@ -97,17 +329,347 @@ class SpiNNaker(SpinnakerMainInterface):
         """
         self._add_socket_address(socket_address)
 
+    def none_labelled_vertex_labels(self, n_vertices, label_format=None):
+        """ Reserve a block of default vertex labels in one go
+
+        :param n_vertices: the number of labels to reserve
+        :type n_vertices: int
+        :param label_format: the format of the labels, which is given the\
+            number of each vertex; "Vertex {}" if None
+        :type label_format: str
+        :return: iterable of labels, each only built when consumed
+        """
+        if label_format is None:
+            label_format = "Vertex {}"
+        first = self._none_labelled_vertex_count
+        self._none_labelled_vertex_count += n_vertices
+        return (label_format.format(vertex_id)
+                for vertex_id in xrange(first, first + n_vertices))
+
+    def none_labelled_edge_labels(self, n_edges):
+        """ Reserve a block of default edge labels in one go
+
+        :param n_edges: the number of labels to reserve
+        :type n_edges: int
+        :return: iterable of labels, each only built when consumed
+        """
+        first = self._none_labelled_edge_count
+        self._none_labelled_edge_count += n_edges
+        return ("Edge {}".format(edge_id)
+                for edge_id in xrange(first, first + n_edges))
+
+    def add_machine_vertex(self, vertex):
+        SpinnakerMainInterface.add_machine_vertex(self, vertex)
+        if self._has_ran:
+            self._added_machine_vertices.append(vertex)
+
+    def add_machine_edge(self, edge, partition_id):
+        SpinnakerMainInterface.add_machine_edge(self, edge, partition_id)
+        if self._has_ran:
+            self._added_machine_edges.append((edge, partition_id))
+
+    def add_application_vertices(self, vertices):
+        """ Add a batch of vertices to the application graph, checking the\
+            state of the graphs once for the whole batch
+
+        :param vertices: the vertices to add to the graph
+        :type vertices: list of AbstractApplicationVertex
+        :return: None
+        :raises: ConfigurationException when both graphs contain vertices
+        """
+        if (len(self._machine_graph.vertices) > 0 and
+                self._graph_mapper is None):
+            raise exceptions.ConfigurationException(
+                "Cannot add vertices to both the machine and application"
+                " graphs")
+        self._check_virtual_vertices(vertices)
+        add_vertex = self._application_graph.add_vertex
+        for vertex in vertices:
+            add_vertex(vertex)
+
+    def add_machine_vertices(self, vertices):
+        """ Add a batch of vertices to the machine graph, checking the state\
+            of the graphs once for the whole batch
+
+        :param vertices: the vertices to add to the graph
+        :type vertices: list of MachineVertex
+        :return: None
+        :raises: ConfigurationException when both graphs contain vertices
+        """
+        if len(self._application_graph.vertices) > 0:
+            raise exceptions.ConfigurationException(
+                "Cannot add vertices to both the machine and application"
+                " graphs")
+        self._check_virtual_vertices(vertices)
+        add_vertex = self._machine_graph.add_vertex
+        for vertex in vertices:
+            add_vertex(vertex)
+        if self._has_ran:
+            self._added_machine_vertices.extend(vertices)
+
+    def add_machine_edges(self, edges, partition_id):
+        """ Add a batch of edges to the machine graph, all in the same\
+            outgoing edge partition
+
+        :param edges: the edges to add to the graph
+        :type edges: list of MachineEdge
+        :param partition_id: the partition identifier for the outgoing\
+                    edge partitions
+        :type partition_id: str
+        :return: None
+        """
+        add_edge = self._machine_graph.add_edge
+        for edge in edges:
+            add_edge(edge, partition_id)
+        if self._has_ran:
+            self._added_machine_edges.extend(
+                (edge, partition_id) for edge in edges)
+
+    def add_application_edges(self, edges, partition_id):
+        """ Add a batch of edges to the application graph, all in the same\
+            outgoing edge partition
+
+        :param edges: the edges to add to the graph
+        :type edges: list of ApplicationEdge
+        :param partition_id: the partition identifier for the outgoing\
+                    edge partitions
+        :type partition_id: str
+        :return: None
+        """
+        add_edge = self._application_graph.add_edge
+        for edge in edges:
+            add_edge(edge, partition_id)
+
+    def _check_virtual_vertices(self, vertices):
+        if self._machine is None:
+            return
+        for vertex in vertices:
+            if isinstance(vertex, AbstractVirtualVertex):
+                raise exceptions.ConfigurationException(
+                    "A Virtual Vertex cannot be added after the machine has"
+                    " been created")
+
     def run(self, run_time):
 
         # set up the correct dsg algorithm
         if self._user_dsg_algorithm is None:
-            self.dsg_algorithm = "FrontEndCommonGraphDataSpecificationWriter"
+            self.dsg_algorithm = config.get("SpecExecution", "dsg_algorithm")
         else:
             self.dsg_algorithm = self._user_dsg_algorithm
 
+        # map anything added to the machine graph since the last run around
+        # what is already mapped, or else map the graph again in full
+        if self._added_machine_vertices or self._added_machine_edges:
+            if not self._has_reset_last:
+                raise exceptions.ConfigurationException(
+                    "The graph cannot be changed between runs without"
+                    " resetting")
+            if config.getboolean("Mapping", "incremental_mapping"):
+                self._do_incremental_mapping()
+
         # run normal procedure
         SpinnakerMainInterface.run(self, run_time)
 
+    def _detect_if_graph_has_changed(self, reset_flags=True):
+
+        # machine vertices and edges added since the last run which have not
+        # been mapped incrementally need the graph to be mapped in full
+        changed = SpinnakerMainInterface._detect_if_graph_has_changed(
+            self, reset_flags)
+        return (
+            changed or bool(self._added_machine_vertices) or
+            bool(self._added_machine_edges))
+
+    def run_iter(self, run_time, chunk_steps, vertices, region, dtype):
+        """ Run for a number of milliseconds a chunk of time steps at a\
+            time, giving the data recorded in each chunk as it ends
+
+        The chunks are run one after another in the calling thread, as the\
+        tools must be run from the main thread; the simulation is paused\
+        while the caller handles the data of a chunk, and the next chunk\
+        is run when the caller asks for it.  The data of each chunk is a\
+        copy of the data held by the buffer manager, so it is not changed\
+        when the buffer manager stores the data of later chunks.
+
+        :param run_time: the number of milliseconds to run for
+        :type run_time: float
+        :param chunk_steps: the number of time steps in each chunk
+        :type chunk_steps: int
+        :param vertices: the vertices whose recorded data is given
+        :type vertices: iterable of MachineVertex
+        :param region: the id of the recording region
+        :type region: int
+        :param dtype: the type of the recorded items
+        :type dtype: NumPy dtype or str
+        :return: iterable of (first time step, number of time steps, the\
+            data recorded by each vertex in the chunk)
+        :rtype: iterable of (int, int, dict of vertex to NumPy array)
+        :raises ConfigurationException:\
+            if there is no run time or the chunks are empty
+        """
+
+        # the arguments are checked here rather than in the generator, so
+        # that they are checked when called rather than on the first chunk
+        if run_time is None:
+            raise exceptions.ConfigurationException(
+                "Running in chunks needs a run time")
+        if chunk_steps <= 0:
+            raise exceptions.ConfigurationException(
+                "Each chunk must be at least one time step long")
+        n_steps = int((run_time * 1000.0) / self._machine_time_step)
+        reader = recorded_data.RecordingReader(vertices, region, dtype)
+        return self._run_chunks(n_steps, chunk_steps, reader)
+
+    def _run_chunks(self, n_steps, chunk_steps, reader):
+        """ Run n_steps time steps chunk_steps at a time, giving the data\
+            read by the reader after each chunk
+        """
+        n_workers = config.getint("Buffers", "extraction_workers")
+        while n_steps > 0:
+            steps = min(chunk_steps, n_steps)
+            first_timestep = self._current_run_timesteps
+
+            # the run time is half a step longer than the chunk, so that it
+            # is not rounded down to a step less
+            self.run(
+                (steps + 0.5) * float(self._machine_time_step) / 1000.0)
+            data = dict()
+            if not self._use_virtual_board:
+                data = reader.read_new_data(
+                    self._buffer_manager, self._placements, self._machine,
+                    n_workers)
+            yield first_timestep, steps, data
+            n_steps -= steps
+
+    def _do_incremental_mapping(self):
+        """ Place the vertices added to the machine graph since the last\
+            run, allocate keys to and route the partitions that are new or\
+            have new edges, and generate the data specifications of the\
+            vertices which are new or have new edges
+        """
+        vertices = list(self._added_machine_vertices)
+        edges = list(self._added_machine_edges)
+        del self._added_machine_vertices[:]
+        del self._added_machine_edges[:]
+        logger.info(
+            "Incrementally mapping {} vertices and {} edges added to the"
+            " graph".format(len(vertices), len(edges)))
+
+        if self._incremental_mapper is None:
+            self._incremental_mapper = incremental_mapping.IncrementalMapper(
+                self._machine, self._machine_graph, self._placements,
+                self._routing_infos, self._tags)
+        for vertex in vertices:
+            self._incremental_mapper.place(vertex)
+
+        # build a graph of just the partitions which have changed, holding
+        # all their edges, so that only these are routed
+        changed_graph = MachineGraph(self._graph_label)
+        changed_vertices = set()
+        partitions = list()
+        for edge, partition_id in edges:
+            partition = self._machine_graph.\
+                get_outgoing_edge_partition_starting_at_vertex(
+                    edge.pre_vertex, partition_id)
+            if partition not in partitions:
+                partitions.append(partition)
+            changed_vertices.add(edge.pre_vertex)
+            changed_vertices.add(edge.post_vertex)
+        changed_partitions = dict()
+        for partition in partitions:
+            for vertex in [partition.pre_vertex] + [
+                    edge.post_vertex for edge in partition.edges]:
+                if vertex not in changed_graph.vertices:
+                    changed_graph.add_vertex(vertex)
+            for edge in partition.edges:
+                changed_graph.add_edge(edge, partition.identifier)
+            changed_partitions[partition] = changed_graph.\
+                get_outgoing_edge_partition_starting_at_vertex(
+                    partition.pre_vertex, partition.identifier)
+
+        if partitions:
+            self._route_changed_partitions(changed_graph, changed_partitions)
+
+        # generate data for the new vertices and the ends of new edges
+        changed_vertices.update(vertices)
+        self._adjacency_index = None
+        inputs = dict(self._mapping_outputs)
+        inputs[adjacency_index.ADJACENCY_INDEX_ITEM] = \
+            self._get_adjacency_index()
+        inputs["FirstMachineTimeStep"] = self._current_run_timesteps
+        inputs["IncrementalMappingVertices"] = [
+            vertex for vertex in self._machine_graph.vertices
+            if vertex in changed_vertices]
+        executor = self._run_machine_algorithms(
+            inputs, ["GraphFrontEndIncrementalDataSpecificationWriter"],
+            ["DataSpecificationTargets"])
+        self._mapping_outputs = executor.get_items()
+
+    def _route_changed_partitions(self, changed_graph, changed_partitions):
+        """ Allocate keys to new partitions and route the changed\
+            partitions, adding the routes to the existing routing tables
+
+        :param changed_graph: a graph of the changed partitions only
+        :param changed_partitions:\
+            dictionary of each changed partition of the machine graph to the\
+            same partition in the changed graph
+        """
+
+        # work out the keys needed by each of the changed partitions
+        inputs = dict(self._mapping_outputs)
+        inputs["MemoryMachineGraph"] = changed_graph
+        executor = self._run_machine_algorithms(
+            inputs, ["FrontEndCommonEdgeToNKeysMapper"],
+            ["MemoryMachinePartitionNKeysMap"])
+        n_keys_map = executor.get_item("MemoryMachinePartitionNKeysMap")
+
+        # allocate keys to partitions which do not yet have them
+        changed_routing_infos = RoutingInfo()
+        extended_partitions = False
+        for partition, changed_partition in changed_partitions.iteritems():
+            routing_info = self._routing_infos.get_routing_info_from_partition(
+                partition)
+            if routing_info is None:
+                keys_and_masks = self._incremental_mapper.allocate_keys(
+                    n_keys_map.n_keys_for_partition(changed_partition),
+                    list(partition.constraints) +
+                    list(changed_partition.constraints))
+                self._routing_infos.add_partition_info(
+                    PartitionRoutingInfo(keys_and_masks, partition))
+            else:
+                keys_and_masks = routing_info.keys_and_masks
+                extended_partitions = True
+            changed_routing_infos.add_partition_info(
+                PartitionRoutingInfo(keys_and_masks, changed_partition))
+
+        # the routing information finds the keys of edges by the edges their
+        # partitions had when added, so it is built again for the edges added
+        # to existing partitions to have keys
+        if extended_partitions:
+            routing_infos = RoutingInfo()
+            for partition in self._machine_graph.outgoing_edge_partitions:
+                routing_info = self._routing_infos.\
+                    get_routing_info_from_partition(partition)
+                if routing_info is not None:
+                    routing_infos.add_partition_info(routing_info)
+            self._routing_infos = routing_infos
+            self._mapping_outputs["MemoryRoutingInfos"] = routing_infos
+
+        # route the changed partitions, and put the routes ahead of those
+        # already in the routing tables
+        inputs["MemoryMachinePartitionNKeysMap"] = n_keys_map
+        inputs["MemoryRoutingInfos"] = changed_routing_infos
+        for item in ("MemoryRoutingTables", "MemoryRoutingTableByPartition"):
+            inputs.pop(item, None)
+        executor = self._run_machine_algorithms(
+            inputs, config.get(
+                "Mapping", "incremental_routing_algorithms").split(","),
+            ["MemoryRoutingTables"])
+        self._router_tables = incremental_mapping.merge_routing_tables(
+            self._machine, self._router_tables,
+            executor.get_item("MemoryRoutingTables"))
+        self._mapping_outputs["MemoryRoutingTables"] = self._router_tables
+
     def __repr__(self):
         return "SpiNNaker Graph Front End object for machine {}"\
             .format(self._hostname)
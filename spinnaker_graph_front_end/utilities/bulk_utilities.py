@@ -0,0 +1,99 @@
+"""
+Helpers for building many graph objects from column-oriented parameters
+"""
+from itertools import izip
+import numpy
+
+
+def is_column(value):
+    """ Determine if a parameter value is a per-item column rather than a\
+        value shared by every item
+
+    :param value: the parameter value
+    :return: True if the value is a list, tuple or NumPy array
+    :rtype: bool
+    """
+    return isinstance(value, (list, tuple, numpy.ndarray))
+
+
+def column_to_list(column):
+    """ Convert a column into a list of native Python values, so that NumPy\
+        scalars do not leak into the vertex and edge objects
+
+    :param column: a list, tuple or NumPy array
+    :rtype: list
+    """
+    if isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+def to_object_array(items):
+    """ Convert a sequence of objects into a flat NumPy object array, without\
+        NumPy trying to look inside the objects
+
+    :param items: a list of objects, or a NumPy object array of any shape
+    :rtype: NumPy array of object
+    """
+    if isinstance(items, numpy.ndarray):
+        return items.ravel()
+    items = list(items)
+    array = numpy.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def split_columns(params_columns, n_items):
+    """ Split a dictionary of parameters into the per-item columns and the\
+        values shared by every item, checking that each column is n_items\
+        long
+
+    :param params_columns: dictionary of parameter name to column or value
+    :type params_columns: dict
+    :param n_items: the number of items being built
+    :type n_items: int
+    :return: a tuple of (column names, columns as lists, shared values)
+    :raises ValueError: if a column is not n_items long
+    """
+    names = list()
+    columns = list()
+    shared = dict()
+    if params_columns is not None:
+        for name, value in params_columns.iteritems():
+            if is_column(value):
+                if len(value) != n_items:
+                    raise ValueError(
+                        "Column {} has {} entries, but {} items are being"
+                        " built".format(name, len(value), n_items))
+                names.append(name)
+                columns.append(column_to_list(value))
+            else:
+                shared[name] = value
+    return names, columns, shared
+
+
+def iterate_kwargs(params_columns, n_items, shared=None):
+    """ Generate one keyword argument dictionary per item from a dictionary\
+        of columns and shared values
+
+    :param params_columns: dictionary of parameter name to column or value
+    :type params_columns: dict
+    :param n_items: the number of items being built
+    :type n_items: int
+    :param shared:\
+        extra values passed unchanged to every item, even if they are lists
+    :type shared: dict
+    :return: iterable of dict
+    """
+    names, columns, split_shared = split_columns(params_columns, n_items)
+    if shared is not None:
+        split_shared.update(shared)
+    shared = split_shared
+    if not names:
+        for _ in xrange(n_items):
+            yield dict(shared)
+        return
+    for row in izip(*columns):
+        kwargs = dict(shared)
+        kwargs.update(izip(names, row))
+        yield kwargs
@@ -5,9 +5,12 @@ We look for config files in a variety of locations starting with the package
 directory, followed by the user's home directory and ending with the current
 working directory.
 
-All config is made accessible through the global object `config`.
+All config is made accessible through the global object `config`.  The files
+are read, and logging is set up, when the config is first used, or when
+`config.load()` is called.
 """
 import ConfigParser
+import atexit
 import logging
 import os
 import shutil
@@ -16,6 +19,8 @@ import sys
 
 import spinnaker_graph_front_end
 from spinnaker_graph_front_end.utilities.conf import log
+from spinnaker_graph_front_end.utilities.conf.config_snapshot \
+    import ConfigSnapshot
 
 read = list()
 
@@ -37,37 +42,168 @@ def _install_cfg():
     print "************************************"
     sys.exit(0)
 
-# Create a config, read global defaults and then read in additional files
-config = ConfigParser.RawConfigParser()
-default = os.path.join(
-    os.path.dirname(spinnaker_graph_front_end.__file__),
-    "spiNNakerGraphFrontEnd.cfg")
-user_config = os.path.expanduser(os.path.join(
-    "~", ".spiNNakerGraphFrontEnd.cfg"))
-other_configs = (user_config, "spiNNakerGraphFrontEnd.cfg")
-located_configs = list()
-
-found_config = False
-for possible_config in other_configs:
-    if os.path.isfile(possible_config):
-        found_config = True
-        located_configs.append(os.path.abspath(possible_config))
-
-with open(default) as f:
-    config.readfp(f)
-if found_config:
-    read = config.read(other_configs)
-else:
-    # Create a default pacman.cfg in the user home directory and get them
-    # to update it.
-    _install_cfg()
-
-read.append(default)
 
-machine_spec_file_path = config.get("Machine", "machine_spec_file")
-if machine_spec_file_path != "None":
-    config.read(machine_spec_file_path)
-    read.append(machine_spec_file_path)
+def _loads_first(method):
+    """ Make a method of RawConfigParser read the config files before it runs
+    """
+    def loaded_method(self, *args, **kwargs):
+        self.load()
+        return method(self, *args, **kwargs)
+    loaded_method.__name__ = method.__name__
+    loaded_method.__doc__ = method.__doc__
+    return loaded_method
+
+
+def _changes(method):
+    """ Make a method of RawConfigParser read the config files before it\
+        runs, and drop the snapshot of the config after
+    """
+    def changing_method(self, *args, **kwargs):
+        self.load()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._snapshot = None
+    changing_method.__name__ = method.__name__
+    changing_method.__doc__ = method.__doc__
+    return changing_method
+
+
+class _LazyConfigParser(ConfigParser.RawConfigParser):
+    """ A config which reads the config files and sets up logging when it\
+        is first used, so that importing the front end does neither
+    """
+
+    def __init__(self):
+        ConfigParser.RawConfigParser.__init__(self)
+        self._is_loaded = False
+        self._snapshot = None
+
+    @property
+    def is_loaded(self):
+        """ True once the config files have been read
+        """
+        return self._is_loaded
+
+    def load(self):
+        """ Read the config files and set up logging, if not yet done
+        """
+        if self._is_loaded:
+            return
+        self._is_loaded = True
+        try:
+            _read_config_files(self)
+        except BaseException:
+            self._is_loaded = False
+            raise
+        _set_up_logging(self)
+
+    def snapshot(self):
+        """ Get the parsed options of the config as attributes, e.g.\
+            ``config.snapshot().buffers.time_between_requests``, which is\
+            much quicker than reading the options one at a time; the\
+            snapshot is shared until the config is changed
+
+        :rtype: ConfigSnapshot
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.load()
+            snapshot = self._snapshot = ConfigSnapshot(self)
+        return snapshot
+
+    defaults = _loads_first(ConfigParser.RawConfigParser.defaults)
+    sections = _loads_first(ConfigParser.RawConfigParser.sections)
+    add_section = _changes(ConfigParser.RawConfigParser.add_section)
+    has_section = _loads_first(ConfigParser.RawConfigParser.has_section)
+    options = _loads_first(ConfigParser.RawConfigParser.options)
+    read = _changes(ConfigParser.RawConfigParser.read)
+    readfp = _changes(ConfigParser.RawConfigParser.readfp)
+    get = _loads_first(ConfigParser.RawConfigParser.get)
+    items = _loads_first(ConfigParser.RawConfigParser.items)
+    getint = _loads_first(ConfigParser.RawConfigParser.getint)
+    getfloat = _loads_first(ConfigParser.RawConfigParser.getfloat)
+    getboolean = _loads_first(ConfigParser.RawConfigParser.getboolean)
+    has_option = _loads_first(ConfigParser.RawConfigParser.has_option)
+    set = _changes(ConfigParser.RawConfigParser.set)
+    write = _loads_first(ConfigParser.RawConfigParser.write)
+    remove_option = _changes(ConfigParser.RawConfigParser.remove_option)
+    remove_section = _changes(ConfigParser.RawConfigParser.remove_section)
+
+
+def _read_config_files(conf):
+    """ Read global defaults and then read in additional files
+    """
+    default = os.path.join(
+        os.path.dirname(spinnaker_graph_front_end.__file__),
+        "spiNNakerGraphFrontEnd.cfg")
+    user_config = os.path.expanduser(os.path.join(
+        "~", ".spiNNakerGraphFrontEnd.cfg"))
+    other_configs = (user_config, "spiNNakerGraphFrontEnd.cfg")
+
+    found_config = False
+    for possible_config in other_configs:
+        if os.path.isfile(possible_config):
+            found_config = True
+            located_configs.append(os.path.abspath(possible_config))
+
+    with open(default) as f:
+        conf.readfp(f)
+    if found_config:
+        read.extend(conf.read(other_configs))
+    else:
+        # Create a default pacman.cfg in the user home directory and get them
+        # to update it.
+        _install_cfg()
+
+    read.append(default)
+
+    machine_spec_file_path = conf.get("Machine", "machine_spec_file")
+    if machine_spec_file_path != "None":
+        conf.read(machine_spec_file_path)
+        read.append(machine_spec_file_path)
+
+
+def _set_up_logging(conf):
+    """ Create the root logger with the given level, and filters based on\
+        logging levels
+    """
+    try:
+        if conf.getboolean("Logging", "instantiate"):
+            logging.basicConfig(level=0)
+
+        for handler in logging.root.handlers:
+            handler.addFilter(log.ConfiguredFilter(conf))
+            handler.setFormatter(log.ConfiguredFormatter(conf))
+
+        # records which pass the filters can be formatted and written by the
+        # handlers in a thread of their own
+        if conf.getboolean("Logging", "use_queue") and logging.root.handlers:
+            _queue_root_handlers(conf)
+    except ConfigParser.NoSectionError:
+        pass
+    except ConfigParser.NoOptionError:
+        pass
+
+    # Log which config files we read
+    logger = logging.getLogger(__name__)
+    logger.info("Read config files: %s" % string.join(read, ", "))
+
+
+def _queue_root_handlers(conf):
+    """ Move the handlers of the root logger behind a queue, which is\
+        emptied when Python exits
+    """
+    handlers = list(logging.root.handlers)
+    queue = log.RecordQueue()
+    queue_handler = log.QueueHandler(queue)
+    queue_handler.addFilter(log.ConfiguredFilter(conf))
+    for handler in handlers:
+        logging.root.removeHandler(handler)
+    logging.root.addHandler(queue_handler)
+    listener = log.QueueListener(queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
 
 
 # creates a directory if needed, or deletes it and rebuilds it
@@ -79,20 +215,6 @@ def create_directory(directory):
         os.makedirs(directory)
 
 
-# Create the root logger with the given level
-# Create filters based on logging levels
-try:
-    if config.getboolean("Logging", "instantiate"):
-        logging.basicConfig(level=0)
-
-    for handler in logging.root.handlers:
-        handler.addFilter(log.ConfiguredFilter(config))
-        handler.setFormatter(log.ConfiguredFormatter(config))
-except ConfigParser.NoSectionError:
-    pass
-except ConfigParser.NoOptionError:
-    pass
-
-# Log which config files we read
-logger = logging.getLogger(__name__)
-logger.info("Read config files: %s" % string.join(read, ", "))
+# The config, which reads the config files when first used
+config = _LazyConfigParser()
+located_configs = list()
@@ -0,0 +1,167 @@
+"""
+A parsed, read-only copy of the config, in which each option is read once\
+and converted to its type, and is then found by attribute access, e.g.\
+``snapshot.buffers.time_between_requests``.
+
+The type of each option is given by :py:data:`SCHEMA`, which covers the\
+sections read by the vertices as they are built; the options of other\
+sections, and options not in the schema, are kept as text.
+"""
+
+# The values of options which are read as booleans, as in ConfigParser
+_BOOLEANS = {
+    "1": True, "true": True, "yes": True, "on": True,
+    "0": False, "false": False, "no": False, "off": False}
+
+
+def _parse_bool(value):
+    try:
+        return _BOOLEANS[value.lower()]
+    except KeyError:
+        raise ValueError("{} is not a boolean".format(value))
+
+
+# The type of each option, by section and option name in lower case; an\
+# option is an int, float or bool, or str for text, and is None if "None"
+SCHEMA = {
+    "Buffers": {
+        "receive_buffer_port": int,
+        "receive_buffer_host": str,
+        "enable_buffered_recording": bool,
+        "spike_buffer_size": int,
+        "v_buffer_size": int,
+        "gsyn_buffer_size": int,
+        "buffer_size_before_receive": int,
+        "time_between_requests": int,
+        "use_auto_pause_and_resume": bool,
+        "minimum_buffer_sdram": int,
+        "extraction_workers": int},
+    "Machine": {
+        "machinename": str,
+        "version": int,
+        "virtual_board": bool,
+        "width": int,
+        "height": int,
+        "core_limit": int,
+        "machinetimestep": int,
+        "timescalefactor": int,
+        "appid": int,
+        "dseappid": int,
+        "number_of_boards": int,
+        "max_sdram_allowed_per_chip": int}
+}
+
+# The function which parses each type of option
+_PARSERS = {int: int, float: float, bool: _parse_bool, str: str}
+
+
+def parse_value(value, value_type=None):
+    """ Convert the text of an option to its type
+
+    :param value: the text of the option
+    :type value: str
+    :param value_type: the type of the option; one of int, float, bool or\
+        str, or None if the type is not known
+    :type value_type: type
+    :return: the text itself if the type is not known, None for "None",\
+        or the value as its type, with the boolean words of ConfigParser as\
+        bools
+    :rtype: None, int, float, bool or str
+    :raises ValueError: if the text is not a value of the type
+    """
+    if value_type is None:
+        return value
+    if value is None or value == "None":
+        return None
+    return _PARSERS[value_type](value)
+
+
+class ConfigSection(object):
+    """ The parsed options of a section of the config, as attributes named\
+        by the option names in lower case
+    """
+
+    def __init__(self, name, items, types=None):
+        """
+
+        :param name: the name of the section
+        :type name: str
+        :param items: the name and text of each option of the section
+        :type items: iterable of (str, str)
+        :param types: the type of each option, by name in lower case;\
+            options without a type are kept as text
+        :type types: dict of str to type
+        :raises ValueError: if an option is not a value of its type
+        """
+        self.__dict__["_name"] = name
+        types = types or dict()
+        for option, value in items:
+            option = option.lower()
+            try:
+                self.__dict__[option] = parse_value(value, types.get(option))
+            except ValueError:
+                raise ValueError(
+                    "The option {} in section {} is {}, which is not of"
+                    " type {}".format(
+                        option, name, value, types[option].__name__))
+
+    def __getattr__(self, name):
+        raise AttributeError("There is no option {} in section {}".format(
+            name, self.__dict__["_name"]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The config snapshot cannot be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("The config snapshot cannot be changed")
+
+    def __contains__(self, option):
+        return option.lower() in self.__dict__
+
+    def __iter__(self):
+        return iter(sorted(
+            option for option in self.__dict__ if option != "_name"))
+
+    def __repr__(self):
+        return "ConfigSection({}: {})".format(
+            self.__dict__["_name"], ", ".join(
+                "{}={!r}".format(option, self.__dict__[option])
+                for option in self))
+
+
+class ConfigSnapshot(object):
+    """ The parsed options of every section of the config, with the\
+        sections as attributes named by the section names in lower case
+    """
+
+    def __init__(self, conf, schema=None):
+        """
+
+        :param conf: the config to read
+        :type conf: RawConfigParser
+        :param schema: the type of each option, by section and option name;\
+            if None, :py:data:`SCHEMA`
+        :type schema: dict of str to dict of str to type
+        :raises ValueError: if an option is not a value of its type
+        """
+        if schema is None:
+            schema = SCHEMA
+        for section in conf.sections():
+            self.__dict__[section.lower()] = ConfigSection(
+                section, conf.items(section), schema.get(section))
+
+    def __getattr__(self, name):
+        raise AttributeError("There is no section {} in the config".format(
+            name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The config snapshot cannot be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("The config snapshot cannot be changed")
+
+    def __contains__(self, section):
+        return section.lower() in self.__dict__
+
+    def __iter__(self):
+        return iter(sorted(self.__dict__))
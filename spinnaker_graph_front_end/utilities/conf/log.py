@@ -1,5 +1,7 @@
+from collections import deque
+import copy
 import logging
-import re
+import threading
 
 levels = {
     'debug': logging.DEBUG,
@@ -9,19 +11,47 @@ levels = {
     'critical': logging.CRITICAL,
 }
 
+# Formats the tracebacks of the records queued
+_exception_formatter = logging.Formatter()
+
 
 class ConfiguredFilter(object):
     def __init__(self, conf):
-        self._levels = ConfiguredFormatter.construct_logging_parents(conf)
-        self._default_level = levels[conf.get("Logging", "default")]
+        self._conf = conf
+        self._snapshot = None
+        self._levels = None
+        self._default_level = None
+
+        # the level of each logger name seen, as found from its parents
+        self._logger_levels = dict()
+        self._read_levels()
+
+    def _read_levels(self):
+        """ Read the levels from the config, forgetting those of the logger\
+            names seen
+        """
+        self._levels = ConfiguredFormatter.construct_logging_parents(
+            self._conf)
+        self._default_level = levels[self._conf.get("Logging", "default")]
+        self._logger_levels = dict()
+
+        # the snapshot of the config changes whenever the config does
+        if hasattr(self._conf, "snapshot"):
+            self._snapshot = self._conf.snapshot()
 
     def filter(self, record):
         """Get the level for the deepest parent, and filter appropriately."""
-        level = ConfiguredFormatter.level_of_deepest_parent(self._levels,
-                                                            record.name)
-
-        if level is None:
-            return record.levelno >= self._default_level
+        if (self._snapshot is not None and
+                self._conf.snapshot() is not self._snapshot):
+            self._read_levels()
+        try:
+            level = self._logger_levels[record.name]
+        except KeyError:
+            level = ConfiguredFormatter.level_of_deepest_parent(
+                self._levels, record.name)
+            if level is None:
+                level = self._default_level
+            self._logger_levels[record.name] = level
 
         return record.levelno >= level
 
@@ -65,13 +95,12 @@ class ConfiguredFormatter(logging.Formatter):
         """ Greediest match between child and parent.
         """
 
-        # TODO: this can almost certainly be neater!
         # Repeatedly strip elements off the child until we match an item in
         # parents
         match = child
 
         while '.' in match and match not in parents:
-            match = re.sub(r'\.[^.]+$', '', match)
+            match = match.rpartition('.')[0]
 
         # If no match then return None, there is no deepest parent
         if match not in parents:
@@ -84,10 +113,135 @@ class ConfiguredFormatter(logging.Formatter):
         """ The logging level of the greediest match between child and parent.
         """
 
-        # child = re.sub( r'^pacman103\.', '', child )
-        parent = ConfiguredFormatter.deepest_parent(parents.keys(), child)
+        parent = ConfiguredFormatter.deepest_parent(parents, child)
 
         if parent is None:
             return None
 
         return parents[parent]
+
+
+class RecordQueue(object):
+    """ A queue of log records, to which records are added without taking\
+        a lock unless the queue was empty
+    """
+
+    def __init__(self):
+        self._records = deque()
+        self._ready = threading.Event()
+
+    def put(self, record):
+        """ Add a record to the queue
+
+        :param record: the record, or None to stop the listener
+        :type record: LogRecord
+        """
+        self._records.append(record)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def get_all(self):
+        """ Wait until there are records, and take all of them
+
+        :rtype: list of LogRecord
+        """
+        self._ready.wait()
+
+        # a record added after the event is cleared sets it again
+        self._ready.clear()
+        records = list()
+        try:
+            while True:
+                records.append(self._records.popleft())
+        except IndexError:
+            pass
+        return records
+
+
+class QueueHandler(logging.Handler):
+    """ A handler which puts the records it is given on a queue, from which\
+        a :py:class:`QueueListener` passes them to the handlers which format\
+        and write them in a thread of its own.
+
+    As in the handler of Python 3, a copy of each record is queued with its\
+    arguments merged into its message and its traceback made into text, so\
+    that the objects it refers to can change or be freed before it is\
+    written.  Unlike the handler of Python 3, the records are not formatted\
+    otherwise, so the thread logging only pays for the filters and the\
+    message.
+    """
+
+    def __init__(self, queue):
+        """
+
+        :param queue: the queue to put the records on
+        :type queue: RecordQueue
+        """
+        logging.Handler.__init__(self)
+        self.queue = queue
+
+    def prepare(self, record):
+        """ Copy a record, merging its arguments into its message and its\
+            traceback into its text
+
+        :param record: the record
+        :type record: LogRecord
+        :rtype: LogRecord
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(
+                    record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+class QueueListener(object):
+    """ Passes the records put on a queue by a :py:class:`QueueHandler` to\
+        a number of handlers, in a thread of its own
+    """
+
+    def __init__(self, queue, *handlers):
+        """
+
+        :param queue: the queue to take the records from
+        :type queue: RecordQueue
+        :param handlers: the handlers to pass the records to
+        :type handlers: Handler
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self._thread = None
+
+    def start(self):
+        """ Start passing records to the handlers
+        """
+        self._thread = threading.Thread(target=self._monitor)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Pass the records already queued to the handlers, and stop
+        """
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _monitor(self):
+        while True:
+            for record in self.queue.get_all():
+                if record is None:
+                    return
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
@@ -0,0 +1,452 @@
+# front end common imports
+from spinn_front_end_common.utilities.connections.live_event_connection \
+    import LiveEventConnection
+
+# spinnman imports
+from spinnman.connections.connection_listener import ConnectionListener
+from spinnman.connections.udp_packet_connections.udp_eieio_connection \
+    import UDPEIEIOConnection
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_prefix import EIEIOPrefix
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+# graph front end imports
+from spinnaker_graph_front_end.utilities.key_index import KeyIndex
+
+# general imports
+from collections import OrderedDict
+from threading import RLock
+import logging
+import numpy
+import struct
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+# The layout of the elements of each type of EIEIO data packet
+_ELEMENT_TYPES = {
+    EIEIOType.KEY_16_BIT: numpy.dtype([("key", "<u2")]),
+    EIEIOType.KEY_PAYLOAD_16_BIT: numpy.dtype(
+        [("key", "<u2"), ("payload", "<u2")]),
+    EIEIOType.KEY_32_BIT: numpy.dtype([("key", "<u4")]),
+    EIEIOType.KEY_PAYLOAD_32_BIT: numpy.dtype(
+        [("key", "<u4"), ("payload", "<u4")])
+}
+
+# The mask and value of the first two bytes of an EIEIO command packet
+_COMMAND_MASK = 0xC000
+_COMMAND_FLAGS = 0x4000
+
+
+class LiveEventBatch(object):
+    """ The live events received from a number of vertices in an EIEIO\
+        packet or a window of time, as arrays with an entry for each event
+    """
+
+    __slots__ = [
+
+        # The labels of the vertices from which events are received, by id
+        "_labels",
+
+        # The key of each event
+        "_keys",
+
+        # The payload of each event, or 0 if the event had none
+        "_payloads",
+
+        # The time of each event
+        "_timestamps",
+
+        # True if the times are time steps rather than host times
+        "_is_time",
+
+        # The id of the label of the vertex that sent each event
+        "_label_ids",
+
+        # The atom of its vertex that sent each event
+        "_atom_ids"
+    ]
+
+    def __init__(self, labels, keys, payloads, timestamps, is_time,
+                 label_ids, atom_ids):
+        self._labels = labels
+        self._keys = keys
+        self._payloads = payloads
+        self._timestamps = timestamps
+        self._is_time = is_time
+        self._label_ids = label_ids
+        self._atom_ids = atom_ids
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def labels(self):
+        """ The labels of the vertices from which events are received, by\
+            label id
+
+        :rtype: list of str
+        """
+        return self._labels
+
+    @property
+    def keys(self):
+        """ The key of each event
+
+        :rtype: NumPy array of uint32
+        """
+        return self._keys
+
+    @property
+    def payloads(self):
+        """ The payload of each event, or 0 for events without a payload
+
+        :rtype: NumPy array of uint32
+        """
+        return self._payloads
+
+    @property
+    def timestamps(self):
+        """ The time of each event; the time step from the payload if the\
+            payloads are time stamps, otherwise the host time in seconds at\
+            which its packet was received
+
+        :rtype: NumPy array of uint32 or float64
+        """
+        return self._timestamps
+
+    @property
+    def is_time(self):
+        """ True if the time stamps are time steps
+
+        :rtype: bool
+        """
+        return self._is_time
+
+    @property
+    def label_ids(self):
+        """ The index in :py:attr:`labels` of the vertex that sent each event
+
+        :rtype: NumPy array of int
+        """
+        return self._label_ids
+
+    @property
+    def atom_ids(self):
+        """ The atom of its vertex that sent each event
+
+        :rtype: NumPy array of int
+        """
+        return self._atom_ids
+
+
+class BatchedLiveEventConnection(LiveEventConnection):
+    """ A live event connection which also gives the events received to\
+        callbacks in batches, as arrays, rather than one event at a time.
+
+    Each EIEIO packet is read with a single NumPy call, and the vertex and\
+    atom of each key are found by looking the keys up in a\
+    :py:class:`KeyIndex` of the keys of the vertices.  The callbacks of\
+    individual events added with add_receive_callback are not called.
+    """
+
+    def __init__(self, live_packet_gather_label, receive_labels=None,
+                 send_labels=None, local_host=None, local_port=19999,
+                 machine_vertices=False, window=None):
+        """
+
+        :param live_packet_gather_label: The label of the LivePacketGather\
+                    vertex to which received events are being sent
+        :param receive_labels: Labels of vertices from which live events\
+                    will be received.
+        :type receive_labels: iterable of str
+        :param send_labels: Labels of vertices to which live events will be\
+                    sent
+        :type send_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+                    ip address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+                    on.  Must match the port that the toolchain will send the\
+                    notification on (19999 by default)
+        :type local_port: int
+        :param machine_vertices: True if the labels are of machine vertices
+        :type machine_vertices: bool
+        :param window: The number of seconds for which events are gathered\
+                    before they are given to the callbacks, or None to give\
+                    the events of each packet as it is received.  A window\
+                    is ended by the first packet received after it ends.
+        :type window: float
+        """
+        LiveEventConnection.__init__(
+            self, live_packet_gather_label, receive_labels=receive_labels,
+            send_labels=send_labels, local_host=local_host,
+            local_port=local_port, machine_vertices=machine_vertices)
+        self._window = window
+        self._batch_callbacks = list()
+        self._batch_lock = RLock()
+        self._pending = list()
+        self._window_start = None
+
+        # the label id and atom id of each key of the vertices
+        self._key_index = KeyIndex([], [], [])
+
+    @property
+    def key_index(self):
+        """ The index of the keys of the vertices from which events are\
+            received, by label id; it can be saved for programs which decode\
+            the events without reading the database
+
+        :rtype: KeyIndex
+        """
+        return self._key_index
+
+    def add_batch_receive_callback(self, batch_callback):
+        """ Add a callback for the reception of batches of live events
+
+        :param batch_callback: A function to be called with each batch of\
+                    events received
+        :type batch_callback: function(LiveEventBatch) -> None
+        """
+        self._batch_callbacks.append(batch_callback)
+
+    def _read_database_callback(self, database_reader):
+        """ Read the details of the vertices sent to and received from, and\
+            listen for packets with receivers which give the bytes of each\
+            packet
+
+        The receivers are made here rather than by LiveEventConnection, so\
+        that each port is bound once, and only after the index of the keys\
+        is built, so no packet is received before its keys can be looked up.
+        """
+        self._handle_possible_rerun_state()
+
+        vertex_sizes = OrderedDict()
+        run_time_ms = database_reader.get_configuration_parameter_value(
+            "runtime")
+        machine_timestep_ms = \
+            database_reader.get_configuration_parameter_value(
+                "machine_time_step") / 1000.0
+        if self._send_labels is not None:
+            self._read_send_details(database_reader, vertex_sizes)
+        ports = list()
+        if self._receive_labels is not None:
+            ports = self._read_receive_details(database_reader, vertex_sizes)
+
+        # build the index which maps keys to vertices and atoms
+        n_keys = len(self._key_to_atom_id_and_label)
+        keys = numpy.fromiter(
+            self._key_to_atom_id_and_label.iterkeys(), dtype="uint32",
+            count=n_keys)
+        values = numpy.array(
+            self._key_to_atom_id_and_label.values(),
+            dtype="int32").reshape(n_keys, 2)
+        self._key_index = KeyIndex(
+            keys, values[:, 1], values[:, 0], self._receive_labels)
+
+        with self._batch_lock:
+            for port in ports:
+                receiver = RawEIEIOConnection(local_port=port)
+                self._receivers[port] = receiver
+                self._listen(port, receiver)
+
+        for label, vertex_size in vertex_sizes.iteritems():
+            for init_callback in self._init_callbacks[label]:
+                init_callback(
+                    label, vertex_size, run_time_ms, machine_timestep_ms)
+
+    def _read_send_details(self, database_reader, vertex_sizes):
+        """ Read the addresses and keys of the vertices sent to, and make\
+            the connection to send with
+
+        :param database_reader: the reader of the database
+        :param vertex_sizes: the number of atoms of each vertex, to add to
+        :type vertex_sizes: OrderedDict of str to int
+        """
+        self._sender_connection = UDPEIEIOConnection()
+        for send_label in self._send_labels:
+            if self._machine_vertices:
+                self._send_address_details[send_label] = \
+                    database_reader.get_machine_live_input_details(
+                        send_label)
+                key, _ = database_reader.get_machine_live_input_key(
+                    send_label)
+                self._atom_id_to_key[send_label] = {0: key}
+                vertex_sizes[send_label] = 1
+            else:
+                self._send_address_details[send_label] = \
+                    database_reader.get_live_input_details(send_label)
+                self._atom_id_to_key[send_label] = \
+                    database_reader.get_atom_id_to_key_mapping(send_label)
+                vertex_sizes[send_label] = len(
+                    self._atom_id_to_key[send_label])
+
+    def _read_receive_details(self, database_reader, vertex_sizes):
+        """ Read the ports and keys of the vertices received from
+
+        :param database_reader: the reader of the database
+        :param vertex_sizes: the number of atoms of each vertex, to add to
+        :type vertex_sizes: OrderedDict of str to int
+        :return: the ports to listen on, in the order first used
+        :rtype: list of int
+        """
+        ports = list()
+        for label_id, receive_label in enumerate(self._receive_labels):
+            if self._machine_vertices:
+                host, port, strip_sdp = \
+                    database_reader.get_machine_live_output_details(
+                        receive_label, self._live_packet_gather_label)
+            else:
+                host, port, strip_sdp = \
+                    database_reader.get_live_output_details(
+                        receive_label, self._live_packet_gather_label)
+            if not strip_sdp:
+                raise Exception(
+                    "Currently, only ip tags which strip the SDP headers are"
+                    " supported")
+            if port not in ports:
+                ports.append(port)
+            logger.info("Listening for traffic from {} on {}:{}".format(
+                receive_label, host, port))
+
+            if self._machine_vertices:
+                key, _ = database_reader.get_machine_live_output_key(
+                    receive_label, self._live_packet_gather_label)
+                self._key_to_atom_id_and_label[key] = (0, label_id)
+                vertex_sizes[receive_label] = 1
+            else:
+                key_to_atom_id = database_reader.get_key_to_atom_id_mapping(
+                    receive_label)
+                for key, atom_id in key_to_atom_id.iteritems():
+                    self._key_to_atom_id_and_label[key] = (atom_id, label_id)
+                vertex_sizes[receive_label] = len(key_to_atom_id)
+        return ports
+
+    def _listen(self, port, receiver):
+        """ Start listening for packets on a receiver
+
+        :param port: the port of the receiver
+        :type port: int
+        :param receiver: the receiver
+        :type receiver: RawEIEIOConnection
+        """
+
+        # the packets are handled one at a time so that they are batched in
+        # the order received
+        listener = ConnectionListener(receiver, n_processes=1)
+        listener.add_callback(self._receive_raw_packet_callback)
+        listener.start()
+        self._listeners[port] = listener
+
+    def _receive_raw_packet_callback(self, data):
+        try:
+            receive_time = time.time()
+            batch = self._decode_packet(data, receive_time)
+            if batch is None:
+                return
+            with self._batch_lock:
+                if self._window is None:
+                    self._call_batch_callbacks(batch)
+                    return
+                if self._window_start is None:
+                    self._window_start = receive_time
+                self._pending.append(batch)
+                if receive_time - self._window_start >= self._window:
+                    self.flush()
+        except Exception:
+            traceback.print_exc()
+
+    def _decode_packet(self, data, receive_time):
+        """ Decode the events of an EIEIO data packet
+
+        :return: the events of the packet sent by the vertices received\
+            from, or None if there are none
+        """
+        if struct.unpack_from("<H", data)[0] & _COMMAND_MASK == _COMMAND_FLAGS:
+            return None
+        header = EIEIODataHeader.from_bytestring(data, 0)
+        element_type = _ELEMENT_TYPES[header.eieio_type]
+        elements = numpy.frombuffer(
+            data, dtype=element_type, count=header.count, offset=header.size)
+
+        keys = elements["key"].astype("uint32")
+        if header.prefix is not None:
+            if header.prefix_type == EIEIOPrefix.UPPER_HALF_WORD:
+                keys |= header.prefix << 16
+            else:
+                keys |= header.prefix
+        if "payload" in element_type.names:
+            payloads = elements["payload"].astype("uint32")
+        else:
+            payloads = numpy.zeros(len(keys), dtype="uint32")
+        if header.payload_base is not None:
+            payloads |= header.payload_base
+
+        # look up the keys, dropping those not from the vertices
+        label_ids, atom_ids = self._key_index.lookup(keys)
+        known = label_ids >= 0
+        if not known.all():
+            keys = keys[known]
+            payloads = payloads[known]
+            label_ids = label_ids[known]
+            atom_ids = atom_ids[known]
+        if not len(keys):
+            return None
+
+        if header.is_time:
+            timestamps = payloads
+        else:
+            timestamps = numpy.repeat(receive_time, len(keys))
+        return LiveEventBatch(
+            self._receive_labels, keys, payloads, timestamps, header.is_time,
+            label_ids, atom_ids)
+
+    def flush(self):
+        """ Give the events gathered in the current window to the callbacks\
+            now, rather than when the window ends
+        """
+        with self._batch_lock:
+            pending = self._pending
+            self._pending = list()
+            self._window_start = None
+            if not pending:
+                return
+            if len(pending) == 1:
+                batch = pending[0]
+            else:
+                batch = LiveEventBatch(
+                    self._receive_labels,
+                    numpy.concatenate([b.keys for b in pending]),
+                    numpy.concatenate([b.payloads for b in pending]),
+                    numpy.concatenate([b.timestamps for b in pending]),
+                    all(b.is_time for b in pending),
+                    numpy.concatenate([b.label_ids for b in pending]),
+                    numpy.concatenate([b.atom_ids for b in pending]))
+            self._call_batch_callbacks(batch)
+
+    def _call_batch_callbacks(self, batch):
+        for callback in self._batch_callbacks:
+            callback(batch)
+
+    def close(self):
+        self.flush()
+        LiveEventConnection.close(self)
+
+
+class RawEIEIOConnection(UDPEIEIOConnection):
+    """ An EIEIO connection whose listeners are given the bytes of each\
+        packet rather than the message decoded from them, and which can be\
+        waited on with select
+    """
+
+    def get_receive_method(self):
+        return self.receive
+
+    def fileno(self):
+        """ The file descriptor of the socket of the connection
+
+        :rtype: int
+        """
+        return self._socket.fileno()
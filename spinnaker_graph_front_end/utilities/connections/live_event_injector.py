@@ -0,0 +1,386 @@
+"""
+Injection of arrays of events into a running simulation through a\
+ReverseIpTagMultiCastSource, packing as many events as possible into each\
+EIEIO packet and sending the packets of each time step as it starts.
+"""
+
+# spinnman imports
+from spinnman.connections.udp_packet_connections.udp_eieio_connection \
+    import UDPEIEIOConnection
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_prefix import EIEIOPrefix
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+# general imports
+import logging
+import numpy
+import time
+
+logger = logging.getLogger(__name__)
+
+# The largest number of bytes in an EIEIO packet
+_MAX_PACKET_SIZE = 256
+
+# The layout of the elements of each type of packet sent
+_ELEMENT_TYPES = {
+    EIEIOType.KEY_16_BIT: numpy.dtype([("key", "<u2")]),
+    EIEIOType.KEY_32_BIT: numpy.dtype([("key", "<u4")]),
+    EIEIOType.KEY_PAYLOAD_32_BIT: numpy.dtype(
+        [("key", "<u4"), ("payload", "<u4")])
+}
+
+
+class InjectionReport(object):
+    """ The numbers of events and packets sent and dropped by an injection,\
+        and the rates at which they were sent
+    """
+
+    __slots__ = [
+
+        # The number of events sent
+        "_n_events_sent",
+
+        # The number of packets sent
+        "_n_packets_sent",
+
+        # The number of events dropped
+        "_n_events_dropped",
+
+        # The number of packets dropped
+        "_n_packets_dropped",
+
+        # The number of seconds from the start of the injection to the\
+        # last packet
+        "_seconds"
+    ]
+
+    def __init__(self, n_events_sent, n_packets_sent, n_events_dropped,
+                 n_packets_dropped, seconds):
+        self._n_events_sent = n_events_sent
+        self._n_packets_sent = n_packets_sent
+        self._n_events_dropped = n_events_dropped
+        self._n_packets_dropped = n_packets_dropped
+        self._seconds = seconds
+
+    @property
+    def n_events_sent(self):
+        """ The number of events sent
+
+        :rtype: int
+        """
+        return self._n_events_sent
+
+    @property
+    def n_packets_sent(self):
+        """ The number of packets sent
+
+        :rtype: int
+        """
+        return self._n_packets_sent
+
+    @property
+    def n_events_dropped(self):
+        """ The number of events not sent, because their packets were too\
+            late or could not be sent
+
+        :rtype: int
+        """
+        return self._n_events_dropped
+
+    @property
+    def n_packets_dropped(self):
+        """ The number of packets not sent
+
+        :rtype: int
+        """
+        return self._n_packets_dropped
+
+    @property
+    def seconds(self):
+        """ The number of seconds from the start of the injection to the\
+            last packet
+
+        :rtype: float
+        """
+        return self._seconds
+
+    @property
+    def events_per_second(self):
+        """ The rate at which events were sent
+
+        :rtype: float
+        """
+        return self._n_events_sent / max(self._seconds, 1e-6)
+
+    @property
+    def packets_per_second(self):
+        """ The rate at which packets were sent
+
+        :rtype: float
+        """
+        return self._n_packets_sent / max(self._seconds, 1e-6)
+
+    @property
+    def dropped_events_per_second(self):
+        """ The rate at which events were dropped
+
+        :rtype: float
+        """
+        return self._n_events_dropped / max(self._seconds, 1e-6)
+
+    def __repr__(self):
+        return (
+            "{} events in {} packets sent in {:.3f}s ({:.1f} events/s, {:.1f}"
+            " packets/s); {} events in {} packets dropped".format(
+                self._n_events_sent, self._n_packets_sent, self._seconds,
+                self.events_per_second, self.packets_per_second,
+                self._n_events_dropped, self._n_packets_dropped))
+
+
+class LiveEventInjector(object):
+    """ Sends events given as arrays to a ReverseIpTagMultiCastSource,\
+        at the time steps at which they are to be sent.
+
+    The events of each time step are packed into as few packets as\
+    possible: events whose keys share their upper 16 bits are sent as 16-bit\
+    keys with the shared bits as the prefix of the packet, other keys are\
+    sent as 32-bit keys, and events with payloads are sent as 32-bit keys\
+    with 32-bit payloads.  The packets of a time step are sent when the\
+    step starts, in host time, counting steps of the machine time step\
+    multiplied by the time scale factor from the start of the injection.\
+    Packets which are more than max_lateness time steps late are dropped.
+    """
+
+    __slots__ = [
+
+        # The address of the board to which the packets are sent
+        "_ip_address",
+
+        # The port to which the packets are sent
+        "_port",
+
+        # The number of seconds of host time in each time step
+        "_step_seconds",
+
+        # The number of time steps late that a packet can be sent
+        "_max_lateness",
+
+        # The largest number of packets sent in a second, or None
+        "_max_packets_per_second",
+
+        # True if 16-bit keys with a prefix are used where possible
+        "_use_prefix",
+
+        # The connection the packets are sent with
+        "_connection",
+
+        # The host time of time step 0, or None until the first injection
+        "_start_time"
+    ]
+
+    def __init__(self, ip_address, port, machine_time_step=1000,
+                 time_scale_factor=1, max_lateness=1,
+                 max_packets_per_second=None, use_prefix=True):
+        """
+
+        :param ip_address: The address of the board to send to
+        :type ip_address: str
+        :param port: The port of the reverse IP tag of the source
+        :type port: int
+        :param machine_time_step: The machine time step in microseconds
+        :type machine_time_step: int
+        :param time_scale_factor: The time scale factor of the simulation
+        :type time_scale_factor: int
+        :param max_lateness: The number of time steps late that a packet can\
+                    be sent before it is dropped, or None to never drop\
+                    late packets
+        :type max_lateness: float
+        :param max_packets_per_second: The largest number of packets to send\
+                    in a second, or None for no limit
+        :type max_packets_per_second: float
+        :param use_prefix: True if keys which share their upper 16 bits can\
+                    be sent as 16-bit keys with a prefix; set to False if the\
+                    source is given a prefix of its own
+        :type use_prefix: bool
+        """
+        self._ip_address = ip_address
+        self._port = port
+        self._step_seconds = (
+            machine_time_step * time_scale_factor / 1000000.0)
+        self._max_lateness = max_lateness
+        self._max_packets_per_second = max_packets_per_second
+        self._use_prefix = use_prefix
+        self._connection = UDPEIEIOConnection()
+        self._start_time = None
+
+    def start(self, start_time=None):
+        """ Set the host time of time step 0 of the simulation
+
+        :param start_time: The host time, as given by time.time(); if None,\
+                    now
+        :type start_time: float
+        """
+        self._start_time = time.time() if start_time is None else start_time
+
+    def inject(self, keys, payloads=None, send_times=None):
+        """ Send a number of events, waiting for the time step of each
+
+        :param keys: The key of each event
+        :type keys: array-like of int
+        :param payloads: The payload of each event, or None to send the\
+                    events without payloads
+        :type payloads: array-like of int
+        :param send_times: The time step at which to send each event,\
+                    counted from the start of the injector, or None to send\
+                    all the events now; the events of a time step need not\
+                    be together
+        :type send_times: array-like of int
+        :rtype: InjectionReport
+        """
+        keys = numpy.asarray(keys, dtype="uint32").ravel()
+        if payloads is not None:
+            payloads = numpy.asarray(payloads, dtype="uint32").ravel()
+        if self._start_time is None:
+            self.start()
+        if send_times is None:
+            steps = numpy.zeros(len(keys), dtype="int64")
+        else:
+            steps = numpy.asarray(send_times).ravel().astype("int64")
+            order = numpy.argsort(steps, kind="mergesort")
+            steps = steps[order]
+            keys = keys[order]
+            if payloads is not None:
+                payloads = payloads[order]
+
+        n_events_sent = n_packets_sent = 0
+        n_events_dropped = n_packets_dropped = 0
+        start_time = time.time()
+        end_time = start_time
+        boundaries = numpy.flatnonzero(numpy.diff(steps)) + 1
+        starts = numpy.concatenate(([0], boundaries)).tolist()
+        ends = numpy.append(boundaries, len(steps)).tolist()
+        for start, end in zip(starts, ends) if len(keys) else []:
+            packets = self._pack(
+                keys[start:end],
+                None if payloads is None else payloads[start:end])
+            lateness = self._wait_for_step(steps[start])
+            if (self._max_lateness is not None and
+                    lateness > self._max_lateness * self._step_seconds):
+                n_events_dropped += end - start
+                n_packets_dropped += len(packets)
+                end_time = time.time()
+                continue
+            for data, n_events in packets:
+                if self._max_packets_per_second is not None:
+                    self._wait_until(
+                        start_time + n_packets_sent /
+                        float(self._max_packets_per_second))
+                try:
+                    self._connection.send_to(
+                        data, (self._ip_address, self._port))
+                    n_events_sent += n_events
+                    n_packets_sent += 1
+                except Exception as e:
+                    logger.debug("Error sending live events: {}".format(e))
+                    n_events_dropped += n_events
+                    n_packets_dropped += 1
+            end_time = time.time()
+
+        report = InjectionReport(
+            n_events_sent, n_packets_sent, n_events_dropped,
+            n_packets_dropped, end_time - start_time)
+        logger.info("Injected to {}:{}: {}".format(
+            self._ip_address, self._port, report))
+        if n_events_dropped:
+            logger.warn(
+                "{} of {} events injected to {}:{} were dropped".format(
+                    n_events_dropped, len(keys), self._ip_address,
+                    self._port))
+        return report
+
+    def _wait_for_step(self, step):
+        """ Wait until a time step starts
+
+        :return: the number of seconds that the step had already started\
+            for, or 0 if it had to be waited for
+        """
+        step_time = self._start_time + step * self._step_seconds
+        lateness = time.time() - step_time
+        if lateness < 0:
+            time.sleep(-lateness)
+            return 0.0
+        return lateness
+
+    @staticmethod
+    def _wait_until(wait_time):
+        delay = wait_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pack(self, keys, payloads):
+        """ Pack the events of a time step into packets
+
+        :return: the bytes and the number of events of each packet
+        :rtype: list of (bytestring, int)
+        """
+        if payloads is not None:
+            return self._pack_elements(
+                EIEIOType.KEY_PAYLOAD_32_BIT, keys, payloads)
+        if not self._use_prefix:
+            return self._pack_elements(EIEIOType.KEY_32_BIT, keys)
+
+        # keys which share their upper half are sent with it as the prefix
+        order = numpy.argsort(keys >> 16, kind="mergesort")
+        keys = keys[order]
+        upper = keys >> 16
+        boundaries = numpy.flatnonzero(numpy.diff(upper)) + 1
+        starts = numpy.concatenate(([0], boundaries)).tolist()
+        ends = numpy.append(boundaries, len(keys)).tolist()
+        packets = list()
+        full_keys = list()
+        for start, end in zip(starts, ends):
+
+            # a 32-bit packet holds keys more compactly than a prefixed one
+            # of only a few keys
+            if end - start < 2:
+                full_keys.append(keys[start:end])
+                continue
+            packets.extend(self._pack_elements(
+                EIEIOType.KEY_16_BIT, keys[start:end] & 0xFFFF,
+                prefix=int(upper[start])))
+        if full_keys:
+            packets.extend(self._pack_elements(
+                EIEIOType.KEY_32_BIT, numpy.concatenate(full_keys)))
+        return packets
+
+    @staticmethod
+    def _pack_elements(eieio_type, keys, payloads=None, prefix=None):
+        element_type = _ELEMENT_TYPES[eieio_type]
+        header_size = 4 if prefix is not None else 2
+        max_elements = (
+            (_MAX_PACKET_SIZE - header_size) // element_type.itemsize)
+        elements = numpy.empty(len(keys), dtype=element_type)
+        elements["key"] = keys
+        if payloads is not None:
+            elements["payload"] = payloads
+        packets = list()
+        for start in xrange(0, len(elements), max_elements):
+            packet_elements = elements[start:start + max_elements]
+            if prefix is None:
+                header = EIEIODataHeader(
+                    eieio_type, count=len(packet_elements))
+            else:
+                header = EIEIODataHeader(
+                    eieio_type, prefix=prefix,
+                    prefix_type=EIEIOPrefix.UPPER_HALF_WORD,
+                    count=len(packet_elements))
+            packets.append((
+                header.bytestring + packet_elements.tostring(),
+                len(packet_elements)))
+        return packets
+
+    def close(self):
+        """ Close the connection the packets are sent with
+        """
+        self._connection.close()
@@ -0,0 +1,338 @@
+"""
+Live input and output of many vertices, whose packets are read by a single\
+thread.
+
+Each :py:class:`PolledLiveEventConnection` is still a\
+:py:class:`DatabaseConnection`, and so is still a thread of its own\
+which waits for the notification that the database of the tools has been\
+written; only the reading of its event packets is moved to the loop.\
+Rather than a listener thread for each port, a :py:class:`LiveEventLoop`\
+waits on the sockets of all its connections at once and queues the\
+batches of events received for each connection, from which they are taken\
+by iterating over :py:meth:`PolledLiveEventConnection.receive` or\
+:py:meth:`LiveEventLoop.receive`.
+"""
+
+# spinnman imports
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+# graph front end imports
+from spinnaker_graph_front_end.utilities.connections\
+    .batched_live_event_connection import BatchedLiveEventConnection
+
+# general imports
+from collections import deque
+from threading import RLock
+import logging
+import numpy
+import select
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+# The maximum number of 32-bit keys that will fit in a packet
+_MAX_FULL_KEYS_PER_PACKET = 63
+
+# The largest number of packets read from one socket in one poll, so that\
+# one busy socket does not hold up the others
+_MAX_PACKETS_PER_POLL = 64
+
+# The largest number of batches queued for a connection by default
+_DEFAULT_MAX_PENDING_BATCHES = 1024
+
+
+class PolledLiveEventConnection(BatchedLiveEventConnection):
+    """ A live event connection whose packets are received by a\
+        :py:class:`LiveEventLoop`, and which queues the batches of events\
+        received until they are taken.
+
+    The connection is still a thread, started when it is made, which takes\
+    part in the database notification handshake as other live event\
+    connections do; the loop replaces only the threads which listen for\
+    packets.
+
+    When the queue of a connection is full, the loop stops reading its\
+    sockets until batches are taken, so that a slow consumer leaves the\
+    packets in the buffers of the operating system (which drops them when\
+    they in turn are full) rather than using more and more memory.
+    """
+
+    def __init__(self, loop, live_packet_gather_label, receive_labels=None,
+                 send_labels=None, local_host=None, local_port=19999,
+                 machine_vertices=False,
+                 max_pending_batches=_DEFAULT_MAX_PENDING_BATCHES):
+        """
+
+        :param loop: The loop which receives the packets of the connection
+        :type loop: LiveEventLoop
+        :param live_packet_gather_label: The label of the LivePacketGather\
+                    vertex to which received events are being sent
+        :param receive_labels: Labels of vertices from which live events\
+                    will be received.
+        :type receive_labels: iterable of str
+        :param send_labels: Labels of vertices to which live events will be\
+                    sent
+        :type send_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+                    ip address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+                    on.  Must match the port that the toolchain will send the\
+                    notification on (19999 by default)
+        :type local_port: int
+        :param machine_vertices: True if the labels are of machine vertices
+        :type machine_vertices: bool
+        :param max_pending_batches: The largest number of batches queued\
+                    before the sockets of the connection are no longer read
+        :type max_pending_batches: int
+        """
+        BatchedLiveEventConnection.__init__(
+            self, live_packet_gather_label, receive_labels=receive_labels,
+            send_labels=send_labels, local_host=local_host,
+            local_port=local_port, machine_vertices=machine_vertices)
+        self._loop = loop
+        self._max_pending_batches = max_pending_batches
+        self._queue = deque()
+        self._is_full_logged = False
+        self._is_closed = False
+        loop.add_connection(self)
+
+    @property
+    def receivers(self):
+        """ The connections on which packets are received
+
+        :rtype: list of RawEIEIOConnection
+        """
+        with self._batch_lock:
+            return list(self._receivers.itervalues())
+
+    @property
+    def is_full(self):
+        """ True if as many batches are queued as are allowed
+
+        :rtype: bool
+        """
+        return len(self._queue) >= self._max_pending_batches
+
+    @property
+    def n_pending_batches(self):
+        """ The number of batches queued
+
+        :rtype: int
+        """
+        return len(self._queue)
+
+    def _listen(self, port, receiver):
+
+        # the loop reads the receivers
+        pass
+
+    def add_packet_data(self, data, receive_time):
+        """ Queue the events of a packet received by the loop
+
+        :param data: the bytes of the packet
+        :type data: bytestring
+        :param receive_time: the host time at which the packet was received
+        :type receive_time: float
+        :return: the batch of events, or None if there were none
+        """
+        batch = self._decode_packet(data, receive_time)
+        if batch is not None:
+            self._queue.append(batch)
+            if self.is_full and not self._is_full_logged:
+                logger.warn(
+                    "{} batches of live events are waiting to be taken from"
+                    " the connection on port {}; its packets will not be"
+                    " read until some are taken".format(
+                        len(self._queue), self._local_port))
+                self._is_full_logged = True
+        return batch
+
+    def get_batch(self):
+        """ Take the oldest queued batch, if there is one
+
+        :rtype: LiveEventBatch or None
+        """
+        if not self._queue:
+            return None
+        batch = self._queue.popleft()
+        if not self.is_full:
+            self._is_full_logged = False
+        return batch
+
+    def receive(self, timeout=None):
+        """ Take the batches of events received, as they arrive, polling\
+            the loop of the connection while none are queued
+
+        :param timeout: The number of seconds to wait for each batch, or\
+                    None to wait until the connection is closed
+        :type timeout: float
+        :return: iterable of batches, which ends if no batch arrives before\
+                    the timeout
+        :rtype: iterable of LiveEventBatch
+        """
+        while not self._is_closed:
+            batch = self.get_batch()
+            if batch is None:
+                if not self._loop.poll_until(
+                        lambda: self._queue or self._is_closed, timeout):
+                    return
+                continue
+            yield batch
+
+    def send_keys(self, label, keys):
+        """ Send a number of keys to a vertex, in as few packets as possible
+
+        :param label: The label of the vertex to which the keys are sent
+        :type label: str
+        :param keys: The keys to send
+        :type keys: array-like of int
+        """
+        keys = numpy.asarray(keys, dtype="<u4")
+        ip_address, port = self._send_address_details[label]
+        for start in xrange(0, len(keys), _MAX_FULL_KEYS_PER_PACKET):
+            packet_keys = keys[start:start + _MAX_FULL_KEYS_PER_PACKET]
+            header = EIEIODataHeader(
+                EIEIOType.KEY_32_BIT, count=len(packet_keys))
+            self._sender_connection.send_to(
+                header.bytestring + packet_keys.tostring(),
+                (ip_address, port))
+
+    def close(self):
+        self._is_closed = True
+        BatchedLiveEventConnection.close(self)
+        self._loop.remove_connection(self)
+
+
+class LiveEventLoop(object):
+    """ Waits for the packets of a number of live event connections in a\
+        single thread, queueing the batches of events received for each\
+        connection
+    """
+
+    __slots__ = [
+
+        # The connections polled
+        "_connections",
+
+        # The lock held while the sockets are polled
+        "_lock"
+    ]
+
+    def __init__(self):
+        self._connections = list()
+        self._lock = RLock()
+
+    def add_connection(self, connection):
+        """ Add a connection to be polled
+
+        :param connection: the connection
+        :type connection: PolledLiveEventConnection
+        """
+        self._connections.append(connection)
+
+    def remove_connection(self, connection):
+        """ Stop polling a connection
+
+        :param connection: the connection
+        :type connection: PolledLiveEventConnection
+        """
+        if connection in self._connections:
+            self._connections.remove(connection)
+
+    def poll(self, timeout=0):
+        """ Read the packets which have arrived on the sockets of the\
+            connections which are not full
+
+        :param timeout: the number of seconds to wait for a packet
+        :type timeout: float
+        :return: the number of batches of events queued
+        :rtype: int
+        """
+        with self._lock:
+            owners = dict()
+            for connection in list(self._connections):
+                if not connection.is_full:
+                    for receiver in connection.receivers:
+                        owners[receiver] = connection
+            if not owners:
+                if timeout:
+                    time.sleep(timeout)
+                return 0
+            try:
+                ready, _, _ = select.select(list(owners), [], [], timeout)
+            except (select.error, socket.error, ValueError):
+
+                # a receiver was closed by a rerun of the simulation
+                return 0
+
+            n_batches = 0
+            receive_time = time.time()
+            for receiver in ready:
+                connection = owners[receiver]
+                n_batches += self._read_receiver(
+                    receiver, connection, receive_time)
+            return n_batches
+
+    @staticmethod
+    def _read_receiver(receiver, connection, receive_time):
+        n_batches = 0
+        for _ in xrange(_MAX_PACKETS_PER_POLL):
+            if connection.is_full or not receiver.is_ready_to_receive():
+                break
+            try:
+                data = receiver.receive(0)
+            except Exception as e:
+                logger.debug("Error receiving live events: {}".format(e))
+                break
+            if connection.add_packet_data(data, receive_time) is not None:
+                n_batches += 1
+        return n_batches
+
+    def poll_until(self, condition, timeout=None):
+        """ Poll until a condition is true
+
+        :param condition: the condition
+        :type condition: callable() -> bool
+        :param timeout: the number of seconds to poll for, or None to poll\
+            until the condition is true
+        :type timeout: float
+        :return: True if the condition is true, False on timeout
+        :rtype: bool
+        """
+        end_time = None if timeout is None else time.time() + timeout
+        while not condition():
+            wait = 1.0
+            if end_time is not None:
+                wait = min(wait, end_time - time.time())
+                if wait <= 0:
+                    return False
+            self.poll(wait)
+        return True
+
+    def receive(self, timeout=None):
+        """ Take the batches of events received by all the connections, as\
+            they arrive
+
+        :param timeout: The number of seconds to wait for each batch, or\
+                    None to wait until all the connections are closed
+        :type timeout: float
+        :return: iterable of (connection, batch), which ends if no batch\
+                    arrives before the timeout
+        :rtype: iterable of (PolledLiveEventConnection, LiveEventBatch)
+        """
+        while self._connections:
+            found = False
+            for connection in list(self._connections):
+                batch = connection.get_batch()
+                if batch is not None:
+                    found = True
+                    yield connection, batch
+            if not found and not self.poll_until(
+                    lambda: any(connection.n_pending_batches
+                                for connection in self._connections) or
+                    not self._connections, timeout):
+                return
@@ -0,0 +1,301 @@
+"""
+Mapping of vertices and edges added to a machine graph after it has been\
+mapped, which keeps the existing placements, routing keys, tags and routes.
+"""
+
+# pacman imports
+from pacman.model.constraints.key_allocator_constraints\
+    .abstract_key_allocator_constraint import AbstractKeyAllocatorConstraint
+from pacman.model.constraints.key_allocator_constraints\
+    .key_allocator_contiguous_range_constraint \
+    import KeyAllocatorContiguousRangeContraint
+from pacman.model.constraints.key_allocator_constraints\
+    .key_allocator_fixed_key_and_mask_constraint \
+    import KeyAllocatorFixedKeyAndMaskConstraint
+from pacman.model.constraints.key_allocator_constraints\
+    .key_allocator_fixed_mask_constraint import KeyAllocatorFixedMaskConstraint
+from pacman.model.constraints.placer_constraints.placer_board_constraint \
+    import PlacerBoardConstraint
+from pacman.model.graphs.abstract_virtual_vertex import AbstractVirtualVertex
+from pacman.model.placements.placement import Placement
+from pacman.model.resources.cpu_cycles_per_tick_resource import \
+    CPUCyclesPerTickResource
+from pacman.model.resources.dtcm_resource import DTCMResource
+from pacman.model.resources.iptag_resource import IPtagResource
+from pacman.model.resources.resource_container import ResourceContainer
+from pacman.model.resources.reverse_iptag_resource import \
+    ReverseIPtagResource
+from pacman.model.resources.sdram_resource import SDRAMResource
+from pacman.model.routing_info.base_key_and_mask import BaseKeyAndMask
+from pacman.model.routing_tables.multicast_routing_table \
+    import MulticastRoutingTable
+from pacman.model.routing_tables.multicast_routing_tables \
+    import MulticastRoutingTables
+from pacman.utilities.utility_objs.resource_tracker import ResourceTracker
+
+# spinn machine imports
+from spinn_machine.tags.iptag import IPTag
+from spinn_machine.tags.reverse_iptag import ReverseIPTag
+
+# front end common imports
+from spinn_front_end_common.utilities import exceptions
+
+_FULL_MASK = 0xFFFFFFFF
+
+# The key allocator constraints which can be met when allocating keys to a\
+# single partition
+_SUPPORTED_KEY_CONSTRAINTS = (
+    KeyAllocatorContiguousRangeContraint,
+    KeyAllocatorFixedKeyAndMaskConstraint,
+    KeyAllocatorFixedMaskConstraint)
+
+
+class IncrementalMapper(object):
+    """ Places vertices and allocates routing keys around the resources\
+        and keys already used by a mapped graph.
+
+    Building the mapper goes through the existing placements and routing\
+    keys once; after that, the cost of mapping additions is proportional\
+    to the size of the additions rather than the size of the graph.
+    """
+
+    __slots__ = [
+
+        # The placements of the graph, to which new placements are added
+        "_placements",
+
+        # The tags of the graph, to which new tags are added
+        "_tags",
+
+        # Tracks the processors, SDRAM and tags already in use
+        "_resource_tracker",
+
+        # The (first key, last key + 1) ranges already allocated
+        "_allocated_keys",
+
+        # The first key above all allocated keys
+        "_next_key"
+    ]
+
+    def __init__(self, machine, machine_graph, placements, routing_infos,
+                 tags):
+        """
+
+        :param machine: the machine that the graph has been mapped onto
+        :type machine: Machine
+        :param machine_graph: the graph that has been mapped
+        :type machine_graph: MachineGraph
+        :param placements: the placements of the vertices of the graph
+        :type placements: Placements
+        :param routing_infos: the routing information of the partitions
+        :type routing_infos: RoutingInfo
+        :param tags: the tags allocated to the vertices of the graph
+        :type tags: Tags
+        """
+        self._placements = placements
+        self._tags = tags
+        self._resource_tracker = ResourceTracker(machine)
+        for placement in placements.placements:
+            if not isinstance(placement.vertex, AbstractVirtualVertex):
+                self._reserve_placement(placement)
+
+        self._allocated_keys = list()
+        self._next_key = 0
+        for partition in machine_graph.outgoing_edge_partitions:
+            routing_info = routing_infos.get_routing_info_from_partition(
+                partition)
+            if routing_info is not None:
+                for key_and_mask in routing_info.keys_and_masks:
+                    self._add_allocated_keys(
+                        key_and_mask.key, _last_key(key_and_mask) + 1)
+
+    def _reserve_placement(self, placement):
+        """ Mark the resources of an existing placement as used, including\
+            the tags that it was allocated
+        """
+        vertex = placement.vertex
+        resources = vertex.resources_required
+        ip_tags = self._tags.get_ip_tags_for_vertex(vertex) or []
+        reverse_ip_tags = \
+            self._tags.get_reverse_ip_tags_for_vertex(vertex) or []
+        board_address = None
+        for tag in ip_tags + reverse_ip_tags:
+            board_address = tag.board_address
+        self._resource_tracker.allocate_resources(
+            _without_tags(resources), [(placement.x, placement.y)],
+            placement.p, board_address,
+            [IPtagResource(tag.ip_address, tag.port, tag.strip_sdp, tag.tag)
+             for tag in ip_tags],
+            [ReverseIPtagResource(tag.port, tag.sdp_port, tag.tag)
+             for tag in reverse_ip_tags])
+
+    def _add_allocated_keys(self, first_key, end_key):
+        self._allocated_keys.append((first_key, end_key))
+        self._next_key = max(self._next_key, end_key)
+
+    def place(self, vertex):
+        """ Place a vertex on a free processor, allocating any tags that it\
+            needs
+
+        :param vertex: the vertex to place
+        :type vertex: MachineVertex
+        :return: the placement of the vertex
+        :rtype: Placement
+        """
+        resources = vertex.resources_required
+        x, y, p = ResourceTracker.get_chip_and_core(vertex.constraints)
+        chips = None
+        if x is not None and y is not None:
+            chips = [(x, y)]
+        board_address = None
+        for constraint in vertex.constraints:
+            if isinstance(constraint, PlacerBoardConstraint):
+                board_address = constraint.board_address
+        (x, y, p, ip_tags, reverse_ip_tags) = \
+            self._resource_tracker.allocate_resources(
+                _without_tags(resources), chips, p, board_address,
+                resources.iptags, resources.reverse_iptags)
+
+        placement = Placement(vertex, x, y, p)
+        self._placements.add_placement(placement)
+
+        # the tracker gives no tag allocations when no tags were asked for
+        for (board_address, tag), resource in zip(
+                ip_tags or [], resources.iptags):
+            self._tags.add_ip_tag(IPTag(
+                board_address, tag, resource.ip_address, resource.port,
+                resource.strip_sdp), vertex)
+        for (board_address, tag), resource in zip(
+                reverse_ip_tags or [], resources.reverse_iptags):
+            self._tags.add_reverse_ip_tag(ReverseIPTag(
+                board_address, tag, resource.port, x, y, p,
+                resource.sdp_port), vertex)
+        return placement
+
+    def allocate_keys(self, n_keys, constraints):
+        """ Allocate routing keys to a partition, away from any keys that\
+            are already allocated
+
+        :param n_keys: the number of keys needed by the partition
+        :type n_keys: int
+        :param constraints: the key allocator constraints of the partition
+        :return: the keys and masks of the partition
+        :rtype: list of BaseKeyAndMask
+        :raises ConfigurationException:\
+            if the constraints of the partition cannot be met
+        """
+        mask = None
+        for constraint in constraints:
+            if isinstance(constraint, KeyAllocatorFixedKeyAndMaskConstraint):
+                return self._allocate_fixed_keys(constraint.keys_and_masks)
+            if isinstance(constraint, KeyAllocatorFixedMaskConstraint):
+                mask = constraint.mask
+            elif (isinstance(constraint, AbstractKeyAllocatorConstraint) and
+                    not isinstance(constraint, _SUPPORTED_KEY_CONSTRAINTS)):
+                raise exceptions.ConfigurationException(
+                    "A partition with constraint {} cannot be added after"
+                    " the graph has been mapped".format(constraint))
+
+        # the block of keys is aligned to its size so that it can be
+        # matched by a single mask
+        if mask is None:
+            block_size = 1
+            while block_size < n_keys:
+                block_size <<= 1
+            mask = _FULL_MASK - (block_size - 1)
+        else:
+            block_size = (~mask & _FULL_MASK) + 1
+        first_key = (
+            (self._next_key + block_size - 1) // block_size) * block_size
+        if first_key + block_size > _FULL_MASK + 1:
+            raise exceptions.ConfigurationException(
+                "There are no routing keys left to allocate to a partition"
+                " of {} keys".format(n_keys))
+        key_and_mask = BaseKeyAndMask(first_key, mask)
+        self._add_allocated_keys(first_key, _last_key(key_and_mask) + 1)
+        return [key_and_mask]
+
+    def _allocate_fixed_keys(self, keys_and_masks):
+        for key_and_mask in keys_and_masks:
+            first_key = key_and_mask.key
+            end_key = _last_key(key_and_mask) + 1
+            for allocated_first, allocated_end in self._allocated_keys:
+                if first_key < allocated_end and allocated_first < end_key:
+                    raise exceptions.ConfigurationException(
+                        "The fixed keys {} of an added partition overlap"
+                        " keys which have already been allocated".format(
+                            key_and_mask))
+        for key_and_mask in keys_and_masks:
+            self._add_allocated_keys(
+                key_and_mask.key, _last_key(key_and_mask) + 1)
+        return list(keys_and_masks)
+
+
+def merge_routing_tables(machine, router_tables, new_router_tables):
+    """ Add routing entries to existing routing tables.
+
+    The new entries are put before the existing entries of each table, and\
+    replace any existing entries with the same key and mask, so that they\
+    take priority over existing entries whose masks (e.g. after\
+    compression) also match their keys.
+
+    :param machine: the machine that the tables are for
+    :type machine: Machine
+    :param router_tables: the existing routing tables
+    :type router_tables: MulticastRoutingTables
+    :param new_router_tables: the routing tables of the new entries
+    :type new_router_tables: MulticastRoutingTables
+    :return: the merged routing tables
+    :rtype: MulticastRoutingTables
+    :raises ConfigurationException:\
+        if a merged table has more entries than its router can hold
+    """
+    new_tables = dict(
+        ((table.x, table.y), table)
+        for table in new_router_tables.routing_tables)
+    merged_tables = MulticastRoutingTables()
+    for table in router_tables.routing_tables:
+        new_table = new_tables.pop((table.x, table.y), None)
+        if new_table is not None:
+            table = _merge_table(machine, table, new_table)
+        merged_tables.add_routing_table(table)
+    for new_table in new_tables.itervalues():
+        _check_table_size(machine, new_table)
+        merged_tables.add_routing_table(new_table)
+    return merged_tables
+
+
+def _merge_table(machine, table, new_table):
+    new_entries = list(new_table.multicast_routing_entries)
+    new_keys = set(
+        (entry.routing_entry_key, entry.mask) for entry in new_entries)
+    merged_table = MulticastRoutingTable(table.x, table.y, new_entries + [
+        entry for entry in table.multicast_routing_entries
+        if (entry.routing_entry_key, entry.mask) not in new_keys])
+    _check_table_size(machine, merged_table)
+    return merged_table
+
+
+def _check_table_size(machine, table):
+    router = machine.get_chip_at(table.x, table.y).router
+    if table.number_of_entries > router.n_available_multicast_entries:
+        raise exceptions.ConfigurationException(
+            "The routing table of chip {}, {} needs {} entries after adding"
+            " to the graph, but the router only has {}; the graph must be"
+            " mapped again in full".format(
+                table.x, table.y, table.number_of_entries,
+                router.n_available_multicast_entries))
+
+
+def _last_key(key_and_mask):
+    return key_and_mask.key | (~key_and_mask.mask & _FULL_MASK)
+
+
+def _without_tags(resources):
+    """ Get the processor and memory parts of some resources; tags are\
+        allocated separately
+    """
+    return ResourceContainer(
+        cpu_cycles=CPUCyclesPerTickResource(resources.cpu_cycles.get_value()),
+        dtcm=DTCMResource(resources.dtcm.get_value()),
+        sdram=SDRAMResource(resources.sdram.get_value()))
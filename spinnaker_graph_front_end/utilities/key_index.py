@@ -0,0 +1,281 @@
+"""
+A compact index of the routing keys sent by the vertices of a graph, which\
+turns arrays of received keys into the index of the vertex and the atom that\
+sent each key with a single NumPy operation.
+"""
+
+# general imports
+import numpy
+
+# The largest number of entries of a direct table, per key in the index,\
+# for which the keys are looked up directly rather than by search
+_MAX_DENSE_ENTRIES_PER_KEY = 4
+
+# The largest number of entries of a direct table
+_MAX_DENSE_ENTRIES = 1 << 22
+
+
+class KeyIndex(object):
+    """ The vertex index and atom of each key sent by a number of vertices,\
+        held as sorted runs of consecutive keys.
+
+    Keys are looked up by searching for the run holding each key, or, when\
+    the keys span few more values than there are keys, by indexing a table\
+    with an entry for every value from the smallest key to the largest.  The\
+    index can be saved to a NumPy ``.npz`` file with arrays ``run_starts``,\
+    ``run_ends``, ``run_vertex_indices``, ``run_first_atoms``, ``labels``\
+    and ``has_labels`` (False if the labels are not known), so that\
+    programs receiving the keys can decode them without reading the\
+    database of the tools, or even the tools themselves.
+    """
+
+    __slots__ = [
+
+        # The labels of the vertices, by index
+        "_labels",
+
+        # The first key of each run, sorted
+        "_run_starts",
+
+        # One more than the last key of each run
+        "_run_ends",
+
+        # The index of the vertex which sends each run
+        "_run_vertex_indices",
+
+        # The atom which sends the first key of each run
+        "_run_first_atoms",
+
+        # The smallest key of the direct table, or None if there is none
+        "_dense_base",
+
+        # The vertex index of each key from the smallest, or -1 if no vertex\
+        # sends the key
+        "_dense_vertex_indices",
+
+        # The atom of each key from the smallest
+        "_dense_atoms"
+    ]
+
+    def __init__(self, keys, vertex_indices, atoms, labels=None):
+        """
+
+        :param keys: the keys
+        :type keys: array-like of int
+        :param vertex_indices: the index of the vertex which sends each key
+        :type vertex_indices: array-like of int
+        :param atoms: the atom which sends each key
+        :type atoms: array-like of int
+        :param labels: the labels of the vertices, by index
+        :type labels: list of str
+        :raises ValueError: if a key is sent by more than one atom
+        """
+        keys = numpy.asarray(keys, dtype="uint32").ravel()
+        vertex_indices = numpy.asarray(vertex_indices, dtype="int32").ravel()
+        atoms = numpy.asarray(atoms, dtype="int32").ravel()
+        order = numpy.argsort(keys, kind="mergesort")
+        keys = keys[order]
+        vertex_indices = vertex_indices[order]
+        atoms = atoms[order]
+        if len(keys) and (numpy.diff(keys) == 0).any():
+            raise ValueError("A key is sent by more than one atom")
+
+        # a run continues while the keys, the vertex and the atoms each go up
+        # by one
+        breaks = numpy.flatnonzero(
+            (numpy.diff(keys.astype("int64")) != 1) |
+            (numpy.diff(vertex_indices) != 0) |
+            (numpy.diff(atoms) != 1)) + 1
+        starts = breaks
+        ends = breaks
+        if len(keys):
+            starts = numpy.concatenate(([0], breaks))
+            ends = numpy.append(breaks, len(keys))
+        self._set_runs(
+            labels, keys[starts], keys[ends - 1].astype("int64") + 1,
+            vertex_indices[starts], atoms[starts])
+
+    @staticmethod
+    def from_graph(machine_graph, routing_infos, vertices=None):
+        """ Make the index of the keys sent by the partitions of vertices of\
+            a machine graph, in which the atom of each key is its position\
+            in the keys of its partition
+
+        :param machine_graph: the machine graph
+        :type machine_graph: MachineGraph
+        :param routing_infos: the keys of the partitions of the graph
+        :type routing_infos: RoutingInfo
+        :param vertices: the vertices to index, by index; if None, all the\
+            vertices of the graph
+        :type vertices: iterable of MachineVertex
+        :rtype: KeyIndex
+        """
+        if vertices is None:
+            vertices = machine_graph.vertices
+        vertices = list(vertices)
+        keys = list()
+        vertex_indices = list()
+        atoms = list()
+        for index, vertex in enumerate(vertices):
+            for partition in machine_graph.\
+                    get_outgoing_edge_partitions_starting_at_vertex(vertex):
+                routing_info = routing_infos.get_routing_info_from_partition(
+                    partition)
+                if routing_info is None:
+                    continue
+                partition_keys = routing_info.get_keys()
+                keys.append(partition_keys)
+                vertex_indices.append(
+                    numpy.repeat(index, len(partition_keys)))
+                atoms.append(numpy.arange(len(partition_keys)))
+        return KeyIndex(
+            _concatenate(keys), _concatenate(vertex_indices),
+            _concatenate(atoms),
+            [vertex.label for vertex in vertices])
+
+    @staticmethod
+    def load(path):
+        """ Read an index saved with :py:meth:`save`
+
+        :param path: the path of the file
+        :type path: str
+        :rtype: KeyIndex
+        """
+        arrays = numpy.load(path)
+        labels = None
+        if "has_labels" not in arrays.files or arrays["has_labels"]:
+            labels = arrays["labels"].tolist()
+        index = KeyIndex.__new__(KeyIndex)
+        index._set_runs(
+            labels, arrays["run_starts"],
+            arrays["run_ends"], arrays["run_vertex_indices"],
+            arrays["run_first_atoms"])
+        return index
+
+    def save(self, path):
+        """ Write the index to a NumPy ``.npz`` file
+
+        :param path: the path of the file
+        :type path: str
+        """
+        numpy.savez(
+            path, run_starts=self._run_starts, run_ends=self._run_ends,
+            run_vertex_indices=self._run_vertex_indices,
+            run_first_atoms=self._run_first_atoms,
+            labels=numpy.array(self._labels or [], dtype=str),
+            has_labels=self._labels is not None)
+
+    def _set_runs(self, labels, starts, ends, vertex_indices, first_atoms):
+        self._labels = list(labels) if labels is not None else None
+        self._run_starts = numpy.asarray(starts, dtype="uint32")
+        self._run_ends = numpy.asarray(ends, dtype="int64")
+        self._run_vertex_indices = numpy.asarray(
+            vertex_indices, dtype="int32")
+        self._run_first_atoms = numpy.asarray(first_atoms, dtype="int32")
+
+        # keys which span few values are looked up in a direct table
+        self._dense_base = None
+        self._dense_vertex_indices = None
+        self._dense_atoms = None
+        n_keys = self.n_keys
+        if not n_keys:
+            return
+        base = int(self._run_starts[0])
+        n_entries = int(self._run_ends[-1]) - base
+        if (n_entries > _MAX_DENSE_ENTRIES or
+                n_entries > n_keys * _MAX_DENSE_ENTRIES_PER_KEY):
+            return
+        lengths = self._run_ends - self._run_starts
+        run_of_key = numpy.repeat(numpy.arange(len(lengths)), lengths)
+        position_in_run = (
+            numpy.arange(n_keys) - numpy.repeat(
+                numpy.cumsum(lengths) - lengths, lengths))
+        offsets = (
+            self._run_starts[run_of_key].astype("int64") - base +
+            position_in_run)
+        vertex_indices = numpy.empty(n_entries, dtype="int32")
+        vertex_indices.fill(-1)
+        vertex_indices[offsets] = self._run_vertex_indices[run_of_key]
+        atoms = numpy.empty(n_entries, dtype="int32")
+        atoms.fill(-1)
+        atoms[offsets] = (
+            self._run_first_atoms[run_of_key] + position_in_run)
+        self._dense_base = base
+        self._dense_vertex_indices = vertex_indices
+        self._dense_atoms = atoms
+
+    @property
+    def labels(self):
+        """ The labels of the vertices, by index, or None if not known
+
+        :rtype: list of str
+        """
+        return self._labels
+
+    @property
+    def n_keys(self):
+        """ The number of keys in the index
+
+        :rtype: int
+        """
+        return int((self._run_ends - self._run_starts).sum())
+
+    @property
+    def n_runs(self):
+        """ The number of runs of consecutive keys in the index
+
+        :rtype: int
+        """
+        return len(self._run_starts)
+
+    @property
+    def is_dense(self):
+        """ True if the keys are looked up in a direct table
+
+        :rtype: bool
+        """
+        return self._dense_base is not None
+
+    def lookup(self, keys):
+        """ Find the vertex index and atom of each of a number of keys
+
+        :param keys: the keys
+        :type keys: array-like of int
+        :return: the vertex index and the atom of each key, both -1 for keys\
+            not in the index
+        :rtype: (NumPy array of int32, NumPy array of int32)
+        """
+        keys = numpy.asarray(keys, dtype="uint32")
+        if not len(self._run_starts):
+            unknown = numpy.empty(keys.shape, dtype="int32")
+            unknown.fill(-1)
+            return unknown, unknown.copy()
+        if self._dense_base is not None:
+            offsets = keys.astype("int64") - self._dense_base
+            known = (offsets >= 0) & (offsets < len(self._dense_atoms))
+            offsets[~known] = 0
+            vertex_indices = self._dense_vertex_indices[offsets]
+            atoms = self._dense_atoms[offsets]
+            if not known.all():
+                vertex_indices[~known] = -1
+                atoms[~known] = -1
+            return vertex_indices, atoms
+
+        runs = numpy.searchsorted(self._run_starts, keys, side="right") - 1
+        known = runs >= 0
+        runs[~known] = 0
+        known &= keys < self._run_ends[runs]
+        vertex_indices = self._run_vertex_indices[runs]
+        atoms = (
+            self._run_first_atoms[runs] +
+            (keys - self._run_starts[runs]).astype("int32"))
+        if not known.all():
+            vertex_indices[~known] = -1
+            atoms[~known] = -1
+        return vertex_indices, atoms
+
+
+def _concatenate(arrays):
+    if not arrays:
+        return numpy.zeros(0, dtype="int64")
+    return numpy.concatenate(arrays)
@@ -0,0 +1,384 @@
+"""
+A persistent, on-disk cache of the results of mapping a machine graph.
+
+Each entry is keyed by a fingerprint of the machine graph (vertex classes,\
+labels, resources, construction parameters and constraints, and the\
+partitions, with the number of keys each needs, and edges between the\
+vertices), the machine and the mapping\
+configuration, and holds the placements, routing information, tags and\
+(compressed) routing tables that mapping produced.  The graph objects\
+themselves are not stored; vertices are referred to by their index in the\
+graph, so the results can be applied to an identical graph built by a\
+later job.
+
+Entries are evicted least recently used first when the total size of the\
+cache passes its cap.
+"""
+
+# pacman imports
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+from pacman.model.routing_info.base_key_and_mask import BaseKeyAndMask
+from pacman.model.routing_info.partition_routing_info \
+    import PartitionRoutingInfo
+from pacman.model.routing_info.routing_info import RoutingInfo
+from pacman.model.routing_tables.multicast_routing_table \
+    import MulticastRoutingTable
+from pacman.model.routing_tables.multicast_routing_tables \
+    import MulticastRoutingTables
+from pacman.model.tags.tags import Tags
+
+# spinn machine imports
+from spinn_machine.multicast_routing_entry import MulticastRoutingEntry
+from spinn_machine.tags.iptag import IPTag
+from spinn_machine.tags.reverse_iptag import ReverseIPTag
+
+# front end common imports
+from spinn_front_end_common.abstract_models\
+    .abstract_provides_n_keys_for_partition \
+    import AbstractProvidesNKeysForPartition
+
+# graph front end imports
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+
+# general imports
+import cPickle
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# The version of the layout of cache entries; part of every fingerprint so\
+# that entries written by older versions are never used
+FORMAT_VERSION = 1
+
+# The extension of the files holding cache entries
+_ENTRY_EXTENSION = ".mapping"
+
+# The number of links on a chip; processor ids follow the links in a route
+_N_LINKS = 6
+
+
+def fingerprint(machine_graph, machine, mapping_config):
+    """ Compute the key of the mapping of a graph onto a machine
+
+    :param machine_graph: the graph to be mapped
+    :type machine_graph: MachineGraph
+    :param machine: the machine that the graph is to be mapped onto
+    :type machine: Machine
+    :param mapping_config:\
+        the configuration which affects mapping, as (name, value) pairs
+    :type mapping_config: iterable of (str, str)
+    :return: the fingerprint, as a hexadecimal string
+    :rtype: str
+    """
+    digest = hashlib.sha1()
+    update = digest.update
+    update("format {}\n".format(FORMAT_VERSION))
+
+    for name, value in sorted(mapping_config):
+        update("config {}={}\n".format(name, value))
+
+    for chip in sorted(machine.chips, key=lambda c: (c.x, c.y)):
+        update("chip {} {} {} {} {} {} {}\n".format(
+            chip.x, chip.y, chip.virtual, chip.ip_address,
+            chip.nearest_ethernet_x, chip.nearest_ethernet_y,
+            chip.sdram.size))
+        update("processors {}\n".format(sorted(
+            (processor.processor_id, processor.is_monitor)
+            for processor in chip.processors)))
+        update("links {}\n".format(sorted(
+            (link.source_link_id, link.destination_x, link.destination_y)
+            for link in chip.router.links)))
+
+    vertex_indices = dict()
+    for index, vertex in enumerate(machine_graph.vertices):
+        vertex_indices[vertex] = index
+        update("vertex {} {} {}\n".format(
+            _class_name(vertex), vertex.label,
+            _resources_fingerprint(vertex.resources_required)))
+        if isinstance(vertex, AbstractProvidesConstructionParams):
+            update("params {}\n".format(
+                sorted(vertex.get_construction_params().iteritems())))
+        for constraint in vertex.constraints:
+            update("constraint {!r}\n".format(constraint))
+
+    # the partitions of the graph are not held in a fixed order, so go
+    # through them by pre vertex and identifier instead
+    for index, vertex in enumerate(machine_graph.vertices):
+        partitions = sorted(
+            machine_graph.get_outgoing_edge_partitions_starting_at_vertex(
+                vertex), key=lambda p: p.identifier)
+        for partition in partitions:
+            update("partition {} {} {}\n".format(
+                index, partition.identifier, _n_keys(partition)))
+            for constraint in partition.constraints:
+                update("constraint {!r}\n".format(constraint))
+            update("edges {}\n".format(sorted(
+                (vertex_indices[edge.post_vertex], _class_name(edge),
+                 edge.label)
+                for edge in partition.edges)))
+    return digest.hexdigest()
+
+
+class MappingCache(object):
+    """ A directory of cached mapping results
+    """
+
+    __slots__ = [
+
+        # The directory holding the cache entries
+        "_directory",
+
+        # The maximum total size of the cache entries, in bytes
+        "_max_size"
+    ]
+
+    def __init__(self, directory, max_size):
+        """
+
+        :param directory:\
+            the directory to hold the cache; created if it does not exist
+        :type directory: str
+        :param max_size:\
+            the maximum total size of the cache entries in bytes; the least\
+            recently used entries are removed to keep the cache below this
+        :type max_size: int
+        """
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self._directory = directory
+        self._max_size = max_size
+
+    @property
+    def directory(self):
+        """ The directory holding the cache entries
+
+        :rtype: str
+        """
+        return self._directory
+
+    def get(self, key, machine_graph):
+        """ Get the cached mapping of a graph
+
+        :param key: the fingerprint of the graph, machine and configuration
+        :type key: str
+        :param machine_graph:\
+            the graph whose fingerprint is the key, to which the mapping is\
+            applied
+        :type machine_graph: MachineGraph
+        :return:\
+            the placements, routing infos, tags and routing tables, or None\
+            if the mapping has not been cached
+        :rtype: (Placements, RoutingInfo, Tags, MulticastRoutingTables)
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = cPickle.load(f)
+        except IOError:
+            return None
+        except Exception:
+            logger.warn(
+                "Ignoring unreadable mapping cache entry {}".format(path))
+            self._remove(path)
+            return None
+
+        # mark the entry as recently used
+        os.utime(path, None)
+
+        vertices = list(machine_graph.vertices)
+        return (
+            _build_placements(entry["placements"], vertices),
+            _build_routing_infos(
+                entry["routing_infos"], vertices, machine_graph),
+            _build_tags(entry["ip_tags"], entry["reverse_ip_tags"], vertices),
+            _build_router_tables(entry["router_tables"]))
+
+    def put(self, key, machine_graph, placements, routing_infos, tags,
+            router_tables):
+        """ Add the mapping of a graph to the cache
+
+        :param key: the fingerprint of the graph, machine and configuration
+        :type key: str
+        :param machine_graph: the graph that was mapped
+        :type machine_graph: MachineGraph
+        :param placements: the placements of the vertices of the graph
+        :type placements: Placements
+        :param routing_infos: the routing information of the partitions
+        :type routing_infos: RoutingInfo
+        :param tags: the tags allocated to the vertices
+        :type tags: Tags
+        :param router_tables: the routing tables of the machine
+        :type router_tables: MulticastRoutingTables
+        """
+        vertices = list(machine_graph.vertices)
+        vertex_indices = dict(
+            (vertex, index) for index, vertex in enumerate(vertices))
+        entry = {
+            "placements": [
+                (vertex_indices[placement.vertex],
+                 placement.x, placement.y, placement.p)
+                for placement in placements.placements],
+            "routing_infos": [
+                (vertex_indices[partition.pre_vertex], partition.identifier,
+                 [(key_and_mask.key, key_and_mask.mask)
+                  for key_and_mask in routing_infos
+                  .get_routing_info_from_partition(partition).keys_and_masks])
+                for partition in machine_graph.outgoing_edge_partitions
+                if routing_infos.get_routing_info_from_partition(
+                    partition) is not None],
+            "ip_tags": [
+                (index, tag.board_address, tag.tag, tag.ip_address, tag.port,
+                 tag.strip_sdp)
+                for index, vertex in enumerate(vertices)
+                for tag in tags.get_ip_tags_for_vertex(vertex) or ()],
+            "reverse_ip_tags": [
+                (index, tag.board_address, tag.tag, tag.port,
+                 tag.destination_x, tag.destination_y, tag.destination_p,
+                 tag.sdp_port)
+                for index, vertex in enumerate(vertices)
+                for tag in tags.get_reverse_ip_tags_for_vertex(vertex) or ()],
+            "router_tables": [
+                (table.x, table.y, [
+                    (routing_entry.routing_entry_key, routing_entry.mask,
+                     _route(routing_entry), routing_entry.defaultable)
+                    for routing_entry in table.multicast_routing_entries])
+                for table in router_tables.routing_tables]
+        }
+
+        # write to a temporary file and then rename it, so that a partly
+        # written entry is never read
+        handle, temp_path = tempfile.mkstemp(
+            dir=self._directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            cPickle.dump(entry, f, cPickle.HIGHEST_PROTOCOL)
+        os.rename(temp_path, self._entry_path(key))
+        self._evict()
+
+    def clear(self):
+        """ Remove every entry from the cache
+        """
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entry_path(self, key):
+        return os.path.join(self._directory, key + _ENTRY_EXTENSION)
+
+    def _entries(self):
+        """ Get the path, last use time and size of each entry
+        """
+        entries = list()
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith(_ENTRY_EXTENSION):
+                path = os.path.join(self._directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self):
+        """ Remove the least recently used entries until the cache is\
+            within its size cap
+        """
+        entries = self._entries()
+        total_size = sum(size for _, _, size in entries)
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total_size <= self._max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _class_name(graph_object):
+    graph_class = type(graph_object)
+    return "{}.{}".format(graph_class.__module__, graph_class.__name__)
+
+
+def _n_keys(partition):
+    """ Get the number of keys of a partition of a machine graph, as\
+        FrontEndCommonEdgeToNKeysMapper finds it
+    """
+    if isinstance(partition.pre_vertex, AbstractProvidesNKeysForPartition):
+        return partition.pre_vertex.get_n_keys_for_partition(partition, None)
+    return 1
+
+
+def _resources_fingerprint(resources):
+    return "{} {} {} {} {}".format(
+        resources.sdram.get_value(), resources.dtcm.get_value(),
+        resources.cpu_cycles.get_value(),
+        [(tag.ip_address, tag.port, tag.strip_sdp, tag.tag)
+         for tag in resources.iptags],
+        [(tag.port, tag.sdp_port, tag.tag)
+         for tag in resources.reverse_iptags])
+
+
+def _route(entry):
+    """ Encode the links and processors of a routing entry as a route word
+    """
+    route = 0
+    for link_id in entry.link_ids:
+        route |= 1 << link_id
+    for processor_id in entry.processor_ids:
+        route |= 1 << (_N_LINKS + processor_id)
+    return route
+
+
+def _build_placements(placements, vertices):
+    return Placements([
+        Placement(vertices[index], x, y, p)
+        for index, x, y, p in placements])
+
+
+def _build_routing_infos(routing_infos, vertices, machine_graph):
+    return RoutingInfo([
+        PartitionRoutingInfo(
+            [BaseKeyAndMask(key, mask) for key, mask in keys_and_masks],
+            machine_graph.get_outgoing_edge_partition_starting_at_vertex(
+                vertices[index], identifier))
+        for index, identifier, keys_and_masks in routing_infos])
+
+
+def _build_tags(ip_tags, reverse_ip_tags, vertices):
+    tags = Tags()
+    for (index, board_address, tag, ip_address, port,
+            strip_sdp) in ip_tags:
+        tags.add_ip_tag(
+            IPTag(board_address, tag, ip_address, port, strip_sdp),
+            vertices[index])
+    for (index, board_address, tag, port, destination_x, destination_y,
+            destination_p, sdp_port) in reverse_ip_tags:
+        tags.add_reverse_ip_tag(
+            ReverseIPTag(board_address, tag, port, destination_x,
+                         destination_y, destination_p, sdp_port),
+            vertices[index])
+    return tags
+
+
+def _build_router_tables(router_tables):
+    tables = MulticastRoutingTables()
+    for x, y, entries in router_tables:
+        tables.add_routing_table(MulticastRoutingTable(x, y, [
+            MulticastRoutingEntry(
+                key, mask,
+                [processor_id for processor_id in xrange(32 - _N_LINKS)
+                 if route & (1 << (_N_LINKS + processor_id))],
+                [link_id for link_id in xrange(_N_LINKS)
+                 if route & (1 << link_id)],
+                defaultable)
+            for key, mask, route, defaultable in entries]))
+    return tables
@@ -0,0 +1,282 @@
+"""
+Extraction of recorded regions as NumPy arrays, rather than lists of Python\
+values.
+"""
+
+# front end common imports
+from spinn_front_end_common.utilities import exceptions
+
+# general imports
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+import logging
+import numpy
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def read_data_array(buffer_manager, placement, region, dtype):
+    """ Get the data recorded in a region of a core as an array, copied\
+        once out of the buffer manager
+
+    :param buffer_manager: the buffer manager holding the recorded data
+    :type buffer_manager: BufferManager
+    :param placement: the placement of the vertex which recorded the data
+    :type placement: Placement
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :return: a tuple of (a NumPy array of the data, True if data is missing)
+    :rtype: (NumPy array, bool)
+    """
+    reader, missing_data = buffer_manager.get_data_for_vertex(
+        placement, region)
+    raw_data = reader.read_all()
+    dtype = numpy.dtype(dtype)
+
+    # any partly recorded item at the end is dropped; the data is copied as
+    # the buffer manager may go on to add to, and so move, the bytes it holds
+    n_items = len(raw_data) // dtype.itemsize
+    return (
+        numpy.frombuffer(raw_data, dtype=dtype, count=n_items).copy(),
+        missing_data)
+
+
+def stack_data_arrays(
+        vertices, placements, buffer_manager, region, dtype,
+        n_timesteps=None, machine=None, n_workers=1):
+    """ Get the data recorded in a region by each of several vertices as\
+        one array, with a row for each vertex
+
+    The data is read by :py:func:`extract_all`, and the data of each vertex\
+    is copied into its row of the result.
+
+    :param vertices: the vertices which recorded the data
+    :type vertices: iterable of MachineVertex
+    :param placements: the placements of the vertices
+    :type placements: Placements
+    :param buffer_manager: the buffer manager holding the recorded data
+    :type buffer_manager: BufferManager
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :param n_timesteps:\
+        the number of items in each row; if None, the number recorded by\
+        the first vertex
+    :type n_timesteps: int
+    :param machine: the machine, used to group the cores by board
+    :type machine: Machine
+    :param n_workers: the number of threads to read with
+    :type n_workers: int
+    :return: an array of shape (number of vertices, n_timesteps)
+    :rtype: NumPy array
+    :raises ConfigurationException:\
+        if a vertex recorded fewer than n_timesteps items
+    """
+    vertices = list(vertices)
+    vertices_data = extract_all(
+        vertices, placements, buffer_manager, region, dtype, machine,
+        n_workers)
+    data = None
+    for index, vertex in enumerate(vertices):
+        vertex_data = vertices_data[vertex]
+        if data is None:
+            if n_timesteps is None:
+                n_timesteps = len(vertex_data)
+            data = numpy.empty(
+                (len(vertices), n_timesteps), dtype=vertex_data.dtype)
+        if len(vertex_data) < n_timesteps:
+            placement = placements.get_placement_of_vertex(vertex)
+            raise exceptions.ConfigurationException(
+                "Vertex {} on {}, {}, {} recorded {} items in region {}, but"
+                " {} were expected".format(
+                    vertex.label, placement.x, placement.y, placement.p,
+                    len(vertex_data), region, n_timesteps))
+        data[index] = vertex_data[:n_timesteps]
+    if data is None:
+        data = numpy.empty((0, n_timesteps or 0), dtype=dtype)
+    return data
+
+
+def extract_all(
+        vertices, placements, buffer_manager, region, dtype, machine=None,
+        n_workers=1):
+    """ Get the data recorded in a region by each of several vertices,\
+        reading the cores of different boards at the same time
+
+    The cores are grouped by the Ethernet connected chip nearest to them,\
+    and the cores of each group are read one after another by one of a pool\
+    of threads, so that each board is read by at most one thread.  The\
+    rate at which the data of each group was read is logged.  The data of\
+    each vertex is read with its ``get_data_array`` method if it has one.
+
+    :param vertices: the vertices which recorded the data
+    :type vertices: iterable of MachineVertex
+    :param placements: the placements of the vertices
+    :type placements: Placements
+    :param buffer_manager: the buffer manager holding the recorded data
+    :type buffer_manager: BufferManager
+    :param region: the id of the recording region
+    :type region: int
+    :param dtype: the type of the recorded items, e.g. "<u4"
+    :type dtype: NumPy dtype or str
+    :param machine:\
+        the machine, used to group the cores by board; if None, the cores\
+        are grouped by chip
+    :type machine: Machine
+    :param n_workers:\
+        the number of threads to read with; 0 for one thread per group
+    :type n_workers: int
+    :return: the data of each vertex
+    :rtype: dict of vertex to NumPy array
+    """
+    groups = _group_by_ethernet_chip(vertices, placements, machine)
+    if n_workers <= 0:
+        n_workers = len(groups)
+    n_workers = max(1, min(n_workers, len(groups)))
+
+    def extract_group(item):
+        chip_key, group = item
+        return _extract_group(chip_key, group, buffer_manager, region, dtype)
+
+    data = dict()
+    if n_workers == 1:
+        results = map(extract_group, groups.iteritems())
+    else:
+        pool = ThreadPool(n_workers)
+        try:
+            results = pool.map(extract_group, groups.iteritems())
+        finally:
+            pool.close()
+            pool.join()
+    for group_data in results:
+        data.update(group_data)
+    return data
+
+
+def _group_by_ethernet_chip(vertices, placements, machine):
+    """ Group the placements of vertices by the Ethernet connected chip\
+        nearest to them
+
+    :return: the placements of each group, by chip coordinates
+    :rtype: OrderedDict of (int, int) to list of Placement
+    """
+    groups = OrderedDict()
+    for vertex in vertices:
+        placement = placements.get_placement_of_vertex(vertex)
+        key = (placement.x, placement.y)
+        chip = None if machine is None else machine.get_chip_at(*key)
+        if chip is not None and chip.nearest_ethernet_x is not None:
+            key = (chip.nearest_ethernet_x, chip.nearest_ethernet_y)
+        groups.setdefault(key, list()).append(placement)
+    return groups
+
+
+def _extract_group(chip_key, group, buffer_manager, region, dtype):
+    """ Read the data of each of a group of placements in turn, and log how\
+        quickly it was read
+    """
+    start_time = time.time()
+    n_bytes = 0
+    data = dict()
+    for placement in group:
+        vertex = placement.vertex
+        if hasattr(vertex, "get_data_array"):
+            vertex_data = vertex.get_data_array(
+                buffer_manager, placement, region, dtype)
+        else:
+            vertex_data, missing_data = read_data_array(
+                buffer_manager, placement, region, dtype)
+            if missing_data:
+                logger.warn(
+                    "Data recorded in region {} on {}, {}, {} is"
+                    " missing".format(
+                        region, placement.x, placement.y, placement.p))
+        n_bytes += vertex_data.nbytes
+        data[vertex] = vertex_data
+    seconds = time.time() - start_time
+    logger.info(
+        "Read {} bytes from {} cores near chip {}, {} in {:.3f}s"
+        " ({:.1f} KB/s)".format(
+            n_bytes, len(group), chip_key[0], chip_key[1], seconds,
+            n_bytes / 1024.0 / max(seconds, 1e-6)))
+    return data
+
+
+class RecordingReader(object):
+    """ Reads the data recorded in a region by each of several vertices a\
+        part at a time, giving only what was recorded since it last read
+    """
+
+    __slots__ = [
+
+        # The vertices whose data is read
+        "_vertices",
+
+        # The id of the recording region
+        "_region",
+
+        # The type of the recorded items
+        "_dtype",
+
+        # The number of items already read for each vertex, by vertex
+        "_n_read"
+    ]
+
+    def __init__(self, vertices, region, dtype):
+        """
+
+        :param vertices: the vertices which record the data
+        :type vertices: iterable of MachineVertex
+        :param region: the id of the recording region
+        :type region: int
+        :param dtype: the type of the recorded items, e.g. "<u4"
+        :type dtype: NumPy dtype or str
+        """
+        self._vertices = list(vertices)
+        self._region = region
+        self._dtype = numpy.dtype(dtype)
+        self._n_read = dict((vertex, 0) for vertex in self._vertices)
+
+    @property
+    def vertices(self):
+        """ The vertices whose data is read
+
+        :rtype: list of MachineVertex
+        """
+        return self._vertices
+
+    def read_new_data(
+            self, buffer_manager, placements, machine=None, n_workers=1):
+        """ Get the data recorded by each vertex since this was last called
+
+        :param buffer_manager: the buffer manager holding the recorded data
+        :type buffer_manager: BufferManager
+        :param placements: the placements of the vertices
+        :type placements: Placements
+        :param machine: the machine, used to group the cores by board
+        :type machine: Machine
+        :param n_workers: the number of threads to read with
+        :type n_workers: int
+        :return: the new data of each vertex, copied so that it is not\
+            changed by data recorded later
+        :rtype: dict of vertex to NumPy array
+        """
+        data = extract_all(
+            self._vertices, placements, buffer_manager, self._region,
+            self._dtype, machine, n_workers)
+        new_data = dict()
+        for vertex, vertex_data in data.iteritems():
+            new_data[vertex] = vertex_data[self._n_read[vertex]:].copy()
+            self._n_read[vertex] = len(vertex_data)
+        return new_data
+
+    def reset(self):
+        """ Indicate that the simulation has been reset, so the data next\
+            recorded by each vertex starts from the beginning
+        """
+        for vertex in self._n_read:
+            self._n_read[vertex] = 0
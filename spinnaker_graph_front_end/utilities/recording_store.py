@@ -0,0 +1,344 @@
+"""
+A store on disk for the data recorded by many vertices over long runs, which\
+holds the data in a memory-mapped file rather than in host memory.
+"""
+
+# front end common imports
+from spinn_front_end_common.utilities import exceptions
+
+# graph front end imports
+from spinnaker_graph_front_end.utilities import recorded_data
+
+# general imports
+import json
+import logging
+import numpy
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# The number of items kept for each vertex when the number to be recorded\
+# is not known
+_DEFAULT_CAPACITY = 1024
+
+
+class RecordingStore(object):
+    """ The data recorded in a region by each of several vertices, kept in a\
+        preallocated, memory-mapped file with a row for each vertex.
+
+    Each time that data is added, the data recorded by each vertex since\
+    the data was last added is appended to the row of the vertex, so the\
+    data of several calls to run is kept one after another; the first\
+    time step and the number of time steps of each addition are kept with\
+    the placement of each vertex in a metadata file next to the data file.\
+    When a row is full, the file is rewritten with twice the space for each\
+    row, after which arrays got from the store before refer to the old\
+    contents.
+    """
+
+    __slots__ = [
+
+        # The path of the data file
+        "_path",
+
+        # The vertices whose data is stored, or None if the store was loaded
+        "_vertices",
+
+        # The index of each vertex
+        "_vertex_indices",
+
+        # The id of the recorded region
+        "_region",
+
+        # The type of the recorded items
+        "_dtype",
+
+        # The number of items recorded by a vertex in each time step
+        "_items_per_timestep",
+
+        # The number of items that there is space for in each row
+        "_capacity",
+
+        # The memory-mapped data, or None if the file is not yet made
+        "_data",
+
+        # The number of items stored for each vertex
+        "_n_items",
+
+        # The reader of the recorded data, or None if the store was loaded
+        "_reader",
+
+        # The (first time step, number of time steps, items stored before\
+        # the run for each vertex) of each run
+        "_runs",
+
+        # The labels of the vertices
+        "_labels",
+
+        # The (x, y, p) placement of each vertex
+        "_placements"
+    ]
+
+    def __init__(
+            self, path, vertices, region, dtype, n_timesteps=None,
+            items_per_timestep=1):
+        """
+
+        :param path: the path of the data file to make
+        :type path: str
+        :param vertices: the vertices whose recorded data is to be stored
+        :type vertices: iterable of MachineVertex
+        :param region: the id of the recording region
+        :type region: int
+        :param dtype: the type of the recorded items, e.g. "<u4"
+        :type dtype: NumPy dtype or str
+        :param n_timesteps:\
+            the number of time steps for which to preallocate space
+        :type n_timesteps: int
+        :param items_per_timestep:\
+            the number of items recorded by a vertex in each time step
+        :type items_per_timestep: int
+        """
+        self._path = path
+        self._vertices = list(vertices)
+        self._vertex_indices = dict(
+            (vertex, index) for index, vertex in enumerate(self._vertices))
+        self._region = region
+        self._dtype = numpy.dtype(dtype)
+        self._items_per_timestep = items_per_timestep
+        self._capacity = _DEFAULT_CAPACITY
+        if n_timesteps is not None:
+            self._capacity = max(1, n_timesteps * items_per_timestep)
+        self._data = None
+        self._n_items = numpy.zeros(len(self._vertices), dtype="int64")
+        self._reader = recorded_data.RecordingReader(
+            self._vertices, region, dtype)
+        self._runs = list()
+        self._labels = [vertex.label for vertex in self._vertices]
+        self._placements = [None] * len(self._vertices)
+
+    @staticmethod
+    def load(path):
+        """ Open a store written before, to read its data
+
+        :param path: the path of the data file
+        :type path: str
+        :rtype: RecordingStore
+        """
+        with open(_metadata_path(path)) as f:
+            metadata = json.load(f)
+        store = RecordingStore.__new__(RecordingStore)
+        store._path = path
+        store._vertices = None
+        store._vertex_indices = dict()
+        store._region = metadata["region"]
+        store._dtype = numpy.dtype(str(metadata["dtype"]))
+        store._items_per_timestep = metadata["items_per_timestep"]
+        store._capacity = metadata["capacity"]
+        store._n_items = numpy.array(metadata["n_items"], dtype="int64")
+        store._reader = None
+        store._runs = [
+            (first, n_timesteps, numpy.array(starts, dtype="int64"))
+            for first, n_timesteps, starts in metadata["runs"]]
+        store._labels = metadata["labels"]
+        store._placements = [
+            None if placement is None else tuple(placement)
+            for placement in metadata["placements"]]
+        store._data = numpy.memmap(
+            path, dtype=store._dtype, mode="r",
+            shape=(len(store._labels), store._capacity))
+        return store
+
+    @property
+    def path(self):
+        """ The path of the data file
+
+        :rtype: str
+        """
+        return self._path
+
+    @property
+    def region(self):
+        """ The id of the recorded region
+
+        :rtype: int
+        """
+        return self._region
+
+    @property
+    def labels(self):
+        """ The labels of the vertices, by index
+
+        :rtype: list of str
+        """
+        return self._labels
+
+    @property
+    def placements(self):
+        """ The placement of each vertex when its data was last added, by\
+            index
+
+        :rtype: list of (int, int, int)
+        """
+        return self._placements
+
+    @property
+    def runs(self):
+        """ The first time step and the number of time steps of each run\
+            whose data has been added
+
+        :rtype: list of (int, int)
+        """
+        return [(first, n_timesteps) for first, n_timesteps, _ in self._runs]
+
+    def add_recorded_data(
+            self, buffer_manager, placements, first_timestep, n_timesteps,
+            machine=None, n_workers=1):
+        """ Append the data recorded by each vertex since data was last\
+            added
+
+        :param buffer_manager: the buffer manager holding the recorded data
+        :type buffer_manager: BufferManager
+        :param placements: the placements of the vertices
+        :type placements: Placements
+        :param first_timestep: the first time step of the run
+        :type first_timestep: int
+        :param n_timesteps: the number of time steps of the run
+        :type n_timesteps: int
+        :param machine: the machine, used to group the cores by board
+        :type machine: Machine
+        :param n_workers: the number of threads to read with
+        :type n_workers: int
+        """
+        if self._vertices is None:
+            raise exceptions.ConfigurationException(
+                "Data cannot be added to a store which has been loaded")
+        data = self._reader.read_new_data(
+            buffer_manager, placements, machine, n_workers)
+
+        new_data = list()
+        for index, vertex in enumerate(self._vertices):
+            new_data.append(data[vertex])
+            placement = placements.get_placement_of_vertex(vertex)
+            self._placements[index] = (placement.x, placement.y, placement.p)
+
+        n_new = numpy.array([len(items) for items in new_data], dtype="int64")
+        needed = int((self._n_items + n_new).max()) if len(n_new) else 0
+        if self._data is None:
+            self._resize(max(needed, self._capacity))
+        elif needed > self._capacity:
+            self._resize(max(needed, self._capacity * 2))
+
+        self._runs.append((first_timestep, n_timesteps, self._n_items.copy()))
+        for index, items in enumerate(new_data):
+            start = self._n_items[index]
+            self._data[index, start:start + len(items)] = items
+        self._n_items += n_new
+        self._data.flush()
+        self._write_metadata()
+
+    def reset(self):
+        """ Indicate that the simulation has been reset, so the data next\
+            recorded by each vertex starts from the beginning
+        """
+        if self._reader is not None:
+            self._reader.reset()
+
+    def get_data(self, vertex, run=None):
+        """ Get the data stored for a vertex
+
+        :param vertex: the vertex, or its index
+        :param run: the index of the run to get the data of, or None for all
+        :type run: int
+        :return: a view of the data in the file
+        :rtype: NumPy memmap
+        """
+        index = self._get_index(vertex)
+        if self._data is None:
+            return numpy.empty(0, dtype=self._dtype)
+        start = 0
+        end = self._n_items[index]
+        if run is not None:
+            start = self._runs[run][2][index]
+            if run + 1 < len(self._runs):
+                end = self._runs[run + 1][2][index]
+        return self._data[index, start:end]
+
+    def get_array(self, n_timesteps=None):
+        """ Get the data stored for all the vertices
+
+        :param n_timesteps:\
+            the number of time steps to get; if None, as many as all the\
+            vertices have
+        :type n_timesteps: int
+        :return: a view of the data in the file, with a row for each vertex
+        :rtype: NumPy memmap
+        """
+        if self._data is None:
+            return numpy.empty((len(self._labels), 0), dtype=self._dtype)
+        n_items = int(self._n_items.min()) if len(self._n_items) else 0
+        if n_timesteps is not None:
+            if n_timesteps * self._items_per_timestep > n_items:
+                raise exceptions.ConfigurationException(
+                    "{} time steps were asked for, but only {} are"
+                    " stored".format(
+                        n_timesteps, n_items // self._items_per_timestep))
+            n_items = n_timesteps * self._items_per_timestep
+        return self._data[:, :n_items]
+
+    def _get_index(self, vertex):
+        if isinstance(vertex, (int, long, numpy.integer)):
+            return int(vertex)
+        return self._vertex_indices[vertex]
+
+    def _resize(self, capacity):
+        """ Make the data file with space for capacity items in each row,\
+            keeping what has been stored
+        """
+        logger.debug(
+            "Making space for {} items for each vertex in {}".format(
+                capacity, self._path))
+        shape = (len(self._vertices), capacity)
+        if self._data is None:
+            self._data = numpy.memmap(
+                self._path, dtype=self._dtype, mode="w+", shape=shape)
+            self._capacity = capacity
+            return
+
+        # write the data into a new file which replaces the old one once
+        # complete
+        handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self._path)), suffix=".tmp")
+        os.close(handle)
+        data = numpy.memmap(temp_path, dtype=self._dtype, mode="w+",
+                            shape=shape)
+        data[:, :self._capacity] = self._data
+        data.flush()
+        del self._data
+        os.rename(temp_path, self._path)
+        self._data = data
+        self._capacity = capacity
+
+    def _write_metadata(self):
+        metadata = {
+            "region": self._region,
+            "dtype": self._dtype.str,
+            "items_per_timestep": self._items_per_timestep,
+            "capacity": self._capacity,
+            "n_items": self._n_items.tolist(),
+            "runs": [
+                (first, n_timesteps, starts.tolist())
+                for first, n_timesteps, starts in self._runs],
+            "labels": self._labels,
+            "placements": self._placements}
+        path = _metadata_path(self._path)
+        handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(handle, "w") as f:
+            json.dump(metadata, f)
+        os.rename(temp_path, path)
+
+
+def _metadata_path(path):
+    return path + ".json"
@@ -0,0 +1,149 @@
+"""
+Building the contents of a memory region in a data specification as a\
+typed buffer, which is written with a single command.
+"""
+
+# dsg imports
+from data_specification.enums.data_type import DataType
+
+# front end common imports
+from spinn_front_end_common.utilities import exceptions
+
+# general imports
+import numpy
+
+# The number of bytes in a word of a region
+_WORD_SIZE = 4
+
+
+def _numpy_type(data_type):
+    """ Get the NumPy type with the layout of a data type
+    """
+    return numpy.dtype("<" + data_type.struct_encoding)
+
+
+class RegionBuilder(object):
+    """ Collects the contents of a memory region, laid out as the\
+        write_value command of a data specification would lay them out, so\
+        that they can be written by one write_array command.
+
+    Fixed point values are scaled and truncated as write_value does, and\
+    every value is checked against the range of its type.  The scaling is\
+    exact, whereas write_value scales the text of a value, which holds only\
+    12 significant digits, so the last bits of some fixed point values\
+    differ.  The contents are padded with zeros to a whole number of words\
+    when written.
+    """
+
+    __slots__ = [
+
+        # The id of the region
+        "_region",
+
+        # The size of the region, as reserved, in bytes
+        "_size",
+
+        # The contents of the region, whole words long
+        "_buffer",
+
+        # The number of bytes added so far
+        "_n_bytes"
+    ]
+
+    def __init__(self, region, size):
+        """
+
+        :param region: the id of the region
+        :type region: int
+        :param size: the size in bytes that was reserved for the region
+        :type size: int
+        """
+        self._region = region
+        self._size = size
+        self._buffer = numpy.zeros(
+            -(-size // _WORD_SIZE) * _WORD_SIZE, dtype="uint8")
+        self._n_bytes = 0
+
+    @property
+    def region(self):
+        """ The id of the region
+
+        :rtype: int
+        """
+        return self._region
+
+    @property
+    def n_bytes(self):
+        """ The number of bytes added to the region so far
+
+        :rtype: int
+        """
+        return self._n_bytes
+
+    def add_value(self, value, data_type=DataType.UINT32):
+        """ Add a value to the region
+
+        :param value: the value to add
+        :param data_type: the type of the value
+        :type data_type: DataType
+        :raises ConfigurationException:\
+            if the value is out of the range of the type, or the region is\
+            full
+        """
+        self.add_array([value], data_type)
+
+    def add_array(self, values, data_type=DataType.UINT32):
+        """ Add an array of values of the same type to the region
+
+        :param values: the values to add
+        :type values: iterable of number or NumPy array
+        :param data_type: the type of the values
+        :type data_type: DataType
+        :raises ConfigurationException:\
+            if a value is out of the range of the type, or the values do not\
+            fit in the region
+        """
+        values = numpy.asarray(values)
+        n_bytes = values.size * data_type.size
+        if self._n_bytes + n_bytes > self._size:
+            raise exceptions.ConfigurationException(
+                "Adding {} bytes to region {} which has {} of its {} bytes"
+                " used would overflow it".format(
+                    n_bytes, self._region, self._n_bytes, self._size))
+        if values.size == 0:
+            return
+
+        min_value = values.min().item()
+        max_value = values.max().item()
+        if min_value < data_type.min or max_value > data_type.max:
+            raise exceptions.ConfigurationException(
+                "Values from {} to {} cannot all be written to region {} as"
+                " {}".format(min_value, max_value, self._region,
+                             data_type.name))
+        if data_type.scale != 1:
+            values = numpy.trunc(values * float(data_type.scale))
+
+        end = self._n_bytes + n_bytes
+        self._buffer[self._n_bytes:end].view(_numpy_type(data_type))[:] = \
+            values.ravel()
+        self._n_bytes = end
+
+    def get_words(self):
+        """ Get the contents of the region added so far
+
+        :return: the contents, padded with zeros to a whole number of words
+        :rtype: NumPy array of uint32
+        """
+        n_words = -(-self._n_bytes // _WORD_SIZE)
+        return self._buffer[:n_words * _WORD_SIZE].view("<u4")
+
+    def write(self, spec):
+        """ Write the contents of the region to a data specification
+
+        :param spec: the specification to write to
+        :type spec: DataSpecificationGenerator
+        """
+        if self._n_bytes == 0:
+            return
+        spec.switch_write_focus(self._region)
+        spec.write_array(self.get_words(), data_type=DataType.UINT32)
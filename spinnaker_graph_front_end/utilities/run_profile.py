@@ -0,0 +1,415 @@
+"""
+A profile of the algorithms run by the work flow of the tools, which\
+measures the wall time, CPU time and growth of the peak resident memory of\
+each algorithm as it runs, and optionally the number of objects it created,\
+and which can be written as a Chrome trace (``chrome://tracing`` or\
+Perfetto).
+"""
+
+# pacman imports
+from pacman.executor.pacman_algorithm_executor \
+    import PACMANAlgorithmExecutor
+
+# general imports
+from collections import OrderedDict
+import gc
+import json
+import os
+import sys
+import time
+
+# resource is only found on Unix; elsewhere the CPU time is that of the\
+# process alone and the peak resident memory is not known
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# The phases in which the extra algorithms given to setup are run
+PRE_RUN_PHASE = "pre run"
+POST_RUN_PHASE = "post run"
+
+# False once the peak resident memory of the process could not be reset, so
+# that it is not tried again
+_can_reset_peak_rss = True
+
+
+class AlgorithmProfile(object):
+    """ The measurements of one run of an algorithm
+    """
+
+    __slots__ = [
+
+        # The phase of the work flow in which the algorithm ran
+        "_phase",
+
+        # The name of the algorithm
+        "_name",
+
+        # The host time at which the algorithm started
+        "_start_time",
+
+        # The wall time taken in seconds
+        "_wall_seconds",
+
+        # The CPU time taken in seconds, by this process and any it ran
+        "_cpu_seconds",
+
+        # The number of bytes by which the peak resident memory rose, or None\
+        # if it could not be measured
+        "_peak_rss_delta",
+
+        # The net number of objects created, or None if not counted
+        "_objects_allocated"
+    ]
+
+    def __init__(self, phase, name, start_time, wall_seconds, cpu_seconds,
+                 peak_rss_delta, objects_allocated):
+        self._phase = phase
+        self._name = name
+        self._start_time = start_time
+        self._wall_seconds = wall_seconds
+        self._cpu_seconds = cpu_seconds
+        self._peak_rss_delta = peak_rss_delta
+        self._objects_allocated = objects_allocated
+
+    @property
+    def phase(self):
+        """ The phase of the work flow in which the algorithm ran, e.g.\
+            "mapping", "data generation", "load", "run", "pre run" or\
+            "post run"
+
+        :rtype: str
+        """
+        return self._phase
+
+    @property
+    def name(self):
+        """ The name of the algorithm
+
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def start_time(self):
+        """ The host time at which the algorithm started, as given by\
+            time.time()
+
+        :rtype: float
+        """
+        return self._start_time
+
+    @property
+    def wall_seconds(self):
+        """ The wall time taken by the algorithm in seconds
+
+        :rtype: float
+        """
+        return self._wall_seconds
+
+    @property
+    def cpu_seconds(self):
+        """ The user and system CPU time taken by the algorithm in seconds,\
+            including that of any processes it ran
+
+        :rtype: float
+        """
+        return self._cpu_seconds
+
+    @property
+    def peak_rss_delta(self):
+        """ The number of bytes by which the resident memory of the process\
+            rose above its level at the start of the algorithm at its peak,\
+            or None if the resident memory could not be measured
+
+        :rtype: int
+        """
+        return self._peak_rss_delta
+
+    @property
+    def objects_allocated(self):
+        """ The net number of objects tracked by the garbage collector which\
+            the algorithm created, or None if objects were not counted
+
+        :rtype: int
+        """
+        return self._objects_allocated
+
+    def to_dict(self):
+        """ The measurements as a dictionary
+
+        :rtype: dict
+        """
+        return {
+            "phase": self._phase, "name": self._name,
+            "start_time": self._start_time,
+            "wall_seconds": self._wall_seconds,
+            "cpu_seconds": self._cpu_seconds,
+            "peak_rss_delta": self._peak_rss_delta,
+            "objects_allocated": self._objects_allocated}
+
+    def __repr__(self):
+        return (
+            "AlgorithmProfile({}, {}, wall={:.3f}s, cpu={:.3f}s, "
+            "peak_rss_delta={}, objects_allocated={})".format(
+                self._phase, self._name, self._wall_seconds,
+                self._cpu_seconds, self._peak_rss_delta,
+                self._objects_allocated))
+
+
+class RunProfile(object):
+    """ The measurements of each algorithm run by the work flow, in the\
+        order run
+    """
+
+    __slots__ = [
+
+        # The measurements of each algorithm run
+        "_records"
+    ]
+
+    def __init__(self):
+        self._records = list()
+
+    def add(self, record):
+        """ Add the measurements of an algorithm
+
+        :param record: the measurements
+        :type record: AlgorithmProfile
+        """
+        self._records.append(record)
+
+    def clear(self):
+        """ Forget the measurements of all the algorithms
+        """
+        del self._records[:]
+
+    @property
+    def records(self):
+        """ The measurements of each algorithm, in the order run
+
+        :rtype: list of AlgorithmProfile
+        """
+        return list(self._records)
+
+    @property
+    def phases(self):
+        """ The measurements of each algorithm by phase, with the phases in\
+            the order first run
+
+        :rtype: OrderedDict of str to list of AlgorithmProfile
+        """
+        phases = OrderedDict()
+        for record in self._records:
+            phases.setdefault(record.phase, list()).append(record)
+        return phases
+
+    def phase_totals(self):
+        """ The wall time, CPU time, largest peak resident memory rise and\
+            objects created by the algorithms of each phase
+
+        :return: a dictionary of the totals of each phase, with the keys\
+            "wall_seconds", "cpu_seconds", "peak_rss_delta" and\
+            "objects_allocated"
+        :rtype: OrderedDict of str to dict
+        """
+        totals = OrderedDict()
+        for phase, records in self.phases.iteritems():
+            objects = [
+                record.objects_allocated for record in records
+                if record.objects_allocated is not None]
+            rss_deltas = [
+                record.peak_rss_delta for record in records
+                if record.peak_rss_delta is not None]
+            totals[phase] = {
+                "wall_seconds": sum(record.wall_seconds for record in records),
+                "cpu_seconds": sum(record.cpu_seconds for record in records),
+                "peak_rss_delta": max(rss_deltas) if rss_deltas else None,
+                "objects_allocated": sum(objects) if objects else None}
+        return totals
+
+    def to_chrome_trace(self):
+        """ The measurements as Chrome trace events, with a complete event\
+            for each algorithm whose category is its phase
+
+        :rtype: dict
+        """
+        pid = os.getpid()
+        events = [{
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "work flow"}}]
+        for record in self._records:
+            events.append({
+                "name": record.name, "cat": record.phase, "ph": "X",
+                "ts": record.start_time * 1000000.0,
+                "dur": record.wall_seconds * 1000000.0,
+                "pid": pid, "tid": 0,
+                "args": {
+                    "cpu_seconds": record.cpu_seconds,
+                    "peak_rss_delta": record.peak_rss_delta,
+                    "objects_allocated": record.objects_allocated}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """ Write the measurements as a Chrome trace event JSON file
+
+        :param path: the path of the file
+        :type path: str
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def __iter__(self):
+        return iter(list(self._records))
+
+    def __len__(self):
+        return len(self._records)
+
+
+class ProfilingAlgorithmExecutor(PACMANAlgorithmExecutor):
+    """ An algorithm executor which adds the measurements of each algorithm\
+        it runs to a profile
+    """
+
+    __slots__ = []
+
+    def __init__(self, profile, phase, extra_pre_run_algorithms=None,
+                 extra_post_run_algorithms=None, count_objects=False,
+                 **kwargs):
+        """
+
+        :param profile: the profile to add the measurements to
+        :type profile: RunProfile
+        :param phase: the phase of the work flow being run
+        :type phase: str
+        :param extra_pre_run_algorithms: algorithms measured in the pre run\
+                    phase wherever they are run
+        :type extra_pre_run_algorithms: list of str
+        :param extra_post_run_algorithms: algorithms measured in the post\
+                    run phase wherever they are run
+        :type extra_post_run_algorithms: list of str
+        :param count_objects: True if the objects created by each algorithm\
+                    are counted; this is a diagnostic which lists every\
+                    object of the process twice for each algorithm, so it\
+                    takes time in proportion to the number of objects
+        :type count_objects: bool
+        :param kwargs: the parameters of PACMANAlgorithmExecutor
+        """
+        PACMANAlgorithmExecutor.__init__(self, **kwargs)
+        pre_run = set(extra_pre_run_algorithms or [])
+        post_run = set(extra_post_run_algorithms or [])
+        algorithms = list()
+        for algorithm in self._algorithms:
+            algorithm_phase = phase
+            if algorithm.algorithm_id in pre_run:
+                algorithm_phase = PRE_RUN_PHASE
+            elif algorithm.algorithm_id in post_run:
+                algorithm_phase = POST_RUN_PHASE
+            algorithms.append(_ProfiledAlgorithm(
+                algorithm, profile, algorithm_phase, count_objects))
+        self._algorithms = algorithms
+
+
+class _ProfiledAlgorithm(object):
+    """ Measures the calls of an algorithm, passing everything else to it
+    """
+
+    __slots__ = [
+
+        # The algorithm measured
+        "_algorithm",
+
+        # The profile to add the measurements to
+        "_profile",
+
+        # The phase of the work flow in which the algorithm is run
+        "_phase",
+
+        # True if the objects created are counted
+        "_count_objects"
+    ]
+
+    def __init__(self, algorithm, profile, phase, count_objects):
+        self._algorithm = algorithm
+        self._profile = profile
+        self._phase = phase
+        self._count_objects = count_objects
+
+    def __getattr__(self, name):
+        return getattr(self._algorithm, name)
+
+    def call(self, inputs):
+        n_objects = len(gc.get_objects()) if self._count_objects else None
+        start_rss = _reset_peak_rss()
+        start_cpu = _cpu_seconds()
+        start_time = time.time()
+        try:
+            return self._algorithm.call(inputs)
+        finally:
+            end_time = time.time()
+            end_cpu = _cpu_seconds()
+            peak_rss = _peak_rss()
+            peak_rss_delta = None
+            if start_rss is not None and peak_rss is not None:
+                peak_rss_delta = max(peak_rss - start_rss, 0)
+            if n_objects is not None:
+                n_objects = len(gc.get_objects()) - n_objects
+            self._profile.add(AlgorithmProfile(
+                self._phase, self._algorithm.algorithm_id, start_time,
+                end_time - start_time, end_cpu - start_cpu, peak_rss_delta,
+                n_objects))
+
+
+def _cpu_seconds():
+    if resource is None:
+        return time.clock()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss():
+    """ Set the peak resident memory of the process to its current value,\
+        where the operating system allows it.  Writing 5 to clear_refs only\
+        resets the peak, without walking the pages of the process; where it\
+        fails, it is not tried again.
+
+    :return: the resident memory in bytes, or the peak so far if the peak\
+        cannot be reset, or None if neither is known
+    :rtype: int
+    """
+    global _can_reset_peak_rss
+    if _can_reset_peak_rss:
+        try:
+            with open("/proc/self/clear_refs", "w") as clear_refs:
+                clear_refs.write("5")
+            return _read_status("VmRSS")
+        except (IOError, OSError, ValueError):
+            _can_reset_peak_rss = False
+    return _peak_rss()
+
+
+def _peak_rss():
+    """ The peak resident memory of the process in bytes, or None if it\
+        is not known
+
+    :rtype: int
+    """
+    try:
+        return _read_status("VmHWM")
+    except (IOError, OSError, ValueError):
+        if resource is None:
+            return None
+
+        # ru_maxrss is in kilobytes on Linux and bytes on Mac OS X
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _read_status(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise ValueError("No {} in the status of the process".format(field))
@@ -0,0 +1,224 @@
+"""
+Building of data specifications from templates.
+
+The first specifications generated for each template key are kept as\
+samples.  Each template value is located by finding the one word of the\
+specifications which holds that value in every sample; once the samples can\
+be rebuilt from the first of them by writing their values into those words,\
+the specifications of other vertices with the key are built in the same way\
+rather than being generated.
+"""
+
+# general imports
+import logging
+import numpy
+
+logger = logging.getLogger(__name__)
+
+_WORD_MASK = 0xFFFFFFFF
+
+# The data type of the words of a specification
+_WORD_TYPE = numpy.dtype("<u4")
+
+# The number of specifications generated for a template before any are\
+# built from it
+DEFAULT_MIN_SAMPLES = 2
+
+# The largest number of specifications kept as samples of a template
+DEFAULT_MAX_SAMPLES = 4
+
+
+class SpecTemplateCache(object):
+    """ Templates of data specifications, by template key
+    """
+
+    __slots__ = [
+
+        # The templates by key
+        "_templates",
+
+        # The number of specifications generated before using a template
+        "_min_samples",
+
+        # The largest number of samples kept by a template
+        "_max_samples",
+
+        # The number of specifications built from templates
+        "_n_built",
+
+        # The number of specifications generated in full
+        "_n_generated"
+    ]
+
+    def __init__(self, min_samples=DEFAULT_MIN_SAMPLES,
+                 max_samples=DEFAULT_MAX_SAMPLES):
+        """
+
+        :param min_samples:\
+            the number of specifications generated for a template before any\
+            are built from it
+        :type min_samples: int
+        :param max_samples:\
+            the largest number of specifications kept as samples of a\
+            template
+        :type max_samples: int
+        """
+        self._templates = dict()
+        self._min_samples = max(1, min_samples)
+        self._max_samples = max(self._min_samples, max_samples)
+        self._n_built = 0
+        self._n_generated = 0
+
+    @property
+    def n_built(self):
+        """ The number of specifications built from templates
+
+        :rtype: int
+        """
+        return self._n_built
+
+    @property
+    def n_generated(self):
+        """ The number of specifications generated in full
+
+        :rtype: int
+        """
+        return self._n_generated
+
+    def get_spec(self, key, values, generate):
+        """ Get the specification of a vertex
+
+        :param key: the template key of the vertex
+        :param values: the template values of the vertex
+        :type values: list of int
+        :param generate:\
+            a callable which generates the specification of the vertex in full
+        :type generate: callable() -> str
+        :return: the specification
+        :rtype: str
+        """
+        values = numpy.array(
+            [value & _WORD_MASK for value in values], dtype=_WORD_TYPE)
+        template = self._templates.get(key, None)
+        if template is None:
+            template = _SpecTemplate()
+            self._templates[key] = template
+
+        if template.n_samples >= self._min_samples:
+            spec = template.build(values)
+            if spec is not None:
+                self._n_built += 1
+                return spec
+
+        spec = generate()
+        self._n_generated += 1
+        if template.n_samples < self._max_samples:
+            template.add_sample(key, values, spec)
+        return spec
+
+
+class _SpecTemplate(object):
+    """ The samples of the specifications with a template key, and the\
+        words of the specifications which hold each template value
+    """
+
+    __slots__ = [
+
+        # The template values of each sample, as a 2D array
+        "_values",
+
+        # The words of each sample, as a 2D array
+        "_words",
+
+        # The indices of the located template values
+        "_value_indices",
+
+        # The word offsets of the located template values
+        "_offsets",
+
+        # False if the samples cannot be rebuilt from the first of them
+        "_usable"
+    ]
+
+    def __init__(self):
+        self._values = None
+        self._words = None
+        self._value_indices = None
+        self._offsets = None
+        self._usable = True
+
+    @property
+    def n_samples(self):
+        return 0 if self._words is None else len(self._words)
+
+    def add_sample(self, key, values, spec):
+        if not self._usable:
+            return
+        if len(spec) % _WORD_TYPE.itemsize != 0:
+            self._disable(key, "is not a whole number of words")
+            return
+        words = numpy.frombuffer(spec, dtype=_WORD_TYPE)
+        if self._words is None:
+            self._values = values.reshape(1, -1)
+            self._words = words.reshape(1, -1)
+        elif (len(values) != self._values.shape[1] or
+                len(words) != self._words.shape[1]):
+            self._disable(key, "changes in length")
+            return
+        else:
+            self._values = numpy.vstack((self._values, values))
+            self._words = numpy.vstack((self._words, words))
+        self._locate_values(key)
+
+    def _locate_values(self, key):
+        """ Find the word which holds each template value, and check that\
+            every sample can be rebuilt from the first
+        """
+        value_indices = list()
+        offsets = list()
+        for index in xrange(self._values.shape[1]):
+            candidates = numpy.flatnonzero(
+                (self._words == self._values[:, index:index + 1]).all(axis=0))
+            if len(candidates) == 1:
+                value_indices.append(index)
+                offsets.append(candidates[0])
+        if len(set(offsets)) != len(offsets):
+            self._disable(key, "has template values which share a word")
+            return
+        self._value_indices = numpy.array(value_indices, dtype="intp")
+        self._offsets = numpy.array(offsets, dtype="intp")
+
+        rebuilt = self._words[0].copy()
+        for values, words in zip(self._values, self._words):
+            rebuilt[self._offsets] = values[self._value_indices]
+            if not numpy.array_equal(rebuilt, words):
+                self._disable(key, "differs in words other than its values")
+                return
+
+    def build(self, values):
+        """ Build a specification from the template
+
+        :return:\
+            the specification, or None if it cannot be built from the\
+            template
+        """
+        if not self._usable or len(values) != self._values.shape[1]:
+            return None
+
+        # values which have not been located must be those of the first
+        # sample, as they could be in any of several words
+        unlocated = numpy.ones(len(values), dtype=bool)
+        unlocated[self._value_indices] = False
+        if not numpy.array_equal(
+                values[unlocated], self._values[0][unlocated]):
+            return None
+
+        words = self._words[0].copy()
+        words[self._offsets] = values[self._value_indices]
+        return words.tostring()
+
+    def _disable(self, key, reason):
+        logger.debug(
+            "Data specifications with template key {} will be generated in"
+            " full as the specification {}".format(key, reason))
+        self._usable = False
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy
+
+from spinnaker_graph_front_end.examples.Conways import conways_reference
+from spinnaker_graph_front_end.examples.Conways\
+    .partitioned_example_a_no_vis_no_buffer.conways_basic_cell \
+    import ConwayBasicCell
+from spinnaker_graph_front_end.graphs import lattice
+
+from unittests.graphs.heat_demo_graph import building_graph
+
+
+def _scalar_conways(states, n_timesteps):
+    """ The states of the cells of a torus, found one cell and generation\
+        at a time
+    """
+    width, height = len(states), len(states[0])
+    results = [[list() for _ in xrange(height)] for _ in xrange(width)]
+    for _ in xrange(n_timesteps):
+        new_states = [[False] * height for _ in xrange(width)]
+        for x in xrange(width):
+            for y in xrange(height):
+                n_alive = 0
+                for d_x in (-1, 0, 1):
+                    for d_y in (-1, 0, 1):
+                        if (d_x or d_y) and states[
+                                (x + d_x) % width][(y + d_y) % height]:
+                            n_alive += 1
+                new_states[x][y] = n_alive == 3 or (
+                    states[x][y] and n_alive == 2)
+                results[x][y].append(int(new_states[x][y]))
+        states = new_states
+    return [results[x][y] for x in xrange(width) for y in xrange(height)]
+
+
+def _build_cells(states):
+    with building_graph() as builder:
+        cells = lattice.build_lattice(
+            states.shape, lambda x, y: ConwayBasicCell(
+                "Cell {}, {}".format(x, y), bool(states[x, y])),
+            stencil=lattice.MOORE, wrap=True)
+    return builder.machine_graph, cells.ravel().tolist()
+
+
+class TestConwaysReference(unittest.TestCase):
+
+    def test_glider(self):
+        states = numpy.zeros((6, 6), dtype=bool)
+        for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+            states[x, y] = True
+        graph, cells = _build_cells(states)
+        results = conways_reference.run_reference(graph, 24, cells)
+
+        # a glider on a 6 by 6 torus is back where it started after 24
+        # generations
+        self.assertEqual(states.ravel().tolist(), results[:, -1].tolist())
+        self.assertEqual([5] * 24, results.sum(axis=0).tolist())
+
+    def test_random_against_scalar(self):
+        rng = numpy.random.RandomState(3)
+        for shape in ((7, 5), (8, 8)):
+            states = rng.randint(0, 2, shape).astype(bool)
+            graph, cells = _build_cells(states)
+            results = conways_reference.run_reference(graph, 15, cells)
+            self.assertEqual(
+                _scalar_conways(states.tolist(), 15), results.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from spinnaker_graph_front_end.examples.heat_demo import heat_demo_reference
+from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+    import HeatDemoEdge
+
+from unittests.graphs.heat_demo_graph import build_heat_demo_graph
+
+_DIRECTIONS = HeatDemoEdge.DIRECTIONS
+
+# The temperature of each missing neighbour, as heat_demo.c leaves it
+_BOUNDARY = {
+    _DIRECTIONS.EAST: 0, _DIRECTIONS.NORTH: 40 << 16,
+    _DIRECTIONS.WEST: 40 << 16, _DIRECTIONS.SOUTH: 10 << 16}
+
+
+def _scalar_heat(machine_graph, n_timesteps):
+    """ The temperatures of the heat elements, found one element and time\
+        step at a time as heat_demo.c does
+    """
+    elements = [
+        vertex for vertex in machine_graph.vertices
+        if hasattr(vertex, "heat_temperature")]
+    neighbours = dict()
+    for element in elements:
+        neighbours[element] = dict(
+            (edge.direction, edge.pre_vertex)
+            for edge in machine_graph.get_edges_ending_at_vertex(element)
+            if isinstance(edge, HeatDemoEdge))
+    temperatures = dict(
+        (element, element.heat_temperature) for element in elements)
+    results = [list() for _ in elements]
+    for _ in xrange(n_timesteps):
+        new_temperatures = dict()
+        for index, element in enumerate(elements):
+            received = dict(
+                (direction, temperatures[neighbours[element][direction]]
+                 if direction in neighbours[element] else
+                 _BOUNDARY[direction])
+                for direction in _DIRECTIONS)
+            temperature = temperatures[element]
+            tmp1 = (received[_DIRECTIONS.EAST] + received[_DIRECTIONS.WEST] -
+                    2 * temperature)
+            tmp2 = (received[_DIRECTIONS.NORTH] +
+                    received[_DIRECTIONS.SOUTH] - 2 * temperature)
+            temperature += (
+                ((heat_demo_reference.CX_ADJ * tmp1) >> 16) +
+                ((heat_demo_reference.CY_ADJ * tmp2) >> 16))
+            new_temperatures[element] = max(temperature, 0)
+            results[index].append(new_temperatures[element])
+        temperatures = new_temperatures
+    return elements, results
+
+
+class TestHeatDemoReference(unittest.TestCase):
+
+    def test_against_scalar(self):
+        for width, height in ((3, 3), (4, 2), (1, 5)):
+            graph = build_heat_demo_graph(width, height)
+            elements, expected = _scalar_heat(graph, 50)
+            results = heat_demo_reference.run_reference(graph, 50)
+            self.assertEqual((width * height, 50), results.shape)
+            self.assertEqual(expected, results.tolist())
+
+    def test_neighbours(self):
+        graph = build_heat_demo_graph(3, 3)
+        elements, neighbours = heat_demo_reference.get_neighbours(graph)
+        labels = [element.label for element in elements]
+        centre = labels.index("Heat Element 1, 1")
+
+        # the neighbours are east, north, west and south, where north is
+        # further up in y; the monitoring edges are not heat edges
+        self.assertEqual(
+            ["Heat Element 2, 1", "Heat Element 1, 2",
+             "Heat Element 0, 1", "Heat Element 1, 0"],
+            [labels[neighbour] for neighbour in neighbours[centre]])
+        corner = labels.index("Heat Element 0, 0")
+        self.assertEqual(2, (neighbours[corner] == -1).sum())
+
+    def test_vertex_order(self):
+        graph = build_heat_demo_graph(3, 3)
+        elements, expected = _scalar_heat(graph, 10)
+        order = list(reversed(elements))
+        results = heat_demo_reference.run_reference(graph, 10, order)
+        self.assertEqual(list(reversed(expected)), results.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
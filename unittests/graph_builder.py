@@ -0,0 +1,72 @@
+"""
+A stand-in for the tool chain which only builds graphs, and a simple machine\
+vertex to build them from, so that the tests need neither a machine nor the\
+vertices of the examples.
+"""
+
+# pacman imports
+from pacman.model.decorators.overrides import overrides
+from pacman.model.graphs.application.impl.application_graph \
+    import ApplicationGraph
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.graphs.machine.impl.machine_vertex import MachineVertex
+from pacman.model.resources.resource_container import ResourceContainer
+
+# graph front end imports
+import spinnaker_graph_front_end as front_end
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+from spinnaker_graph_front_end.spinnaker import SpiNNaker
+
+# general imports
+import contextlib
+
+
+class SimpleVertex(MachineVertex, AbstractProvidesConstructionParams):
+    """ A machine vertex which holds a value, and needs no resources
+    """
+
+    def __init__(self, label=None, constraints=None, value=0):
+        MachineVertex.__init__(
+            self, ResourceContainer(), label=label, constraints=constraints)
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {'value': self._value}
+
+
+class GraphBuilder(SpiNNaker):
+    """ Stands in for the tool chain as the target of the functions of the\
+        front end, adding the vertices and edges they build to its graphs\
+        without a machine
+    """
+
+    def __init__(self):
+        self._machine_graph = MachineGraph("test")
+        self._application_graph = ApplicationGraph("test")
+        self._graph_mapper = None
+        self._machine = None
+        self._has_ran = False
+        self._added_machine_vertices = list()
+        self._added_machine_edges = list()
+        self._none_labelled_vertex_count = 0
+        self._none_labelled_edge_count = 0
+
+
+@contextlib.contextmanager
+def building_graph():
+    """ Direct the functions of the front end to a new graph builder
+    """
+    builder = GraphBuilder()
+    old_spinnaker = front_end._spinnaker
+    front_end._spinnaker = builder
+    try:
+        yield builder
+    finally:
+        front_end._spinnaker = old_spinnaker
@@ -0,0 +1,111 @@
+"""
+A small heat demo machine graph, built without a machine from elements which\
+stand in for the vertices of the heat demo.
+"""
+
+# pacman imports
+from pacman.model.constraints.placer_constraints\
+    .placer_chip_and_core_constraint import PlacerChipAndCoreConstraint
+from pacman.model.decorators.overrides import overrides
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from pacman.model.graphs.machine.impl.machine_vertex import MachineVertex
+from pacman.model.resources.resource_container import ResourceContainer
+
+# graph front end imports
+from spinnaker_graph_front_end.abstract_models\
+    .abstract_provides_construction_params \
+    import AbstractProvidesConstructionParams
+from spinnaker_graph_front_end.graphs import lattice
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import default_registry
+
+# example imports
+from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+    import HeatDemoEdge
+
+# test imports
+from unittests.graph_builder import building_graph
+
+
+class HeatElement(MachineVertex, AbstractProvidesConstructionParams):
+    """ Stands in for a heat demo vertex, holding only its temperature
+    """
+
+    def __init__(self, label=None, constraints=None, heat_temperature=0):
+        MachineVertex.__init__(
+            self, ResourceContainer(), label=label, constraints=constraints)
+        self._heat_temperature = heat_temperature
+
+    @property
+    def heat_temperature(self):
+        return self._heat_temperature
+
+    @overrides(AbstractProvidesConstructionParams.get_construction_params)
+    def get_construction_params(self):
+        return {'heat_temperature': self._heat_temperature}
+
+
+def build_heat_demo_graph(width=3, height=3):
+    """ Build the elements of a heat demo on one chip, linked as in the heat\
+        demo, with a monitoring edge from each element to the first
+
+    :rtype: MachineGraph
+    """
+    def create_element(x, y):
+        return HeatElement(
+            label="Heat Element {}, {}".format(x, y),
+            heat_temperature=x - y,
+            constraints=[PlacerChipAndCoreConstraint(
+                0, 0, (x * height) + y + 1)])
+
+    with building_graph() as builder:
+        vertices = lattice.build_lattice(
+            (width, height), create_element, stencil=lattice.VON_NEUMANN,
+            wrap=False, partition_id="TRANSMISSION", edge_class=HeatDemoEdge,
+            direction_param="direction",
+            direction_values={
+                "N": HeatDemoEdge.DIRECTIONS.SOUTH,
+                "E": HeatDemoEdge.DIRECTIONS.WEST,
+                "S": HeatDemoEdge.DIRECTIONS.NORTH,
+                "W": HeatDemoEdge.DIRECTIONS.EAST})
+        elements = vertices.ravel().tolist()
+        builder.add_machine_edges([
+            MachineEdge(
+                element, elements[0], label="Monitor {}".format(index),
+                traffic_weight=2)
+            for index, element in enumerate(elements[1:])], "MONITOR")
+    return builder.machine_graph
+
+
+def heat_demo_registry():
+    """ Create a registry which can also import the classes of the tests
+
+    :rtype: GraphClassRegistry
+    """
+    registry = default_registry()
+    registry.allow_imports_from("unittests")
+    return registry
+
+
+def describe_graph(machine_graph):
+    """ Describe the vertices and edges of a graph by their classes, labels,\
+        parameters and constraints, in an order which does not depend on the\
+        order in which they were added
+
+    :return: the description of the vertices and of the edges
+    :rtype: (list, list)
+    """
+    registry = default_registry()
+    vertices = sorted(
+        (type(vertex), vertex.label, vertex.get_construction_params(),
+         [(constraint.x, constraint.y, constraint.p)
+          for constraint in vertex.constraints])
+        for vertex in machine_graph.vertices)
+    edges = sorted((
+        (partition.identifier, edge.pre_vertex.label,
+         edge.post_vertex.label, type(edge), edge.label,
+         registry.get_params(edge) if type(edge) is MachineEdge
+         else edge.get_construction_params())
+        for partition in machine_graph.outgoing_edge_partitions
+        for edge in partition.edges), key=lambda edge: edge[:3])
+    return vertices, edges
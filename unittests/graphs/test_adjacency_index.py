@@ -0,0 +1,143 @@
+import unittest
+
+import numpy
+
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+
+from spinnaker_graph_front_end.graphs.adjacency_index import AdjacencyIndex
+
+from unittests.graph_builder import SimpleVertex
+from unittests.graphs.heat_demo_graph import build_heat_demo_graph
+
+
+class TestAdjacencyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = build_heat_demo_graph(width=4, height=3)
+        self.index = AdjacencyIndex(self.graph)
+        self.vertices = list(self.graph.vertices)
+
+    def test_vertex_indices(self):
+        self.assertEqual(len(self.vertices), self.index.n_vertices)
+        for index, vertex in enumerate(self.vertices):
+            self.assertIs(vertex, self.index.vertices[index])
+            self.assertEqual(index, self.index.vertex_index(vertex))
+
+    def test_outgoing_edges(self):
+        for index, vertex in enumerate(self.vertices):
+            partitions = list(
+                self.graph.get_outgoing_edge_partitions_starting_at_vertex(
+                    vertex))
+            edges = [edge for partition in partitions
+                     for edge in partition.edges]
+            self.assertEqual(edges, list(self.index.outgoing_edges(index)))
+            self.assertEqual(
+                [self.vertices.index(edge.post_vertex) for edge in edges],
+                self.index.outgoing_targets(index).tolist())
+            self.assertEqual(len(edges), self.index.out_degree(index))
+            self.assertEqual(
+                partitions, list(self.index.outgoing_partitions(index)))
+
+    def test_incoming_edges(self):
+        for index, vertex in enumerate(self.vertices):
+            edges = self.graph.get_edges_ending_at_vertex(vertex)
+            self.assertEqual(
+                set(edges), set(self.index.incoming_edges(index)))
+            self.assertEqual(len(edges), self.index.in_degree(index))
+
+            # the incoming edges are in the order of their pre vertices
+            sources = self.index.incoming_sources(index).tolist()
+            self.assertEqual(sorted(sources), sources)
+            self.assertEqual(
+                [self.vertices.index(edge.pre_vertex)
+                 for edge in self.index.incoming_edges(index)], sources)
+
+    def test_csr_offsets(self):
+        offsets, sources, edges = self.index.incoming_csr()
+        n_edges = sum(
+            len(partition.edges)
+            for partition in self.graph.outgoing_edge_partitions)
+        self.assertEqual(self.index.n_vertices + 1, len(offsets))
+        self.assertEqual(0, offsets[0])
+        self.assertEqual(n_edges, offsets[-1])
+        self.assertTrue(numpy.all(numpy.diff(offsets) >= 0))
+        self.assertEqual(n_edges, len(sources))
+        self.assertEqual(n_edges, len(edges))
+        for index in xrange(self.index.n_vertices):
+            self.assertEqual(
+                list(self.index.incoming_edges(index)),
+                list(edges[offsets[index]:offsets[index + 1]]))
+
+    def test_read_only(self):
+        offsets, sources, _ = self.index.incoming_csr()
+        with self.assertRaises(ValueError):
+            offsets[0] = 1
+        with self.assertRaises(ValueError):
+            sources[0] = 1
+        with self.assertRaises(ValueError):
+            self.index.outgoing_targets(0)[0] = 1
+
+    def test_attributes(self):
+        labels = self.index.get_attribute("label")
+        self.assertEqual(
+            [vertex.label for vertex in self.vertices], labels.tolist())
+        self.assertIs(labels, self.index.get_attribute("label"))
+        self.assertEqual(
+            [None] * len(self.vertices),
+            self.index.get_attribute("no_such_attribute").tolist())
+        self.assertEqual(
+            [self.vertices[source].label
+             for source in self.index.incoming_sources(0)],
+            self.index.incoming_attribute(0, "label").tolist())
+
+
+class TestAdjacencyIndexOfSparseGraph(unittest.TestCase):
+
+    def setUp(self):
+
+        # a vertex with edges in two partitions, an edge to itself, and a
+        # vertex with no edges
+        self.graph = MachineGraph("test")
+        self.vertices = [
+            SimpleVertex("v{}".format(index), value=index * 10)
+            for index in xrange(4)]
+        for vertex in self.vertices:
+            self.graph.add_vertex(vertex)
+        for pre, post, partition_id in (
+                (0, 1, "A"), (0, 2, "A"), (0, 2, "B"), (1, 1, "A"),
+                (2, 0, "A")):
+            self.graph.add_edge(
+                MachineEdge(self.vertices[pre], self.vertices[post]),
+                partition_id)
+        self.index = AdjacencyIndex(self.graph)
+
+    def test_degrees(self):
+        self.assertEqual(
+            [3, 1, 1, 0],
+            [self.index.out_degree(index) for index in xrange(4)])
+        self.assertEqual(
+            [1, 2, 2, 0],
+            [self.index.in_degree(index) for index in xrange(4)])
+
+    def test_targets_and_sources(self):
+        self.assertEqual(
+            [1, 2, 2], sorted(self.index.outgoing_targets(0).tolist()))
+        self.assertEqual([0, 1], self.index.incoming_sources(1).tolist())
+        self.assertEqual([0, 0], self.index.incoming_sources(2).tolist())
+        self.assertEqual([], self.index.incoming_sources(3).tolist())
+        self.assertEqual([], list(self.index.outgoing_edges(3)))
+        self.assertEqual(
+            ["A", "B"],
+            sorted(partition.identifier
+                   for partition in self.index.outgoing_partitions(0)))
+
+    def test_attributes(self):
+        self.assertEqual(
+            [0, 10, 20, 30], self.index.get_attribute("value").tolist())
+        self.assertEqual(
+            [0, 10], self.index.incoming_attribute(1, "value").tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
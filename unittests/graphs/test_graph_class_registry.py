@@ -0,0 +1,93 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+
+from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+    import HeatDemoEdge
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import GraphClassRegistry, default_registry
+
+from unittests.graphs.heat_demo_graph import HeatElement
+
+_HEAT_DEMO_EDGE = (
+    "spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge"
+    ".HeatDemoEdge")
+
+
+class TestGraphClassRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        sys.path.insert(0, self._directory)
+
+    def tearDown(self):
+        sys.path.remove(self._directory)
+        for name in list(sys.modules):
+            if name.startswith("broken_graph_classes"):
+                del sys.modules[name]
+        shutil.rmtree(self._directory)
+
+    def test_registered_names(self):
+        registry = GraphClassRegistry()
+        registry.register(HeatElement, name="Element")
+        self.assertIs(HeatElement, registry.get_class("Element"))
+        self.assertEqual("Element", registry.get_name(HeatElement))
+        self.assertEqual(
+            _HEAT_DEMO_EDGE, registry.get_name(HeatDemoEdge))
+
+    def test_no_imports_by_default(self):
+        registry = GraphClassRegistry()
+        with self.assertRaises(KeyError):
+            registry.get_class(_HEAT_DEMO_EDGE)
+
+    def test_allowed_packages(self):
+        registry = default_registry()
+        self.assertIs(MachineEdge, registry.get_class("MachineEdge"))
+        self.assertIs(HeatDemoEdge, registry.get_class(_HEAT_DEMO_EDGE))
+        self.assertIs(
+            HeatDemoEdge.DIRECTIONS,
+            registry.get_class(_HEAT_DEMO_EDGE + ".DIRECTIONS"))
+
+        # classes outside the tool chain must be registered or allowed
+        test_path = "unittests.graphs.heat_demo_graph.HeatElement"
+        with self.assertRaises(KeyError):
+            registry.get_class(test_path)
+
+        # a package is matched by whole names only
+        registry.allow_imports_from("unittests.graph")
+        with self.assertRaises(KeyError):
+            registry.get_class(test_path)
+        registry.allow_imports_from("unittests.graphs")
+        self.assertIs(HeatElement, registry.get_class(test_path))
+
+    def test_missing_classes(self):
+        registry = GraphClassRegistry(["spinnaker_graph_front_end"])
+        for path in (
+                "spinnaker_graph_front_end.no_such_module.Vertex",
+                "spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge"
+                ".NoSuchEdge"):
+            with self.assertRaises(KeyError):
+                registry.get_class(path)
+
+    def test_module_which_fails_to_import(self):
+        package = os.path.join(self._directory, "broken_graph_classes")
+        os.mkdir(package)
+        with open(os.path.join(package, "__init__.py"), "w"):
+            pass
+        with open(os.path.join(package, "vertices.py"), "w") as f:
+            f.write("import no_such_module_of_graph_classes\n")
+        registry = GraphClassRegistry(["broken_graph_classes"])
+        with self.assertRaises(ImportError):
+            registry.get_class("broken_graph_classes.vertices.Vertex")
+
+        # a missing module is not an import failure
+        with self.assertRaises(KeyError):
+            registry.get_class("broken_graph_classes.missing.Vertex")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from enum import Enum
+
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+
+from spinn_front_end_common.utilities import exceptions
+from spinn_front_end_common.utility_models.\
+    live_packet_gather_machine_vertex import LivePacketGatherMachineVertex
+
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+    import HeatDemoEdge
+from spinnaker_graph_front_end.graphs.graph_snapshot import \
+    DESCRIPTION_FILE, load_graph_snapshot, save_graph_snapshot
+
+from unittests.graph_builder import building_graph
+from unittests.graphs.heat_demo_graph import \
+    build_heat_demo_graph, describe_graph, heat_demo_registry
+
+
+class TestGraphSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = os.path.join(tempfile.mkdtemp(), "snapshot")
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self._directory))
+
+    def _load(self):
+        with building_graph() as builder:
+            vertices = load_graph_snapshot(
+                self._directory, builder, heat_demo_registry())
+        return vertices, builder.machine_graph
+
+    def test_heat_demo_round_trip(self):
+        graph = build_heat_demo_graph()
+        save_graph_snapshot(self._directory, graph)
+        with open(os.path.join(self._directory, DESCRIPTION_FILE)) as f:
+            self.assertEqual("test", json.load(f)["label"])
+        vertices, loaded = self._load()
+        self.assertEqual(describe_graph(graph), describe_graph(loaded))
+        self.assertEqual(
+            [vertex.label for vertex in graph.vertices],
+            [vertex.label for vertex in vertices])
+
+    def test_vertex_without_params_is_not_saved(self):
+
+        # the live packet gatherer of the heat demo cannot describe how to
+        # rebuild itself
+        graph = build_heat_demo_graph(2, 2)
+        gatherer = LivePacketGatherMachineVertex(
+            label="LiveHeatGatherer", ip_address="0.0.0.0", port=22222,
+            payload_as_time_stamps=False, use_payload_prefix=False,
+            strip_sdp=True, message_type=EIEIOType.KEY_PAYLOAD_32_BIT)
+        graph.add_vertex(gatherer)
+        for vertex in list(graph.vertices)[:-1]:
+            graph.add_edge(MachineEdge(vertex, gatherer), "TRANSMISSION")
+        with self.assertRaises(exceptions.ConfigurationException) as context:
+            save_graph_snapshot(self._directory, graph)
+        self.assertIn("LivePacketGatherMachineVertex", str(context.exception))
+        self.assertFalse(os.path.exists(self._directory))
+
+    def test_unfindable_enum_is_not_saved(self):
+
+        # an enum made in a function cannot be found again by name
+        hidden = Enum(value="HIDDEN", names=[("ONLY", 0)])
+        graph = build_heat_demo_graph(2, 1)
+        vertices = list(graph.vertices)
+        graph.add_edge(
+            HeatDemoEdge(vertices[1], vertices[0], hidden.ONLY), "OTHER")
+        with self.assertRaises(exceptions.ConfigurationException):
+            save_graph_snapshot(self._directory, graph)
+        self.assertFalse(os.path.exists(self._directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
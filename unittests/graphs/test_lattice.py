@@ -0,0 +1,158 @@
+import unittest
+
+import numpy
+
+from spinnaker_graph_front_end.graphs import lattice
+
+from unittests.graph_builder import SimpleVertex, building_graph
+
+# The offset of each direction of the stencils
+_OFFSETS = {
+    "N": (0, 1), "NE": (1, 1), "E": (1, 0), "SE": (1, -1),
+    "S": (0, -1), "SW": (-1, -1), "W": (-1, 0), "NW": (-1, 1)}
+
+
+def _scalar_edges(shape, stencil, wrap, present):
+    """ The edges of a lattice found one cell and direction at a time
+    """
+    width, height = shape
+    wrap_x, wrap_y = wrap
+    edges = set()
+    for x in xrange(width):
+        for y in xrange(height):
+            if not present[x, y]:
+                continue
+            for direction_index, direction in enumerate(
+                    lattice.stencil_directions(stencil)):
+                d_x, d_y = _OFFSETS[direction]
+                dest_x, dest_y = x + d_x, y + d_y
+                if wrap_x:
+                    dest_x %= width
+                if wrap_y:
+                    dest_y %= height
+                if (0 <= dest_x < width and 0 <= dest_y < height and
+                        present[dest_x, dest_y]):
+                    edges.add((
+                        x * height + y, dest_x * height + dest_y,
+                        direction_index))
+    return edges
+
+
+class TestLattice(unittest.TestCase):
+
+    def test_stencil_directions(self):
+        self.assertEqual(
+            ["N", "E", "S", "W"],
+            lattice.stencil_directions(lattice.VON_NEUMANN))
+        self.assertEqual(8, len(lattice.stencil_directions(lattice.MOORE)))
+        with self.assertRaises(ValueError):
+            lattice.stencil_directions("hexagonal")
+
+    def test_torus_edge_counts(self):
+        for stencil, n_neighbours in (
+                (lattice.VON_NEUMANN, 4), (lattice.MOORE, 8)):
+            pre, post, _ = lattice.lattice_edges(
+                (5, 7), stencil, wrap=True)
+            self.assertEqual(5 * 7 * n_neighbours, len(pre))
+            self.assertEqual(
+                [n_neighbours] * 35, numpy.bincount(post).tolist())
+
+    def test_grid_edge_counts(self):
+        pre, _, _ = lattice.lattice_edges(
+            (5, 7), lattice.VON_NEUMANN, wrap=False)
+        self.assertEqual(2 * ((4 * 7) + (5 * 6)), len(pre))
+
+    def test_north_is_increasing_y(self):
+        pre, post, directions = lattice.lattice_edges(
+            (2, 3), lattice.VON_NEUMANN, wrap=False)
+        north = lattice.stencil_directions(lattice.VON_NEUMANN).index("N")
+        self.assertEqual(
+            set([(0, 1), (1, 2), (3, 4), (4, 5)]),
+            set(zip(pre[directions == north].tolist(),
+                    post[directions == north].tolist())))
+
+    def test_against_scalar(self):
+        rng = numpy.random.RandomState(42)
+        for shape in ((1, 1), (1, 4), (3, 2), (4, 5), (6, 6), (3, 3)):
+            for stencil in (lattice.VON_NEUMANN, lattice.MOORE):
+                for wrap in (
+                        (False, False), (True, True), (True, False),
+                        (False, True)):
+                    if any(is_wrapped and size < 3
+                           for is_wrapped, size in zip(wrap, shape)):
+                        continue
+                    for present in (
+                            numpy.ones(shape, dtype=bool),
+                            rng.rand(*shape) < 0.7):
+                        pre, post, directions = lattice.lattice_edges(
+                            shape, stencil, wrap, present)
+                        self.assertEqual(
+                            _scalar_edges(shape, stencil, wrap, present),
+                            set(zip(pre.tolist(), post.tolist(),
+                                    directions.tolist())))
+
+    def test_build_lattice(self):
+        with building_graph() as builder:
+            vertices = lattice.build_lattice(
+                (3, 2),
+                lambda x, y: None if (x, y) == (1, 1) else SimpleVertex(
+                    "cell{}_{}".format(x, y)),
+                stencil=lattice.VON_NEUMANN, wrap=False,
+                partition_id="STATE", direction_param="label",
+                direction_values={
+                    "N": "north", "E": "east", "S": "south", "W": "west"})
+        self.assertEqual((3, 2), vertices.shape)
+        self.assertIsNone(vertices[1, 1])
+        graph = builder.machine_graph
+        self.assertEqual(5, len(list(graph.vertices)))
+        edges = set(
+            (edge.pre_vertex.label, edge.post_vertex.label, edge.label)
+            for edge in graph.edges)
+        self.assertEqual(set([
+            ("cell0_0", "cell0_1", "north"), ("cell0_1", "cell0_0", "south"),
+            ("cell0_0", "cell1_0", "east"), ("cell1_0", "cell0_0", "west"),
+            ("cell1_0", "cell2_0", "east"), ("cell2_0", "cell1_0", "west"),
+            ("cell2_0", "cell2_1", "north"), ("cell2_1", "cell2_0", "south")]),
+            edges)
+
+    def test_short_wrapped_dimensions(self):
+        for shape, wrap in (
+                ((1, 5), True), ((2, 5), (True, False)),
+                ((5, 2), (False, True)), ((5, 1), (True, True))):
+            with self.assertRaises(ValueError):
+                lattice.lattice_edges(shape, lattice.VON_NEUMANN, wrap)
+
+        # an unwrapped short dimension is fine
+        pre, post, _ = lattice.lattice_edges(
+            (1, 5), lattice.VON_NEUMANN, (False, True))
+        self.assertEqual(10, len(pre))
+        self.assertFalse(numpy.any(pre == post))
+
+        # nothing is added when the lattice cannot be built
+        with building_graph() as builder:
+            with self.assertRaises(ValueError):
+                lattice.build_lattice(
+                    (2, 2), lambda x, y: SimpleVertex(), wrap=True)
+        self.assertEqual(0, len(list(builder.machine_graph.vertices)))
+
+    def test_numpy_wrap(self):
+        edges = lattice.lattice_edges((3, 4), lattice.MOORE, True)
+        for wrap in (numpy.bool_(True), numpy.array(True),
+                     numpy.array([True, True])):
+            for expected, found in zip(
+                    edges, lattice.lattice_edges((3, 4), lattice.MOORE, wrap)):
+                self.assertEqual(expected.tolist(), found.tolist())
+        pre, _, _ = lattice.lattice_edges(
+            (3, 4), lattice.VON_NEUMANN, numpy.bool_(False))
+        self.assertEqual(2 * ((2 * 4) + (3 * 3)), len(pre))
+
+    def test_no_self_loops_or_duplicates(self):
+        for stencil in (lattice.VON_NEUMANN, lattice.MOORE):
+            pre, post, _ = lattice.lattice_edges((3, 3), stencil, True)
+            self.assertFalse(numpy.any(pre == post))
+            self.assertEqual(
+                len(pre), len(set(zip(pre.tolist(), post.tolist()))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from enum import Enum
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinnaker_graph_front_end.examples.heat_demo.heat_demo_edge\
+    import HeatDemoEdge
+from spinnaker_graph_front_end.graphs.graph_class_registry \
+    import default_registry
+from spinnaker_graph_front_end.graphs.xml_graph_reader import XMLGraphReader
+from spinnaker_graph_front_end.graphs.xml_graph_writer import XMLGraphWriter
+
+from unittests.graph_builder import building_graph
+from unittests.graphs.heat_demo_graph import \
+    build_heat_demo_graph, describe_graph, heat_demo_registry
+
+_HEAT_DEMO = "spinnaker_graph_front_end.examples.heat_demo."
+
+_HEAT_ELEMENT = "unittests.graphs.heat_demo_graph.HeatElement"
+
+# An edge file written by hand, with an enum parameter which has no class
+_EDGE_WITHOUT_ENUM_CLASS = """<graph type="machine">
+  <vertex id="0" class="{1}" label="a">
+    <param name="heat_temperature" type="int">1</param>
+  </vertex>
+  <vertex id="1" class="{1}" label="b"/>
+  <edge pre="0" post="1" partition="TRANSMISSION"
+      class="{0}heat_demo_edge.HeatDemoEdge">
+    <param name="direction" type="enum">SOUTH</param>
+  </edge>
+</graph>
+""".format(_HEAT_DEMO, _HEAT_ELEMENT)
+
+
+class TestXMLGraph(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "graph.xml")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _read(self, registry=None):
+        if registry is None:
+            registry = heat_demo_registry()
+        with building_graph() as builder:
+            XMLGraphReader(registry, batch_size=4).read(self._path, builder)
+        return builder.machine_graph
+
+    def test_heat_demo_round_trip(self):
+        graph = build_heat_demo_graph()
+        with XMLGraphWriter(self._path, label="heat") as writer:
+            writer.write_graph(graph)
+        self.assertEqual(describe_graph(graph), describe_graph(self._read()))
+
+    def test_enum_written_with_class(self):
+        graph = build_heat_demo_graph(2, 1)
+        with XMLGraphWriter(self._path) as writer:
+            writer.write_graph(graph)
+        with open(self._path) as f:
+            text = f.read()
+        self.assertIn(
+            'class="{}heat_demo_edge.HeatDemoEdge.DIRECTIONS"'.format(
+                _HEAT_DEMO), text)
+        self.assertIn(
+            'class="pacman.model.graphs.common.edge_traffic_type'
+            '.EdgeTrafficType"', text)
+
+    def test_enum_without_class(self):
+        with open(self._path, "w") as f:
+            f.write(_EDGE_WITHOUT_ENUM_CLASS)
+        with self.assertRaises(exceptions.ConfigurationException):
+            self._read()
+
+        # a converter reads the member name instead
+        registry = heat_demo_registry()
+        registry.register(HeatDemoEdge, converters={
+            "direction": lambda name: HeatDemoEdge.DIRECTIONS[name]})
+        graph = self._read(registry)
+        edges = list(graph.edges)
+        self.assertEqual(1, len(edges))
+        self.assertIs(HeatDemoEdge.DIRECTIONS.SOUTH, edges[0].direction)
+        self.assertEqual(
+            [("a", 1), ("b", 0)],
+            sorted((vertex.label, vertex.heat_temperature)
+                   for vertex in graph.vertices))
+
+    def test_unregistered_class_outside_allowed_packages(self):
+        graph = build_heat_demo_graph(2, 1)
+        with XMLGraphWriter(self._path) as writer:
+            writer.write_graph(graph)
+
+        # the default registry only imports classes of the tool chain
+        with self.assertRaises(KeyError):
+            self._read(default_registry())
+
+    def test_unknown_enum_member(self):
+        with open(self._path, "w") as f:
+            f.write(_EDGE_WITHOUT_ENUM_CLASS.replace(
+                'type="enum"', 'type="enum" class="{}heat_demo_edge.'
+                'HeatDemoEdge.DIRECTIONS"'.format(_HEAT_DEMO)).replace(
+                    "SOUTH", "UP"))
+        with self.assertRaises(exceptions.ConfigurationException):
+            self._read()
+
+    def test_unfindable_enum_is_not_written(self):
+
+        # an enum made in a function cannot be found again by name
+        hidden = Enum(value="HIDDEN", names=[("ONLY", 0)])
+        with XMLGraphWriter(self._path) as writer:
+            first = writer.write_vertex(_HEAT_ELEMENT)
+            with self.assertRaises(TypeError):
+                writer.write_edge(
+                    first, first, "TRANSMISSION", HeatDemoEdge,
+                    {"direction": hidden.ONLY})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+
+from spinn_front_end_common.abstract_models\
+    .abstract_generates_data_specification \
+    import AbstractGeneratesDataSpecification
+
+from spinnaker_graph_front_end.interface_functions \
+    import graph_front_end_parallel_data_specification_writer as parallel
+from spinnaker_graph_front_end.interface_functions\
+    .graph_front_end_data_specification_writer \
+    import GraphFrontEndDataSpecificationWriter
+from spinnaker_graph_front_end.utilities.conf import config
+
+from unittests.graph_builder import SimpleVertex
+
+
+class SpecVertex(SimpleVertex, AbstractGeneratesDataSpecification):
+    """ A vertex whose specification holds its value and where it is placed
+    """
+
+    def generate_data_specification(self, spec, placement):
+        spec.reserve_memory_region(0, 12)
+        spec.switch_write_focus(0)
+        spec.write_value(self.value)
+        spec.write_value((placement.x << 8) | placement.y)
+        spec.write_value(placement.p)
+        spec.end_specification()
+
+
+def _build(n_vertices):
+    graph = MachineGraph("test")
+    placements = Placements()
+    for index in xrange(n_vertices):
+        vertex = SpecVertex("v{}".format(index), value=index * 3)
+        graph.add_vertex(vertex)
+        placements.add_placement(
+            Placement(vertex, index % 2, index // 32, (index // 2) % 16 + 1))
+    return graph, placements
+
+
+class TestShards(unittest.TestCase):
+
+    def test_every_item_once(self):
+        for n_items in (0, 1, 5, 16, 17, 100):
+            for n_shards in (0, 1, 3, 4, 16, 200):
+                shards = parallel._shards(n_items, n_shards)
+                indices = [index for shard in shards for index in shard]
+                self.assertEqual(range(n_items), indices)
+                self.assertTrue(all(len(shard) > 0 for shard in shards))
+                self.assertLessEqual(len(shards), max(1, n_shards))
+
+
+class TestParallelDataSpecificationWriter(unittest.TestCase):
+
+    _OPTIONS = [
+        ("SpecExecution", "dsg_processes"),
+        ("SpecExecution", "use_spec_templates")]
+
+    def setUp(self):
+        self._old_options = [
+            (section, option, config.get(section, option))
+            for section, option in self._OPTIONS]
+        config.set("SpecExecution", "use_spec_templates", "False")
+        self._directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for section, option, value in self._old_options:
+            config.set(section, option, value)
+        shutil.rmtree(self._directory)
+
+    def _write(self, writer, graph, placements, name):
+        folder = os.path.join(self._directory, name)
+        os.mkdir(folder)
+        targets = writer(
+            placements, graph, "host", self._directory, False, folder)
+        contents = dict()
+        for core, path in targets.iteritems():
+            self.assertEqual(folder, os.path.dirname(path))
+            with open(path, "rb") as f:
+                contents[core] = f.read()
+        return contents
+
+    def _check_matches_serial(self, n_processes, n_vertices=37):
+        graph, placements = _build(n_vertices)
+        serial = self._write(
+            GraphFrontEndDataSpecificationWriter(), graph, placements,
+            "serial")
+        config.set("SpecExecution", "dsg_processes", str(n_processes))
+        sharded = self._write(
+            parallel.GraphFrontEndParallelDataSpecificationWriter(), graph,
+            placements, "parallel")
+
+        # every placement has its own specification, as the serial writer
+        # generates it
+        self.assertEqual(
+            set((placement.x, placement.y, placement.p)
+                for placement in placements.placements),
+            set(sharded.keys()))
+        self.assertEqual(serial, sharded)
+        self.assertEqual(n_vertices, len(set(sharded.values())))
+
+    def test_processes(self):
+        self._check_matches_serial(3)
+
+    def test_more_processes_than_placements(self):
+        self._check_matches_serial(8, n_vertices=3)
+
+    def test_one_process(self):
+        self._check_matches_serial(1)
+
+    def test_number_of_processes(self):
+        get_n_processes = parallel\
+            .GraphFrontEndParallelDataSpecificationWriter._get_n_processes
+        config.set("SpecExecution", "dsg_processes", "3")
+        self.assertEqual(3, get_n_processes(10))
+        self.assertEqual(2, get_n_processes(2))
+        self.assertEqual(1, get_n_processes(0))
+        config.set("SpecExecution", "dsg_processes", "0")
+        self.assertGreaterEqual(get_n_processes(1000), 1)
+
+    def test_without_fork(self):
+
+        # where processes cannot be forked, everything is generated here
+        fork = os.fork
+        del os.fork
+        try:
+            config.set("SpecExecution", "dsg_processes", "4")
+            self.assertEqual(
+                1, parallel.GraphFrontEndParallelDataSpecificationWriter
+                ._get_n_processes(10))
+            self._check_matches_serial(4)
+        finally:
+            os.fork = fork
+
+
+if __name__ == "__main__":
+    unittest.main()
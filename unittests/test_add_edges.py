@@ -0,0 +1,89 @@
+import unittest
+
+import numpy
+
+import spinnaker_graph_front_end as front_end
+
+from unittests.graph_builder import SimpleVertex, building_graph
+
+
+class TestAddEdges(unittest.TestCase):
+
+    def test_end_points(self):
+        with building_graph() as builder:
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 4)
+            edges = front_end.add_machine_edges_from_arrays(
+                vertices, [0, 1, 2], [1, 2, 3], "DATA")
+        self.assertEqual(
+            [(vertices[0], vertices[1]), (vertices[1], vertices[2]),
+             (vertices[2], vertices[3])],
+            [(edge.pre_vertex, edge.post_vertex) for edge in edges])
+        self.assertEqual(set(edges), set(builder.machine_graph.edges))
+
+    def test_flattened_vertices(self):
+        with building_graph():
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 4)
+            grid = numpy.empty((2, 2), dtype=object)
+            grid.ravel()[:] = vertices
+            edges = front_end.add_machine_edges_from_arrays(
+                grid, numpy.array([[0], [3]]), numpy.array([[2], [1]]),
+                "DATA")
+        self.assertEqual(
+            [(vertices[0], vertices[2]), (vertices[3], vertices[1])],
+            [(edge.pre_vertex, edge.post_vertex) for edge in edges])
+
+    def test_default_labels_continue(self):
+        with building_graph():
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            first = front_end.add_machine_edges_from_arrays(
+                vertices, [0, 1], [1, 0], "DATA")
+            second = front_end.add_machine_edges_from_arrays(
+                vertices, [0], [1], "OTHER")
+        self.assertEqual(
+            ["Edge 0", "Edge 1", "Edge 2"],
+            [edge.label for edge in first + second])
+
+    def test_given_labels(self):
+        with building_graph():
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            edges = front_end.add_machine_edges_from_arrays(
+                vertices, [0, 1], [1, 0], "DATA",
+                extra_columns={"label": ["forward", "back"]})
+            same = front_end.add_machine_edges_from_arrays(
+                vertices, [0, 1], [1, 0], "OTHER",
+                extra_columns={"label": "link"})
+        self.assertEqual(["forward", "back"], [edge.label for edge in edges])
+        self.assertEqual(["link", "link"], [edge.label for edge in same])
+
+    def test_mismatched_indices(self):
+        with building_graph():
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            with self.assertRaises(ValueError):
+                front_end.add_machine_edges_from_arrays(
+                    vertices, [0, 1], [1], "DATA")
+
+    def test_negative_index(self):
+        with building_graph() as builder:
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            with self.assertRaises(ValueError):
+                front_end.add_machine_edges_from_arrays(
+                    vertices, [0, -1], [1, 0], "DATA")
+            with self.assertRaises(ValueError):
+                front_end.add_machine_edges_from_arrays(
+                    vertices, [0], [-2], "DATA")
+        self.assertEqual(0, len(list(builder.machine_graph.edges)))
+
+    def test_missing_vertex(self):
+        with building_graph() as builder:
+            vertices = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            grid = numpy.empty(3, dtype=object)
+            grid[:2] = vertices
+            front_end.add_machine_edges_from_arrays(grid, [0], [1], "DATA")
+            with self.assertRaises(ValueError):
+                front_end.add_machine_edges_from_arrays(
+                    grid, [0], [2], "DATA")
+        self.assertEqual(1, len(list(builder.machine_graph.edges)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy
+
+from pacman.model.constraints.placer_constraints\
+    .placer_chip_and_core_constraint import PlacerChipAndCoreConstraint
+
+import spinnaker_graph_front_end as front_end
+
+from unittests.graph_builder import SimpleVertex, building_graph
+
+
+class TestAddVertices(unittest.TestCase):
+
+    def test_columns(self):
+        with building_graph() as builder:
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {"value": numpy.arange(4) * 2}, 4,
+                labels=["a", "b", "c", "d"])
+        self.assertEqual([0, 2, 4, 6], [vertex.value for vertex in vertices])
+        self.assertEqual(
+            ["a", "b", "c", "d"], [vertex.label for vertex in vertices])
+        self.assertEqual(
+            set(vertices), set(builder.machine_graph.vertices))
+
+    def test_scalar_params(self):
+        with building_graph():
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {"value": 3}, 3)
+        self.assertEqual([3, 3, 3], [vertex.value for vertex in vertices])
+
+    def test_default_labels_continue(self):
+        with building_graph():
+            first = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+            front_end.add_machine_vertex(SimpleVertex, {})
+            second = front_end.add_machine_vertices(SimpleVertex, {}, 2)
+        self.assertEqual(
+            ["Vertex 0", "Vertex 1", "Vertex 3", "Vertex 4"],
+            [vertex.label for vertex in first + second])
+
+    def test_format_labels_continue(self):
+        with building_graph():
+            first = front_end.add_machine_vertices(
+                SimpleVertex, {}, 2, labels="Cell {}")
+            second = front_end.add_machine_vertices(
+                SimpleVertex, {}, 3, labels="Cell {}")
+        labels = [vertex.label for vertex in first + second]
+        self.assertEqual(len(labels), len(set(labels)))
+        self.assertEqual(
+            ["Cell 0", "Cell 1", "Cell 2", "Cell 3", "Cell 4"], labels)
+
+    def test_params_label(self):
+        with building_graph():
+
+            # a label in the params is not a format
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {"label": "Cell {}"}, 2)
+            self.assertEqual(
+                ["Cell {}", "Cell {}"], [vertex.label for vertex in vertices])
+
+            # a column of labels in the params is used as given
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {"label": numpy.array(["x", "y"])}, 2)
+            self.assertEqual(["x", "y"], [vertex.label for vertex in vertices])
+
+            # the labels argument takes the place of a label in the params
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {"label": "ignored"}, 1, labels=["z"])
+            self.assertEqual(["z"], [vertex.label for vertex in vertices])
+
+    def test_constraints(self):
+        constraints = [PlacerChipAndCoreConstraint(0, 0)]
+        with building_graph():
+            vertices = front_end.add_machine_vertices(
+                SimpleVertex, {}, 2, constraints=constraints)
+        for vertex in vertices:
+            self.assertEqual(constraints, list(vertex.constraints))
+
+    def test_wrong_number_of_labels(self):
+        with building_graph():
+            with self.assertRaises(ValueError):
+                front_end.add_machine_vertices(
+                    SimpleVertex, {}, 3, labels=["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
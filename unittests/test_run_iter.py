@@ -0,0 +1,112 @@
+import unittest
+
+import numpy
+
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinnaker_graph_front_end.spinnaker import SpiNNaker
+
+
+class _ChunkedSpiNNaker(SpiNNaker):
+    """ Counts the time steps run rather than running them
+    """
+
+    def __init__(self):
+        self._machine_time_step = 1000
+        self._current_run_timesteps = 0
+        self._use_virtual_board = True
+        self.run_times = list()
+
+    def run(self, run_time):
+        self.run_times.append(run_time)
+        self._current_run_timesteps += int(
+            (run_time * 1000.0) / self._machine_time_step)
+
+
+class _GrowingVertex(object):
+    """ Records its time steps in storage which is moved to a larger array\
+        as it grows, reusing the old array, and hands out that storage\
+        itself when its data is read
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.storage = numpy.zeros(0, dtype="<u4")
+
+    def record(self, first_step, n_steps):
+        old_storage = self.storage
+        self.storage = numpy.concatenate((
+            old_storage,
+            numpy.arange(first_step, first_step + n_steps, dtype="<u4")))
+        old_storage[:] = 0xFFFFFFFF
+
+    def get_data_array(self, buffer_manager, placement, region, dtype):
+        return self.storage
+
+
+class _RecordingSpiNNaker(_ChunkedSpiNNaker):
+    """ Records the time steps run by each of a number of vertices rather\
+        than running them
+    """
+
+    def __init__(self, vertices):
+        _ChunkedSpiNNaker.__init__(self)
+        self._use_virtual_board = False
+        self._buffer_manager = None
+        self._machine = None
+        self._placements = Placements([
+            Placement(vertex, 0, 0, index + 1)
+            for index, vertex in enumerate(vertices)])
+
+    def run(self, run_time):
+        first_step = self._current_run_timesteps
+        _ChunkedSpiNNaker.run(self, run_time)
+        for placement in self._placements.placements:
+            placement.vertex.record(
+                first_step, self._current_run_timesteps - first_step)
+
+
+class TestRunIter(unittest.TestCase):
+
+    def test_chunks(self):
+        spinnaker = _ChunkedSpiNNaker()
+        chunks = [
+            (first_step, n_steps)
+            for first_step, n_steps, _ in spinnaker.run_iter(
+                25, 10, [], 0, "<u4")]
+        self.assertEqual([(0, 10), (10, 10), (20, 5)], chunks)
+        self.assertEqual(25, spinnaker._current_run_timesteps)
+
+    def test_chunks_run_when_asked_for(self):
+        spinnaker = _ChunkedSpiNNaker()
+        chunks = spinnaker.run_iter(30, 10, [], 0, "<u4")
+        self.assertEqual([], spinnaker.run_times)
+        next(chunks)
+        self.assertEqual(1, len(spinnaker.run_times))
+        self.assertEqual(10, spinnaker._current_run_timesteps)
+
+    def test_chunk_data_not_changed_by_later_chunks(self):
+        vertices = [_GrowingVertex("v0"), _GrowingVertex("v1")]
+        spinnaker = _RecordingSpiNNaker(vertices)
+        chunks = list(spinnaker.run_iter(25, 10, vertices, 0, "<u4"))
+        self.assertEqual([0, 10, 20], [chunk[0] for chunk in chunks])
+        for first_step, n_steps, data in chunks:
+            for vertex in vertices:
+                self.assertEqual(
+                    range(first_step, first_step + n_steps),
+                    data[vertex].tolist())
+
+    def test_arguments_checked_when_called(self):
+        spinnaker = _ChunkedSpiNNaker()
+        with self.assertRaises(exceptions.ConfigurationException):
+            spinnaker.run_iter(None, 10, [], 0, "<u4")
+        with self.assertRaises(exceptions.ConfigurationException):
+            spinnaker.run_iter(100, 0, [], 0, "<u4")
+        self.assertEqual([], spinnaker.run_times)
+
+
+if __name__ == "__main__":
+    unittest.main()
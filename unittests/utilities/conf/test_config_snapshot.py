@@ -0,0 +1,126 @@
+import ConfigParser
+import unittest
+
+from spinnaker_graph_front_end.utilities.conf import config_snapshot
+from spinnaker_graph_front_end.utilities.conf.config_snapshot import \
+    ConfigSnapshot, parse_value
+
+
+def _conf(sections):
+    conf = ConfigParser.RawConfigParser()
+    for section, options in sections.iteritems():
+        conf.add_section(section)
+        for option, value in options.iteritems():
+            conf.set(section, option, value)
+    return conf
+
+
+class TestParseValue(unittest.TestCase):
+
+    def test_types(self):
+        self.assertEqual(12, parse_value("12", int))
+        self.assertEqual(0.5, parse_value("0.5", float))
+        self.assertEqual("12", parse_value("12", str))
+        for text in ("True", "yes", "on", "1"):
+            self.assertIs(True, parse_value(text, bool))
+        for text in ("false", "No", "off", "0"):
+            self.assertIs(False, parse_value(text, bool))
+
+    def test_none(self):
+        for value_type in (int, float, bool, str):
+            self.assertIsNone(parse_value("None", value_type))
+
+    def test_unknown_type_is_text(self):
+        for text in ("None", "12", "True", "0.0.0.0"):
+            self.assertEqual(text, parse_value(text))
+
+    def test_bad_values(self):
+        with self.assertRaises(ValueError):
+            parse_value("1.5", int)
+        with self.assertRaises(ValueError):
+            parse_value("maybe", bool)
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+    def test_schema(self):
+        snapshot = ConfigSnapshot(_conf({
+            "Buffers": {
+                "receive_buffer_port": "None",
+                "receive_buffer_host": "0.0.0.0",
+                "enable_buffered_recording": "False",
+                "time_between_requests": "50",
+                "buffer_size_before_receive": "16384",
+                "unknown_option": "10"},
+            "Machine": {
+                "machineName": "192.168.240.1",
+                "machineTimeStep": "1000",
+                "virtual_board": "True"},
+            "Other": {"number": "3"}}))
+        buffers = snapshot.buffers
+        self.assertIsNone(buffers.receive_buffer_port)
+        self.assertEqual("0.0.0.0", buffers.receive_buffer_host)
+        self.assertIs(False, buffers.enable_buffered_recording)
+        self.assertEqual(50, buffers.time_between_requests)
+        self.assertEqual(16384, buffers.buffer_size_before_receive)
+
+        # options outside the schema are kept as text
+        self.assertEqual("10", buffers.unknown_option)
+        self.assertEqual("3", snapshot.other.number)
+
+        # the options are found by their names in lower case
+        self.assertEqual("192.168.240.1", snapshot.machine.machinename)
+        self.assertEqual(1000, snapshot.machine.machinetimestep)
+        self.assertIs(True, snapshot.machine.virtual_board)
+
+    def test_text_that_looks_like_a_number(self):
+        snapshot = ConfigSnapshot(_conf({
+            "Machine": {"machineName": "1234"},
+            "Buffers": {"receive_buffer_host": "10"}}))
+        self.assertEqual("1234", snapshot.machine.machinename)
+        self.assertEqual("10", snapshot.buffers.receive_buffer_host)
+
+    def test_bad_value(self):
+        conf = _conf({"Buffers": {"time_between_requests": "often"}})
+        with self.assertRaises(ValueError) as context:
+            ConfigSnapshot(conf)
+        self.assertIn("time_between_requests", str(context.exception))
+
+    def test_given_schema(self):
+        snapshot = ConfigSnapshot(
+            _conf({"Buffers": {"time_between_requests": "50"},
+                   "Other": {"rate": "0.25"}}),
+            {"Other": {"rate": float}})
+        self.assertEqual(0.25, snapshot.other.rate)
+        self.assertEqual("50", snapshot.buffers.time_between_requests)
+
+    def test_read_only(self):
+        snapshot = ConfigSnapshot(_conf({"Buffers": {
+            "time_between_requests": "50"}}))
+        with self.assertRaises(AttributeError):
+            snapshot.buffers = None
+        with self.assertRaises(AttributeError):
+            snapshot.buffers.time_between_requests = 10
+        with self.assertRaises(AttributeError):
+            snapshot.machine
+        with self.assertRaises(AttributeError):
+            snapshot.buffers.no_such_option
+        self.assertIn("Buffers", snapshot)
+        self.assertIn("time_between_requests", snapshot.buffers)
+        self.assertEqual(["buffers"], list(snapshot))
+
+    def test_default_config(self):
+
+        # every option of the schema in the default config has its type
+        from spinnaker_graph_front_end.utilities.conf import config
+        snapshot = ConfigSnapshot(config)
+        for section, types in config_snapshot.SCHEMA.iteritems():
+            options = getattr(snapshot, section.lower())
+            for option in options:
+                value = getattr(options, option)
+                if option in types and value is not None:
+                    self.assertIsInstance(value, types[option])
+
+
+if __name__ == "__main__":
+    unittest.main()
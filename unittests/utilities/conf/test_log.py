@@ -0,0 +1,165 @@
+import ConfigParser
+import logging
+import sys
+import unittest
+
+from spinnaker_graph_front_end.utilities.conf import _LazyConfigParser
+from spinnaker_graph_front_end.utilities.conf.log import ConfiguredFilter, \
+    QueueHandler, QueueListener, RecordQueue, levels
+
+
+def _record(name, level):
+    return logging.LogRecord(name, level, __file__, 0, "message", (), None)
+
+
+def _logging_conf(conf, default="info", **module_levels):
+    conf.add_section("Logging")
+    conf.set("Logging", "default", default)
+    for level, modules in module_levels.iteritems():
+        conf.set("Logging", level, modules)
+    return conf
+
+
+def _loaded_config():
+    """ A config of the front end which does not read the config files
+    """
+    conf = _LazyConfigParser()
+    conf._is_loaded = True
+    return conf
+
+
+def _scalar_level(conf, name):
+    """ The level of a logger name, found by searching the options for its\
+        deepest parent
+    """
+    while True:
+        for level in levels:
+            if conf.has_option("Logging", level) and name in [
+                    module.strip() for module in
+                    conf.get("Logging", level).split(",")]:
+                return levels[level]
+        if "." not in name:
+            return levels[conf.get("Logging", "default")]
+        name = name.rpartition(".")[0]
+
+
+class TestConfiguredFilter(unittest.TestCase):
+
+    def test_levels_against_scalar(self):
+        conf = _logging_conf(
+            ConfigParser.RawConfigParser(), default="warning",
+            debug="a.b, c", error="a.b.c, a", info="a.b.c.d")
+        log_filter = ConfiguredFilter(conf)
+        names = ["a", "a.x", "a.b", "a.b.x", "a.b.c", "a.b.c.x", "a.b.c.d",
+                 "a.b.c.d.e", "ab", "b", "c", "c.a.b", "x.a"]
+        for name in names:
+            for level in sorted(levels.itervalues()):
+
+                # twice, so the second is found in the cache
+                for _ in xrange(2):
+                    self.assertEqual(
+                        level >= _scalar_level(conf, name),
+                        log_filter.filter(_record(name, level)), name)
+
+    def test_levels_cached(self):
+        conf = _logging_conf(ConfigParser.RawConfigParser(), debug="a")
+        log_filter = ConfiguredFilter(conf)
+        self.assertTrue(log_filter.filter(_record("a.b", logging.DEBUG)))
+        self.assertEqual(
+            {"a.b": logging.DEBUG}, log_filter._logger_levels)
+
+        # a config without a snapshot is not read again
+        conf.set("Logging", "debug", "")
+        self.assertTrue(log_filter.filter(_record("a.b", logging.DEBUG)))
+
+    def test_cache_dropped_when_config_changes(self):
+        conf = _logging_conf(_loaded_config(), debug="a")
+        log_filter = ConfiguredFilter(conf)
+        self.assertTrue(log_filter.filter(_record("a.b", logging.DEBUG)))
+        self.assertFalse(log_filter.filter(_record("x", logging.DEBUG)))
+
+        conf.set("Logging", "error", "a.b")
+        conf.set("Logging", "debug", "a, x")
+        self.assertFalse(log_filter.filter(_record("a.b", logging.WARNING)))
+        self.assertTrue(log_filter.filter(_record("a.c", logging.DEBUG)))
+        self.assertTrue(log_filter.filter(_record("x", logging.DEBUG)))
+
+        conf.remove_option("Logging", "error")
+        self.assertTrue(log_filter.filter(_record("a.b", logging.WARNING)))
+
+    def test_cache_kept_while_config_unchanged(self):
+        conf = _logging_conf(_loaded_config(), debug="a")
+        log_filter = ConfiguredFilter(conf)
+        log_filter.filter(_record("a.b", logging.DEBUG))
+        levels_seen = log_filter._logger_levels
+        log_filter.filter(_record("a.c", logging.DEBUG))
+        self.assertIs(levels_seen, log_filter._logger_levels)
+        self.assertEqual(["a.b", "a.c"], sorted(levels_seen))
+
+
+class _ListHandler(logging.Handler):
+    """ Keeps the formatted records it is given
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = list()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class TestQueueHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = RecordQueue()
+        self.handler = QueueHandler(self.queue)
+
+    def test_arguments_merged(self):
+        items = [1, 2]
+        record = logging.LogRecord(
+            "a", logging.INFO, __file__, 0, "items %s of %d", (items, 3),
+            None)
+        self.handler.emit(record)
+        items.append(3)
+
+        # the message is as it was when logged, and the record given to
+        # the other handlers is not changed
+        queued, = self.queue.get_all()
+        self.assertIsNot(record, queued)
+        self.assertEqual("items [1, 2] of 3", queued.msg)
+        self.assertIsNone(queued.args)
+        self.assertEqual("items [1, 2] of 3", queued.getMessage())
+        self.assertEqual((items, 3), record.args)
+
+    def test_traceback_made_text(self):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            record = logging.LogRecord(
+                "a", logging.ERROR, __file__, 0, "failed", (),
+                sys.exc_info())
+        self.handler.emit(record)
+        queued, = self.queue.get_all()
+        self.assertIsNone(queued.exc_info)
+        self.assertIn("ValueError: bad value", queued.exc_text)
+        self.assertIsNotNone(record.exc_info)
+
+    def test_listener_writes_prepared_records(self):
+        written = _ListHandler()
+        listener = QueueListener(self.queue, written)
+        listener.start()
+        logger = logging.Logger("queued")
+        logger.addHandler(self.handler)
+        try:
+            raise KeyError("missing")
+        except KeyError:
+            logger.exception("step %d failed", 4)
+        listener.stop()
+        self.assertEqual(1, len(written.messages))
+        self.assertTrue(written.messages[0].startswith("step 4 failed\n"))
+        self.assertIn("KeyError: 'missing'", written.messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
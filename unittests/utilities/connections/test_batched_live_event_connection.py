@@ -0,0 +1,116 @@
+import socket
+import threading
+import unittest
+
+import numpy
+
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+from spinnaker_graph_front_end.utilities.connections\
+    .batched_live_event_connection import BatchedLiveEventConnection, \
+    RawEIEIOConnection
+
+
+def _free_port():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+class _DatabaseReader(object):
+    """ Gives the details of two vertices which send to the same port, with\
+        a key for each of their atoms
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.keys = {
+            "first": {0x10000 + atom: atom for atom in xrange(4)},
+            "second": {0x20000 + atom: atom for atom in xrange(3)}}
+
+    def get_configuration_parameter_value(self, name):
+        return {"runtime": 100.0, "machine_time_step": 1000}[name]
+
+    def get_live_output_details(self, label, live_packet_gather_label):
+        return "127.0.0.1", self.port, True
+
+    def get_key_to_atom_id_mapping(self, label):
+        return self.keys[label]
+
+
+class TestBatchedLiveEventConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = BatchedLiveEventConnection(
+            "LiveSpikeReceiver", receive_labels=["first", "second"],
+            local_port=_free_port())
+        self.reader = _DatabaseReader(_free_port())
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_receivers_made_from_database(self):
+        sizes = dict()
+        self.connection.add_init_callback(
+            "second", lambda label, size, *_: sizes.update({label: size}))
+        self.connection._read_database_callback(self.reader)
+        self.assertEqual({"second": 3}, sizes)
+
+        # the vertices share a port, which is bound once by a raw receiver
+        self.assertEqual([self.reader.port], self.connection._receivers.keys())
+        self.assertIsInstance(
+            self.connection._receivers[self.reader.port], RawEIEIOConnection)
+        self.assertEqual(
+            [self.reader.port], self.connection._listeners.keys())
+
+        label_ids, atom_ids = self.connection.key_index.lookup(
+            numpy.array([0x10002, 0x20001, 0x30000], dtype="uint32"))
+        self.assertEqual([0, 1, -1], label_ids.tolist())
+        self.assertEqual(2, atom_ids[0])
+        self.assertEqual(1, atom_ids[1])
+
+    def test_packets_received(self):
+        received = threading.Event()
+        batches = list()
+
+        def receive(batch):
+            batches.append(batch)
+            received.set()
+        self.connection.add_batch_receive_callback(receive)
+        self.connection._read_database_callback(self.reader)
+
+        keys = numpy.array([0x10003, 0x30000, 0x20000], dtype="<u4")
+        header = EIEIODataHeader(EIEIOType.KEY_32_BIT, count=len(keys))
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sender.sendto(
+                header.bytestring + keys.tostring(),
+                ("127.0.0.1", self.reader.port))
+        finally:
+            sender.close()
+        self.assertTrue(received.wait(5.0))
+
+        # the key of no vertex is dropped
+        batch = batches[0]
+        self.assertEqual([0x10003, 0x20000], batch.keys.tolist())
+        self.assertEqual(["first", "second"], [
+            batch.labels[label_id] for label_id in batch.label_ids])
+        self.assertEqual([3, 0], batch.atom_ids.tolist())
+
+    def test_read_again(self):
+        self.connection._read_database_callback(self.reader)
+        old_receiver = self.connection._receivers[self.reader.port]
+
+        # a second run binds the port again once the old receiver is closed
+        self.connection._read_database_callback(self.reader)
+        self.assertIsNot(
+            old_receiver, self.connection._receivers[self.reader.port])
+        self.assertEqual(1, len(self.connection._receivers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import time
+import unittest
+
+import numpy
+
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+from spinnaker_graph_front_end.utilities.connections.live_event_injector \
+    import LiveEventInjector
+
+
+class _Sender(object):
+    """ Keeps the packets sent rather than sending them, failing to send\
+        those with a key in a set of keys
+    """
+
+    def __init__(self, failing_keys=()):
+        self.packets = list()
+        self.failing_keys = set(failing_keys)
+
+    def send_to(self, data, address):
+        if self.failing_keys.intersection(_decode(data)[1]):
+            raise IOError("Not sent")
+        self.packets.append(data)
+
+    def close(self):
+        pass
+
+
+def _decode(data):
+    """ Get the header and the full keys of a packet
+    """
+    header = EIEIODataHeader.from_bytestring(data, 0)
+    if header.eieio_type == EIEIOType.KEY_16_BIT:
+        keys = numpy.frombuffer(
+            data, dtype="<u2", count=header.count, offset=header.size)
+        keys = keys.astype("uint32") | (header.prefix << 16)
+    elif header.eieio_type == EIEIOType.KEY_PAYLOAD_32_BIT:
+        keys = numpy.frombuffer(
+            data, dtype="<u4", count=header.count * 2,
+            offset=header.size)[::2]
+    else:
+        keys = numpy.frombuffer(
+            data, dtype="<u4", count=header.count, offset=header.size)
+    return header, keys.tolist()
+
+
+class TestLiveEventInjector(unittest.TestCase):
+
+    def _injector(self, **kwargs):
+        injector = LiveEventInjector("127.0.0.1", 12345, **kwargs)
+        injector._connection.close()
+        injector._connection = _Sender()
+        self.addCleanup(injector.close)
+        return injector
+
+    def _packets(self, injector, keys, payloads=None):
+        """ Get the header, keys and number of events of each packet of a\
+            time step
+        """
+        packets = injector._pack(
+            numpy.asarray(keys, dtype="uint32"),
+            None if payloads is None else numpy.asarray(
+                payloads, dtype="uint32"))
+        return [_decode(data) + (n_events,) for data, n_events in packets]
+
+    def test_keys_grouped_by_prefix(self):
+        injector = self._injector()
+        packets = self._packets(
+            injector, [0x20001, 0x10005, 0x30000, 0x10006, 0x20002, 0x50000])
+        self.assertEqual(3, len(packets))
+
+        # the keys which share their upper halves with others are sent as
+        # 16-bit keys with a prefix, in the order given
+        for (header, keys, n_events), prefix, expected in zip(
+                packets[:2], [0x1, 0x2],
+                [[0x10005, 0x10006], [0x20001, 0x20002]]):
+            self.assertEqual(EIEIOType.KEY_16_BIT, header.eieio_type)
+            self.assertEqual(prefix, header.prefix)
+            self.assertEqual(expected, keys)
+            self.assertEqual(len(expected), n_events)
+
+        # the others are sent together as 32-bit keys
+        header, keys, n_events = packets[2]
+        self.assertEqual(EIEIOType.KEY_32_BIT, header.eieio_type)
+        self.assertIsNone(header.prefix)
+        self.assertEqual([0x30000, 0x50000], keys)
+        self.assertEqual(2, n_events)
+
+    def test_prefixed_packets_limited_to_126_keys(self):
+        keys = numpy.arange(300) + 0x70000
+        packets = self._packets(self._injector(), keys)
+        self.assertEqual(
+            [126, 126, 48], [header.count for header, _, _ in packets])
+        self.assertEqual(
+            keys.tolist(), sum([packet[1] for packet in packets], []))
+        for header, _, _ in packets:
+            self.assertLessEqual(
+                header.size + header.count * 2, 256)
+
+    def test_full_key_packets_limited_to_63_keys(self):
+
+        # no two keys share their upper halves
+        keys = (numpy.arange(130) << 16) + 3
+        packets = self._packets(self._injector(), keys)
+        self.assertEqual(
+            [63, 63, 4], [header.count for header, _, _ in packets])
+        self.assertEqual(
+            [EIEIOType.KEY_32_BIT] * 3,
+            [header.eieio_type for header, _, _ in packets])
+        self.assertEqual(
+            keys.tolist(), sum([packet[1] for packet in packets], []))
+
+    def test_no_prefix(self):
+        packets = self._packets(
+            self._injector(use_prefix=False), numpy.arange(70) + 0x10000)
+        self.assertEqual([63, 7], [header.count for header, _, _ in packets])
+        self.assertEqual(
+            [None, None], [header.prefix for header, _, _ in packets])
+
+    def test_payloads(self):
+        keys = numpy.arange(40) + 0x10000
+        packets = self._packets(self._injector(), keys, keys * 2)
+        self.assertEqual(
+            [EIEIOType.KEY_PAYLOAD_32_BIT] * 2,
+            [header.eieio_type for header, _, _ in packets])
+        self.assertEqual([31, 9], [header.count for header, _, _ in packets])
+        self.assertEqual(
+            keys.tolist(), sum([packet[1] for packet in packets], []))
+
+    def test_inject_now(self):
+        injector = self._injector()
+        report = injector.inject(numpy.arange(200) + 0x10000)
+        self.assertEqual(200, report.n_events_sent)
+        self.assertEqual(2, report.n_packets_sent)
+        self.assertEqual(0, report.n_events_dropped)
+        self.assertEqual(0, report.n_packets_dropped)
+        self.assertEqual(2, len(injector._connection.packets))
+
+    def test_late_steps_dropped(self):
+
+        # steps are a tenth of a second, and the injector started a second
+        # ago, so steps 0 to 8 are more than one step late
+        injector = self._injector(time_scale_factor=100, max_lateness=1)
+        injector.start(time.time() - 1.0)
+        report = injector.inject(
+            [0x10000, 0x10001, 0x10002, 0x20000, 0x30000],
+            send_times=[12, 0, 0, 5, 12])
+        self.assertEqual(2, report.n_events_sent)
+        self.assertEqual(1, report.n_packets_sent)
+        self.assertEqual(3, report.n_events_dropped)
+        self.assertEqual(2, report.n_packets_dropped)
+        self.assertEqual(
+            [[0x10000, 0x30000]],
+            [_decode(data)[1] for data in injector._connection.packets])
+
+    def test_late_steps_sent_without_max_lateness(self):
+        injector = self._injector(max_lateness=None)
+        injector.start(time.time() - 10.0)
+        report = injector.inject([1, 2, 3], send_times=[0, 1, 2])
+        self.assertEqual(3, report.n_events_sent)
+        self.assertEqual(3, report.n_packets_sent)
+        self.assertEqual(0, report.n_events_dropped)
+
+    def test_failed_packets_dropped(self):
+        injector = self._injector()
+        injector._connection.failing_keys.add(0x30000)
+        report = injector.inject([0x10000, 0x10001, 0x30000, 0x40000])
+        self.assertEqual(2, report.n_events_sent)
+        self.assertEqual(1, report.n_packets_sent)
+        self.assertEqual(2, report.n_events_dropped)
+        self.assertEqual(1, report.n_packets_dropped)
+
+    def test_nothing_injected(self):
+        report = self._injector().inject([])
+        self.assertEqual(0, report.n_events_sent)
+        self.assertEqual(0, report.n_packets_sent)
+        self.assertEqual(0.0, report.events_per_second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import socket
+import unittest
+
+import numpy
+
+from spinnman.messages.eieio.data_messages.eieio_data_header \
+    import EIEIODataHeader
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+from spinnaker_graph_front_end.utilities.connections.live_event_loop \
+    import LiveEventLoop, PolledLiveEventConnection
+
+from unittests.utilities.connections.test_batched_live_event_connection \
+    import _DatabaseReader, _free_port
+
+
+class _Sender(object):
+    """ Keeps the packets sent rather than sending them
+    """
+
+    def __init__(self):
+        self.packets = list()
+
+    def send_to(self, data, address):
+        self.packets.append((data, address))
+
+
+def _send_keys(port, keys):
+    keys = numpy.asarray(keys, dtype="<u4")
+    header = EIEIODataHeader(EIEIOType.KEY_32_BIT, count=len(keys))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sender.sendto(
+            header.bytestring + keys.tostring(), ("127.0.0.1", port))
+    finally:
+        sender.close()
+
+
+class TestLiveEventLoop(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = LiveEventLoop()
+        self.connections = list()
+
+    def tearDown(self):
+        for connection in self.connections:
+            connection.close()
+
+    def _connection(self, max_pending_batches=16):
+        connection = PolledLiveEventConnection(
+            self.loop, "LiveSpikeReceiver",
+            receive_labels=["first", "second"], local_port=_free_port(),
+            max_pending_batches=max_pending_batches)
+        self.connections.append(connection)
+        reader = _DatabaseReader(_free_port())
+        connection._read_database_callback(reader)
+        return connection, reader.port
+
+    def _poll(self, n_batches):
+        """ Poll until a number of batches have been queued
+        """
+        total = 0
+        for _ in xrange(50):
+            total += self.loop.poll(0.1)
+            if total >= n_batches:
+                break
+        return total
+
+    def test_poll(self):
+        first, first_port = self._connection()
+        second, second_port = self._connection()
+        self.assertEqual(0, self.loop.poll())
+
+        _send_keys(first_port, [0x10001, 0x20002])
+        _send_keys(second_port, [0x10003])
+        self.assertEqual(2, self._poll(2))
+        self.assertEqual(1, first.n_pending_batches)
+        self.assertEqual(1, second.n_pending_batches)
+        self.assertEqual(
+            [0x10001, 0x20002], first.get_batch().keys.tolist())
+        self.assertEqual([0x10003], second.get_batch().keys.tolist())
+        self.assertIsNone(first.get_batch())
+
+    def test_packet_of_no_vertex_not_queued(self):
+        connection, port = self._connection()
+        _send_keys(port, [0x30000])
+        _send_keys(port, [0x10000])
+        self.assertEqual(1, self._poll(1))
+        self.assertEqual([0x10000], connection.get_batch().keys.tolist())
+        self.assertEqual(0, connection.n_pending_batches)
+
+    def test_full_connection_not_read(self):
+        connection, port = self._connection(max_pending_batches=2)
+        for key in xrange(3):
+            _send_keys(port, [0x10000 + key])
+        self.assertEqual(2, self._poll(2))
+        self.assertTrue(connection.is_full)
+
+        # the third packet is left in the socket until a batch is taken
+        self.assertEqual(0, self.loop.poll(0.1))
+        self.assertEqual(2, connection.n_pending_batches)
+        self.assertEqual([0x10000], connection.get_batch().keys.tolist())
+        self.assertFalse(connection.is_full)
+        self.assertEqual(1, self._poll(1))
+        self.assertEqual(
+            [[0x10001], [0x10002]],
+            [connection.get_batch().keys.tolist(),
+             connection.get_batch().keys.tolist()])
+
+    def test_receive(self):
+        connection, port = self._connection()
+        _send_keys(port, [0x20001])
+        batches = list(connection.receive(timeout=5.0))
+        self.assertEqual(1, len(batches))
+        self.assertEqual([1], batches[0].atom_ids.tolist())
+
+    def test_closed_connection_not_polled(self):
+        connection = self._connection()[0]
+        connection.close()
+        self.connections.remove(connection)
+        self.assertEqual([], list(self.loop.receive(timeout=0.1)))
+
+    def test_send_keys(self):
+        connection = self._connection()[0]
+        sender = _Sender()
+        connection._sender_connection = sender
+        connection._send_address_details["target"] = ("127.0.0.1", 12345)
+        keys = numpy.arange(130, dtype="<u4") + 0x40000
+        connection.send_keys("target", keys)
+
+        # the keys are split into packets of at most 63 32-bit keys
+        self.assertEqual([63, 63, 4], [
+            EIEIODataHeader.from_bytestring(data, 0).count
+            for data, _ in sender.packets])
+        self.assertEqual(
+            [("127.0.0.1", 12345)] * 3,
+            [address for _, address in sender.packets])
+        sent = numpy.concatenate([
+            numpy.frombuffer(
+                data, dtype="<u4",
+                offset=EIEIODataHeader.from_bytestring(data, 0).size)
+            for data, _ in sender.packets])
+        self.assertEqual(keys.tolist(), sent.tolist())
+
+    def test_send_no_keys(self):
+        connection = self._connection()[0]
+        sender = _Sender()
+        connection._sender_connection = sender
+        connection._send_address_details["target"] = ("127.0.0.1", 12345)
+        connection.send_keys("target", [])
+        self.assertEqual([], sender.packets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import unittest
+
+from pacman.model.constraints.key_allocator_constraints\
+    .key_allocator_fixed_key_and_mask_constraint \
+    import KeyAllocatorFixedKeyAndMaskConstraint
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.placements.placements import Placements
+from pacman.model.routing_info.base_key_and_mask import BaseKeyAndMask
+from pacman.model.routing_info.routing_info import RoutingInfo
+from pacman.model.routing_tables.multicast_routing_table \
+    import MulticastRoutingTable
+from pacman.model.routing_tables.multicast_routing_tables \
+    import MulticastRoutingTables
+from pacman.model.tags.tags import Tags
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinn_machine.multicast_routing_entry import MulticastRoutingEntry
+from spinn_machine.virtual_machine import VirtualMachine
+
+import spinnaker_graph_front_end as front_end
+from spinnaker_graph_front_end.utilities import incremental_mapping
+from spinnaker_graph_front_end.utilities.conf import config
+
+from unittests import graph_builder
+from unittests.graph_builder import SimpleVertex
+
+
+def _entry(key, mask, processor_id):
+    return MulticastRoutingEntry(key, mask, [processor_id], [], False)
+
+
+def _route(table, key):
+    """ The processors a key is sent to by a router, which uses the first\
+        entry of its table that matches the key
+    """
+    for entry in table.multicast_routing_entries:
+        if key & entry.mask == entry.routing_entry_key:
+            return list(entry.processor_ids)
+    return None
+
+
+def _tables(*tables):
+    routing_tables = MulticastRoutingTables()
+    for table in tables:
+        routing_tables.add_routing_table(table)
+    return routing_tables
+
+
+class TestMergeRoutingTables(unittest.TestCase):
+
+    def setUp(self):
+        self._machine = VirtualMachine(2, 2)
+
+    def test_new_entries_take_priority(self):
+
+        # the second existing entry covers a block of keys, as after
+        # compression, including the key of the first new entry
+        existing = MulticastRoutingTable(0, 0, [
+            _entry(0x000, 0xFFFFFFF0, 1), _entry(0x100, 0xFFFFFF00, 2)])
+        added = MulticastRoutingTable(0, 0, [
+            _entry(0x104, 0xFFFFFFFC, 3), _entry(0x000, 0xFFFFFFF0, 4)])
+        merged = incremental_mapping.merge_routing_tables(
+            self._machine, _tables(existing), _tables(added))
+        table = merged.get_routing_table_for_chip(0, 0)
+
+        # the new entries come first, and replace the existing entry with
+        # the same key and mask
+        self.assertEqual(
+            [(0x104, 3), (0x000, 4), (0x100, 2)],
+            [(entry.routing_entry_key, list(entry.processor_ids)[0])
+             for entry in table.multicast_routing_entries])
+        self.assertEqual([3], _route(table, 0x105))
+        self.assertEqual([2], _route(table, 0x1F0))
+        self.assertEqual([4], _route(table, 0x00A))
+
+    def test_tables_of_other_chips(self):
+        existing = MulticastRoutingTable(0, 0, [_entry(0x0, 0xFFFFFFFF, 1)])
+        untouched = MulticastRoutingTable(0, 1, [_entry(0x1, 0xFFFFFFFF, 1)])
+        added = MulticastRoutingTable(1, 0, [_entry(0x2, 0xFFFFFFFF, 2)])
+        merged = incremental_mapping.merge_routing_tables(
+            self._machine, _tables(existing, untouched), _tables(added))
+        self.assertIs(existing, merged.get_routing_table_for_chip(0, 0))
+        self.assertIs(untouched, merged.get_routing_table_for_chip(0, 1))
+        self.assertIs(added, merged.get_routing_table_for_chip(1, 0))
+
+    def test_full_table(self):
+        n_entries = self._machine.get_chip_at(0, 0).router.\
+            n_available_multicast_entries
+        existing = MulticastRoutingTable(0, 0, [
+            _entry(key, 0xFFFFFFFF, 1) for key in xrange(n_entries)])
+        added = MulticastRoutingTable(0, 0, [
+            _entry(n_entries, 0xFFFFFFFF, 1)])
+        with self.assertRaises(exceptions.ConfigurationException):
+            incremental_mapping.merge_routing_tables(
+                self._machine, _tables(existing), _tables(added))
+
+
+class TestIncrementalMapperKeys(unittest.TestCase):
+
+    def setUp(self):
+        self._mapper = incremental_mapping.IncrementalMapper(
+            VirtualMachine(2, 2), MachineGraph("test"), Placements(),
+            RoutingInfo(), Tags())
+
+    def test_aligned_blocks(self):
+        keys = [
+            self._mapper.allocate_keys(n_keys, [])[0]
+            for n_keys in (5, 1, 16)]
+        self.assertEqual(
+            [(0x00, 0xFFFFFFF8), (0x08, 0xFFFFFFFF), (0x10, 0xFFFFFFF0)],
+            [(key.key, key.mask) for key in keys])
+
+    def test_fixed_keys(self):
+        self._mapper.allocate_keys(8, [])
+        with self.assertRaises(exceptions.ConfigurationException):
+            self._mapper.allocate_keys(4, [
+                KeyAllocatorFixedKeyAndMaskConstraint(
+                    [BaseKeyAndMask(0x4, 0xFFFFFFFC)])])
+        fixed = BaseKeyAndMask(0x40, 0xFFFFFFFC)
+        self.assertEqual([fixed], self._mapper.allocate_keys(4, [
+            KeyAllocatorFixedKeyAndMaskConstraint([fixed])]))
+
+        # keys allocated later go above the fixed keys
+        self.assertEqual(0x44, self._mapper.allocate_keys(1, [])[0].key)
+
+
+class TestIncrementalMappingOnVirtualBoard(unittest.TestCase):
+
+    _OPTIONS = [
+        ("Machine", "virtual_board", "True"),
+        ("Machine", "width", "2"),
+        ("Machine", "height", "2"),
+        ("Machine", "version", "None"),
+        ("Machine", "machineName", "None"),
+        ("Mapping", "incremental_mapping", "True"),
+
+        # the MallocBasedRoutingInfoAllocator of PACMAN 3.0.1 fails on a key
+        # block with a plain mask under recent NumPy
+        ("Mapping", "machine_graph_to_machine_algorithms",
+         "RadialPlacer,RigRoute,BasicTagAllocator,"
+         "FrontEndCommonEdgeToNKeysMapper,BasicRoutingInfoAllocator,"
+         "BasicRoutingTableGenerator,MundyRouterCompressor")]
+
+    def setUp(self):
+        self._old_options = [
+            (section, option, config.get(section, option))
+            for section, option, _ in self._OPTIONS]
+        for section, option, value in self._OPTIONS:
+            config.set(section, option, value)
+
+    def tearDown(self):
+        try:
+            front_end.stop()
+        finally:
+            for section, option, value in self._old_options:
+                config.set(section, option, value)
+
+    def _run_pair(self):
+        """ Run a graph of two vertices which send to each other
+        """
+        front_end.setup(
+            graph_label="incremental", model_binary_module=graph_builder)
+        first = SimpleVertex("first")
+        second = SimpleVertex("second")
+        front_end.add_machine_vertex_instances([first, second])
+        front_end.add_machine_edge_instance(
+            MachineEdge(first, second), "TRANSMISSION")
+        front_end.add_machine_edge_instance(
+            MachineEdge(second, first), "TRANSMISSION")
+        front_end.run(10)
+        return first, second
+
+    def test_add_vertex_and_edge_after_reset(self):
+        first, second = self._run_pair()
+        old_locations = self._locations([first, second])
+        old_keys = self._keys([first, second])
+
+        # add a vertex with edges to it in the existing partitions, and an
+        # edge from it in a new partition
+        front_end._spinnaker.reset()
+        third = SimpleVertex("third")
+        front_end.add_machine_vertex_instance(third)
+        front_end.add_machine_edge_instance(
+            MachineEdge(first, third), "TRANSMISSION")
+        front_end.add_machine_edge_instance(
+            MachineEdge(second, third), "TRANSMISSION")
+        front_end.add_machine_edge_instance(
+            MachineEdge(third, first), "TRANSMISSION")
+        front_end.run(10)
+
+        # the existing placements and keys are kept, and the new vertex and
+        # partition are given their own
+        self.assertEqual(old_locations, self._locations([first, second]))
+        self.assertEqual(old_keys, self._keys([first, second]))
+        third_location = self._locations([third])[third]
+        self.assertNotIn(third_location, old_locations.values())
+        third_keys = self._keys([third])[third]
+        for key, mask in old_keys.itervalues():
+            self.assertNotEqual(key & third_keys[1], third_keys[0])
+            self.assertNotEqual(third_keys[0] & mask, key)
+
+        # the changed partitions are routed to the new vertex, and the new
+        # partition to its destination
+        for keys, location in (
+                (old_keys[first], third_location),
+                (old_keys[second], third_location),
+                (third_keys, old_locations[first])):
+            x, y, p = location
+            table = front_end._spinnaker._router_tables.\
+                get_routing_table_for_chip(x, y)
+            self.assertIn(p, _route(table, keys[0]))
+
+    def test_full_mapping_when_not_incremental(self):
+        config.set("Mapping", "incremental_mapping", "False")
+        first, second = self._run_pair()
+
+        # the added vertex and edge are mapped with the rest of the graph
+        front_end._spinnaker.reset()
+        third = SimpleVertex("third")
+        front_end.add_machine_vertex_instance(third)
+        front_end.add_machine_edge_instance(
+            MachineEdge(third, first), "TRANSMISSION")
+        front_end.run(10)
+        locations = self._locations([first, second, third])
+        self.assertEqual(3, len(set(locations.values())))
+        third_keys = self._keys([third])[third]
+        x, y, p = locations[first]
+        table = front_end._spinnaker._router_tables.\
+            get_routing_table_for_chip(x, y)
+        self.assertIn(p, _route(table, third_keys[0]))
+
+    def _check_change_without_reset(self):
+        self._run_pair()
+        front_end.add_machine_vertex_instance(SimpleVertex("third"))
+        with self.assertRaises(exceptions.ConfigurationException):
+            front_end.run(10)
+
+    def test_incremental_change_without_reset(self):
+        self._check_change_without_reset()
+
+    def test_full_change_without_reset(self):
+        config.set("Mapping", "incremental_mapping", "False")
+        self._check_change_without_reset()
+
+    @staticmethod
+    def _locations(vertices):
+        placements = front_end.placements()
+        return dict(
+            (vertex, (placement.x, placement.y, placement.p))
+            for vertex, placement in (
+                (vertex, placements.get_placement_of_vertex(vertex))
+                for vertex in vertices))
+
+    @staticmethod
+    def _keys(vertices):
+        graph = front_end.machine_graph()
+        routing_infos = front_end.routing_infos()
+        keys = dict()
+        for vertex in vertices:
+            key_and_mask = routing_infos.get_routing_info_from_partition(
+                graph.get_outgoing_edge_partition_starting_at_vertex(
+                    vertex, "TRANSMISSION")).first_key_and_mask
+            keys[vertex] = (key_and_mask.key, key_and_mask.mask)
+        return keys
+
+
+if __name__ == "__main__":
+    unittest.main()
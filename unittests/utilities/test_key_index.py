@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.routing_info.base_key_and_mask import BaseKeyAndMask
+from pacman.model.routing_info.partition_routing_info \
+    import PartitionRoutingInfo
+from pacman.model.routing_info.routing_info import RoutingInfo
+
+from spinnaker_graph_front_end.utilities.key_index import KeyIndex
+
+from unittests.graph_builder import SimpleVertex
+
+
+def _random_keys(rng, n_vertices, spread):
+    """ Give each vertex a block of keys at a random place, with its atoms\
+        in a random order so that some blocks are not runs
+    """
+    keys = list()
+    vertex_indices = list()
+    atoms = list()
+    base = 0
+    for vertex_index in xrange(n_vertices):
+        n_atoms = rng.randint(1, 20)
+        base += rng.randint(0, spread)
+        vertex_atoms = numpy.arange(n_atoms)
+        if rng.randint(2):
+            rng.shuffle(vertex_atoms)
+        keys.extend(base + numpy.arange(n_atoms))
+        base += n_atoms
+        vertex_indices.extend([vertex_index] * n_atoms)
+        atoms.extend(vertex_atoms)
+    return keys, vertex_indices, atoms
+
+
+class TestKeyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _check_against_dict(self, index, keys, vertex_indices, atoms):
+        expected = dict(
+            (key, (vertex_index, atom))
+            for key, vertex_index, atom in zip(keys, vertex_indices, atoms))
+        looked_up = numpy.arange(
+            min(keys) - 5, max(keys) + 5, dtype="int64").clip(0)
+        found_vertices, found_atoms = index.lookup(looked_up)
+        for key, vertex_index, atom in zip(
+                looked_up, found_vertices, found_atoms):
+            self.assertEqual(
+                expected.get(key, (-1, -1)), (vertex_index, atom))
+
+    def test_lookup_against_dict(self):
+        rng = numpy.random.RandomState(42)
+        for spread, is_dense in ((2, True), (1000, False)):
+            for _ in xrange(10):
+                keys, vertex_indices, atoms = _random_keys(rng, 20, spread)
+                index = KeyIndex(keys, vertex_indices, atoms)
+                self.assertEqual(is_dense, index.is_dense)
+                self.assertEqual(len(keys), index.n_keys)
+                self._check_against_dict(index, keys, vertex_indices, atoms)
+
+    def test_runs(self):
+
+        # key 4 of vertex 1 splits the keys of vertex 0, so the runs are
+        # 1 to 3, 4, 5 and 10 to 11
+        index = KeyIndex(
+            [5, 1, 2, 3, 4, 10, 11], [0, 0, 0, 0, 1, 1, 1],
+            [3, 0, 1, 2, 0, 5, 6])
+        self.assertEqual(4, index.n_runs)
+        self.assertEqual(7, index.n_keys)
+
+    def test_extreme_keys(self):
+        keys = [0, 1, 0xFFFFFFFE, 0xFFFFFFFF]
+        index = KeyIndex(keys, [0, 0, 1, 1], [0, 1, 0, 1])
+        self.assertFalse(index.is_dense)
+        vertex_indices, atoms = index.lookup(keys + [2, 0xFFFFFFFD])
+        self.assertEqual([0, 0, 1, 1, -1, -1], vertex_indices.tolist())
+        self.assertEqual([0, 1, 0, 1, -1, -1], atoms.tolist())
+
+    def test_empty(self):
+        index = KeyIndex([], [], [])
+        self.assertEqual(0, index.n_keys)
+        vertex_indices, atoms = index.lookup([1, 2])
+        self.assertEqual([-1, -1], vertex_indices.tolist())
+        self.assertEqual([-1, -1], atoms.tolist())
+
+    def test_repeated_key(self):
+        with self.assertRaises(ValueError):
+            KeyIndex([1, 2, 1], [0, 0, 1], [0, 1, 0])
+
+    def test_save_and_load(self):
+        rng = numpy.random.RandomState(7)
+        for spread in (2, 1000):
+            keys, vertex_indices, atoms = _random_keys(rng, 15, spread)
+            labels = ["Vertex {}".format(i) for i in xrange(15)]
+            index = KeyIndex(keys, vertex_indices, atoms, labels)
+            path = os.path.join(self.directory, "keys.npz")
+            index.save(path)
+            loaded = KeyIndex.load(path)
+            self.assertEqual(labels, loaded.labels)
+            self.assertEqual(index.n_runs, loaded.n_runs)
+            self.assertEqual(index.is_dense, loaded.is_dense)
+            self._check_against_dict(loaded, keys, vertex_indices, atoms)
+
+    def test_save_and_load_without_labels(self):
+        path = os.path.join(self.directory, "keys.npz")
+        KeyIndex([1, 2], [0, 0], [0, 1]).save(path)
+        self.assertIsNone(KeyIndex.load(path).labels)
+        KeyIndex([1, 2], [0, 0], [0, 1], []).save(path)
+        self.assertEqual([], KeyIndex.load(path).labels)
+
+    def test_from_graph(self):
+
+        # each vertex sends to the next in two partitions, and the last
+        # vertex sends nothing
+        graph = MachineGraph("Keys")
+        vertices = [SimpleVertex("v{}".format(index)) for index in xrange(4)]
+        for vertex in vertices:
+            graph.add_vertex(vertex)
+        for pre_vertex, post_vertex in zip(vertices, vertices[1:]):
+            for partition_id in ("A", "B"):
+                graph.add_edge(
+                    MachineEdge(pre_vertex, post_vertex), partition_id)
+        routing_infos = RoutingInfo()
+        expected = dict()
+        for index, vertex in enumerate(vertices):
+            for partition_index, partition in enumerate(
+                    graph.get_outgoing_edge_partitions_starting_at_vertex(
+                        vertex)):
+                base = (index << 8) + (partition_index << 4)
+                routing_infos.add_partition_info(PartitionRoutingInfo(
+                    [BaseKeyAndMask(base, 0xFFFFFFFC)], partition))
+                for atom in xrange(4):
+                    expected[base + atom] = (index, atom)
+        index = KeyIndex.from_graph(graph, routing_infos)
+        self.assertEqual(
+            [vertex.label for vertex in vertices], index.labels)
+        keys = sorted(expected)
+        vertex_indices, atoms = index.lookup(keys)
+        self.assertEqual(
+            [expected[key] for key in keys],
+            zip(vertex_indices.tolist(), atoms.tolist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
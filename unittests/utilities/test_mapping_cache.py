@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+from pacman.model.graphs.machine.impl.machine_graph import MachineGraph
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+from pacman.model.routing_info.base_key_and_mask import BaseKeyAndMask
+from pacman.model.routing_info.partition_routing_info \
+    import PartitionRoutingInfo
+from pacman.model.routing_info.routing_info import RoutingInfo
+from pacman.model.routing_tables.multicast_routing_table \
+    import MulticastRoutingTable
+from pacman.model.routing_tables.multicast_routing_tables \
+    import MulticastRoutingTables
+from pacman.model.tags.tags import Tags
+
+from spinn_front_end_common.abstract_models\
+    .abstract_provides_n_keys_for_partition \
+    import AbstractProvidesNKeysForPartition
+
+from spinn_machine.multicast_routing_entry import MulticastRoutingEntry
+from spinn_machine.tags.iptag import IPTag
+from spinn_machine.tags.reverse_iptag import ReverseIPTag
+from spinn_machine.virtual_machine import VirtualMachine
+
+from spinnaker_graph_front_end.utilities import mapping_cache
+
+from unittests.graph_builder import SimpleVertex
+
+_CONFIG = [("Mapping", "placer=OneToOnePlacer")]
+
+
+class KeyedVertex(SimpleVertex, AbstractProvidesNKeysForPartition):
+    """ A vertex which sends more than one key on each partition
+    """
+
+    def __init__(self, label=None, n_keys=1):
+        SimpleVertex.__init__(self, label=label)
+        self._n_keys = n_keys
+
+    def get_n_keys_for_partition(self, partition, graph_mapper):
+        return self._n_keys
+
+
+def _build_graph(n_keys=4, label="b", extra_edge=False):
+    graph = MachineGraph("test")
+    vertices = [
+        KeyedVertex("a", n_keys), SimpleVertex(label), SimpleVertex("c")]
+    for vertex in vertices:
+        graph.add_vertex(vertex)
+    graph.add_edge(MachineEdge(vertices[0], vertices[1]), "DATA")
+    graph.add_edge(MachineEdge(vertices[0], vertices[2]), "DATA")
+    graph.add_edge(MachineEdge(vertices[1], vertices[2]), "OTHER")
+    if extra_edge:
+        graph.add_edge(MachineEdge(vertices[2], vertices[0]), "OTHER")
+    return graph, vertices
+
+
+def _mapping(graph, vertices):
+    """ A mapping of the graph, as mapping would find it
+    """
+    placements = Placements([
+        Placement(vertex, 0, 0, index + 1)
+        for index, vertex in enumerate(vertices)])
+    routing_infos = RoutingInfo([
+        PartitionRoutingInfo(
+            [BaseKeyAndMask(index << 8, 0xFFFFFF00)],
+            graph.get_outgoing_edge_partition_starting_at_vertex(
+                vertices[index], identifier))
+        for index, identifier in ((0, "DATA"), (1, "OTHER"))])
+    tags = Tags()
+    tags.add_ip_tag(IPTag("1.2.3.4", 1, "5.6.7.8", 17895, True), vertices[2])
+    tags.add_reverse_ip_tag(
+        ReverseIPTag("1.2.3.4", 2, 12345, 0, 0, 1, 2), vertices[0])
+    router_tables = MulticastRoutingTables()
+    router_tables.add_routing_table(MulticastRoutingTable(0, 0, [
+        MulticastRoutingEntry(0, 0xFFFFFF00, [2, 3], [], False),
+        MulticastRoutingEntry(0x100, 0xFFFFFF00, [3], [1, 4], True)]))
+    return placements, routing_infos, tags, router_tables
+
+
+def _describe(graph, vertices, placements, routing_infos, tags, tables):
+    """ Describe a mapping by the indices of the vertices it refers to
+    """
+    indices = dict((vertex, index) for index, vertex in enumerate(vertices))
+    return (
+        sorted((indices[placement.vertex], placement.x, placement.y,
+                placement.p) for placement in placements.placements),
+        sorted((indices[partition.pre_vertex], partition.identifier,
+                [(key_and_mask.key, key_and_mask.mask)
+                 for key_and_mask in routing_infos
+                 .get_routing_info_from_partition(partition).keys_and_masks])
+               for partition in graph.outgoing_edge_partitions
+               if routing_infos.get_routing_info_from_partition(partition)
+               is not None),
+        [[(tag.tag, tag.ip_address, tag.port, tag.strip_sdp)
+          for tag in tags.get_ip_tags_for_vertex(vertex) or ()]
+         for vertex in vertices],
+        [[(tag.tag, tag.port, tag.destination_p, tag.sdp_port)
+          for tag in tags.get_reverse_ip_tags_for_vertex(vertex) or ()]
+         for vertex in vertices],
+        [(table.x, table.y, [
+            (entry.routing_entry_key, entry.mask, sorted(entry.processor_ids),
+             sorted(entry.link_ids), entry.defaultable)
+            for entry in table.multicast_routing_entries])
+         for table in tables.routing_tables])
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self._machine = VirtualMachine(2, 2)
+
+    def _key(self, graph, config=_CONFIG):
+        return mapping_cache.fingerprint(graph, self._machine, config)
+
+    def test_identical_graphs(self):
+        self.assertEqual(
+            self._key(_build_graph()[0]), self._key(_build_graph()[0]))
+
+    def test_changes(self):
+        key = self._key(_build_graph()[0])
+        for graph in (
+                _build_graph(label="changed")[0],
+                _build_graph(extra_edge=True)[0],
+                _build_graph(n_keys=8)[0]):
+            self.assertNotEqual(key, self._key(graph))
+        self.assertNotEqual(
+            key, self._key(
+                _build_graph()[0], [("Mapping", "placer=OtherPlacer")]))
+        self.assertNotEqual(
+            key, mapping_cache.fingerprint(
+                _build_graph()[0], VirtualMachine(8, 8), _CONFIG))
+
+
+class TestMappingCache(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_miss_then_hit(self):
+        cache = mapping_cache.MappingCache(self._directory, 1 << 20)
+        graph, vertices = _build_graph()
+        key = mapping_cache.fingerprint(graph, VirtualMachine(2, 2), _CONFIG)
+        self.assertIsNone(cache.get(key, graph))
+        mapping = _mapping(graph, vertices)
+        cache.put(key, graph, *mapping)
+
+        # the mapping is applied to an identical graph built again
+        new_graph, new_vertices = _build_graph()
+        cached = cache.get(key, new_graph)
+        self.assertIsNotNone(cached)
+        self.assertEqual(
+            _describe(graph, vertices, *mapping),
+            _describe(new_graph, new_vertices, *cached))
+
+        cache.clear()
+        self.assertIsNone(cache.get(key, graph))
+
+    def test_unreadable_entry(self):
+        cache = mapping_cache.MappingCache(self._directory, 1 << 20)
+        graph, _ = _build_graph()
+        with open(os.path.join(self._directory, "bad.mapping"), "w") as f:
+            f.write("not a pickle")
+        self.assertIsNone(cache.get("bad", graph))
+        self.assertEqual([], os.listdir(self._directory))
+
+    def test_least_recently_used_evicted(self):
+        graph, vertices = _build_graph()
+        mapping = _mapping(graph, vertices)
+        cache = mapping_cache.MappingCache(self._directory, 1 << 20)
+        cache.put("first", graph, *mapping)
+        size = os.path.getsize(os.path.join(self._directory, "first.mapping"))
+
+        # room for two entries
+        cache = mapping_cache.MappingCache(
+            self._directory, (size * 5) // 2)
+        cache.put("second", graph, *mapping)
+        os.utime(os.path.join(self._directory, "first.mapping"), (100, 100))
+        os.utime(os.path.join(self._directory, "second.mapping"), (200, 200))
+
+        # using the first entry makes the second the least recently used
+        self.assertIsNotNone(cache.get("first", graph))
+        cache.put("third", graph, *mapping)
+        self.assertEqual(
+            ["first.mapping", "third.mapping"],
+            sorted(os.listdir(self._directory)))
+
+
+if __name__ == "__main__":
+    unittest.main()
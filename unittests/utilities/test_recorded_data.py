@@ -0,0 +1,218 @@
+import threading
+import unittest
+
+import numpy
+
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinn_machine.virtual_machine import VirtualMachine
+
+from spinnaker_graph_front_end.utilities import recorded_data
+
+_DTYPE = numpy.dtype("<u4")
+
+
+class _Reader(object):
+
+    def __init__(self, data):
+        self._data = data
+
+    def read_all(self):
+        return self._data
+
+
+class _Vertex(object):
+    """ A vertex which only has a label
+    """
+
+    def __init__(self, label):
+        self.label = label
+
+
+class _ArrayVertex(_Vertex):
+    """ A vertex which reads its own recorded data
+    """
+
+    def __init__(self, label, data):
+        _Vertex.__init__(self, label)
+        self._data = numpy.asarray(data, dtype=_DTYPE)
+
+    def get_data_array(self, buffer_manager, placement, region, dtype):
+        return self._data
+
+
+class _BufferManager(object):
+    """ Holds the bytes recorded on each core in a bytearray which is added\
+        to in place, and hands out that bytearray itself, as the buffer\
+        manager does
+    """
+
+    def __init__(self):
+        self.recorded = dict()
+        self.missing = set()
+        self.reading_threads = dict()
+
+    def record(self, placement, items):
+        self.recorded.setdefault(
+            (placement.x, placement.y, placement.p), bytearray()).extend(
+                numpy.asarray(items, dtype=_DTYPE).tobytes())
+
+    def get_data_for_vertex(self, placement, region):
+        core = (placement.x, placement.y, placement.p)
+        self.reading_threads[core] = threading.current_thread()
+        return (
+            _Reader(self.recorded.setdefault(core, bytearray())),
+            core in self.missing)
+
+
+class TestReadDataArray(unittest.TestCase):
+
+    def setUp(self):
+        self.placement = Placement(None, 0, 0, 1)
+        self.buffer_manager = _BufferManager()
+
+    def test_read(self):
+        self.buffer_manager.record(self.placement, [1, 2, 3])
+        data, missing = recorded_data.read_data_array(
+            self.buffer_manager, self.placement, 0, _DTYPE)
+        self.assertEqual([1, 2, 3], data.tolist())
+        self.assertEqual(_DTYPE, data.dtype)
+        self.assertFalse(missing)
+
+    def test_partly_recorded_item_dropped(self):
+        self.buffer_manager.record(self.placement, [7, 8])
+        self.buffer_manager.recorded[0, 0, 1].extend(b"\x01\x02")
+        self.buffer_manager.missing.add((0, 0, 1))
+        data, missing = recorded_data.read_data_array(
+            self.buffer_manager, self.placement, 0, _DTYPE)
+        self.assertEqual([7, 8], data.tolist())
+        self.assertTrue(missing)
+
+    def test_storage_grows_after_reading(self):
+        self.buffer_manager.record(self.placement, [1, 2, 3])
+        data, _ = recorded_data.read_data_array(
+            self.buffer_manager, self.placement, 0, _DTYPE)
+
+        # growing the bytearray moves its bytes, and changing it in place
+        # changes its bytes; neither is seen by the data already read
+        self.buffer_manager.record(self.placement, range(10000))
+        self.buffer_manager.recorded[0, 0, 1][0:4] = b"\xff" * 4
+        self.assertEqual([1, 2, 3], data.tolist())
+        more_data, _ = recorded_data.read_data_array(
+            self.buffer_manager, self.placement, 0, _DTYPE)
+        self.assertEqual(10003, len(more_data))
+        self.assertEqual(0xFFFFFFFF, more_data[0])
+
+
+class TestExtractAll(unittest.TestCase):
+
+    # the cores of the vertices, near three Ethernet connected chips
+    _CORES = [
+        (0, 0, 1), (1, 1, 1), (4, 8, 2), (5, 9, 3), (8, 4, 1), (0, 0, 2),
+        (11, 11, 4)]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.machine = VirtualMachine(12, 12, with_wrap_arounds=True)
+
+    def setUp(self):
+        self.vertices = [
+            _Vertex("v{}".format(index)) for index in xrange(len(self._CORES))]
+        self.placements = Placements([
+            Placement(vertex, x, y, p)
+            for vertex, (x, y, p) in zip(self.vertices, self._CORES)])
+        self.buffer_manager = _BufferManager()
+        for index, vertex in enumerate(self.vertices):
+            self.buffer_manager.record(
+                self.placements.get_placement_of_vertex(vertex),
+                range(index * 10, index * 10 + index + 1))
+
+    def test_group_by_ethernet_chip(self):
+        groups = recorded_data._group_by_ethernet_chip(
+            self.vertices, self.placements, self.machine)
+        self.assertEqual([(0, 0), (4, 8), (8, 4)], list(groups))
+        self.assertEqual(
+            [[(0, 0, 1), (1, 1, 1), (0, 0, 2)],
+             [(4, 8, 2), (5, 9, 3), (11, 11, 4)], [(8, 4, 1)]],
+            [[(placement.x, placement.y, placement.p)
+              for placement in group] for group in groups.itervalues()])
+
+        # without a machine, the cores are grouped by chip
+        groups = recorded_data._group_by_ethernet_chip(
+            self.vertices, self.placements, None)
+        self.assertEqual(
+            [(0, 0), (1, 1), (4, 8), (5, 9), (8, 4), (11, 11)], list(groups))
+
+    def _check_data(self, data):
+        self.assertEqual(set(self.vertices), set(data))
+        for index, vertex in enumerate(self.vertices):
+            self.assertEqual(
+                range(index * 10, index * 10 + index + 1),
+                data[vertex].tolist())
+
+    def _groups_by_thread(self):
+        threads = dict()
+        groups = recorded_data._group_by_ethernet_chip(
+            self.vertices, self.placements, self.machine)
+        for chip, group in groups.iteritems():
+            group_threads = set(
+                self.buffer_manager.reading_threads[
+                    placement.x, placement.y, placement.p]
+                for placement in group)
+
+            # each board is read by one thread
+            self.assertEqual(1, len(group_threads))
+            threads.setdefault(group_threads.pop(), list()).append(chip)
+        return threads
+
+    def test_one_worker(self):
+        self._check_data(recorded_data.extract_all(
+            self.vertices, self.placements, self.buffer_manager, 0, _DTYPE,
+            self.machine, n_workers=1))
+        self.assertEqual(
+            [threading.current_thread()], self._groups_by_thread().keys())
+
+    def test_workers(self):
+        for n_workers in (0, 2, 3, 50):
+            self._check_data(recorded_data.extract_all(
+                self.vertices, self.placements, self.buffer_manager, 0,
+                _DTYPE, self.machine, n_workers=n_workers))
+            threads = self._groups_by_thread()
+            self.assertNotIn(threading.current_thread(), threads)
+            self.assertLessEqual(len(threads), 3)
+
+    def test_vertex_reads_own_data(self):
+
+        # a vertex with get_data_array is not read from the buffer manager
+        vertex = _ArrayVertex("own", [5, 6])
+        self.placements.add_placement(Placement(vertex, 8, 4, 5))
+        data = recorded_data.extract_all(
+            self.vertices + [vertex], self.placements, self.buffer_manager,
+            0, _DTYPE, self.machine)
+        self.assertEqual([5, 6], data[vertex].tolist())
+        self.assertNotIn((8, 4, 5), self.buffer_manager.reading_threads)
+        self.assertEqual([0], data[self.vertices[0]].tolist())
+
+    def test_stack_data_arrays(self):
+        data = recorded_data.stack_data_arrays(
+            self.vertices[1:4], self.placements, self.buffer_manager, 0,
+            _DTYPE, n_timesteps=2, machine=self.machine, n_workers=2)
+        self.assertEqual([[10, 11], [20, 21], [30, 31]], data.tolist())
+
+        # the first vertex gives the number of time steps if not given
+        data = recorded_data.stack_data_arrays(
+            self.vertices[:3], self.placements, self.buffer_manager, 0,
+            _DTYPE)
+        self.assertEqual([[0], [10], [20]], data.tolist())
+
+        with self.assertRaises(exceptions.ConfigurationException):
+            recorded_data.stack_data_arrays(
+                self.vertices[:3], self.placements, self.buffer_manager, 0,
+                _DTYPE, n_timesteps=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from pacman.model.placements.placement import Placement
+from pacman.model.placements.placements import Placements
+from spinn_front_end_common.utilities import exceptions
+
+from spinnaker_graph_front_end.utilities import recording_store
+from spinnaker_graph_front_end.utilities.recording_store \
+    import RecordingStore
+
+_DTYPE = numpy.dtype("<u4")
+
+
+class _Vertex(object):
+    """ A vertex which only has a label, which is all the store reads
+    """
+
+    def __init__(self, label):
+        self.label = label
+
+
+class _Reader(object):
+
+    def __init__(self, data):
+        self._data = data
+
+    def read_all(self):
+        return self._data
+
+
+class _BufferManager(object):
+    """ Holds the data recorded by each vertex so far, as the buffer manager\
+        does
+    """
+
+    def __init__(self):
+        self.recorded = dict()
+
+    def record(self, vertex, items):
+        old = self.recorded.get(vertex, numpy.empty(0, dtype=_DTYPE))
+        self.recorded[vertex] = numpy.concatenate(
+            [old, numpy.asarray(items, dtype=_DTYPE)])
+
+    def get_data_for_vertex(self, placement, region):
+        data = self.recorded.get(
+            placement.vertex, numpy.empty(0, dtype=_DTYPE))
+        return _Reader(bytearray(data.tobytes())), False
+
+
+class TestRecordingStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "recording.dat")
+        self.vertices = [_Vertex("Vertex {}".format(i)) for i in xrange(3)]
+        self.placements = Placements([
+            Placement(vertex, 0, 0, index + 1)
+            for index, vertex in enumerate(self.vertices)])
+        self.buffer_manager = _BufferManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run(self, store, first_timestep, n_timesteps):
+        """ Record a time step for each vertex in each time step of a run,\
+            holding the time step and the index of the vertex
+        """
+        for index, vertex in enumerate(self.vertices):
+            self.buffer_manager.record(vertex, [
+                (timestep << 8) + index for timestep in xrange(
+                    first_timestep, first_timestep + n_timesteps)])
+        store.add_recorded_data(
+            self.buffer_manager, self.placements, first_timestep, n_timesteps)
+
+    def _expected(self, index, first_timestep, n_timesteps):
+        return [(timestep << 8) + index for timestep in xrange(
+            first_timestep, first_timestep + n_timesteps)]
+
+    def test_empty(self):
+        store = RecordingStore(self.path, self.vertices, 2, _DTYPE)
+        self.assertEqual(0, len(store.get_data(self.vertices[0])))
+        self.assertEqual((3, 0), store.get_array().shape)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_append_runs(self):
+        store = RecordingStore(
+            self.path, self.vertices, 2, _DTYPE, n_timesteps=20)
+        self._run(store, 0, 10)
+        self._run(store, 10, 5)
+        self.assertEqual([(0, 10), (10, 5)], store.runs)
+        for index, vertex in enumerate(self.vertices):
+            self.assertEqual(
+                self._expected(index, 0, 15),
+                store.get_data(vertex).tolist())
+            self.assertEqual(
+                self._expected(index, 0, 10),
+                store.get_data(vertex, run=0).tolist())
+            self.assertEqual(
+                self._expected(index, 10, 5),
+                store.get_data(index, run=1).tolist())
+        self.assertEqual(
+            [(0, 0, 1), (0, 0, 2), (0, 0, 3)], store.placements)
+        self.assertEqual((3, 15), store.get_array().shape)
+        self.assertEqual(
+            [self._expected(index, 0, 4) for index in xrange(3)],
+            store.get_array(4).tolist())
+        with self.assertRaises(exceptions.ConfigurationException):
+            store.get_array(16)
+
+    def test_resize(self):
+        store = RecordingStore(
+            self.path, self.vertices, 2, _DTYPE, n_timesteps=4)
+        self._run(store, 0, 3)
+        self._run(store, 3, 3)
+
+        # the rows are doubled when full, keeping what was stored
+        self.assertEqual(8, store._capacity)
+        self._run(store, 6, 10)
+        self.assertEqual(16, store._capacity)
+        self.assertEqual(
+            3 * 16 * _DTYPE.itemsize, os.path.getsize(self.path))
+        for index, vertex in enumerate(self.vertices):
+            self.assertEqual(
+                self._expected(index, 0, 16),
+                store.get_data(vertex).tolist())
+        self.assertEqual(
+            [], [name for name in os.listdir(self.directory)
+                 if name.endswith(".tmp")])
+
+    def test_default_capacity(self):
+        store = RecordingStore(self.path, self.vertices, 2, _DTYPE)
+        self._run(store, 0, 5)
+        self.assertEqual(recording_store._DEFAULT_CAPACITY, store._capacity)
+
+    def test_reset(self):
+        store = RecordingStore(
+            self.path, self.vertices, 2, _DTYPE, n_timesteps=10)
+        self._run(store, 0, 5)
+
+        # after a reset, the buffer manager holds only the new data
+        store.reset()
+        self.buffer_manager.recorded.clear()
+        self._run(store, 0, 5)
+        self.assertEqual(
+            self._expected(1, 0, 5) * 2,
+            store.get_data(self.vertices[1]).tolist())
+
+    def test_reload(self):
+        store = RecordingStore(
+            self.path, self.vertices, 7, _DTYPE, n_timesteps=4)
+        self._run(store, 0, 3)
+        self._run(store, 3, 4)
+        loaded = RecordingStore.load(self.path)
+        self.assertEqual(7, loaded.region)
+        self.assertEqual(store.labels, loaded.labels)
+        self.assertEqual(store.placements, loaded.placements)
+        self.assertEqual(store.runs, loaded.runs)
+        for index in xrange(len(self.vertices)):
+            self.assertEqual(
+                store.get_data(index).tolist(),
+                loaded.get_data(index).tolist())
+            self.assertEqual(
+                self._expected(index, 3, 4),
+                loaded.get_data(index, run=1).tolist())
+        self.assertEqual(
+            store.get_array().tolist(), loaded.get_array().tolist())
+
+        # a loaded store is only read
+        with self.assertRaises(exceptions.ConfigurationException):
+            self._run(loaded, 7, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import decimal
+import struct
+import unittest
+
+import numpy
+
+from data_specification.enums.data_type import DataType
+
+from spinn_front_end_common.utilities import exceptions
+
+from spinnaker_graph_front_end.utilities.region_builder import RegionBuilder
+
+
+def _packed(data_type, values):
+    """ The bytes of values as write_value lays them out, scaled exactly\
+        and truncated one at a time
+    """
+    return "".join(
+        struct.pack("<" + data_type.struct_encoding, int(
+            decimal.Decimal(value) * data_type.scale))
+        for value in values)
+
+
+def _padded(data):
+    return data + "\0" * (-len(data) % 4)
+
+
+class _RecordingSpec(object):
+    """ Records the commands given to a data specification
+    """
+
+    def __init__(self):
+        self.commands = list()
+
+    def switch_write_focus(self, region):
+        self.commands.append(("switch_write_focus", region))
+
+    def write_array(self, array_values, data_type):
+        self.commands.append(("write_array", list(array_values), data_type))
+
+
+class TestRegionBuilder(unittest.TestCase):
+
+    def test_words(self):
+        builder = RegionBuilder(3, 16)
+        builder.add_value(7)
+        builder.add_array(numpy.array([1, 2, 0xFFFFFFFF]))
+        self.assertEqual(
+            [7, 1, 2, 0xFFFFFFFF], builder.get_words().tolist())
+        self.assertEqual(16, builder.n_bytes)
+
+    def test_mixed_types(self):
+        values = [
+            (DataType.UINT8, [1, 255]), (DataType.INT16, [-2]),
+            (DataType.UINT32, [0xDEADBEEF]), (DataType.INT8, [-128, 127, 0]),
+            (DataType.INT64, [-(2 ** 40)])]
+        builder = RegionBuilder(0, 64)
+        for data_type, data_values in values:
+            builder.add_array(data_values, data_type)
+        expected = "".join(
+            _packed(data_type, data_values)
+            for data_type, data_values in values)
+        self.assertEqual(len(expected), builder.n_bytes)
+        self.assertEqual(_padded(expected), builder.get_words().tobytes())
+
+    def test_fixed_point(self):
+        for data_type, values in (
+                (DataType.S1615, [
+                    1.5, -0.25, 1.0 / 3.0, -1.0 / 3.0, -32768.0, 32767.99]),
+                (DataType.U032, [0.0, 0.5, 0.1, 0.9999999997]),
+                (DataType.S3231, [-1.75, 12345.678, 4294967295.5])):
+            builder = RegionBuilder(0, 64)
+            builder.add_array(values, data_type)
+            self.assertEqual(
+                _packed(data_type, values), builder.get_words().tobytes(),
+                data_type.name)
+
+    def test_fixed_point_against_exact(self):
+        rng = numpy.random.RandomState(42)
+        for data_type, low, high in (
+                (DataType.S1615, -32768, 32767), (DataType.U032, 0, 1),
+                (DataType.S3231, -1e9, 1e9)):
+            values = rng.uniform(low, high, 1000)
+            builder = RegionBuilder(0, values.size * data_type.size)
+            builder.add_array(values, data_type)
+            self.assertEqual(
+                _packed(data_type, values.tolist()),
+                builder.get_words().tobytes(), data_type.name)
+
+    def test_out_of_range(self):
+        for data_type, value in (
+                (DataType.UINT8, 256), (DataType.UINT8, -1),
+                (DataType.INT8, -129), (DataType.UINT32, 2 ** 32),
+                (DataType.S1615, 32768.0), (DataType.S1615, -32768.5),
+                (DataType.U032, 1.0)):
+            builder = RegionBuilder(0, 16)
+            with self.assertRaises(exceptions.ConfigurationException):
+                builder.add_value(value, data_type)
+            self.assertEqual(0, builder.n_bytes)
+
+    def test_region_full(self):
+        builder = RegionBuilder(0, 6)
+        builder.add_value(1)
+        with self.assertRaises(exceptions.ConfigurationException):
+            builder.add_value(2)
+        builder.add_value(3, DataType.UINT16)
+        with self.assertRaises(exceptions.ConfigurationException):
+            builder.add_value(4, DataType.UINT8)
+        self.assertEqual([1, 3], builder.get_words().tolist())
+
+    def test_write(self):
+        spec = _RecordingSpec()
+        builder = RegionBuilder(5, 8)
+        builder.write(spec)
+        builder.add_array([], DataType.UINT8)
+        builder.write(spec)
+        self.assertEqual([], spec.commands)
+
+        builder.add_array([1, 2, 3], DataType.UINT8)
+        builder.write(spec)
+        self.assertEqual([
+            ("switch_write_focus", 5),
+            ("write_array", [0x030201], DataType.UINT32)], spec.commands)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from spinnaker_graph_front_end.utilities import run_profile
+from spinnaker_graph_front_end.utilities.run_profile import \
+    AlgorithmProfile, RunProfile
+
+
+class _Algorithm(object):
+    """ An algorithm which makes a number of objects and keeps them
+    """
+
+    algorithm_id = "MakeObjects"
+
+    def __init__(self, n_objects):
+        self._n_objects = n_objects
+        self.made = None
+
+    def call(self, inputs):
+        self.made = [list() for _ in xrange(self._n_objects)]
+        return inputs
+
+
+class TestRunProfile(unittest.TestCase):
+
+    def _call(self, count_objects, n_objects=1000):
+        profile = RunProfile()
+        algorithm = run_profile._ProfiledAlgorithm(
+            _Algorithm(n_objects), profile, "mapping", count_objects)
+        self.assertEqual("MakeObjects", algorithm.algorithm_id)
+        self.assertEqual({"a": 1}, algorithm.call({"a": 1}))
+        self.assertEqual(1, len(profile))
+        return profile.records[0]
+
+    def test_objects_not_counted(self):
+        record = self._call(False)
+        self.assertIsNone(record.objects_allocated)
+        self.assertEqual("mapping", record.phase)
+        self.assertGreaterEqual(record.wall_seconds, 0)
+        self.assertGreaterEqual(record.peak_rss_delta, 0)
+
+    def test_objects_counted(self):
+
+        # the count is net of any garbage collected during the call
+        record = self._call(True, n_objects=100000)
+        self.assertGreater(record.objects_allocated, 90000)
+
+    def test_phase_totals(self):
+        profile = RunProfile()
+        profile.add(AlgorithmProfile("mapping", "A", 0.0, 1.0, 0.5, 10, None))
+        profile.add(AlgorithmProfile("mapping", "B", 1.0, 2.0, 1.5, 30, None))
+        profile.add(AlgorithmProfile("load", "C", 3.0, 1.0, 1.0, 5, 7))
+        totals = profile.phase_totals()
+        self.assertEqual(["mapping", "load"], list(totals))
+        self.assertEqual({
+            "wall_seconds": 3.0, "cpu_seconds": 2.0, "peak_rss_delta": 30,
+            "objects_allocated": None}, totals["mapping"])
+        self.assertEqual(7, totals["load"]["objects_allocated"])
+
+        events = profile.to_chrome_trace()["traceEvents"]
+        self.assertEqual(["A", "B", "C"], [
+            event["name"] for event in events if event["ph"] == "X"])
+
+
+class TestRunProfileWithoutResource(unittest.TestCase):
+    """ Measures as on a system without the resource module or /proc
+    """
+
+    def setUp(self):
+        self.resource = run_profile.resource
+        self.read_status = run_profile._read_status
+        self.can_reset_peak_rss = run_profile._can_reset_peak_rss
+        run_profile.resource = None
+        run_profile._read_status = self._no_status
+        run_profile._can_reset_peak_rss = True
+
+    def tearDown(self):
+        run_profile.resource = self.resource
+        run_profile._read_status = self.read_status
+        run_profile._can_reset_peak_rss = self.can_reset_peak_rss
+
+    @staticmethod
+    def _no_status(field):
+        raise IOError("No /proc/self/status")
+
+    def test_memory_not_measured(self):
+        profile = RunProfile()
+        algorithm = run_profile._ProfiledAlgorithm(
+            _Algorithm(10), profile, "mapping", False)
+        algorithm.call({})
+        record = profile.records[0]
+        self.assertIsNone(record.peak_rss_delta)
+        self.assertGreaterEqual(record.cpu_seconds, 0)
+        self.assertIsNone(
+            profile.phase_totals()["mapping"]["peak_rss_delta"])
+        self.assertIn("peak_rss_delta=None", repr(record))
+
+
+if __name__ == "__main__":
+    unittest.main()
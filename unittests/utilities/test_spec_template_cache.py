@@ -0,0 +1,125 @@
+import struct
+import unittest
+
+from spinnaker_graph_front_end.utilities.spec_template_cache \
+    import SpecTemplateCache
+
+
+def _spec(*words):
+    return struct.pack("<{}I".format(len(words)), *words)
+
+
+class _Generator(object):
+    """ Generates specifications in full, counting how many it generates
+    """
+
+    def __init__(self, make_spec):
+        self._make_spec = make_spec
+        self.n_calls = 0
+
+    def __call__(self, cache, key, values):
+        def generate():
+            self.n_calls += 1
+            return self._make_spec(*values)
+        return cache.get_spec(key, values, generate)
+
+
+class TestSpecTemplateCache(unittest.TestCase):
+
+    def _check_all(self, make_spec, all_values, min_samples=2):
+        """ Get the specification of each set of values, checking that each\
+            is the one generated in full
+        """
+        cache = SpecTemplateCache(min_samples=min_samples)
+        generator = _Generator(make_spec)
+        for values in all_values:
+            self.assertEqual(
+                make_spec(*values), generator(cache, "key", values))
+        return cache, generator
+
+    def test_locate_and_rebuild(self):
+
+        # two values among constant words, including a negative value
+        cache, generator = self._check_all(
+            lambda a, b: _spec(0xAD130AD6, a, 7, b & 0xFFFFFFFF, 0),
+            [(1, 100), (2, 200), (3, 300), (9, -1), (0x10000, 5)])
+        self.assertEqual(2, generator.n_calls)
+        self.assertEqual(2, cache.n_generated)
+        self.assertEqual(3, cache.n_built)
+
+    def test_min_samples(self):
+        cache, generator = self._check_all(
+            lambda a: _spec(1, a), [(value,) for value in xrange(6)],
+            min_samples=4)
+        self.assertEqual(4, generator.n_calls)
+        self.assertEqual(2, cache.n_built)
+
+    def test_keys_are_separate(self):
+        cache = SpecTemplateCache()
+        first = _Generator(lambda a: _spec(1, a))
+        second = _Generator(lambda a: _spec(a, 2, 2))
+        for value in xrange(4):
+            self.assertEqual(_spec(1, value), first(cache, "a", [value]))
+            self.assertEqual(_spec(value, 2, 2), second(cache, "b", [value]))
+        self.assertEqual(4, cache.n_built)
+
+    def test_value_in_several_words(self):
+
+        # a value written twice cannot be placed in one word, so it is
+        # never built from the template
+        cache, generator = self._check_all(
+            lambda a, b: _spec(a, 5, a, b),
+            [(value, value * 2) for value in xrange(1, 7)])
+        self.assertEqual(6, generator.n_calls)
+        self.assertEqual(0, cache.n_built)
+
+    def test_value_equal_to_a_constant(self):
+
+        # a value that matches a constant word in one sample is still found
+        # from the other samples
+        cache, generator = self._check_all(
+            lambda a: _spec(3, a, 4), [(3,), (4,), (5,), (6,)])
+        self.assertEqual(2, generator.n_calls)
+        self.assertEqual(2, cache.n_built)
+
+    def test_undeclared_varying_word(self):
+
+        # a word which varies without being a template value stops the
+        # samples from being rebuilt, so everything is generated in full
+        counter = [0]
+
+        def make_spec(a):
+            counter[0] += 1
+            return _spec(a, counter[0])
+        cache = SpecTemplateCache()
+        generator = _Generator(make_spec)
+        for value in xrange(6):
+            spec = generator(cache, "key", [value])
+            self.assertEqual(_spec(value, counter[0]), spec)
+        self.assertEqual(6, generator.n_calls)
+        self.assertEqual(0, cache.n_built)
+
+    def test_fallback_to_full_generation(self):
+
+        # specifications which are not whole words
+        cache, generator = self._check_all(
+            lambda a: _spec(a) + b"x", [(value,) for value in xrange(4)])
+        self.assertEqual(4, generator.n_calls)
+
+        # specifications which change in length
+        cache, generator = self._check_all(
+            lambda a: _spec(*([a] * (a + 1))),
+            [(value,) for value in xrange(4)])
+        self.assertEqual(4, generator.n_calls)
+
+        # a different number of values, after which the template is no
+        # longer trusted
+        cache, generator = self._check_all(
+            lambda *values: _spec(9, *values),
+            [(1,), (2,), (3,), (4, 5), (6,)])
+        self.assertEqual(4, generator.n_calls)
+        self.assertEqual(1, cache.n_built)
+
+
+if __name__ == "__main__":
+    unittest.main()